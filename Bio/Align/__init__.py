@@ -2473,6 +2473,33 @@ class Alignment:
         return m
 
 
+class _PathTuple:
+    """Iterator over paths that were found in advance (PRIVATE).
+
+    This behaves like the path generator returned by the C aligner, and is
+    used for the single alignment found in linear memory.
+    """
+
+    def __init__(self, paths):
+        self._paths = paths
+        self._index = 0
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._index == len(self._paths):
+            raise StopIteration
+        self._index += 1
+        return self._paths[self._index - 1]
+
+    def reset(self):
+        self._index = 0
+
+
 class PairwiseAlignments:
     """Implements an iterator over pairwise alignments returned by the aligner.
 
@@ -2536,6 +2563,23 @@ class PairwiseAlignments:
         return alignment
 
 
+class QueryProfile(_aligners.QueryProfile):
+    """Query profile to calculate local alignment scores quickly.
+
+    A QueryProfile is created by the prepare method of a PairwiseAligner,
+    and stores the scores of the query letters against each letter of the
+    alphabet in the order used by the striped Smith-Waterman algorithm
+    (Farrar, Bioinformatics 2007). Scoring many targets against the same
+    query then only needs the score method of the query profile.
+    """
+
+    def score(self, target):
+        """Return the local alignment score of the target and the query."""
+        if isinstance(target, (Seq, MutableSeq)):
+            target = bytes(target)
+        return _aligners.QueryProfile.score(self, target)
+
+
 class PairwiseAligner(_aligners.PairwiseAligner):
     """Performs pairwise sequence alignment using dynamic programming.
 
@@ -2699,7 +2743,18 @@ class PairwiseAligner(_aligners.PairwiseAligner):
         _aligners.PairwiseAligner.__setattr__(self, key, value)
 
     def align(self, seqA, seqB, strand="+"):
-        """Return the alignments of two sequences using PairwiseAligner."""
+        """Return the alignments of two sequences using PairwiseAligner.
+
+        Finding all optimal alignments needs memory proportional to the
+        product of the sequence lengths. If memory_mode is 'linear', a single
+        optimal alignment is found instead by divide and conquer (the
+        Hirschberg and Myers-Miller algorithms), needing memory proportional
+        to the sum of the sequence lengths only, at the cost of about twice
+        the time of calculating the score. With the default memory_mode
+        'auto', this is done if the traceback matrix would have more than
+        10**8 cells; use 'full' to always find all optimal alignments. Gap
+        score functions always use the full traceback matrix.
+        """
         if isinstance(seqA, (Seq, MutableSeq)):
             sA = bytes(seqA)
         else:
@@ -2711,11 +2766,40 @@ class PairwiseAligner(_aligners.PairwiseAligner):
         if isinstance(sB, (Seq, MutableSeq)):
             sB = bytes(sB)
         score, paths = _aligners.PairwiseAligner.align(self, sA, sB, strand)
+        if isinstance(paths, tuple):
+            paths = _PathTuple(paths)
         alignments = PairwiseAlignments(seqA, seqB, score, paths)
         return alignments
 
     def score(self, seqA, seqB, strand="+"):
-        """Return the alignments score of two sequences using PairwiseAligner."""
+        """Return the alignments score of two sequences using PairwiseAligner.
+
+        To calculate the score faster for long similar sequences, the
+        dynamic programming can be restricted to a band of diagonals, by
+        setting band_width to the maximum distance of the alignment path
+        from the diagonal given by band_offset (the position in the query
+        minus the position in the target, 0 by default):
+
+        >>> from Bio import Align
+        >>> aligner = Align.PairwiseAligner(mismatch_score=-1, gap_score=-2)
+        >>> aligner.score("GAACTGCTTA", "GACTGCCTTA")
+        5.0
+        >>> aligner.band_width = 1
+        >>> aligner.score("GAACTGCTTA", "GACTGCCTTA")
+        5.0
+        >>> aligner.band_width = 0
+        >>> aligner.score("GAACTGCTTA", "GACTGCCTTA")
+        2.0
+
+        Alternatively, or additionally, setting xdrop stops extending the
+        alignment paths whose score drops more than xdrop below the best
+        score found so far. For a global alignment, the score is -inf if the
+        end of the alignment cannot be reached that way. Both take time
+        proportional to the number of cells calculated rather than to the
+        product of the sequence lengths, but may miss the optimal alignment
+        if it lies outside the band or scores too low in between. They are
+        available for the score method only, and not for gap score functions.
+        """
         if isinstance(seqA, (Seq, MutableSeq)):
             seqA = bytes(seqA)
         if strand == "-":
@@ -2724,6 +2808,126 @@ class PairwiseAligner(_aligners.PairwiseAligner):
             seqB = bytes(seqB)
         return _aligners.PairwiseAligner.score(self, seqA, seqB, strand)
 
+    def _score_pairs(self, seqsA, seqsB, rows, columns, strand, threads):
+        """Return the scores of seqsA[rows[i]] and seqsB[columns[i]] (PRIVATE)."""
+        seqsA = [bytes(s) if isinstance(s, (Seq, MutableSeq)) else s for s in seqsA]
+        if strand == "-":
+            seqsB = [reverse_complement(s, inplace=False) for s in seqsB]
+        seqsB = [bytes(s) if isinstance(s, (Seq, MutableSeq)) else s for s in seqsB]
+        n = len(rows)
+        scores = numpy.empty(n)
+        score = _aligners.PairwiseAligner.score
+
+        def run(start, end):
+            for i in range(start, end):
+                scores[i] = score(self, seqsA[rows[i]], seqsB[columns[i]], strand)
+
+        if threads is None:
+            import os
+
+            threads = os.cpu_count() or 1
+        if threads == 1 or n < 2:
+            run(0, n)
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            # Several pieces per thread, to balance sequences of different lengths
+            size = max(n // (4 * threads), 1)
+            starts = range(0, n, size)
+            with ThreadPoolExecutor(threads) as executor:
+                # Iterate over the results to raise any exceptions
+                for result in executor.map(
+                    run, starts, [min(start + size, n) for start in starts]
+                ):
+                    pass
+        return scores
+
+    def score_many(self, seqsA, seqsB, strand="+", threads=1):
+        """Return the alignment scores of pairs of sequences as a NumPy array.
+
+        The i-th score is the alignment score of seqsA[i] and seqsB[i], which
+        is the same as aligner.score(seqsA[i], seqsB[i], strand):
+
+        >>> from Bio import Align
+        >>> aligner = Align.PairwiseAligner()
+        >>> aligner.score_many(["GAACT", "GAACT", "ACGT"], ["GAT", "AACT", "CG"])
+        array([ 3.,  4.,  2.])
+
+        The pairs are scored in the given number of threads (default 1; if
+        None, one thread for each CPU). As the dynamic programming is done
+        without holding the global interpreter lock, the threads run in
+        parallel, all using this aligner with its substitution matrix. Only
+        the Waterman-Smith-Beyer algorithm used for user-defined gap score
+        functions does not run in parallel, as it calls the gap functions.
+        """
+        if len(seqsA) != len(seqsB):
+            raise ValueError(
+                "expected the same number of sequences (found %d and %d)"
+                % (len(seqsA), len(seqsB))
+            )
+        indices = numpy.arange(len(seqsA))
+        return self._score_pairs(seqsA, seqsB, indices, indices, strand, threads)
+
+    def score_matrix(self, seqsA, seqsB=None, strand="+", threads=1):
+        """Return the alignment scores of all pairs of sequences as a NumPy array.
+
+        Element [i, j] of the returned array is the alignment score of
+        seqsA[i] and seqsB[j]; if seqsB is None, the sequences in seqsA are
+        aligned to each other:
+
+        >>> from Bio import Align
+        >>> aligner = Align.PairwiseAligner()
+        >>> aligner.score_matrix(["GAACT", "GAT", "ACGT"])
+        array([[ 5.,  3.,  3.],
+               [ 3.,  3.,  2.],
+               [ 3.,  2.,  4.]])
+
+        See the score_many method for the threads argument.
+        """
+        if seqsB is None:
+            seqsB = seqsA
+        rows = numpy.repeat(numpy.arange(len(seqsA)), len(seqsB))
+        columns = numpy.tile(numpy.arange(len(seqsB)), len(seqsA))
+        scores = self._score_pairs(seqsA, seqsB, rows, columns, strand, threads)
+        return scores.reshape(len(seqsA), len(seqsB))
+
+    def prepare(self, query, strand="+"):
+        """Return a query profile to calculate local alignment scores quickly.
+
+        The score method of the query profile returns the same score as the
+        score method of the aligner with the given query and strand:
+
+        >>> from Bio import Align
+        >>> aligner = Align.PairwiseAligner(mode="local", mismatch_score=-1)
+        >>> aligner.open_gap_score = -2
+        >>> aligner.extend_gap_score = -1
+        >>> profile = aligner.prepare("GAACTGCTTA")
+        >>> profile.score("TTGACTGCTTACC")
+        8.0
+        >>> aligner.score("TTGACTGCTTACC", "GAACTGCTTA")
+        8.0
+
+        If all scores are integers, and opening a gap costs at least as
+        much as extending it, the query profile uses the striped
+        Smith-Waterman algorithm, calculating the scores in vectors of 8-bit
+        or, if these overflow, 16-bit integers. Otherwise, or if the 16-bit
+        integers overflow, the score is calculated in the usual way. The
+        query profile uses a copy of the aligner, so changing the aligner
+        afterwards does not affect the query profile. As the score is
+        calculated without holding the global interpreter lock, a query
+        profile can be used by several threads at the same time.
+
+        Query profiles are only available for local alignments, and not for
+        gap score functions, band_width, or xdrop.
+        """
+        if strand == "-":
+            query = reverse_complement(query, inplace=False)
+        if isinstance(query, (Seq, MutableSeq)):
+            query = bytes(query)
+        aligner = PairwiseAligner()
+        aligner.__setstate__(self.__getstate__())
+        return QueryProfile(aligner, query)
+
     def __getstate__(self):
         state = {
             "wildcard": self.wildcard,
@@ -2740,10 +2944,15 @@ class PairwiseAligner(_aligners.PairwiseAligner):
             "query_right_open_gap_score": self.query_right_open_gap_score,
             "query_right_extend_gap_score": self.query_right_extend_gap_score,
             "mode": self.mode,
+            "band_width": self.band_width,
+            "band_offset": self.band_offset,
+            "xdrop": self.xdrop,
+            "memory_mode": self.memory_mode,
         }
         if self.substitution_matrix is None:
             state["match_score"] = self.match_score
             state["mismatch_score"] = self.mismatch_score
+            state["alphabet"] = self.alphabet
         else:
             state["substitution_matrix"] = self.substitution_matrix
         return state
@@ -2765,10 +2974,15 @@ class PairwiseAligner(_aligners.PairwiseAligner):
         self.query_right_open_gap_score = state["query_right_open_gap_score"]
         self.query_right_extend_gap_score = state["query_right_extend_gap_score"]
         self.mode = state["mode"]
+        self.band_width = state.get("band_width")
+        self.band_offset = state.get("band_offset", 0)
+        self.xdrop = state.get("xdrop")
+        self.memory_mode = state.get("memory_mode", "auto")
         substitution_matrix = state.get("substitution_matrix")
         if substitution_matrix is None:
             self.match_score = state["match_score"]
             self.mismatch_score = state["mismatch_score"]
+            self.alphabet = state.get("alphabet")
         else:
             self.substitution_matrix = substitution_matrix
 
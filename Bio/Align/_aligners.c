@@ -44,6 +44,8 @@ typedef enum {NeedlemanWunschSmithWaterman,
 
 typedef enum {Global, Local} Mode;
 
+typedef enum {AutoMemory, FullMemory, LinearMemory} MemoryMode;
+
 typedef struct {
     unsigned char trace : 5;
     unsigned char path : 3;
@@ -1726,6 +1728,10 @@ typedef struct {
     PyObject* alphabet;
     int* mapping;
     int wildcard;
+    int band_width;
+    int band_offset;
+    double xdrop;
+    MemoryMode memory_mode;
 } Aligner;
 
 
@@ -1842,6 +1848,10 @@ Aligner_init(Aligner *self, PyObject *args, PyObject *kwds)
     self->alphabet = NULL;
     self->mapping = NULL;
     self->wildcard = -1;
+    self->band_width = -1;
+    self->band_offset = 0;
+    self->xdrop = -1;
+    self->memory_mode = AutoMemory;
     return 0;
 }
 
@@ -1928,9 +1938,21 @@ Aligner_str(Aligner* self)
         p += sprintf(p, "  query_right_extend_gap_score: %f\n",
                      self->query_right_extend_gap_score);
     }
+    if (self->band_width >= 0) {
+        p += sprintf(p, "  band_width: %d\n", self->band_width);
+        p += sprintf(p, "  band_offset: %d\n", self->band_offset);
+    }
+    if (self->xdrop >= 0) {
+        p += sprintf(p, "  xdrop: %f\n", self->xdrop);
+    }
     switch (self->mode) {
-        case Global: sprintf(p, "  mode: global\n"); break;
-        case Local: sprintf(p, "  mode: local\n"); break;
+        case Global: p += sprintf(p, "  mode: global\n"); break;
+        case Local: p += sprintf(p, "  mode: local\n"); break;
+    }
+    switch (self->memory_mode) {
+        case AutoMemory: sprintf(p, "  memory_mode: auto\n"); break;
+        case FullMemory: sprintf(p, "  memory_mode: full\n"); break;
+        case LinearMemory: sprintf(p, "  memory_mode: linear\n"); break;
     }
     s = PyUnicode_FromFormat(text, args[0], args[1], args[2]);
     Py_XDECREF(wildcard);
@@ -1967,6 +1989,41 @@ Aligner_set_mode(Aligner* self, PyObject* value, void* closure)
     return -1;
 }
 
+static char Aligner_memory_mode__doc__[] = "memory used for the traceback ('auto', 'full', or 'linear')";
+
+static PyObject*
+Aligner_get_memory_mode(Aligner* self, void* closure)
+{   const char* message = NULL;
+    switch (self->memory_mode) {
+        case AutoMemory: message = "auto"; break;
+        case FullMemory: message = "full"; break;
+        case LinearMemory: message = "linear"; break;
+    }
+    return PyUnicode_FromString(message);
+}
+
+static int
+Aligner_set_memory_mode(Aligner* self, PyObject* value, void* closure)
+{
+    if (PyUnicode_Check(value)) {
+        if (PyUnicode_CompareWithASCIIString(value, "auto") == 0) {
+            self->memory_mode = AutoMemory;
+            return 0;
+        }
+        if (PyUnicode_CompareWithASCIIString(value, "full") == 0) {
+            self->memory_mode = FullMemory;
+            return 0;
+        }
+        if (PyUnicode_CompareWithASCIIString(value, "linear") == 0) {
+            self->memory_mode = LinearMemory;
+            return 0;
+        }
+    }
+    PyErr_SetString(PyExc_ValueError,
+                    "invalid memory_mode (expected 'auto', 'full', or 'linear')");
+    return -1;
+}
+
 static char Aligner_match_score__doc__[] = "match score";
 
 static PyObject*
@@ -3725,6 +3782,93 @@ Aligner_set_wildcard(Aligner* self, PyObject* value, void* closure)
 
 static char Aligner_wildcard__doc__[] = "wildcard character";
 
+static PyObject*
+Aligner_get_band_width(Aligner* self, void* closure)
+{
+    if (self->band_width < 0) {
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+    return PyLong_FromLong(self->band_width);
+}
+
+static int
+Aligner_set_band_width(Aligner* self, PyObject* value, void* closure)
+{
+    long band_width;
+    if (value == Py_None) {
+        self->band_width = -1;
+        return 0;
+    }
+    band_width = PyLong_AsLong(value);
+    if (band_width == -1 && PyErr_Occurred()) return -1;
+    if (band_width < 0) {
+        PyErr_SetString(PyExc_ValueError,
+                        "band_width should be a non-negative integer, or None");
+        return -1;
+    }
+    if (band_width > INT_MAX) {
+        PyErr_SetString(PyExc_OverflowError, "band_width is too large");
+        return -1;
+    }
+    self->band_width = band_width;
+    return 0;
+}
+
+static char Aligner_band_width__doc__[] = "half-width of the band of diagonals around band_offset (None for no band)";
+
+static PyObject*
+Aligner_get_band_offset(Aligner* self, void* closure)
+{
+    return PyLong_FromLong(self->band_offset);
+}
+
+static int
+Aligner_set_band_offset(Aligner* self, PyObject* value, void* closure)
+{
+    const long band_offset = PyLong_AsLong(value);
+    if (band_offset == -1 && PyErr_Occurred()) return -1;
+    if (band_offset < INT_MIN || band_offset > INT_MAX) {
+        PyErr_SetString(PyExc_OverflowError, "band_offset is too large");
+        return -1;
+    }
+    self->band_offset = band_offset;
+    return 0;
+}
+
+static char Aligner_band_offset__doc__[] = "diagonal (query position minus target position) at the center of the band";
+
+static PyObject*
+Aligner_get_xdrop(Aligner* self, void* closure)
+{
+    if (self->xdrop < 0) {
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+    return PyFloat_FromDouble(self->xdrop);
+}
+
+static int
+Aligner_set_xdrop(Aligner* self, PyObject* value, void* closure)
+{
+    double xdrop;
+    if (value == Py_None) {
+        self->xdrop = -1;
+        return 0;
+    }
+    xdrop = PyFloat_AsDouble(value);
+    if (xdrop == -1.0 && PyErr_Occurred()) return -1;
+    if (!(xdrop >= 0)) {
+        PyErr_SetString(PyExc_ValueError,
+                        "xdrop should be a non-negative number, or None");
+        return -1;
+    }
+    self->xdrop = xdrop;
+    return 0;
+}
+
+static char Aligner_xdrop__doc__[] = "X-drop threshold for terminating the score calculation (None for no X-drop)";
+
 static Algorithm _get_algorithm(Aligner* self)
 {
     Algorithm algorithm = self->algorithm;
@@ -4021,6 +4165,22 @@ static PyGetSetDef Aligner_getset[] = {
         (getter)Aligner_get_wildcard,
         (setter)Aligner_set_wildcard,
         Aligner_wildcard__doc__, NULL},
+    {"band_width",
+        (getter)Aligner_get_band_width,
+        (setter)Aligner_set_band_width,
+        Aligner_band_width__doc__, NULL},
+    {"band_offset",
+        (getter)Aligner_get_band_offset,
+        (setter)Aligner_set_band_offset,
+        Aligner_band_offset__doc__, NULL},
+    {"xdrop",
+        (getter)Aligner_get_xdrop,
+        (setter)Aligner_set_xdrop,
+        Aligner_xdrop__doc__, NULL},
+    {"memory_mode",
+        (getter)Aligner_get_memory_mode,
+        (setter)Aligner_set_memory_mode,
+        Aligner_memory_mode__doc__, NULL},
     {"algorithm",
         (getter)Aligner_get_algorithm,
         (setter)NULL,
@@ -4332,8 +4492,12 @@ static PyGetSetDef Aligner_getset[] = {
     } \
 \
     /* Needleman-Wunsch algorithm */ \
-    row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!row) return PyErr_NoMemory(); \
+    /* The buffers are allocated with PyMem_RawMalloc, and the dynamic \
+     * programming is done without holding the GIL. \
+     */ \
+    Py_BEGIN_ALLOW_THREADS \
 \
     /* The top row of the score matrix is a special case, \
      * as there are no previously aligned characters. \
@@ -4374,7 +4538,8 @@ static PyGetSetDef Aligner_getset[] = {
     SELECT_SCORE_GLOBAL(temp + (align_score), \
                         row[nB] + right_gap_extend_B, \
                         row[nB-1] + right_gap_extend_A); \
-    PyMem_Free(row); \
+    PyMem_RawFree(row); \
+    Py_END_ALLOW_THREADS \
     return PyFloat_FromDouble(score);
 
 
@@ -4391,8 +4556,9 @@ static PyGetSetDef Aligner_getset[] = {
     double maximum = 0; \
 \
     /* Smith-Waterman algorithm */ \
-    row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!row) return PyErr_NoMemory(); \
+    Py_BEGIN_ALLOW_THREADS \
 \
     /* The top row of the score matrix is a special case, \
      * as there are no previously aligned characters. \
@@ -4425,7 +4591,8 @@ static PyGetSetDef Aligner_getset[] = {
     } \
     kB = sB[nB-1]; \
     SELECT_SCORE_LOCAL1(temp + (align_score)); \
-    PyMem_Free(row); \
+    PyMem_RawFree(row); \
+    Py_END_ALLOW_THREADS \
     return PyFloat_FromDouble(maximum);
 
 
@@ -4468,12 +4635,13 @@ static PyGetSetDef Aligner_getset[] = {
     /* Needleman-Wunsch algorithm */ \
     paths = PathGenerator_create_NWSW(nA, nB, Global, strand); \
     if (!paths) return NULL; \
-    row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!row) { \
         Py_DECREF(paths); \
         return PyErr_NoMemory(); \
     } \
     M = paths->M; \
+    Py_BEGIN_ALLOW_THREADS \
     row[0] = 0; \
     for (j = 1; j <= nB; j++) row[j] = j * left_gap_extend_A; \
     for (i = 1; i < nA; i++) { \
@@ -4496,8 +4664,9 @@ static PyGetSetDef Aligner_getset[] = {
     } \
     kB = sB[j-1]; \
     SELECT_TRACE_NEEDLEMAN_WUNSCH(right_gap_extend_A, right_gap_extend_B, align_score); \
-    PyMem_Free(row); \
+    PyMem_RawFree(row); \
     M[nA][nB].path = 0; \
+    Py_END_ALLOW_THREADS \
     return Py_BuildValue("fN", score, paths);
 
 
@@ -4522,12 +4691,13 @@ static PyGetSetDef Aligner_getset[] = {
     /* Smith-Waterman algorithm */ \
     paths = PathGenerator_create_NWSW(nA, nB, Local, strand); \
     if (!paths) return NULL; \
-    row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!row) { \
         Py_DECREF(paths); \
         return PyErr_NoMemory(); \
     } \
     M = paths->M; \
+    Py_BEGIN_ALLOW_THREADS \
     for (j = 0; j <= nB; j++) row[j] = 0; \
     for (i = 1; i < nA; i++) { \
         temp = 0; \
@@ -4547,7 +4717,7 @@ static PyGetSetDef Aligner_getset[] = {
     } \
     kB = sB[nB-1]; \
     SELECT_TRACE_SMITH_WATERMAN_D(align_score); \
-    PyMem_Free(row); \
+    PyMem_RawFree(row); \
 \
     /* As we don't allow zero-score extensions to alignments, \
      * we need to remove all traces towards an ENDPOINT. \
@@ -4582,6 +4752,7 @@ static PyGetSetDef Aligner_getset[] = {
     } \
     if (maximum == 0) M[0][0].path = NONE; \
     else M[0][0].path = 0; \
+    Py_END_ALLOW_THREADS \
     return Py_BuildValue("fN", maximum, paths);
 
 
@@ -4637,12 +4808,13 @@ static PyGetSetDef Aligner_getset[] = {
     } \
 \
     /* Gotoh algorithm with three states */ \
-    M_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    M_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!M_row) goto exit; \
-    Ix_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    Ix_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!Ix_row) goto exit; \
-    Iy_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    Iy_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!Iy_row) goto exit; \
+    Py_BEGIN_ALLOW_THREADS \
 \
     /* The top row of the score matrix is a special case, \
      * as there are no previously aligned characters. \
@@ -4742,15 +4914,16 @@ static PyGetSetDef Aligner_getset[] = {
     Iy_row[nB] = score; \
 \
     SELECT_SCORE_GLOBAL(M_row[nB], Ix_row[nB], Iy_row[nB]); \
-    PyMem_Free(M_row); \
-    PyMem_Free(Ix_row); \
-    PyMem_Free(Iy_row); \
+    PyMem_RawFree(M_row); \
+    PyMem_RawFree(Ix_row); \
+    PyMem_RawFree(Iy_row); \
+    Py_END_ALLOW_THREADS \
     return PyFloat_FromDouble(score); \
 \
 exit: \
-    if (M_row) PyMem_Free(M_row); \
-    if (Ix_row) PyMem_Free(Ix_row); \
-    if (Iy_row) PyMem_Free(Iy_row); \
+    if (M_row) PyMem_RawFree(M_row); \
+    if (Ix_row) PyMem_RawFree(Ix_row); \
+    if (Iy_row) PyMem_RawFree(Iy_row); \
     return PyErr_NoMemory(); \
 
 
@@ -4774,12 +4947,13 @@ exit: \
     double maximum = 0.0; \
 \
     /* Gotoh algorithm with three states */ \
-    M_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    M_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!M_row) goto exit; \
-    Ix_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    Ix_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!Ix_row) goto exit; \
-    Iy_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    Iy_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!Iy_row) goto exit; \
+    Py_BEGIN_ALLOW_THREADS \
  \
     /* The top row of the score matrix is a special case, \
      * as there are no previously aligned characters. \
@@ -4854,14 +5028,15 @@ exit: \
                                    Ix_temp, \
                                    Iy_temp, \
                                    (align_score)); \
-    PyMem_Free(M_row); \
-    PyMem_Free(Ix_row); \
-    PyMem_Free(Iy_row); \
+    PyMem_RawFree(M_row); \
+    PyMem_RawFree(Ix_row); \
+    PyMem_RawFree(Iy_row); \
+    Py_END_ALLOW_THREADS \
     return PyFloat_FromDouble(maximum); \
 exit: \
-    if (M_row) PyMem_Free(M_row); \
-    if (Ix_row) PyMem_Free(Ix_row); \
-    if (Iy_row) PyMem_Free(Iy_row); \
+    if (M_row) PyMem_RawFree(M_row); \
+    if (Ix_row) PyMem_RawFree(Ix_row); \
+    if (Iy_row) PyMem_RawFree(Iy_row); \
     return PyErr_NoMemory(); \
 
 
@@ -4924,14 +5099,15 @@ exit: \
     /* Gotoh algorithm with three states */ \
     paths = PathGenerator_create_Gotoh(nA, nB, Global, strand); \
     if (!paths) return NULL; \
-    M_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    M_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!M_row) goto exit; \
-    Ix_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    Ix_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!Ix_row) goto exit; \
-    Iy_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    Iy_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!Iy_row) goto exit; \
     M = paths->M; \
     gaps = paths->gaps.gotoh; \
+    Py_BEGIN_ALLOW_THREADS \
  \
     /* Gotoh algorithm with three states */ \
     M_row[0] = 0; \
@@ -5031,15 +5207,16 @@ exit: \
     if (M_row[nB] < score - epsilon) M[nA][nB].trace = 0; \
     if (Ix_row[nB] < score - epsilon) gaps[nA][nB].Ix = 0; \
     if (Iy_row[nB] < score - epsilon) gaps[nA][nB].Iy = 0; \
-    PyMem_Free(M_row); \
-    PyMem_Free(Ix_row); \
-    PyMem_Free(Iy_row); \
+    PyMem_RawFree(M_row); \
+    PyMem_RawFree(Ix_row); \
+    PyMem_RawFree(Iy_row); \
+    Py_END_ALLOW_THREADS \
     return Py_BuildValue("fN", score, paths); \
 exit: \
     Py_DECREF(paths); \
-    if (M_row) PyMem_Free(M_row); \
-    if (Ix_row) PyMem_Free(Ix_row); \
-    if (Iy_row) PyMem_Free(Iy_row); \
+    if (M_row) PyMem_RawFree(M_row); \
+    if (Ix_row) PyMem_RawFree(Ix_row); \
+    if (Iy_row) PyMem_RawFree(Iy_row); \
     return PyErr_NoMemory(); \
 
 
@@ -5074,12 +5251,13 @@ exit: \
     if (!paths) return NULL; \
     M = paths->M; \
     gaps = paths->gaps.gotoh; \
-    M_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    M_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!M_row) goto exit; \
-    Ix_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    Ix_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!Ix_row) goto exit; \
-    Iy_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    Iy_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!Iy_row) goto exit; \
+    Py_BEGIN_ALLOW_THREADS \
     M_row[0] = 0; \
     Ix_row[0] = -DBL_MAX; \
     Iy_row[0] = -DBL_MAX; \
@@ -5152,9 +5330,9 @@ exit: \
     gaps[nA][nB].Ix = 0; \
     gaps[nA][nB].Iy = 0; \
 \
-    PyMem_Free(M_row); \
-    PyMem_Free(Ix_row); \
-    PyMem_Free(Iy_row); \
+    PyMem_RawFree(M_row); \
+    PyMem_RawFree(Ix_row); \
+    PyMem_RawFree(Iy_row); \
 \
     /* As we don't allow zero-score extensions to alignments, \
      * we need to remove all traces towards an ENDPOINT. \
@@ -5221,13 +5399,14 @@ exit: \
     /* traceback */ \
     if (maximum == 0) M[0][0].path = DONE; \
     else M[0][0].path = 0; \
+    Py_END_ALLOW_THREADS \
     return Py_BuildValue("fN", maximum, paths); \
 \
 exit: \
     Py_DECREF(paths); \
-    if (M_row) PyMem_Free(M_row); \
-    if (Ix_row) PyMem_Free(Ix_row); \
-    if (Iy_row) PyMem_Free(Iy_row); \
+    if (M_row) PyMem_RawFree(M_row); \
+    if (Ix_row) PyMem_RawFree(Ix_row); \
+    if (Iy_row) PyMem_RawFree(Iy_row); \
     return PyErr_NoMemory(); \
 
 
@@ -6121,6 +6300,879 @@ Aligner_gotoh_local_score_matrix(Aligner* self,
     GOTOH_LOCAL_SCORE(MATRIX_SCORE);
 }
 
+/* Score-only dynamic programming restricted to a band of diagonals and/or
+ * using X-drop termination, for the Needleman-Wunsch, Smith-Waterman, and
+ * Gotoh algorithms.  The Needleman-Wunsch and Smith-Waterman algorithms are
+ * the special case of the Gotoh algorithm with open gap scores equal to the
+ * extend gap scores, so the three states are used for all of them.
+ *
+ * Cell (i, j) is inside the band if j - i is within band_width of
+ * band_offset.  Cells outside the band, and states whose score has dropped
+ * more than xdrop below the best score found so far, are dead (-DBL_MAX),
+ * and are not extended further.  Only the columns that can contain live
+ * cells are calculated in each row, so the time is proportional to the
+ * number of cells in the band (or to the number of live cells for X-drop),
+ * while the memory is proportional to the length of the query.
+ */
+
+#define BANDED_STORE \
+    if (M < cutoff) M = -DBL_MAX; \
+    if (Ix < cutoff) Ix = -DBL_MAX; \
+    if (Iy < cutoff) Iy = -DBL_MAX; \
+    M_row[j] = M; \
+    Ix_row[j] = Ix; \
+    Iy_row[j] = Iy; \
+    score = M; \
+    if (Ix > score) score = Ix; \
+    if (Iy > score) score = Iy; \
+    if (score > -DBL_MAX) { \
+        if (j < alo) alo = j; \
+        ahi = j; \
+        if (score > best) { \
+            best = score; \
+            if (xdrop >= 0) cutoff = best - xdrop; \
+        } \
+    }
+
+#define BANDED_SCORE(align_score) \
+    Py_ssize_t i; \
+    Py_ssize_t j; \
+    int kA; \
+    int kB; \
+    const Mode mode = self->mode; \
+    const double xdrop = self->xdrop; \
+    const double gap_open_A = self->target_internal_open_gap_score; \
+    const double gap_open_B = self->query_internal_open_gap_score; \
+    const double gap_extend_A = self->target_internal_extend_gap_score; \
+    const double gap_extend_B = self->query_internal_extend_gap_score; \
+    double left_gap_open_A; \
+    double left_gap_open_B; \
+    double left_gap_extend_A; \
+    double left_gap_extend_B; \
+    double right_gap_open_A; \
+    double right_gap_open_B; \
+    double right_gap_extend_A; \
+    double right_gap_extend_B; \
+    double open_A; \
+    double open_B; \
+    double extend_A; \
+    double extend_B; \
+    Py_ssize_t lo; \
+    Py_ssize_t hi; \
+    Py_ssize_t start; \
+    Py_ssize_t end; \
+    Py_ssize_t plo; \
+    Py_ssize_t phi; \
+    Py_ssize_t alo = PY_SSIZE_T_MAX; \
+    Py_ssize_t ahi = -1; \
+    Py_ssize_t last; \
+    int narrow; \
+    double* buffer; \
+    double* M_row; \
+    double* Ix_row; \
+    double* Iy_row; \
+    double* M_prev; \
+    double* Ix_prev; \
+    double* Iy_prev; \
+    double* p; \
+    double M; \
+    double Ix; \
+    double Iy; \
+    double zero; \
+    double score; \
+    double temp; \
+    double best = 0; \
+    double cutoff = -DBL_MAX; \
+    switch (strand) { \
+        case '+': \
+            left_gap_open_A = self->target_left_open_gap_score; \
+            left_gap_open_B = self->query_left_open_gap_score; \
+            left_gap_extend_A = self->target_left_extend_gap_score; \
+            left_gap_extend_B = self->query_left_extend_gap_score; \
+            right_gap_open_A = self->target_right_open_gap_score; \
+            right_gap_open_B = self->query_right_open_gap_score; \
+            right_gap_extend_A = self->target_right_extend_gap_score; \
+            right_gap_extend_B = self->query_right_extend_gap_score; \
+            break; \
+        case '-': \
+            left_gap_open_A = self->target_right_open_gap_score; \
+            left_gap_open_B = self->query_right_open_gap_score; \
+            left_gap_extend_A = self->target_right_extend_gap_score; \
+            left_gap_extend_B = self->query_right_extend_gap_score; \
+            right_gap_open_A = self->target_left_open_gap_score; \
+            right_gap_open_B = self->query_left_open_gap_score; \
+            right_gap_extend_A = self->target_left_extend_gap_score; \
+            right_gap_extend_B = self->query_left_extend_gap_score; \
+            break; \
+        default: \
+            PyErr_SetString(PyExc_RuntimeError, "strand was neither '+' nor '-'"); \
+            return NULL; \
+    } \
+    if (self->band_width < 0) { \
+        lo = -nA; \
+        hi = nB; \
+    } \
+    else { \
+        lo = (Py_ssize_t)self->band_offset - self->band_width; \
+        hi = (Py_ssize_t)self->band_offset + self->band_width; \
+    } \
+    if (mode == Global && (lo > 0 || hi < 0 || lo > nB - nA || hi < nB - nA)) { \
+        PyErr_SetString(PyExc_ValueError, \
+                        "the band does not include both ends of the " \
+                        "global alignment"); \
+        return NULL; \
+    } \
+    buffer = PyMem_RawMalloc(6*(nB+1)*sizeof(double)); \
+    if (!buffer) return PyErr_NoMemory(); \
+    M_row = buffer; \
+    Ix_row = M_row + nB + 1; \
+    Iy_row = Ix_row + nB + 1; \
+    M_prev = Iy_row + nB + 1; \
+    Ix_prev = M_prev + nB + 1; \
+    Iy_prev = Ix_prev + nB + 1; \
+    Py_BEGIN_ALLOW_THREADS \
+    if (xdrop >= 0) cutoff = -xdrop; \
+\
+    /* The top row of the score matrix is a special case, \
+     * as there are no previously aligned characters. \
+     */ \
+    start = lo > 0 ? lo : 0; \
+    end = hi < nB ? hi : nB; \
+    for (j = start; j <= end; j++) { \
+        M = -DBL_MAX; \
+        Ix = -DBL_MAX; \
+        Iy = -DBL_MAX; \
+        if (j == 0) M = 0; \
+        else if (mode == Local) Iy = 0; \
+        else if (j == 1 || Iy_row[j-1] > -DBL_MAX) \
+            Iy = left_gap_open_A + left_gap_extend_A * (j-1); \
+        BANDED_STORE \
+    } \
+\
+    for (i = 1; i <= nA; i++) { \
+        plo = start; \
+        phi = end; \
+        p = M_prev; M_prev = M_row; M_row = p; \
+        p = Ix_prev; Ix_prev = Ix_row; Ix_row = p; \
+        p = Iy_prev; Iy_prev = Iy_row; Iy_row = p; \
+        /* Without restarts of a local alignment, only the columns reachable \
+         * from the live cells in the previous row need to be calculated. \
+         */ \
+        narrow = xdrop >= 0 && (mode == Global || cutoff > 0); \
+        start = i + lo; \
+        if (start < 0) start = 0; \
+        end = i + hi; \
+        if (end > nB) end = nB; \
+        if (narrow) { \
+            if (ahi < 0) break; \
+            if (start < alo) start = alo; \
+            last = ahi; \
+        } \
+        else last = nB; \
+        alo = PY_SSIZE_T_MAX; \
+        ahi = -1; \
+        if (start > end) continue; \
+        if (start > 0) { \
+            M_row[start-1] = -DBL_MAX; \
+            Ix_row[start-1] = -DBL_MAX; \
+            Iy_row[start-1] = -DBL_MAX; \
+        } \
+        kA = sA[i-1]; \
+        if (i < nA) { \
+            open_A = gap_open_A; \
+            extend_A = gap_extend_A; \
+        } \
+        else { \
+            open_A = right_gap_open_A; \
+            extend_A = right_gap_extend_A; \
+        } \
+        for (j = start; j <= end; j++) { \
+            if (j > last + 1 && ahi != j - 1) { \
+                /* Only horizontal gaps from a live cell could reach here */ \
+                end = j - 1; \
+                break; \
+            } \
+            zero = (mode == Local && cutoff <= 0) ? 0 : -DBL_MAX; \
+            if (j == 0) { \
+                M = -DBL_MAX; \
+                Iy = -DBL_MAX; \
+                if (mode == Local) Ix = zero; \
+                else if (i == 1 || (plo == 0 && Ix_prev[0] > -DBL_MAX)) \
+                    Ix = left_gap_open_B + left_gap_extend_B * (i-1); \
+                else Ix = -DBL_MAX; \
+                BANDED_STORE \
+                continue; \
+            } \
+            kB = sB[j-1]; \
+            score = -DBL_MAX; \
+            if (j - 1 >= plo && j - 1 <= phi) { \
+                score = M_prev[j-1]; \
+                temp = Ix_prev[j-1]; \
+                if (temp > score) score = temp; \
+                temp = Iy_prev[j-1]; \
+                if (temp > score) score = temp; \
+            } \
+            if (score < zero) score = zero; \
+            M = (score > -DBL_MAX) ? score + (align_score) : -DBL_MAX; \
+            if (M < zero) M = zero; \
+            if (mode == Local && (i == nA || j == nB)) { \
+                /* No gaps at the ends of a local alignment */ \
+                Ix = zero; \
+                Iy = zero; \
+            } \
+            else { \
+                if (j < nB) { \
+                    open_B = gap_open_B; \
+                    extend_B = gap_extend_B; \
+                } \
+                else { \
+                    open_B = right_gap_open_B; \
+                    extend_B = right_gap_extend_B; \
+                } \
+                Ix = -DBL_MAX; \
+                if (j >= plo && j <= phi) { \
+                    Ix = M_prev[j] + open_B; \
+                    temp = Ix_prev[j] + extend_B; \
+                    if (temp > Ix) Ix = temp; \
+                    temp = Iy_prev[j] + open_B; \
+                    if (temp > Ix) Ix = temp; \
+                } \
+                if (Ix < zero) Ix = zero; \
+                Iy = M_row[j-1] + open_A; \
+                temp = Ix_row[j-1] + open_A; \
+                if (temp > Iy) Iy = temp; \
+                temp = Iy_row[j-1] + extend_A; \
+                if (temp > Iy) Iy = temp; \
+                if (Iy < zero) Iy = zero; \
+            } \
+            BANDED_STORE \
+        } \
+    } \
+    if (mode == Global) { \
+        score = -DBL_MAX; \
+        if (i > nA && start <= end && end == nB) { \
+            score = M_row[nB]; \
+            if (Ix_row[nB] > score) score = Ix_row[nB]; \
+            if (Iy_row[nB] > score) score = Iy_row[nB]; \
+        } \
+        /* The end of the alignment was not reached within the X-drop */ \
+        if (score == -DBL_MAX) score = -INFINITY; \
+    } \
+    else score = best; \
+    PyMem_RawFree(buffer); \
+    Py_END_ALLOW_THREADS \
+    return PyFloat_FromDouble(score);
+
+static PyObject*
+Aligner_banded_score_compare(Aligner* self,
+                             const int* sA, Py_ssize_t nA,
+                             const int* sB, Py_ssize_t nB,
+                             unsigned char strand)
+{
+    const double match = self->match;
+    const double mismatch = self->mismatch;
+    const int wildcard = self->wildcard;
+    BANDED_SCORE(COMPARE_SCORE);
+}
+
+static PyObject*
+Aligner_banded_score_matrix(Aligner* self,
+                            const int* sA, Py_ssize_t nA,
+                            const int* sB, Py_ssize_t nB,
+                            unsigned char strand)
+{
+    const Py_ssize_t n = self->substitution_matrix.shape[0];
+    const double* scores = self->substitution_matrix.buf;
+    BANDED_SCORE(MATRIX_SCORE);
+}
+
+/* Alignment in linear memory.
+ *
+ * The traceback matrices used to find all optimal alignments need memory
+ * proportional to the product of the sequence lengths, which becomes too
+ * large for long sequences.  Instead, a single optimal alignment can be
+ * found in linear memory by divide and conquer (Hirschberg's algorithm,
+ * generalized to the three states of the Gotoh algorithm as described by
+ * Myers and Miller): the best scores from the start of the alignment to
+ * each cell and state in the middle row, and from there to the end of the
+ * alignment, identify a cell and state in the middle row that an optimal
+ * alignment passes through, after which the two halves are aligned
+ * recursively.  This takes about twice the time of calculating the score.
+ *
+ * The Needleman-Wunsch and Smith-Waterman algorithms are handled as the
+ * Gotoh algorithm with open gap scores equal to the extend gap scores.  For
+ * local alignments, the start and end of the best local alignment are found
+ * first, after which the aligned subsequences are aligned globally.
+ */
+
+/* Number of cells in the traceback matrix above which the alignment is
+ * calculated in linear memory if the memory mode is 'auto'. */
+#define LINEAR_MEMORY_THRESHOLD 100000000
+
+/* Blocks with at most this many cells are aligned using the full matrix */
+#define LINEAR_MEMORY_BLOCK 4096
+
+typedef struct {
+    const int* sA;
+    const int* sB;
+    Py_ssize_t nA;
+    Py_ssize_t nB;
+    const double* scores;
+    Py_ssize_t n;
+    double match;
+    double mismatch;
+    int wildcard;
+    /* gap scores in the first row or column, inside, and in the last */
+    double open_A[3];
+    double extend_A[3];
+    double open_B[3];
+    double extend_B[3];
+    double* buffer;
+    Py_ssize_t* iA;
+    Py_ssize_t* iB;
+    Py_ssize_t length;
+} LinearAligner;
+
+#define LINEAR_GAP_INDEX(i, n) ((i) == 0 ? 0 : (i) == (n) ? 2 : 1)
+
+static double
+LinearAligner_substitution(const LinearAligner* aligner,
+                           Py_ssize_t i, Py_ssize_t j)
+{
+    const int kA = aligner->sA[i-1];
+    const int kB = aligner->sB[j-1];
+    if (aligner->scores) return aligner->scores[kA*aligner->n+kB];
+    if (kA == aligner->wildcard || kB == aligner->wildcard) return 0;
+    return (kA == kB) ? aligner->match : aligner->mismatch;
+}
+
+static void
+LinearAligner_add_point(LinearAligner* aligner, Py_ssize_t i, Py_ssize_t j)
+{
+    Py_ssize_t* iA = aligner->iA;
+    Py_ssize_t* iB = aligner->iB;
+    const Py_ssize_t k = aligner->length;
+    if (k > 0 && iA[k-1] == i && iB[k-1] == j) return;
+    if (k > 1
+     && (iA[k-1] == iA[k-2]) == (i == iA[k-1])
+     && (iB[k-1] == iB[k-2]) == (j == iB[k-1])) {
+        /* continuing in the same direction */
+        iA[k-1] = i;
+        iB[k-1] = j;
+        return;
+    }
+    iA[k] = i;
+    iB[k] = j;
+    aligner->length++;
+}
+
+/* Calculate the best scores of each state in row i, ending at columns
+ * j0 to j1, from those in the previous row (or from the start state s0 at
+ * cell (i, j0) if previous is NULL).  The scores are stored as M, Ix, Iy
+ * for each column in turn. */
+static void
+LinearAligner_forward_row(const LinearAligner* aligner,
+                          Py_ssize_t i, Py_ssize_t j0, Py_ssize_t j1,
+                          const double* previous, double* row, int s0)
+{
+    Py_ssize_t j;
+    Py_ssize_t k;
+    double score;
+    double temp;
+    const Py_ssize_t nB = aligner->nB;
+    const int g = LINEAR_GAP_INDEX(i, aligner->nA);
+    const double open_A = aligner->open_A[g];
+    const double extend_A = aligner->extend_A[g];
+    double open_B;
+    double extend_B;
+
+    if (previous) {
+        open_B = aligner->open_B[LINEAR_GAP_INDEX(j0, nB)];
+        extend_B = aligner->extend_B[LINEAR_GAP_INDEX(j0, nB)];
+        row[0] = -DBL_MAX;
+        SELECT_SCORE_GLOBAL(previous[0] + open_B,
+                            previous[1] + extend_B,
+                            previous[2] + open_B);
+        row[1] = score;
+        row[2] = -DBL_MAX;
+    }
+    else {
+        row[0] = (s0 == 0) ? 0 : -DBL_MAX;
+        row[1] = (s0 == 1) ? 0 : -DBL_MAX;
+        row[2] = (s0 == 2) ? 0 : -DBL_MAX;
+    }
+    for (j = j0 + 1, k = 3; j <= j1; j++, k += 3) {
+        if (previous) {
+            SELECT_SCORE_GLOBAL(previous[k-3], previous[k-2], previous[k-1]);
+            row[k] = score + LinearAligner_substitution(aligner, i, j);
+            if (j == nB) {
+                open_B = aligner->open_B[2];
+                extend_B = aligner->extend_B[2];
+            }
+            else {
+                open_B = aligner->open_B[1];
+                extend_B = aligner->extend_B[1];
+            }
+            SELECT_SCORE_GLOBAL(previous[k] + open_B,
+                                previous[k+1] + extend_B,
+                                previous[k+2] + open_B);
+            row[k+1] = score;
+        }
+        else {
+            row[k] = -DBL_MAX;
+            row[k+1] = -DBL_MAX;
+        }
+        SELECT_SCORE_GLOBAL(row[k-3] + open_A,
+                            row[k-2] + open_A,
+                            row[k-1] + extend_A);
+        row[k+2] = score;
+    }
+}
+
+/* Calculate the best scores from each state in row i, starting at columns
+ * j0 to j1, to the end of the block, from those in the next row (or from
+ * the end states s1 at cell (i, j1) if next is NULL). */
+static void
+LinearAligner_backward_row(const LinearAligner* aligner,
+                           Py_ssize_t i, Py_ssize_t j0, Py_ssize_t j1,
+                           const double* next, double* row, int s1)
+{
+    Py_ssize_t j;
+    Py_ssize_t k = 3 * (j1 - j0);
+    int g;
+    double score;
+    double temp;
+    double diagonal;
+    const Py_ssize_t nB = aligner->nB;
+    const double open_A = aligner->open_A[LINEAR_GAP_INDEX(i, aligner->nA)];
+    const double extend_A = aligner->extend_A[LINEAR_GAP_INDEX(i, aligner->nA)];
+    double open_B;
+    double extend_B;
+
+    if (next) {
+        g = LINEAR_GAP_INDEX(j1, nB);
+        row[k] = next[k+1] + aligner->open_B[g];
+        row[k+1] = next[k+1] + aligner->extend_B[g];
+        row[k+2] = next[k+1] + aligner->open_B[g];
+    }
+    else {
+        row[k] = (s1 & M_MATRIX) ? 0 : -DBL_MAX;
+        row[k+1] = (s1 & Ix_MATRIX) ? 0 : -DBL_MAX;
+        row[k+2] = (s1 & Iy_MATRIX) ? 0 : -DBL_MAX;
+    }
+    for (j = j1 - 1, k -= 3; j >= j0; j--, k -= 3) {
+        if (next) {
+            diagonal = next[k+3] + LinearAligner_substitution(aligner, i+1, j+1);
+            g = LINEAR_GAP_INDEX(j, nB);
+            open_B = aligner->open_B[g];
+            extend_B = aligner->extend_B[g];
+            SELECT_SCORE_GLOBAL(diagonal,
+                                next[k+1] + open_B,
+                                row[k+5] + open_A);
+            row[k] = score;
+            SELECT_SCORE_GLOBAL(diagonal,
+                                next[k+1] + extend_B,
+                                row[k+5] + open_A);
+            row[k+1] = score;
+            SELECT_SCORE_GLOBAL(diagonal,
+                                next[k+1] + open_B,
+                                row[k+5] + extend_A);
+            row[k+2] = score;
+        }
+        else {
+            row[k] = row[k+5] + open_A;
+            row[k+1] = row[k+5] + open_A;
+            row[k+2] = row[k+5] + extend_A;
+        }
+    }
+}
+
+/* Align the block from cell (i0, j0) in state s0 (0 for M, 1 for Ix, 2 for
+ * Iy) to cell (i1, j1) in any of the states in the mask s1, using the full
+ * score matrix of the block, and add the path to the aligner. */
+static int
+LinearAligner_align_block(LinearAligner* aligner,
+                          Py_ssize_t i0, Py_ssize_t j0, int s0,
+                          Py_ssize_t i1, Py_ssize_t j1, int s1,
+                          double* result)
+{
+    const Py_ssize_t w = 3 * (j1 - j0 + 1);
+    Py_ssize_t i;
+    Py_ssize_t j;
+    Py_ssize_t n = 0;
+    int s = -1;
+    int t;
+    int g;
+    double score;
+    double temp;
+    const double* p;
+    const double* q;
+    double* scores = PyMem_RawMalloc((i1 - i0 + 1) * w * sizeof(double));
+    unsigned char* moves = PyMem_RawMalloc(i1 - i0 + j1 - j0 + 1);
+
+    if (!scores || !moves) {
+        if (scores) PyMem_RawFree(scores);
+        if (moves) PyMem_RawFree(moves);
+        return -1;
+    }
+    LinearAligner_forward_row(aligner, i0, j0, j1, NULL, scores, s0);
+    for (i = i0 + 1; i <= i1; i++)
+        LinearAligner_forward_row(aligner, i, j0, j1,
+                                  scores + (i - i0 - 1) * w,
+                                  scores + (i - i0) * w, s0);
+    p = scores + (i1 - i0 + 1) * w - 3;
+    for (t = 0; t < 3; t++) {
+        if (!(s1 & (1 << t))) continue;
+        if (s < 0 || p[t] > p[s]) s = t;
+    }
+    if (result) *result = p[s];
+    i = i1;
+    j = j1;
+    while (i > i0 || j > j0) {
+        p = scores + (i - i0) * w + 3 * (j - j0);
+        score = p[s];
+        moves[n++] = s;
+        switch (s) {
+            case 0:
+                q = p - w - 3;
+                temp = LinearAligner_substitution(aligner, i, j);
+                if (q[0] + temp == score) t = 0;
+                else if (q[1] + temp == score) t = 1;
+                else t = 2;
+                i--;
+                j--;
+                break;
+            case 1:
+                q = p - w;
+                g = LINEAR_GAP_INDEX(j, aligner->nB);
+                if (q[0] + aligner->open_B[g] == score) t = 0;
+                else if (q[1] + aligner->extend_B[g] == score) t = 1;
+                else t = 2;
+                i--;
+                break;
+            case 2:
+            default:
+                q = p - 3;
+                g = LINEAR_GAP_INDEX(i, aligner->nA);
+                if (q[0] + aligner->open_A[g] == score) t = 0;
+                else if (q[1] + aligner->open_A[g] == score) t = 1;
+                else t = 2;
+                j--;
+                break;
+        }
+        s = t;
+    }
+    LinearAligner_add_point(aligner, i0, j0);
+    while (n > 0) {
+        switch (moves[--n]) {
+            case 0: i++; j++; break;
+            case 1: i++; break;
+            case 2: j++; break;
+        }
+        LinearAligner_add_point(aligner, i, j);
+    }
+    PyMem_RawFree(scores);
+    PyMem_RawFree(moves);
+    return 0;
+}
+
+/* Align cell (i0, j0) in state s0 to cell (i1, j1) in any of the states in
+ * the mask s1, by splitting at the middle row, and add the path to the
+ * aligner.  The optimal score is stored in result, if not NULL. */
+static int
+LinearAligner_align(LinearAligner* aligner,
+                    Py_ssize_t i0, Py_ssize_t j0, int s0,
+                    Py_ssize_t i1, Py_ssize_t j1, int s1,
+                    double* result)
+{
+    const Py_ssize_t w = 3 * (j1 - j0 + 1);
+    const Py_ssize_t imid = (i0 + i1) / 2;
+    Py_ssize_t i;
+    Py_ssize_t k;
+    Py_ssize_t kmax = 0;
+    double score;
+    double best;
+    double* forward = aligner->buffer;
+    double* backward = forward + w;
+    double* current = backward + w;
+    double* other = current + w;
+    double* p;
+
+    if (i1 - i0 <= 1 || j1 - j0 <= 1
+     || (i1 - i0 + 1) * (j1 - j0 + 1) <= LINEAR_MEMORY_BLOCK)
+        return LinearAligner_align_block(aligner, i0, j0, s0, i1, j1, s1,
+                                         result);
+
+    LinearAligner_forward_row(aligner, i0, j0, j1, NULL, current, s0);
+    for (i = i0 + 1; i <= imid; i++) {
+        LinearAligner_forward_row(aligner, i, j0, j1, current, other, s0);
+        p = current; current = other; other = p;
+    }
+    memcpy(forward, current, w * sizeof(double));
+    LinearAligner_backward_row(aligner, i1, j0, j1, NULL, current, s1);
+    for (i = i1 - 1; i >= imid; i--) {
+        LinearAligner_backward_row(aligner, i, j0, j1, current, other, s1);
+        p = current; current = other; other = p;
+    }
+    memcpy(backward, current, w * sizeof(double));
+    best = forward[0] + backward[0];
+    for (k = 1; k < w; k++) {
+        score = forward[k] + backward[k];
+        if (score > best) {
+            best = score;
+            kmax = k;
+        }
+    }
+    if (result) *result = best;
+    if (LinearAligner_align(aligner, i0, j0, s0,
+                            imid, j0 + kmax / 3, 1 << (kmax % 3), NULL) < 0)
+        return -1;
+    return LinearAligner_align(aligner, imid, j0 + kmax / 3, kmax % 3,
+                               i1, j1, s1, NULL);
+}
+
+/* Find the score, the first aligned cell, and the last aligned cell of the
+ * best local alignment, as calculated by the Gotoh local score algorithm. */
+static int
+LinearAligner_find_local(LinearAligner* aligner, double* maximum,
+                         Py_ssize_t* iS, Py_ssize_t* jS,
+                         Py_ssize_t* iE, Py_ssize_t* jE)
+{
+    const Py_ssize_t nA = aligner->nA;
+    const Py_ssize_t nB = aligner->nB;
+    const double open_A = aligner->open_A[1];
+    const double extend_A = aligner->extend_A[1];
+    const double open_B = aligner->open_B[1];
+    const double extend_B = aligner->extend_B[1];
+    Py_ssize_t i;
+    Py_ssize_t j;
+    Py_ssize_t k;
+    int t;
+    double score;
+    double temp;
+    double* previous = aligner->buffer;
+    double* row = previous + 3 * (nB + 1);
+    double* p;
+    /* first aligned cell of the best path to each state (or -1 if none) */
+    Py_ssize_t* starts = PyMem_RawMalloc(12 * (nB + 1) * sizeof(Py_ssize_t));
+    Py_ssize_t* previous_starts = starts;
+    Py_ssize_t* row_starts = starts + 6 * (nB + 1);
+    Py_ssize_t* q;
+
+    if (!starts) return -1;
+    *maximum = 0;
+    row[0] = 0;
+    row[1] = -DBL_MAX;
+    row[2] = -DBL_MAX;
+    for (j = 1, k = 3; j <= nB; j++, k += 3) {
+        row[k] = -DBL_MAX;
+        row[k+1] = -DBL_MAX;
+        row[k+2] = 0;
+    }
+    for (k = 0; k < 6 * (nB + 1); k++) row_starts[k] = -1;
+    for (i = 1; i <= nA; i++) {
+        p = previous; previous = row; row = p;
+        q = previous_starts; previous_starts = row_starts; row_starts = q;
+        row[0] = -DBL_MAX;
+        row[1] = 0;
+        row[2] = -DBL_MAX;
+        for (k = 0; k < 6; k++) row_starts[k] = -1;
+        for (j = 1, k = 3; j <= nB; j++, k += 3) {
+            /* M: a new alignment starts here unless the best score of the
+             * previous cell is positive */
+            t = 0;
+            score = previous[k-3];
+            if (previous[k-2] > score) { score = previous[k-2]; t = 1; }
+            if (previous[k-1] > score) { score = previous[k-1]; t = 2; }
+            temp = LinearAligner_substitution(aligner, i, j);
+            if (score > 0 && previous_starts[2*(k-3+t)] >= 0) {
+                row[k] = score + temp;
+                row_starts[2*k] = previous_starts[2*(k-3+t)];
+                row_starts[2*k+1] = previous_starts[2*(k-3+t)+1];
+            }
+            else {
+                row[k] = temp;
+                row_starts[2*k] = i;
+                row_starts[2*k+1] = j;
+            }
+            if (row[k] < 0) {
+                row[k] = 0;
+                row_starts[2*k] = -1;
+            }
+            else if (row[k] > *maximum) {
+                *maximum = row[k];
+                *iS = row_starts[2*k];
+                *jS = row_starts[2*k+1];
+                *iE = i;
+                *jE = j;
+            }
+            /* No gaps at the ends of a local alignment */
+            row[k+1] = 0;
+            row[k+2] = 0;
+            row_starts[2*k+2] = -1;
+            row_starts[2*k+4] = -1;
+            if (i == nA || j == nB) continue;
+            /* Ix */
+            t = 0;
+            score = previous[k] + open_B;
+            if (previous[k+1] + extend_B > score) {
+                score = previous[k+1] + extend_B;
+                t = 1;
+            }
+            if (previous[k+2] + open_B > score) {
+                score = previous[k+2] + open_B;
+                t = 2;
+            }
+            if (score > 0 && previous_starts[2*(k+t)] >= 0) {
+                row[k+1] = score;
+                row_starts[2*k+2] = previous_starts[2*(k+t)];
+                row_starts[2*k+3] = previous_starts[2*(k+t)+1];
+            }
+            /* Iy */
+            t = 0;
+            score = row[k-3] + open_A;
+            if (row[k-2] + open_A > score) {
+                score = row[k-2] + open_A;
+                t = 1;
+            }
+            if (row[k-1] + extend_A > score) {
+                score = row[k-1] + extend_A;
+                t = 2;
+            }
+            if (score > 0 && row_starts[2*(k-3+t)] >= 0) {
+                row[k+2] = score;
+                row_starts[2*k+4] = row_starts[2*(k-3+t)];
+                row_starts[2*k+5] = row_starts[2*(k-3+t)+1];
+            }
+        }
+    }
+    PyMem_RawFree(starts);
+    return 0;
+}
+
+static PyObject*
+Aligner_linear_align(Aligner* self,
+                     const int* sA, Py_ssize_t nA,
+                     const int* sB, Py_ssize_t nB,
+                     unsigned char strand)
+{
+    LinearAligner aligner;
+    Py_ssize_t i;
+    Py_ssize_t iS = 0;
+    Py_ssize_t jS = 0;
+    Py_ssize_t iE = 0;
+    Py_ssize_t jE = 0;
+    int status = 0;
+    double score = 0;
+    PyObject* paths;
+    PyObject* path;
+    PyObject* target_row;
+    PyObject* query_row;
+    PyObject* value;
+
+    aligner.sA = sA;
+    aligner.sB = sB;
+    aligner.nA = nA;
+    aligner.nB = nB;
+    if (self->substitution_matrix.obj) {
+        aligner.scores = self->substitution_matrix.buf;
+        aligner.n = self->substitution_matrix.shape[0];
+    }
+    else {
+        aligner.scores = NULL;
+        aligner.n = 0;
+    }
+    aligner.match = self->match;
+    aligner.mismatch = self->mismatch;
+    aligner.wildcard = self->wildcard;
+    aligner.open_A[1] = self->target_internal_open_gap_score;
+    aligner.extend_A[1] = self->target_internal_extend_gap_score;
+    aligner.open_B[1] = self->query_internal_open_gap_score;
+    aligner.extend_B[1] = self->query_internal_extend_gap_score;
+    if (self->mode == Local) {
+        aligner.open_A[0] = aligner.open_A[2] = aligner.open_A[1];
+        aligner.extend_A[0] = aligner.extend_A[2] = aligner.extend_A[1];
+        aligner.open_B[0] = aligner.open_B[2] = aligner.open_B[1];
+        aligner.extend_B[0] = aligner.extend_B[2] = aligner.extend_B[1];
+    }
+    else {
+        const int left = (strand == '+') ? 0 : 2;
+        const int right = 2 - left;
+        aligner.open_A[left] = self->target_left_open_gap_score;
+        aligner.extend_A[left] = self->target_left_extend_gap_score;
+        aligner.open_A[right] = self->target_right_open_gap_score;
+        aligner.extend_A[right] = self->target_right_extend_gap_score;
+        aligner.open_B[left] = self->query_left_open_gap_score;
+        aligner.extend_B[left] = self->query_left_extend_gap_score;
+        aligner.open_B[right] = self->query_right_open_gap_score;
+        aligner.extend_B[right] = self->query_right_extend_gap_score;
+    }
+    aligner.length = 0;
+    aligner.buffer = PyMem_RawMalloc(12 * (nB + 1) * sizeof(double));
+    aligner.iA = PyMem_RawMalloc((nA + nB + 2) * sizeof(Py_ssize_t));
+    aligner.iB = PyMem_RawMalloc((nA + nB + 2) * sizeof(Py_ssize_t));
+    if (!aligner.buffer || !aligner.iA || !aligner.iB) {
+        status = -1;
+        goto exit;
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    switch (self->mode) {
+        case Global:
+            status = LinearAligner_align(&aligner, 0, 0, 0, nA, nB,
+                                         M_MATRIX | Ix_MATRIX | Iy_MATRIX,
+                                         &score);
+            break;
+        case Local:
+            status = LinearAligner_find_local(&aligner, &score,
+                                              &iS, &jS, &iE, &jE);
+            if (status < 0 || score <= 0) break;
+            LinearAligner_add_point(&aligner, iS - 1, jS - 1);
+            status = LinearAligner_align(&aligner, iS, jS, 0, iE, jE,
+                                         M_MATRIX, NULL);
+            break;
+    }
+    Py_END_ALLOW_THREADS
+
+exit:
+    if (aligner.buffer) PyMem_RawFree(aligner.buffer);
+    if (status < 0) {
+        if (aligner.iA) PyMem_RawFree(aligner.iA);
+        if (aligner.iB) PyMem_RawFree(aligner.iB);
+        return PyErr_NoMemory();
+    }
+    paths = PyTuple_New(aligner.length ? 1 : 0);
+    if (paths && aligner.length) {
+        path = PyTuple_New(2);
+        target_row = PyTuple_New(aligner.length);
+        query_row = PyTuple_New(aligner.length);
+        if (path) PyTuple_SET_ITEM(paths, 0, path);
+        if (!path || !target_row || !query_row) {
+            Py_XDECREF(target_row);
+            Py_XDECREF(query_row);
+            Py_CLEAR(paths);
+        }
+        else {
+            PyTuple_SET_ITEM(path, 0, target_row);
+            PyTuple_SET_ITEM(path, 1, query_row);
+            for (i = 0; i < aligner.length; i++) {
+                value = PyLong_FromSsize_t(aligner.iA[i]);
+                if (!value) break;
+                PyTuple_SET_ITEM(target_row, i, value);
+                if (strand == '+') value = PyLong_FromSsize_t(aligner.iB[i]);
+                else value = PyLong_FromSsize_t(nB - aligner.iB[i]);
+                if (!value) break;
+                PyTuple_SET_ITEM(query_row, i, value);
+            }
+            if (i < aligner.length) Py_CLEAR(paths);
+        }
+    }
+    PyMem_RawFree(aligner.iA);
+    PyMem_RawFree(aligner.iB);
+    if (!paths) return NULL;
+    return Py_BuildValue("fN", score, paths);
+}
+
 static PyObject*
 Aligner_gotoh_global_align_compare(Aligner* self,
                                    const int* sA, Py_ssize_t nA,
@@ -6725,7 +7777,21 @@ Aligner_score(Aligner* self, PyObject* args, PyObject* keywords)
     sB = bB.buf;
     nB = bB.len / bB.itemsize;
 
-    switch (algorithm) {
+    /* The GIL is released during the dynamic programming, so keep the
+     * substitution matrix alive in case another thread replaces it. */
+    Py_XINCREF(substitution_matrix);
+
+    if (self->band_width >= 0 || self->xdrop >= 0) {
+        if (algorithm == WatermanSmithBeyer)
+            PyErr_SetString(PyExc_ValueError,
+                            "band_width and xdrop cannot be used with "
+                            "gap score functions");
+        else if (substitution_matrix)
+            result = Aligner_banded_score_matrix(self, sA, nA, sB, nB, strand);
+        else
+            result = Aligner_banded_score_compare(self, sA, nA, sB, nB, strand);
+    }
+    else switch (algorithm) {
         case NeedlemanWunschSmithWaterman:
             switch (mode) {
                 case Global:
@@ -6780,6 +7846,7 @@ Aligner_score(Aligner* self, PyObject* args, PyObject* keywords)
             break;
     }
 
+    Py_XDECREF(substitution_matrix);
     sequence_converter(NULL, &bA);
     sequence_converter(NULL, &bB);
 
@@ -6805,6 +7872,13 @@ Aligner_align(Aligner* self, PyObject* args, PyObject* keywords)
 
     static char *kwlist[] = {"sequenceA", "sequenceB", "strand", NULL};
 
+    if (self->band_width >= 0 || self->xdrop >= 0) {
+        PyErr_SetString(PyExc_ValueError,
+                        "band_width and xdrop are only available for "
+                        "calculating the alignment score");
+        return NULL;
+    }
+
     bA.obj = (PyObject*)self;
     bB.obj = (PyObject*)self;
     if(!PyArg_ParseTupleAndKeywords(args, keywords, "O&O&O&", kwlist,
@@ -6818,7 +7892,20 @@ Aligner_align(Aligner* self, PyObject* args, PyObject* keywords)
     sB = bB.buf;
     nB = bB.len / bB.itemsize;
 
-    switch (algorithm) {
+    /* The GIL is released during the dynamic programming, so keep the
+     * substitution matrix alive in case another thread replaces it. */
+    Py_XINCREF(substitution_matrix);
+
+    if (algorithm != WatermanSmithBeyer
+     && (self->memory_mode == LinearMemory
+      || (self->memory_mode == AutoMemory
+       && (double)(nA + 1) * (nB + 1) > LINEAR_MEMORY_THRESHOLD)))
+        result = Aligner_linear_align(self, sA, nA, sB, nB, strand);
+    else if (self->memory_mode == LinearMemory)
+        PyErr_SetString(PyExc_ValueError,
+                        "linear memory mode cannot be used with "
+                        "gap score functions");
+    else switch (algorithm) {
         case NeedlemanWunschSmithWaterman:
             switch (mode) {
                 case Global:
@@ -6873,6 +7960,7 @@ Aligner_align(Aligner* self, PyObject* args, PyObject* keywords)
             break;
     }
 
+    Py_XDECREF(substitution_matrix);
     sequence_converter(NULL, &bA);
     sequence_converter(NULL, &bB);
 
@@ -6936,6 +8024,555 @@ static PyTypeObject AlignerType = {
 };
 
 
+
+/* Query profiles */
+
+/* Number of 8-bit and 16-bit lanes processed together by the striped
+ * Smith-Waterman algorithm; the loops over the lanes have a fixed length,
+ * allowing the compiler to vectorize them. */
+#define STRIPED_LANES_8 32
+#define STRIPED_LANES_16 16
+
+/* Restrict-qualified pointers allow the compiler to vectorize the loops */
+#if defined(_MSC_VER)
+#define RESTRICT __restrict
+#else
+#define RESTRICT restrict
+#endif
+
+typedef struct {
+    int bias;
+    int target_open;
+    int target_extend;
+    int query_open;
+    int query_extend;
+} StripedParameters;
+
+typedef struct {
+    PyObject_HEAD
+    Aligner* aligner;
+    int* query;
+    Py_ssize_t length;
+    int* letters;
+    int n;
+    int size;
+    Py_ssize_t segments8;
+    unsigned char* profile8;
+    StripedParameters parameters8;
+    Py_ssize_t segments16;
+    unsigned short* profile16;
+    StripedParameters parameters16;
+} QueryProfile;
+
+static void
+QueryProfile_dealloc(QueryProfile* self)
+{
+    Py_XDECREF(self->aligner);
+    if (self->query) PyMem_Free(self->query);
+    if (self->letters) PyMem_Free(self->letters);
+    if (self->profile8) PyMem_Free(self->profile8);
+    if (self->profile16) PyMem_Free(self->profile16);
+    Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+/* Return the row of the query profile for letter k of the target. Without a
+ * substitution matrix, the profile has one row for each distinct letter in
+ * the query, followed by a row for all other letters and a row for the
+ * wildcard. */
+static int
+QueryProfile_row(const QueryProfile* self, int k)
+{
+    const int* letters = self->letters;
+    int low = 0;
+    int high = self->n;
+    int middle;
+    if (!letters) return k;
+    while (low < high) {
+        middle = (low + high) / 2;
+        if (letters[middle] < k) low = middle + 1;
+        else high = middle;
+    }
+    if (low < self->n && letters[low] == k) return low;
+    if (k == self->aligner->wildcard) return self->n + 1;
+    return self->n;
+}
+
+static double
+QueryProfile_substitution(const QueryProfile* self, int row, int kB)
+{
+    const Aligner* aligner = self->aligner;
+    const int wildcard = aligner->wildcard;
+    int kA;
+    if (!self->letters) {
+        const double* scores = aligner->substitution_matrix.buf;
+        return scores[row*self->size+kB];
+    }
+    if (row == self->n + 1 || kB == wildcard) return 0;
+    if (row == self->n) return aligner->mismatch;
+    kA = self->letters[row];
+    if (kA == wildcard) return 0;
+    return (kA == kB) ? aligner->match : aligner->mismatch;
+}
+
+/* Store the substitution scores in the striped order used by the striped
+ * Smith-Waterman algorithm (Farrar 2007): the score of query position
+ * l*segments+j is stored in lane l of segment j. The scores are stored as
+ * unsigned integers by adding the bias; positions beyond the end of the
+ * query are padded with the lowest possible score. */
+#define STRIPED_PROFILE(T, lanes) \
+    int row; \
+    int l; \
+    Py_ssize_t j; \
+    Py_ssize_t position; \
+    const Py_ssize_t segments = (self->length + lanes - 1) / lanes; \
+    T* profile = PyMem_Malloc(self->size*segments*lanes*sizeof(T)); \
+    if (!profile) { \
+        PyErr_NoMemory(); \
+        return NULL; \
+    } \
+    for (row = 0; row < self->size; row++) { \
+        for (j = 0; j < segments; j++) { \
+            for (l = 0; l < lanes; l++) { \
+                position = l * segments + j; \
+                profile[(row*segments+j)*lanes+l] = position < self->length \
+                    ? (T)(QueryProfile_substitution(self, row, self->query[position]) + bias) \
+                    : 0; \
+            } \
+        } \
+    } \
+    *pointer = segments; \
+    return profile;
+
+static unsigned char*
+QueryProfile_create_profile8(const QueryProfile* self, int bias, Py_ssize_t* pointer)
+{
+    STRIPED_PROFILE(unsigned char, STRIPED_LANES_8);
+}
+
+static unsigned short*
+QueryProfile_create_profile16(const QueryProfile* self, int bias, Py_ssize_t* pointer)
+{
+    STRIPED_PROFILE(unsigned short, STRIPED_LANES_16);
+}
+
+#define SATURATED_ADD(a, b, limit) \
+    (((T)((a) + (b)) < (a)) ? (limit) : (T)((a) + (b)))
+
+#define SATURATED_SUBTRACT(a, b) (((a) > (b)) ? (T)((a) - (b)) : 0)
+
+#define MAXIMUM(a, b) (((a) > (b)) ? (a) : (b))
+
+/* Calculate one column of the striped Smith-Waterman algorithm, using
+ * saturating unsigned lanes. Besides H and E, for each segment we keep the
+ * value of F used in the first pass, so that the second pass (the "lazy F
+ * loop") can stop as soon as the gaps carried over from the previous segment
+ * no longer change anything. The pointers are restrict-qualified so that the
+ * compiler can vectorize the loops over the lanes. */
+#define STRIPED_COLUMN(lanes, limit) \
+    Py_ssize_t j; \
+    int k; \
+    int l; \
+    T v; \
+    T g; \
+    T x; \
+    T changed; \
+    const Py_ssize_t n = segments * lanes; \
+    const T bias = (T)parameters->bias; \
+    const T target_open = (T)Py_MIN(parameters->target_open, limit); \
+    const T target_extend = (T)Py_MIN(parameters->target_extend, limit); \
+    const T query_open = (T)Py_MIN(parameters->query_open, limit); \
+    const T query_extend = (T)Py_MIN(parameters->query_extend, limit); \
+\
+    H_diagonal[0] = 0; \
+    for (l = 1; l < lanes; l++) H_diagonal[l] = H_load[n-lanes+l-1]; \
+    for (l = 0; l < lanes; l++) F[l] = 0; \
+    for (j = 0; j < segments; j++) { \
+        const T* p = profile + j*lanes; \
+        const T* h_load = H_load + j*lanes; \
+        T* h = H_store + j*lanes; \
+        T* e = E + j*lanes; \
+        T* f = F_store + j*lanes; \
+        for (l = 0; l < lanes; l++) { \
+            v = SATURATED_ADD(H_diagonal[l], p[l], limit); \
+            v = SATURATED_SUBTRACT(v, bias); \
+            M[l] = MAXIMUM(M[l], v); \
+            v = MAXIMUM(v, e[l]); \
+            v = MAXIMUM(v, F[l]); \
+            h[l] = v; \
+            f[l] = F[l]; \
+            H_diagonal[l] = h_load[l]; \
+            g = SATURATED_SUBTRACT(v, query_open); \
+            x = SATURATED_SUBTRACT(e[l], query_extend); \
+            e[l] = MAXIMUM(g, x); \
+            g = SATURATED_SUBTRACT(v, target_open); \
+            x = SATURATED_SUBTRACT(F[l], target_extend); \
+            F[l] = MAXIMUM(g, x); \
+        } \
+    } \
+    for (k = 0; k < lanes; k++) { \
+        for (l = lanes - 1; l > 0; l--) F[l] = F[l-1]; \
+        F[0] = 0; \
+        for (j = 0; j < segments; j++) { \
+            T* h = H_store + j*lanes; \
+            T* e = E + j*lanes; \
+            T* f = F_store + j*lanes; \
+            changed = 0; \
+            for (l = 0; l < lanes; l++) changed |= (F[l] > f[l]); \
+            if (!changed) return; \
+            for (l = 0; l < lanes; l++) { \
+                x = MAXIMUM(F[l], f[l]); \
+                f[l] = x; \
+                v = MAXIMUM(h[l], x); \
+                h[l] = v; \
+                g = SATURATED_SUBTRACT(v, query_open); \
+                e[l] = MAXIMUM(e[l], g); \
+                g = SATURATED_SUBTRACT(v, target_open); \
+                x = SATURATED_SUBTRACT(x, target_extend); \
+                F[l] = MAXIMUM(g, x); \
+            } \
+        } \
+    }
+
+static void
+QueryProfile_striped_column8(const StripedParameters* parameters,
+                             Py_ssize_t segments,
+                             const unsigned char* RESTRICT profile,
+                             const unsigned char* RESTRICT H_load,
+                             unsigned char* RESTRICT H_store,
+                             unsigned char* RESTRICT E,
+                             unsigned char* RESTRICT F_store,
+                             unsigned char* RESTRICT H_diagonal,
+                             unsigned char* RESTRICT F,
+                             unsigned char* RESTRICT M)
+{
+    typedef unsigned char T;
+    STRIPED_COLUMN(STRIPED_LANES_8, UCHAR_MAX);
+}
+
+static void
+QueryProfile_striped_column16(const StripedParameters* parameters,
+                              Py_ssize_t segments,
+                              const unsigned short* RESTRICT profile,
+                              const unsigned short* RESTRICT H_load,
+                              unsigned short* RESTRICT H_store,
+                              unsigned short* RESTRICT E,
+                              unsigned short* RESTRICT F_store,
+                              unsigned short* RESTRICT H_diagonal,
+                              unsigned short* RESTRICT F,
+                              unsigned short* RESTRICT M)
+{
+    typedef unsigned short T;
+    STRIPED_COLUMN(STRIPED_LANES_16, USHRT_MAX);
+}
+
+/* Calculate the local alignment score by the striped Smith-Waterman
+ * algorithm. Returns -1 if the score overflows the lanes, or if memory
+ * allocation fails. */
+#define STRIPED_SCORE(T, lanes, limit, profile, segments, column) \
+    Py_ssize_t i; \
+    int l; \
+    int maximum = 0; \
+    const Py_ssize_t n = segments * lanes; \
+    T* memory; \
+    T* H_load; \
+    T* H_store; \
+    T* t; \
+\
+    memory = PyMem_RawCalloc(4*n+3*lanes, sizeof(T)); \
+    if (!memory) return -1; \
+    H_load = memory; \
+    H_store = memory + n; \
+    for (i = 0; i < nA; i++) { \
+        t = H_load; \
+        H_load = H_store; \
+        H_store = t; \
+        column(parameters, segments, profile + rows[i] * n, \
+               H_load, H_store, memory + 2*n, memory + 3*n, \
+               memory + 4*n, memory + 4*n + lanes, memory + 4*n + 2*lanes); \
+    } \
+    for (l = 0; l < lanes; l++) { \
+        if (memory[4*n+2*lanes+l] > maximum) \
+            maximum = memory[4*n+2*lanes+l]; \
+    } \
+    PyMem_RawFree(memory); \
+    /* the lanes saturate if the score plus the bias reaches the limit */ \
+    if (maximum + parameters->bias >= limit) return -1; \
+    return maximum;
+
+static int
+QueryProfile_striped_score8(const QueryProfile* self,
+                            const int* rows, Py_ssize_t nA)
+{
+    const StripedParameters* parameters = &self->parameters8;
+    STRIPED_SCORE(unsigned char, STRIPED_LANES_8, UCHAR_MAX,
+                  self->profile8, self->segments8,
+                  QueryProfile_striped_column8);
+}
+
+static int
+QueryProfile_striped_score16(const QueryProfile* self,
+                             const int* rows, Py_ssize_t nA)
+{
+    const StripedParameters* parameters = &self->parameters16;
+    STRIPED_SCORE(unsigned short, STRIPED_LANES_16, USHRT_MAX,
+                  self->profile16, self->segments16,
+                  QueryProfile_striped_column16);
+}
+
+/* Convert an integer gap score to a positive penalty, or return -1 if the
+ * gap score cannot be used by the striped algorithm. */
+static int
+_get_gap_penalty(double score)
+{
+    if (score > 0 || score != floor(score)) return -1;
+    if (score < -USHRT_MAX) return USHRT_MAX;
+    return (int)(-score);
+}
+
+static int
+_compare_letters(const void* a, const void* b)
+{
+    const int x = *(const int*)a;
+    const int y = *(const int*)b;
+    return (x > y) - (x < y);
+}
+
+static int
+QueryProfile_init(QueryProfile* self, PyObject* args, PyObject* keywords)
+{
+    Py_ssize_t i;
+    Py_ssize_t m;
+    int n;
+    int k;
+    double score;
+    double minimum = 0;
+    double maximum = 0;
+    StripedParameters parameters;
+    Aligner* aligner;
+    int* query;
+    int* letters;
+    Py_buffer buffer = {0};
+    PyObject* object;
+
+    static char *kwlist[] = {"aligner", "query", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywords, "O!O", kwlist,
+                                     &AlignerType, &object, &buffer.obj))
+        return -1;
+    aligner = (Aligner*)object;
+    if (aligner->mode != Local) {
+        PyErr_SetString(PyExc_ValueError,
+                        "query profiles are available for local alignments "
+                        "only");
+        return -1;
+    }
+    if (_get_algorithm(aligner) == WatermanSmithBeyer) {
+        PyErr_SetString(PyExc_ValueError,
+                        "query profiles cannot be used with gap score "
+                        "functions");
+        return -1;
+    }
+    if (aligner->band_width >= 0 || aligner->xdrop >= 0) {
+        PyErr_SetString(PyExc_ValueError,
+                        "query profiles cannot be used with band_width or "
+                        "xdrop");
+        return -1;
+    }
+    object = buffer.obj;
+    buffer.obj = (PyObject*)aligner;
+    if (!sequence_converter(object, &buffer)) return -1;
+    m = buffer.len / buffer.itemsize;
+    query = PyMem_Malloc(m*sizeof(int));
+    if (query) memcpy(query, buffer.buf, m*sizeof(int));
+    sequence_converter(NULL, &buffer);
+    if (!query) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    Py_INCREF(aligner);
+    self->aligner = aligner;
+    self->query = query;
+    self->length = m;
+
+    if (aligner->substitution_matrix.obj) {
+        self->size = (int)aligner->substitution_matrix.shape[0];
+    }
+    else {
+        /* Collect the distinct letters in the query, in sorted order */
+        letters = PyMem_Malloc(m*sizeof(int));
+        if (!letters) {
+            PyErr_NoMemory();
+            return -1;
+        }
+        self->letters = letters;
+        memcpy(letters, query, m*sizeof(int));
+        qsort(letters, m, sizeof(int), _compare_letters);
+        n = 1;
+        for (i = 1; i < m; i++) if (letters[i] != letters[n-1]) letters[n++] = letters[i];
+        self->n = n;
+        self->size = n + 2;
+    }
+
+    /* The striped algorithm can be used for integer scores, with gaps that
+     * cost at least as much to open as to extend. */
+    parameters.target_open = _get_gap_penalty(aligner->target_internal_open_gap_score);
+    parameters.target_extend = _get_gap_penalty(aligner->target_internal_extend_gap_score);
+    parameters.query_open = _get_gap_penalty(aligner->query_internal_open_gap_score);
+    parameters.query_extend = _get_gap_penalty(aligner->query_internal_extend_gap_score);
+    if (parameters.target_open < parameters.target_extend
+     || parameters.query_open < parameters.query_extend
+     || parameters.target_extend < 0
+     || parameters.query_extend < 0) return 0;
+    for (k = 0; k < self->size; k++) {
+        for (i = 0; i < m; i++) {
+            score = QueryProfile_substitution(self, k, query[i]);
+            if (score != floor(score)) return 0;
+            if (score < minimum) minimum = score;
+            if (score > maximum) maximum = score;
+        }
+    }
+    /* Shift the scores by the bias to make them non-negative */
+    parameters.bias = (int)(-minimum);
+    if (maximum - minimum < UCHAR_MAX) {
+        self->parameters8 = parameters;
+        self->profile8 = QueryProfile_create_profile8(self, parameters.bias,
+                                                      &self->segments8);
+        if (!self->profile8) return -1;
+    }
+    if (maximum - minimum < USHRT_MAX) {
+        self->parameters16 = parameters;
+        self->profile16 = QueryProfile_create_profile16(self, parameters.bias,
+                                                        &self->segments16);
+        if (!self->profile16) return -1;
+    }
+    return 0;
+}
+
+static PyObject*
+QueryProfile_exact_score(QueryProfile* self, const int* sA, Py_ssize_t nA)
+{
+    Aligner* aligner = self->aligner;
+    const int* sB = self->query;
+    const Py_ssize_t nB = self->length;
+    if (_get_algorithm(aligner) == Gotoh) {
+        if (aligner->substitution_matrix.obj)
+            return Aligner_gotoh_local_score_matrix(aligner, sA, nA, sB, nB);
+        else
+            return Aligner_gotoh_local_score_compare(aligner, sA, nA, sB, nB);
+    }
+    else {
+        if (aligner->substitution_matrix.obj)
+            return Aligner_smithwaterman_score_matrix(aligner, sA, nA, sB, nB);
+        else
+            return Aligner_smithwaterman_score_compare(aligner, sA, nA, sB, nB);
+    }
+}
+
+static const char QueryProfile_score__doc__[] = "calculate the local alignment score of a target to the query";
+
+static PyObject*
+QueryProfile_score(QueryProfile* self, PyObject* args, PyObject* keywords)
+{
+    Py_ssize_t i;
+    Py_ssize_t nA;
+    const int* sA;
+    int* rows = NULL;
+    int score = -1;
+    Py_buffer buffer = {0};
+    PyObject* result = NULL;
+
+    static char *kwlist[] = {"target", NULL};
+
+    if (!self->aligner) {
+        PyErr_SetString(PyExc_RuntimeError, "query profile is not initialized");
+        return NULL;
+    }
+    buffer.obj = (PyObject*)self->aligner;
+    if (!PyArg_ParseTupleAndKeywords(args, keywords, "O&", kwlist,
+                                     sequence_converter, &buffer))
+        return NULL;
+    sA = buffer.buf;
+    nA = buffer.len / buffer.itemsize;
+
+    if (self->profile8 || self->profile16) {
+        if (self->letters) {
+            rows = PyMem_Malloc(nA*sizeof(int));
+            if (!rows) {
+                PyErr_NoMemory();
+                goto exit;
+            }
+            for (i = 0; i < nA; i++) rows[i] = QueryProfile_row(self, sA[i]);
+        }
+        /* Try 8-bit lanes first, then 16-bit lanes if these overflow. An
+         * overflow of the 16-bit lanes is rare enough that we then simply
+         * calculate the score without the query profile. */
+        Py_BEGIN_ALLOW_THREADS
+        if (self->profile8)
+            score = QueryProfile_striped_score8(self, rows ? rows : sA, nA);
+        if (self->profile16 && score < 0)
+            score = QueryProfile_striped_score16(self, rows ? rows : sA, nA);
+        Py_END_ALLOW_THREADS
+    }
+    if (score >= 0) result = PyFloat_FromDouble(score);
+    else result = QueryProfile_exact_score(self, sA, nA);
+
+exit:
+    if (rows) PyMem_Free(rows);
+    sequence_converter(NULL, &buffer);
+    return result;
+}
+
+static char QueryProfile_doc[] =
+"Query profile for calculating local alignment scores.\n";
+
+static PyMethodDef QueryProfile_methods[] = {
+    {"score",
+     (PyCFunction)QueryProfile_score,
+     METH_VARARGS | METH_KEYWORDS,
+     QueryProfile_score__doc__
+    },
+    {NULL}  /* Sentinel */
+};
+
+static PyTypeObject QueryProfileType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "_aligners.QueryProfile",      /* tp_name */
+    sizeof(QueryProfile),          /* tp_basicsize */
+    0,                             /* tp_itemsize */
+    (destructor)QueryProfile_dealloc, /* tp_dealloc */
+    0,                             /* tp_print */
+    0,                             /* tp_getattr */
+    0,                             /* tp_setattr */
+    0,                             /* tp_compare */
+    0,                             /* tp_repr */
+    0,                             /* tp_as_number */
+    0,                             /* tp_as_sequence */
+    0,                             /* tp_as_mapping */
+    0,                             /* tp_hash */
+    0,                             /* tp_call */
+    0,                             /* tp_str */
+    0,                             /* tp_getattro */
+    0,                             /* tp_setattro */
+    0,                             /* tp_as_buffer */
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,        /*tp_flags*/
+    QueryProfile_doc,              /* tp_doc */
+    0,                             /* tp_traverse */
+    0,                             /* tp_clear */
+    0,                             /* tp_richcompare */
+    0,                             /* tp_weaklistoffset */
+    0,                             /* tp_iter */
+    0,                             /* tp_iternext */
+    QueryProfile_methods,          /* tp_methods */
+    0,                             /* tp_members */
+    0,                             /* tp_getset */
+    0,                             /* tp_base */
+    0,                             /* tp_dict */
+    0,                             /* tp_descr_get */
+    0,                             /* tp_descr_set */
+    0,                             /* tp_dictoffset */
+    (initproc)QueryProfile_init,   /* tp_init */
+};
+
 /* Module definition */
 
 static char _aligners__doc__[] =
@@ -6959,7 +8596,10 @@ PyInit__aligners(void)
     PyObject* module;
     AlignerType.tp_new = PyType_GenericNew;
 
-    if (PyType_Ready(&AlignerType) < 0 || PyType_Ready(&PathGenerator_Type) < 0)
+    QueryProfileType.tp_new = PyType_GenericNew;
+
+    if (PyType_Ready(&AlignerType) < 0 || PyType_Ready(&PathGenerator_Type) < 0
+     || PyType_Ready(&QueryProfileType) < 0)
         return NULL;
 
     module = PyModule_Create(&moduledef);
@@ -6975,5 +8615,13 @@ PyInit__aligners(void)
         return NULL;
     }
 
+    Py_INCREF(&QueryProfileType);
+    if (PyModule_AddObject(module,
+                           "QueryProfile", (PyObject*) &QueryProfileType) < 0) {
+        Py_DECREF(&QueryProfileType);
+        Py_DECREF(module);
+        return NULL;
+    }
+
     return module;
 }
@@ -0,0 +1,669 @@
+# Copyright 2022 by Michiel de Hoon.  All rights reserved.
+#
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Bio.Align support for the "bam" pairwise alignment format.
+
+The Binary Alignment/Map (BAM) format is the compressed binary version of the
+Sequence Alignment/Map (SAM) format, storing the same information. The file
+is compressed in BGZF blocks (see Bio.bgzf), and stores the alignments as
+binary records, with the sequence encoded in four bits per letter.
+
+See http://www.htslib.org/ for more information.
+
+You are expected to use this module via the Bio.Align functions.
+
+Reading a BAM file gives the same alignments as reading the corresponding SAM
+file with Bio.Align.sam, except that the target sequences are always known
+from the list of reference sequences stored in the BAM file, even if the
+header text does not include @SQ lines. The CIGAR string, sequence, quality,
+and tags are decoded directly from the binary record. Use lazy=True to decode
+them only when they are first used.
+"""
+import re
+import struct
+import warnings
+from io import StringIO
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+
+    raise MissingPythonDependencyError(
+        "Please install numpy if you want to use Bio.Align. "
+        "See http://www.numpy.org/"
+    ) from None
+
+from Bio import bgzf
+from Bio.Align import Alignment
+from Bio.Align import interfaces
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+from Bio import BiopythonExperimentalWarning
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", BiopythonExperimentalWarning)
+    from Bio.Align import sam
+
+warnings.warn(
+    "Bio.Align.bam is an experimental module which may undergo "
+    "significant changes prior to its future official release.",
+    BiopythonExperimentalWarning,
+)
+
+
+_BLOCK_SIZE = struct.Struct("<i")
+
+# refID, pos, l_read_name, mapq, bin, n_cigar_op, flag, l_seq, next_refID,
+# next_pos, tlen
+_CORE = struct.Struct("<iiBBHHHiiii")
+
+_CIGAR_OPERATIONS = "MIDNSHP=X"
+
+_SEQUENCE_LETTERS = "=ACMGRSVTWYHKDBN"
+
+# Each byte of the sequence encodes two letters
+_SEQUENCE_PAIRS = [a + b for a in _SEQUENCE_LETTERS for b in _SEQUENCE_LETTERS]
+
+_SEQUENCE_CODES = {letter: code for code, letter in enumerate(_SEQUENCE_LETTERS)}
+_SEQUENCE_CODES.update(
+    {letter.lower(): code for code, letter in enumerate(_SEQUENCE_LETTERS)}
+)
+
+# Phred quality scores are stored without the offset of 33 used in SAM
+_QUALITY_TABLE = bytes((i + 33) % 256 for i in range(256))
+
+_TAG_TYPES = {
+    "c": struct.Struct("<b"),
+    "C": struct.Struct("<B"),
+    "s": struct.Struct("<h"),
+    "S": struct.Struct("<H"),
+    "i": struct.Struct("<i"),
+    "I": struct.Struct("<I"),
+    "f": struct.Struct("<f"),
+}
+
+_ARRAY_TYPES = {
+    "c": "<i1",
+    "C": "<u1",
+    "s": "<i2",
+    "S": "<u2",
+    "i": "<i4",
+    "I": "<u4",
+    "f": "<f4",
+}
+
+
+def _parse_core(data):
+    """Return the attributes stored in the fixed-length part of a record (PRIVATE).
+
+    These are the flag, mapq, rnext, pnext, and tlen attributes of the
+    alignment, which are only included if available, as in Bio.Align.sam.
+    """
+    (
+        ref_id,
+        pos,
+        l_read_name,
+        mapq,
+        bin_,
+        n_cigar_op,
+        flag,
+        l_seq,
+        next_ref_id,
+        next_pos,
+        tlen,
+    ) = _CORE.unpack_from(data)
+    attributes = {"flag": flag}
+    if mapq != 255:
+        attributes["mapq"] = mapq
+    if next_ref_id >= 0:
+        attributes["rnext"] = next_ref_id
+    if next_pos >= 0:
+        attributes["pnext"] = next_pos
+    if tlen != 0:
+        attributes["tlen"] = tlen
+    return attributes
+
+
+def _parse_tags(data, offset):
+    """Return the score, MD tag, and other tags of a record as a dictionary (PRIVATE)."""
+    score = None
+    md = None
+    annotations = {}
+    end = len(data)
+    while offset < end:
+        tag = data[offset : offset + 2].decode()
+        datatype = chr(data[offset + 2])
+        offset += 3
+        if datatype == "A":
+            value = chr(data[offset])
+            offset += 1
+        elif datatype in "ZH":
+            index = data.index(0, offset)
+            value = data[offset:index].decode()
+            offset = index + 1
+            if datatype == "H":
+                value = bytes.fromhex(value)
+        elif datatype == "B":
+            letter = chr(data[offset])
+            (count,) = _BLOCK_SIZE.unpack_from(data, offset + 1)
+            offset += 5
+            try:
+                dtype = numpy.dtype(_ARRAY_TYPES[letter])
+            except KeyError:
+                raise ValueError(
+                    f"Unknown number type '{letter}' in tag '{tag}'"
+                ) from None
+            value = numpy.frombuffer(data, dtype, count, offset).copy()
+            offset += count * dtype.itemsize
+        else:
+            try:
+                number = _TAG_TYPES[datatype]
+            except KeyError:
+                raise ValueError(
+                    f"Unknown data type '{datatype}' in tag '{tag}'"
+                ) from None
+            (value,) = number.unpack_from(data, offset)
+            offset += number.size
+        if tag == "AS":
+            score = value
+        elif tag == "MD":
+            md = value
+        else:
+            annotations[tag] = value
+    return score, md, annotations
+
+
+def _parse_record(data, names, targets):
+    """Return the sequences, coordinates, and attributes of a record (PRIVATE).
+
+    The attributes are those not stored in the fixed-length part of the
+    record, which are returned by _parse_core; they are only included if
+    available.
+    """
+    (
+        ref_id,
+        target_pos,
+        l_read_name,
+        mapq,
+        bin_,
+        n_cigar_op,
+        flag,
+        l_seq,
+        next_ref_id,
+        next_pos,
+        tlen,
+    ) = _CORE.unpack_from(data)
+    offset = _CORE.size
+    qname = data[offset : offset + l_read_name - 1].decode()
+    offset += l_read_name
+    cigar = struct.unpack_from("<%dI" % n_cigar_op, data, offset)
+    offset += 4 * n_cigar_op
+    size = (l_seq + 1) // 2
+    query = "".join([_SEQUENCE_PAIRS[code] for code in data[offset : offset + size]])
+    query = query[:l_seq]
+    offset += size
+    if l_seq == 0 or data[offset] == 0xFF:
+        qual = None
+    else:
+        qual = data[offset : offset + l_seq].translate(_QUALITY_TABLE).decode()
+    offset += l_seq
+    score, md, annotations = _parse_tags(data, offset)
+    cg = annotations.get("CG")
+    if (
+        cg is not None
+        and len(cigar) == 2
+        and cigar[0] == l_seq << 4 | 4
+        and cigar[1] & 15 == 3
+    ):
+        # More than 65535 CIGAR operations, stored in the CG tag
+        cigar = cg.tolist()
+        del annotations["CG"]
+    if flag & 0x10:
+        strand = "-"
+    else:
+        strand = "+"
+    hard_clip_left = None
+    hard_clip_right = None
+    store_operations = False
+    query_pos = 0
+    if flag & 0x4:  # unmapped
+        target = None
+        coordinates = None
+    else:
+        rname = names[ref_id]
+        coordinates = [[target_pos, query_pos]]
+        operations = bytearray()
+        # for the MD tag
+        target = ""
+        starts = [target_pos]
+        size = 0
+        sizes = []
+        for value in cigar:
+            length = value >> 4
+            operation = value & 15
+            if operation == 0 or operation == 7 or operation == 8:
+                # M: alignment match
+                # =: sequence match
+                # X: sequence mismatch
+                if md is not None:
+                    target += query[query_pos : query_pos + length]
+                    size += length
+                target_pos += length
+                query_pos += length
+                if operation != 0:
+                    store_operations = True
+            elif operation == 1:
+                # I: insertion to the reference
+                query_pos += length
+            elif operation == 4:
+                # S: soft clipping
+                if query_pos == 0:
+                    coordinates[0][1] += length
+                query_pos += length
+                continue
+            elif operation == 2:
+                # D: deletion from the reference
+                target_pos += length
+                if md is not None:
+                    size += length
+                    starts.append(target_pos)
+                    sizes.append(size)
+                    size = 0
+            elif operation == 3:
+                # N: skipped region from the reference
+                target_pos += length
+                if md is not None:
+                    starts.append(target_pos)
+                    sizes.append(size)
+                    size = 0
+                store_operations = True
+            elif operation == 5:
+                # H: hard clipping (clipped sequences not present in sequence)
+                if query_pos == 0:
+                    hard_clip_left = length
+                else:
+                    hard_clip_right = length
+                continue
+            elif operation == 6:
+                # P: padding
+                raise NotImplementedError("padding operator is not yet implemented")
+            else:
+                raise ValueError(f"Unknown CIGAR operation {operation}")
+            coordinates.append([target_pos, query_pos])
+            operations.append(ord(_CIGAR_OPERATIONS[operation]))
+        if md is None:
+            target = targets[rname]
+        else:
+            sizes.append(size)
+            target = sam._create_target(targets[rname], target, md, starts, sizes)
+        coordinates = numpy.array(coordinates).transpose()
+        if strand == "-":
+            coordinates[1, :] = query_pos - coordinates[1, :]
+    if l_seq == 0:
+        sequence = Seq(None, length=query_pos)
+    else:
+        sequence = Seq(query)
+        if not (flag & 0x4):  # not unmapped
+            if l_seq != query_pos:
+                raise ValueError(
+                    "sequence length %d is inconsistent with CIGAR (%d)"
+                    % (l_seq, query_pos)
+                )
+            if strand == "-":
+                sequence = sequence.reverse_complement()
+    query = SeqRecord(sequence, id=qname)
+    if strand == "-":
+        hard_clip_left, hard_clip_right = hard_clip_right, hard_clip_left
+    if hard_clip_left is not None:
+        query.annotations["hard_clip_left"] = hard_clip_left
+    if hard_clip_right is not None:
+        query.annotations["hard_clip_right"] = hard_clip_right
+    if qual is not None:
+        query.letter_annotations["phred_quality"] = qual
+    attributes = {}
+    if score is not None:
+        attributes["score"] = score
+    if annotations:
+        attributes["annotations"] = annotations
+    if hard_clip_left is not None:
+        attributes["hard_clip_left"] = hard_clip_left
+    if hard_clip_right is not None:
+        attributes["hard_clip_right"] = hard_clip_right
+    if store_operations:
+        attributes["operations"] = operations
+    return [target, query], coordinates, attributes
+
+
+class _LazyAlignment(Alignment):
+    """Alignment from a BAM record, decoded on demand (PRIVATE).
+
+    Only the fixed-length part of the record is decoded when this is created,
+    giving the flag, mapq, rnext, pnext, and tlen attributes. The sequences,
+    coordinates, score, annotations, and other attributes are decoded from the
+    binary record the first time any of them is used.
+    """
+
+    _lazy_attributes = (
+        "sequences",
+        "coordinates",
+        "score",
+        "annotations",
+        "operations",
+        "hard_clip_left",
+        "hard_clip_right",
+    )
+
+    @classmethod
+    def _from_record(cls, data, names, targets):
+        """Create the alignment from the binary record (PRIVATE)."""
+        # Not calling Alignment.__init__, as the sequences and coordinates are
+        # filled in by __getattr__ when first used.
+        self = cls.__new__(cls)
+        self._record = data, names, targets
+        self.__dict__.update(_parse_core(data))
+        return self
+
+    def __getattr__(self, name):
+        """Decode the record when the sequences or coordinates are first used (PRIVATE)."""
+        if name in self._lazy_attributes:
+            record = self.__dict__.pop("_record", None)
+            if record is not None:
+                sequences, coordinates, attributes = _parse_record(*record)
+                attributes["sequences"] = sequences
+                attributes["coordinates"] = coordinates
+                # Keep any attributes already set by the user
+                for key, value in attributes.items():
+                    self.__dict__.setdefault(key, value)
+                if name in self.__dict__:
+                    return self.__dict__[name]
+        raise AttributeError(
+            f"'{self.__class__.__name__}' object has no attribute '{name}'"
+        )
+
+
+class AlignmentWriter(interfaces.AlignmentWriter):
+    """Alignment file writer for the Binary Alignment/Map (BAM) file format.
+
+    The alignments are formatted as by the SAM writer in Bio.Align.sam, and
+    then encoded as binary records. As the BAM header lists the target
+    sequences before any alignments, these are taken from the targets
+    attribute of the alignments (as set by the alignment iterators for the
+    SAM and BAM formats) if available; otherwise, the alignments should be
+    given as a list, so that the targets can be collected from them first.
+    The file is closed when all alignments have been written, as the BGZF
+    end-of-file marker is written at that point.
+    """
+
+    def __init__(self, target, md=False):
+        """Create an AlignmentWriter object.
+
+        Arguments:
+         - md - If True, calculate the MD tag from the alignment and include it
+                in the output.
+                If False (default), do not include the MD tag in the output.
+
+        """
+        super().__init__(target, mode="wb")
+        if target is not None:
+            self.stream = bgzf.BgzfWriter(fileobj=self.stream)
+        self.md = md
+        self._formatter = sam.AlignmentWriter(None, md=md)
+        self._references = {}
+
+    def write_header(self, alignments):
+        """Write the BAM header, with the SAM header text and the target sequences."""
+        text = StringIO()
+        sam.AlignmentWriter(text).write_header(alignments)
+        text = text.getvalue().encode()
+        targets = getattr(alignments, "targets", None)
+        if targets:
+            references = [(name, len(record.seq)) for name, record in targets.items()]
+        elif iter(alignments) is alignments:
+            raise ValueError(
+                "alignments without targets should be given as a list, as the "
+                "BAM header lists the target sequences first"
+            )
+        else:
+            references = {}
+            for alignment in alignments:
+                target = alignment.sequences[0]
+                try:
+                    name = target.id
+                except AttributeError:
+                    name = "target"
+                try:
+                    length = len(target)
+                except TypeError:  # length unknown
+                    length = 0
+                references.setdefault(name, length)
+            references = references.items()
+        data = [b"BAM\1", _BLOCK_SIZE.pack(len(text)), text]
+        data.append(_BLOCK_SIZE.pack(len(references)))
+        self._references.clear()
+        for index, (name, length) in enumerate(references):
+            self._references[name] = index
+            name = name.encode() + b"\0"
+            data.append(_BLOCK_SIZE.pack(len(name)))
+            data.append(name)
+            data.append(_BLOCK_SIZE.pack(length))
+        self.stream.write(b"".join(data))
+
+    def format_alignment(self, alignment, md=None):
+        """Return the binary BAM record of a single alignment as bytes."""
+        line = self._formatter.format_alignment(alignment, md)
+        (
+            qname,
+            flag,
+            rname,
+            pos,
+            mapq,
+            cigar,
+            rnext,
+            pnext,
+            tlen,
+            seq,
+            qual,
+            *tags,
+        ) = line.rstrip("\n").split("\t")
+        # Unlike the SAM writer, keep the flag and the mate information of
+        # alignments read from SAM or BAM files.
+        flag = int(flag) | getattr(alignment, "flag", 0) & ~0x10
+        rnext = getattr(alignment, "rnext", rnext)
+        pnext = getattr(alignment, "pnext", int(pnext) - 1)
+        tlen = getattr(alignment, "tlen", int(tlen))
+        ref_id = self._get_reference(rname)
+        pos = int(pos) - 1
+        if rnext == "=":
+            next_ref_id = ref_id
+        else:
+            next_ref_id = self._get_reference(rnext)
+        operations = []
+        end = pos
+        if cigar != "*":
+            for length, operation in re.findall(r"(\d+)([MIDNSHP=X])", cigar):
+                length = int(length)
+                operation = _CIGAR_OPERATIONS.index(operation)
+                if operation in (0, 2, 3, 7, 8):  # consumes the reference
+                    end += length
+                operations.append(length << 4 | operation)
+        if seq == "*":
+            seq = b""
+            l_seq = 0
+        else:
+            l_seq = len(seq)
+            codes = [_SEQUENCE_CODES.get(letter, 15) for letter in seq]
+            codes.append(0)
+            seq = bytes(a << 4 | b for a, b in zip(codes[0::2], codes[1::2]))
+        if qual == "*":
+            qual = b"\xff" * l_seq
+        else:
+            qual = bytes(score - 33 for score in qual.encode())
+        if len(operations) > 65535:
+            # Store the CIGAR operations in the CG tag, and use a placeholder
+            # of the query length soft-clipped, skipping the aligned region.
+            tags.append("CG:B:I," + ",".join(str(value) for value in operations))
+            operations = [l_seq << 4 | 4, (end - pos) << 4 | 3]
+        qname = qname.encode() + b"\0"
+        data = [
+            _CORE.pack(
+                ref_id,
+                pos,
+                len(qname),
+                int(mapq),
+                _reg2bin(pos, max(end, pos + 1)),
+                len(operations),
+                flag,
+                l_seq,
+                next_ref_id,
+                pnext,
+                tlen,
+            ),
+            qname,
+            struct.pack("<%dI" % len(operations), *operations),
+            seq,
+            qual,
+        ]
+        for field in tags:
+            data.append(_format_tag(field))
+        data = b"".join(data)
+        return _BLOCK_SIZE.pack(len(data)) + data
+
+    def _get_reference(self, name):
+        """Return the index of the target sequence in the BAM header (PRIVATE)."""
+        if name == "*":
+            return -1
+        try:
+            return self._references[name]
+        except KeyError:
+            raise ValueError(f"target {name} is missing from the BAM header") from None
+
+
+def _reg2bin(start, end):
+    """Return the BAI bin of the zero-based half-open region start to end (PRIVATE)."""
+    end -= 1
+    if start >> 14 == end >> 14:
+        return ((1 << 15) - 1) // 7 + (start >> 14)
+    if start >> 17 == end >> 17:
+        return ((1 << 12) - 1) // 7 + (start >> 17)
+    if start >> 20 == end >> 20:
+        return ((1 << 9) - 1) // 7 + (start >> 20)
+    if start >> 23 == end >> 23:
+        return ((1 << 6) - 1) // 7 + (start >> 23)
+    if start >> 26 == end >> 26:
+        return ((1 << 3) - 1) // 7 + (start >> 26)
+    return 0
+
+
+def _format_tag(field):
+    """Return a tag in SAM format encoded as binary BAM data (PRIVATE)."""
+    tag, datatype, value = field.split(":", 2)
+    tag = tag.encode()
+    if datatype == "i":
+        value = int(value)
+        if value >= 0:
+            for datatype in "CSI":
+                if value < 1 << (8 * _TAG_TYPES[datatype].size):
+                    break
+        else:
+            for datatype in "csi":
+                if value >= -1 << (8 * _TAG_TYPES[datatype].size - 1):
+                    break
+        return tag + datatype.encode() + _TAG_TYPES[datatype].pack(value)
+    if datatype == "f":
+        return tag + b"f" + _TAG_TYPES["f"].pack(float(value))
+    if datatype in "AZH":
+        return tag + datatype.encode() + value.encode() + b"\0" * (datatype != "A")
+    if datatype == "B":
+        letter, *values = value.split(",")
+        array = numpy.array(values, _ARRAY_TYPES[letter])
+        return (
+            tag
+            + b"B"
+            + letter.encode()
+            + _BLOCK_SIZE.pack(len(array))
+            + array.tobytes()
+        )
+    raise ValueError(f"Unknown data type '{datatype}' in tag '{field}'")
+
+
+class AlignmentIterator(sam.AlignmentIterator):
+    """Alignment iterator for Binary Alignment/Map (BAM) files.
+
+    Each binary record in the file contains one genomic alignment, which are
+    loaded and returned incrementally, with the same attributes as the
+    alignments returned by the alignment iterator for SAM files in
+    Bio.Align.sam. The rnext attribute is the name of the target sequence.
+
+    With lazy=True, only the fixed-length part of each record is decoded up
+    front, giving the flag, mapq, rnext, pnext, and tlen attributes. The
+    sequences, coordinates, score, and annotations are decoded from the binary
+    record when first used. This is useful when most alignments are filtered
+    by their flag or mapping quality:
+
+    >>> from Bio.Align import bam
+    >>> alignments = bam.AlignmentIterator("SamBam/ex1.bam", lazy=True)
+    >>> unmapped = [alignment for alignment in alignments if alignment.flag & 0x4]
+    >>> len(unmapped)
+    35
+    >>> unmapped[0].query.id
+    'EAS56_57:6:190:289:82'
+    """
+
+    def __init__(self, source, lazy=False):
+        """Create an AlignmentIterator object.
+
+        Arguments:
+         - source   - input file name, or a file opened in binary mode
+         - lazy     - if True, decode the binary records on demand
+
+        """
+        self.lazy = lazy
+        interfaces.AlignmentIterator.__init__(self, source, mode="b", fmt="BAM")
+
+    def _read_header(self, stream):
+        handle = bgzf.BgzfReader(fileobj=stream, mode="rb")
+        self._handle = handle
+        magic = handle.read(4)
+        if magic != b"BAM\1":
+            raise ValueError("file does not start with the BAM magic string")
+        (length,) = _BLOCK_SIZE.unpack(handle.read(4))
+        text = handle.read(length).rstrip(b"\0").decode()
+        super()._read_header(text.splitlines())
+        (count,) = _BLOCK_SIZE.unpack(handle.read(4))
+        names = []
+        for index in range(count):
+            (length,) = _BLOCK_SIZE.unpack(handle.read(4))
+            name = handle.read(length)[:-1].decode()
+            (length,) = _BLOCK_SIZE.unpack(handle.read(4))
+            if name not in self.targets:
+                sequence = Seq(None, length=length)
+                self.targets[name] = SeqRecord(sequence, id=name)
+            names.append(name)
+        self._names = names
+
+    def _read_next_alignment(self, stream):
+        handle = self._handle
+        data = handle.read(4)
+        if not data:
+            return None
+        (size,) = _BLOCK_SIZE.unpack(data)
+        data = handle.read(size)
+        if len(data) < size:
+            raise ValueError("BAM file ended in the middle of a record")
+        if self.lazy:
+            alignment = _LazyAlignment._from_record(data, self._names, self.targets)
+        else:
+            sequences, coordinates, attributes = _parse_record(
+                data, self._names, self.targets
+            )
+            alignment = Alignment(sequences, coordinates)
+            alignment.__dict__.update(_parse_core(data))
+            alignment.__dict__.update(attributes)
+        rnext = alignment.__dict__.get("rnext")
+        if rnext is not None:
+            alignment.rnext = self._names[rnext]
+        return alignment
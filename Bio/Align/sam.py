@@ -49,6 +49,72 @@ warnings.warn(
 )
 
 
+def _create_target(record, seq, md, starts, sizes):
+    """Return a copy of the target record with the aligned sequence filled in (PRIVATE).
+
+    Arguments:
+     - record - The SeqRecord of the target, typically from the header.
+     - seq    - The query letters aligned to the target, as a string.
+     - md     - The MD tag, giving the target letters at mismatches and
+                deletions.
+     - starts - The start positions of the aligned blocks in the target.
+     - sizes  - The sizes of the aligned blocks in the target.
+
+    """
+    target = ""
+    number = ""
+    letters = iter(md)
+    for letter in letters:
+        if letter in "ACGTNacgtn":
+            if number:
+                number = int(number)
+                target += seq[:number]
+                seq = seq[number:]
+                number = ""
+            target += letter
+            seq = seq[1:]
+        elif letter == "^":
+            if number:
+                number = int(number)
+                target += seq[:number]
+                seq = seq[number:]
+                number = ""
+            for letter in letters:
+                if letter not in "ACGTNacgtn":
+                    break
+                target += letter
+            else:
+                break
+            number = letter
+        else:
+            number += letter
+    if number:
+        number = int(number)
+        target += seq[:number]
+    seq = target
+    target = copy.deepcopy(record)
+    length = len(target.seq)
+    data = {}
+    index = 0
+    for start, size in zip(starts, sizes):
+        data[start] = seq[index : index + size]
+        index += size
+    target.seq = Seq(data, length=length)
+    return target
+
+
+# Letter used in a B (numeric array) tag for each integer array element type,
+# as (dtype.kind, dtype.itemsize); any other integer arrays are written as "i".
+_ARRAY_LETTERS = {
+    ("i", 1): "c",
+    ("u", 1): "C",
+    ("i", 2): "s",
+    ("u", 2): "S",
+    ("i", 4): "i",
+    ("u", 4): "I",
+}
+
+
 class AlignmentWriter(interfaces.AlignmentWriter):
     """Alignment file writer for the Sequence Alignment/Map (SAM) file format."""
 
@@ -348,18 +414,21 @@ class AlignmentWriter(interfaces.AlignmentWriter):
                         datatype = "Z"
                 elif isinstance(value, bytes):
                     datatype = "H"
-                    value = "".join(map(str, value))
-                elif isinstance(value, numpy.array):
+                    value = value.hex().upper()
+                elif isinstance(value, numpy.ndarray):
                     datatype = "B"
                     if numpy.issubdtype(value.dtype, numpy.integer):
-                        letter = "i"
-                    elif numpy.issubdtype(value.dtype, float):
+                        # Keep the element type, e.g. of an array read from BAM
+                        letter = _ARRAY_LETTERS.get(
+                            (value.dtype.kind, value.dtype.itemsize), "i"
+                        )
+                    elif numpy.issubdtype(value.dtype, numpy.floating):
                         letter = "f"
                     else:
                         raise ValueError(
                             f"Array of incompatible data type {value.dtype} in annotation '{key}'"
                         )
-                    value = ",".join(map(str, value))
+                    value = ",".join([letter] + [str(number) for number in value])
                 field = f"{key}:{datatype}:{value}"
                 fields.append(field)
         line = "\t".join(fields) + "\n"
@@ -503,11 +572,9 @@ class AlignmentIterator(interfaces.AlignmentIterator):
                     elif datatype in ("A", "Z"):  # string
                         pass
                     elif datatype == "H":
-                        n = len(value)
-                        value = bytes(int(value[i : i + 2]) for i in range(0, n, 2))
+                        value = bytes.fromhex(value)
                     elif datatype == "B":
-                        letter = value[0]
-                        value = value[1:].split(",")
+                        letter, *value = value.split(",")
                         if letter in "cCsSiI":
                             dtype = int
                         elif letter == "f":
@@ -665,46 +732,7 @@ class AlignmentIterator(interfaces.AlignmentIterator):
                     operations.append(ord(letter))
                     number = ""
                 sizes.append(size)
-                seq = target
-                target = ""
-                number = ""
-                letters = iter(md)
-                for letter in letters:
-                    if letter in "ACGTNacgtn":
-                        if number:
-                            number = int(number)
-                            target += seq[:number]
-                            seq = seq[number:]
-                            number = ""
-                        target += letter
-                        seq = seq[1:]
-                    elif letter == "^":
-                        if number:
-                            number = int(number)
-                            target += seq[:number]
-                            seq = seq[number:]
-                            number = ""
-                        for letter in letters:
-                            if letter not in "ACGTNacgtn":
-                                break
-                            target += letter
-                        else:
-                            break
-                        number = letter
-                    else:
-                        number += letter
-                if number:
-                    number = int(number)
-                    target += seq[:number]
-                seq = target
-                target = copy.deepcopy(self.targets[rname])
-                length = len(target.seq)
-                data = {}
-                index = 0
-                for start, size in zip(starts, sizes):
-                    data[start] = seq[index : index + size]
-                    index += size
-                target.seq = Seq(data, length=length)
+                target = _create_target(self.targets[rname], target, md, starts, sizes)
             if coordinates is not None:
                 coordinates = numpy.array(coordinates).transpose()
                 if strand == "-":
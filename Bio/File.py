@@ -11,12 +11,19 @@ Bio.File defines private classes used in Bio.SeqIO and Bio.SearchIO for
 indexing files. These are not intended for direct use.
 """
 
+import io
+import copy
 import os
+import sys
+import mmap
+import struct
 import contextlib
 import itertools
 import collections.abc
+import concurrent.futures
 
 from abc import ABC, abstractmethod
+from array import array
 
 try:
     import sqlite3
@@ -146,6 +153,319 @@ class _IndexedSeqFileProxy(ABC):
         # Should be done by each sub-class (if possible)
         raise NotImplementedError("Not available for this file format.")
 
+    @contextlib.contextmanager
+    def _sequential_reads(self, buffer_size=1048576):
+        """Return a proxy reading the file through a large buffer (PRIVATE).
+
+        Used when fetching many records in order of their offsets, so that
+        nearby records are served from a single large read, rather than a
+        seek and a small read each. This gives a copy of the proxy with its
+        own handle, which is closed on leaving the context, leaving this
+        proxy unchanged. This only applies to uncompressed files, as BGZF
+        files are already read (and cached) a block at a time; for those
+        this proxy itself is used.
+        """
+        handle = self._handle
+        if not isinstance(handle, io.BufferedReader):
+            yield self
+            return
+        # Use a new handle, as sharing the file descriptor would leave the
+        # position cached by the original handle out of date
+        proxy = copy.copy(self)
+        proxy._handle = open(handle.name, "rb", buffering=buffer_size)
+        try:
+            yield proxy
+        finally:
+            proxy._handle.close()
+
+
+# Header of the offset table files written by Bio.SeqIO.index(...) when
+# given an index_filename: magic, indexer name, size and modification time
+# (in nanoseconds) of the indexed file, number of records, and length of the
+# key buffer. The header is 72 bytes, so the arrays which follow are aligned.
+_OFFSET_TABLE_MAGIC = b"BIOIDX1" + sys.byteorder[0].upper().encode()
+_OFFSET_TABLE_HEADER = struct.Struct("<8s32sQqQQ")
+
+
+class _OffsetTable(collections.abc.Mapping):
+    """Base class for compact mappings of string keys to file offsets (PRIVATE).
+
+    Rather than a dict of str to int, the keys are stored UTF-8 encoded and
+    concatenated in file order in a single buffer, with key_starts giving the
+    boundaries (one more entry than there are records), and the offsets held
+    in an array in file order. This takes a fraction of the memory of a dict
+    when there are millions of records. Iteration is in file order.
+
+    The arrays can be anything supporting integer indexing (such as an
+    array.array or a memoryview cast to unsigned 64 bit integers), and the
+    key buffer anything which can be sliced and converted to bytes.
+
+    Subclasses define how a key is found, by implementing the _find method.
+    """
+
+    def __init__(self, offsets, key_starts, keys):
+        """Initialize the class."""
+        self._offsets = offsets
+        self._key_starts = key_starts
+        self._keys = keys
+
+    @staticmethod
+    def _collect(offset_iter, hashes=None):
+        """Store the keys and offsets from (key, offset, length) tuples (PRIVATE).
+
+        Returns the offsets, key_starts and keys. If given an array, the hash
+        of each key is appended to it. All the keys must be strings.
+        """
+        offsets = array("Q")
+        key_starts = array("Q", [0])
+        keys = bytearray()
+        for key, offset, length in offset_iter:
+            if not isinstance(key, str):
+                raise TypeError(f"Only string keys can be stored, not {key!r}")
+            keys += key.encode()
+            key_starts.append(len(keys))
+            offsets.append(offset)
+            if hashes is not None:
+                hashes.append(hash(key))
+        return offsets, key_starts, bytes(keys)
+
+    def __len__(self):
+        """Return the number of keys."""
+        return len(self._offsets)
+
+    def __iter__(self):
+        """Iterate over the keys in file order."""
+        key_starts = self._key_starts
+        keys = self._keys
+        for i in range(len(self._offsets)):
+            yield bytes(keys[key_starts[i] : key_starts[i + 1]]).decode()
+
+    def _find(self, key):
+        """Return the record number for the key, or -1 if absent (PRIVATE)."""
+        raise NotImplementedError
+
+    def __contains__(self, key):
+        """Return True if the key is present."""
+        return self._find(key) != -1
+
+    def __getitem__(self, key):
+        """Return the file offset for the key."""
+        i = self._find(key)
+        if i == -1:
+            raise KeyError(key)
+        return self._offsets[i]
+
+
+class _HashedOffsetTable(_OffsetTable):
+    """Compact key to offset mapping using an open addressing hash table (PRIVATE).
+
+    The slots array has a power of two size at least twice the number of
+    records, each slot holding zero (empty) or one plus a record number.
+    Collisions are resolved by linear probing. Python's own (salted) string
+    hash is used, so this is for use in memory only.
+    """
+
+    def __init__(self, offsets, key_starts, keys, slots):
+        """Initialize the class."""
+        _OffsetTable.__init__(self, offsets, key_starts, keys)
+        self._slots = slots
+
+    def _find(self, key):
+        """Return the record number for the key, or -1 if absent (PRIVATE)."""
+        if not isinstance(key, str):
+            return -1
+        target = key.encode()
+        key_starts = self._key_starts
+        keys = self._keys
+        slots = self._slots
+        mask = len(slots) - 1
+        j = hash(key) & mask
+        while True:
+            i = slots[j]
+            if not i:
+                return -1
+            i -= 1
+            if keys[key_starts[i] : key_starts[i + 1]] == target:
+                return i
+            j = (j + 1) & mask
+
+    @classmethod
+    def from_records(cls, offset_iter):
+        """Build a table from (key, offset, length) tuples (PRIVATE).
+
+        All the keys must be strings. Duplicate keys raise a ValueError.
+        """
+        hashes = array("q")
+        offsets, key_starts, keys = cls._collect(offset_iter, hashes)
+        size = 8
+        while size < 2 * len(offsets):
+            size *= 2
+        mask = size - 1
+        slots = array("Q", bytes(8 * size))
+        for i, h in enumerate(hashes):
+            key = keys[key_starts[i] : key_starts[i + 1]]
+            j = h & mask
+            while slots[j]:
+                k = slots[j] - 1
+                if hashes[k] == h and keys[key_starts[k] : key_starts[k + 1]] == key:
+                    raise ValueError(f"Duplicate key '{key.decode()}'")
+                j = (j + 1) & mask
+            slots[j] = i + 1
+        return cls(offsets, key_starts, keys, slots)
+
+
+class _SortedOffsetTable(_OffsetTable):
+    """Compact key to offset mapping using a sorted array (PRIVATE).
+
+    In addition to the keys and offsets in file order, the order array lists
+    the record numbers sorted by their encoded key, so that a lookup is a
+    binary search. Unlike a hash table this does not depend on the Python
+    process, so the table can be saved to disk and used directly on a memory
+    mapped file.
+    """
+
+    def __init__(self, offsets, key_starts, order, keys):
+        """Initialize the class."""
+        _OffsetTable.__init__(self, offsets, key_starts, keys)
+        self._order = order
+
+    def _find(self, key):
+        """Return the record number for the key, or -1 if absent (PRIVATE)."""
+        if not isinstance(key, str):
+            return -1
+        target = key.encode()
+        key_starts = self._key_starts
+        keys = self._keys
+        order = self._order
+        low = 0
+        high = len(order)
+        while low < high:
+            middle = (low + high) // 2
+            i = order[middle]
+            value = bytes(keys[key_starts[i] : key_starts[i + 1]])
+            if value < target:
+                low = middle + 1
+            elif target < value:
+                high = middle
+            else:
+                return i
+        return -1
+
+    @classmethod
+    def from_records(cls, offset_iter):
+        """Build a table from (key, offset, length) tuples (PRIVATE).
+
+        All the keys must be strings. Duplicate keys raise a ValueError.
+        """
+        offsets, key_starts, keys = cls._collect(offset_iter)
+        order = sorted(
+            range(len(offsets)), key=lambda i: keys[key_starts[i] : key_starts[i + 1]]
+        )
+        previous = None
+        for i in order:
+            key = keys[key_starts[i] : key_starts[i + 1]]
+            if key == previous:
+                raise ValueError(f"Duplicate key '{key.decode()}'")
+            previous = key
+        return cls(offsets, key_starts, array("Q", order), keys)
+
+    def save(self, filename, indexer, size, mtime):
+        """Write the table to disk (PRIVATE).
+
+        The table is written to a temporary file which is then renamed,
+        so that other processes never see a partially written index.
+        """
+        header = _OFFSET_TABLE_HEADER.pack(
+            _OFFSET_TABLE_MAGIC,
+            indexer.encode(),
+            size,
+            mtime,
+            len(self._offsets),
+            len(self._keys),
+        )
+        tmp_filename = f"{filename}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_filename, "wb") as handle:
+                handle.write(header)
+                for values in (self._offsets, self._key_starts, self._order):
+                    array("Q", values).tofile(handle)
+                handle.write(self._keys)
+            os.replace(tmp_filename, filename)
+        except BaseException:
+            if os.path.isfile(tmp_filename):
+                os.remove(tmp_filename)
+            raise
+
+    @classmethod
+    def load(cls, filename, indexer, size, mtime):
+        """Memory map a table written by the save method (PRIVATE).
+
+        Returns None if the table is out of date, meaning it was built from
+        a file with a different size or modification time, or by a different
+        indexer. Raises a ValueError if the file is not an offset table.
+        """
+        with open(filename, "rb") as handle:
+            data = handle.read(_OFFSET_TABLE_HEADER.size)
+            if len(data) != _OFFSET_TABLE_HEADER.size or data[:7] != b"BIOIDX1":
+                raise ValueError(f"{filename!r} is not a Biopython offset index file")
+            (
+                magic,
+                name,
+                size2,
+                mtime2,
+                count,
+                keys_length,
+            ) = _OFFSET_TABLE_HEADER.unpack(data)
+            if (
+                magic != _OFFSET_TABLE_MAGIC
+                or name.rstrip(b"\0") != indexer.encode()[:32]
+                or size2 != size
+                or mtime2 != mtime
+            ):
+                # Stale, or written on a machine with a different byte order
+                return None
+            handle.seek(0, os.SEEK_END)
+            expected = _OFFSET_TABLE_HEADER.size + 8 * (3 * count + 1) + keys_length
+            if handle.tell() != expected:
+                raise ValueError(f"Truncated or corrupt offset index file {filename!r}")
+            data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        start = _OFFSET_TABLE_HEADER.size
+        view = memoryview(data)
+        offsets = view[start : start + 8 * count].cast("Q")
+        start += 8 * count
+        key_starts = view[start : start + 8 * (count + 1)].cast("Q")
+        start += 8 * (count + 1)
+        order = view[start : start + 8 * count].cast("Q")
+        start += 8 * count
+        keys = view[start : start + keys_length]
+        table = cls(offsets, key_starts, order, keys)
+        table._mmap = data
+        table._views = (view, offsets, key_starts, order, keys)
+        return table
+
+    def close(self):
+        """Release any memory mapped file (PRIVATE)."""
+        data = getattr(self, "_mmap", None)
+        if data is not None:
+            for view in reversed(self._views):
+                view.release()
+            data.close()
+            self._mmap = None
+
+
+_CacheInfo = collections.namedtuple(
+    "CacheInfo", ["hits", "misses", "maxsize", "currsize"]
+)
+
+
+def _check_cache_size(cache_size):
+    """Raise a ValueError if the record cache size is negative (PRIVATE).
+
+    Called by Bio.SeqIO.index and Bio.SearchIO.index before opening the file.
+    """
+    if cache_size < 0:
+        raise ValueError(f"Cache size should be zero or more, not {cache_size}")
+
 
 class _IndexedSeqFileDict(collections.abc.Mapping):
     """Read only dictionary interface to a sequential record file.
@@ -156,6 +476,10 @@ class _IndexedSeqFileDict(collections.abc.Mapping):
     Keeps the keys and associated file offsets in memory, reads the file
     to access entries as objects parsing them on demand. This approach
     is memory limited, but will work even with millions of records.
+    With compact=True the keys and offsets are held in flat arrays with
+    a hash table for lookups, rather than in a dict, which needs several
+    times less memory for files with hundreds of millions of records.
+    This requires the keys to be strings.
 
     Note duplicate keys are not allowed. If this happens, a ValueError
     exception is raised.
@@ -170,20 +494,52 @@ class _IndexedSeqFileDict(collections.abc.Mapping):
 
     Note that this dictionary is essentially read only. You cannot
     add or change values, pop values, nor clear the dictionary.
+
+    If an index_filename is given, the keys and offsets are saved to that
+    file as a compact table (sorted keys plus an array of offsets) together
+    with the size and modification time of the indexed file. If the index
+    file already exists and is up to date, it is memory mapped instead of
+    scanning the indexed file again, so many processes can share the same
+    index cheaply. The keys must be strings, and it is up to the caller to
+    use the same key_function each time.
+
+    The cache_size most recently used records are cached, so that they can
+    be returned again without going to disk (by default only the previous
+    record). Note the cached records are returned as the same objects, so
+    any changes you make to them will be seen next time.
     """
 
-    def __init__(self, random_access_proxy, key_function, repr, obj_repr):
+    def __init__(
+        self,
+        random_access_proxy,
+        key_function,
+        repr,
+        obj_repr,
+        index_filename=None,
+        compact=False,
+        cache_size=1,
+    ):
         """Initialize the class."""
         # Use key_function=None for default value
         self._proxy = random_access_proxy
         self._key_function = key_function
         self._repr = repr
         self._obj_repr = obj_repr
-        self._cached_prev_record = (None, None)  # (key, record)
+        self._init_cache(cache_size)
         if key_function:
             offset_iter = ((key_function(k), o, l) for (k, o, l) in random_access_proxy)
         else:
             offset_iter = random_access_proxy
+        if index_filename is not None:
+            self._offsets = self._load_offset_table(index_filename, offset_iter)
+            return
+        if compact:
+            try:
+                self._offsets = _HashedOffsetTable.from_records(offset_iter)
+            except (TypeError, ValueError):
+                self._proxy._handle.close()
+                raise
+            return
         offsets = {}
         for key, offset, length in offset_iter:
             # Note - we don't store the length because I want to minimise the
@@ -202,6 +558,28 @@ class _IndexedSeqFileDict(collections.abc.Mapping):
                 offsets[key] = offset
         self._offsets = offsets
 
+    def _load_offset_table(self, index_filename, offset_iter):
+        """Call from __init__ to reuse or create an offset table file (PRIVATE)."""
+        indexer = type(self._proxy).__name__
+        stat = os.fstat(self._proxy._handle.fileno())
+        if os.path.isfile(index_filename):
+            try:
+                table = _SortedOffsetTable.load(
+                    index_filename, indexer, stat.st_size, stat.st_mtime_ns
+                )
+            except ValueError:
+                self._proxy._handle.close()
+                raise
+            if table is not None:
+                return table
+        try:
+            table = _SortedOffsetTable.from_records(offset_iter)
+        except (TypeError, ValueError):
+            self._proxy._handle.close()
+            raise
+        table.save(index_filename, indexer, stat.st_size, stat.st_mtime_ns)
+        return table
+
     def __repr__(self):
         """Return a string representation of the File object."""
         return self._repr
@@ -222,25 +600,140 @@ class _IndexedSeqFileDict(collections.abc.Mapping):
         """Iterate over the keys."""
         return iter(self._offsets)
 
+    def _init_cache(self, cache_size):
+        """Call from __init__ to set up the record cache (PRIVATE)."""
+        _check_cache_size(cache_size)
+        self._cache_size = cache_size
+        # As dict keeps the insertion order, the least recently used record
+        # is always first
+        self._cache = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+
     def __getitem__(self, key):
         """Return record for the specified key.
 
-        As an optimization when repeatedly asked to look up the same record,
-        the key and record are cached so that if the *same* record is
-        requested next time, it can be returned without going to disk.
+        As an optimization when repeatedly asked to look up the same records,
+        the most recently used records are cached so that if the *same*
+        record is requested again, it can be returned without going to disk.
         """
-        if key == self._cached_prev_record[0]:
-            return self._cached_prev_record[1]
+        cache = self._cache
+        if key in cache:
+            # Move to the end, as most recently used
+            record = cache[key] = cache.pop(key)
+            self._cache_hits += 1
+            return record
+        self._cache_misses += 1
+        record = self._get_record(key)
+        if self._cache_size:
+            if len(cache) >= self._cache_size:
+                del cache[next(iter(cache))]
+            cache[key] = record
+        return record
+
+    def _get_record(self, key):
+        """Parse the record for the specified key from the file (PRIVATE)."""
         # Pass the offset to the proxy
         record = self._proxy.get(self._offsets[key])
+        self._check_key(key, record)
+        return record
+
+    def _check_key(self, key, record):
+        """Raise a ValueError if the record does not match the key (PRIVATE)."""
         if self._key_function:
             key2 = self._key_function(record.id)
         else:
             key2 = record.id
         if key != key2:
             raise ValueError(f"Key did not match ({key} vs {key2})")
-        self._cached_prev_record = (key, record)
-        return record
+
+    def _locate(self, key):
+        """Return the file number, offset and length for a key (PRIVATE).
+
+        The length is zero if not known.
+        """
+        return 0, self._offsets[key], 0
+
+    def _get_proxy(self, file_number):
+        """Return the random access proxy for a file number (PRIVATE)."""
+        return self._proxy
+
+    def get_many(self, keys, sort=False):
+        """Iterate over (key, record) tuples for the given keys.
+
+        This is much faster than looking up many keys one by one, as the
+        records are read in order of their position in the file, so that
+        nearby records are read together in large sequential reads rather
+        than each with its own seek. The keys are taken in batches of ten
+        thousand, and by default the records are returned in the same order
+        as the keys. With sort=True they are instead returned in the order
+        they are read, i.e. in file order within each batch, which avoids
+        holding a batch of records in memory.
+
+        If a key is not found, a KeyError exception is raised.
+
+        The records are not cached (see the cache_size argument).
+        """
+        return self._get_many(keys, sort, False)
+
+    def get_raw_many(self, keys, sort=False):
+        """Iterate over (key, raw record) tuples for the given keys.
+
+        Like the get_many method, but giving the raw records from the file
+        as bytes strings, as for the get_raw method.
+        """
+        return self._get_many(keys, sort, True)
+
+    def _get_many(self, keys, sort, raw):
+        """Implement the get_many and get_raw_many methods (PRIVATE)."""
+        keys = iter(keys)
+        while True:
+            batch = list(itertools.islice(keys, 10000))
+            if not batch:
+                break
+            # Sort the positions in the batch by file number and offset
+            locations = [self._locate(key) for key in batch]
+            order = sorted(range(len(batch)), key=locations.__getitem__)
+            values = [None] * len(batch)
+            for file_number, group in itertools.groupby(
+                order, key=lambda n: locations[n][0]
+            ):
+                proxy = self._get_proxy(file_number)
+                with proxy._sequential_reads() as reader:
+                    for n in group:
+                        key = batch[n]
+                        file_number, offset, length = locations[n]
+                        if not raw:
+                            value = reader.get(offset)
+                            self._check_key(key, value)
+                        elif length:
+                            # Shortcut if we have the length
+                            reader._handle.seek(offset)
+                            value = reader._handle.read(length)
+                        else:
+                            value = reader.get_raw(offset)
+                        if sort:
+                            yield key, value
+                        else:
+                            values[n] = value
+            if not sort:
+                yield from zip(batch, values)
+
+    def cache_info(self):
+        """Return the record cache statistics as a named tuple.
+
+        This gives the number of hits and misses, the maximum size of the
+        cache, and the number of records currently cached.
+        """
+        return _CacheInfo(
+            self._cache_hits, self._cache_misses, self._cache_size, len(self._cache)
+        )
+
+    def cache_clear(self):
+        """Empty the record cache, and reset the statistics."""
+        self._cache.clear()
+        self._cache_hits = 0
+        self._cache_misses = 0
 
     def get_raw(self, key):
         """Return the raw record from the file as a bytes string.
@@ -259,6 +752,22 @@ class _IndexedSeqFileDict(collections.abc.Mapping):
         all open handles to that file.
         """
         self._proxy._handle.close()
+        self._cache.clear()
+        if isinstance(self._offsets, _SortedOffsetTable):
+            self._offsets.close()
+
+
+def _scan_offsets(proxy_factory, fmt, filename):
+    """Return a list of (key, offset, length) tuples for one file (PRIVATE).
+
+    This is run in worker processes when building an SQLite index with
+    several workers, so the proxy_factory must be picklable.
+    """
+    random_access_proxy = proxy_factory(fmt, filename)
+    try:
+        return list(random_access_proxy)
+    finally:
+        random_access_proxy._handle.close()
 
 
 class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
@@ -274,6 +783,14 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
     There are OS limits on the number of files that can be open at once,
     so a pool are kept. If a record is required from a closed file, then
     one of the open handles is closed first.
+
+    When building a new index from many files, they can be scanned in
+    parallel by a pool of worker processes (workers argument), in which
+    case the proxy_factory must be picklable. The key_function is applied
+    in the main process, so need not be.
+
+    Unlike the in memory index, by default no records are cached, but the
+    most recently used records can be cached by setting cache_size.
     """
 
     def __init__(
@@ -285,6 +802,8 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         key_function,
         repr,
         max_open=10,
+        workers=None,
+        cache_size=0,
     ):
         """Initialize the class."""
         # TODO? - Don't keep filename list in memory (just in DB)?
@@ -310,7 +829,9 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         self._proxy_factory = proxy_factory
         self._repr = repr
         self._max_open = max_open
+        self._workers = workers
         self._proxies = {}
+        self._init_cache(cache_size)
 
         # Note if using SQLite :memory: trick index filename, this will
         # give $PWD as the relative path (which is fine).
@@ -432,6 +953,7 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         key_function = self._key_function
         proxy_factory = self._proxy_factory
         max_open = self._max_open
+        workers = self._workers
         random_access_proxies = self._proxies
 
         if not fmt or not filenames:
@@ -464,50 +986,87 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
             "file_number INTEGER, offset INTEGER, length INTEGER);"
         )
         count = 0
-        for i, filename in enumerate(filenames):
-            # Default to storing as an absolute path,
-            f = os.path.abspath(filename)
-            if not os.path.isabs(filename) and not os.path.isabs(index_filename):
-                # Since user gave BOTH filename & index as relative paths,
-                # we will store this relative to the index file even though
-                # if it may now start ../ (meaning up a level)
-                # Note for cross platform use (e.g. shared drive over SAMBA),
-                # convert any Windows slash into Unix style for rel paths.
-                f = os.path.relpath(filename, relative_path).replace(os.path.sep, "/")
-            elif (os.path.dirname(os.path.abspath(filename)) + os.path.sep).startswith(
-                relative_path + os.path.sep
-            ):
-                # Since sequence file is in same directory or sub directory,
-                # might as well make this into a relative path:
-                f = os.path.relpath(filename, relative_path).replace(os.path.sep, "/")
-                assert not f.startswith("../"), f
-            # print("DEBUG - storing %r as [%r] %r" % (filename, relative_path, f))
-            con.execute(
-                "INSERT INTO file_data (file_number, name) VALUES (?,?);", (i, f)
-            )
-            random_access_proxy = proxy_factory(fmt, filename)
-            if key_function:
-                offset_iter = (
-                    (key_function(k), i, o, l) for (k, o, l) in random_access_proxy
-                )
-            else:
-                offset_iter = ((k, i, o, l) for (k, o, l) in random_access_proxy)
-            while True:
-                batch = list(itertools.islice(offset_iter, 100))
-                if not batch:
-                    break
-                # print("Inserting batch of %i offsets, %s ... %s"
-                #       % (len(batch), batch[0][0], batch[-1][0]))
-                con.executemany(
-                    "INSERT INTO offset_data (key,file_number,offset,length) VALUES (?,?,?,?);",
-                    batch,
+        if workers and workers > 1 and len(filenames) > 1:
+            # Scan the files in worker processes, in parallel with loading
+            # the results into SQLite as each file is done
+            executor = concurrent.futures.ProcessPoolExecutor(workers)
+            scans = [
+                executor.submit(_scan_offsets, proxy_factory, fmt, filename)
+                for filename in filenames
+            ]
+        else:
+            executor = None
+        try:
+            for i, filename in enumerate(filenames):
+                # Default to storing as an absolute path,
+                f = os.path.abspath(filename)
+                if not os.path.isabs(filename) and not os.path.isabs(index_filename):
+                    # Since user gave BOTH filename & index as relative paths,
+                    # we will store this relative to the index file even though
+                    # if it may now start ../ (meaning up a level)
+                    # Note for cross platform use (e.g. shared drive over SAMBA),
+                    # convert any Windows slash into Unix style for rel paths.
+                    f = os.path.relpath(filename, relative_path).replace(
+                        os.path.sep, "/"
+                    )
+                elif (
+                    os.path.dirname(os.path.abspath(filename)) + os.path.sep
+                ).startswith(relative_path + os.path.sep):
+                    # Since sequence file is in same directory or sub directory,
+                    # might as well make this into a relative path:
+                    f = os.path.relpath(filename, relative_path).replace(
+                        os.path.sep, "/"
+                    )
+                    assert not f.startswith("../"), f
+                # print("DEBUG - storing %r as [%r] %r" % (filename, relative_path, f))
+                con.execute(
+                    "INSERT INTO file_data (file_number, name) VALUES (?,?);", (i, f)
                 )
-                con.commit()
-                count += len(batch)
-            if len(random_access_proxies) < max_open:
-                random_access_proxies[i] = random_access_proxy
-            else:
-                random_access_proxy._handle.close()
+                if executor is not None:
+                    # Scanned in a worker process, insert as one transaction
+                    offsets = scans[i].result()
+                    scans[i] = None
+                    if key_function:
+                        batch = [(key_function(k), i, o, l) for (k, o, l) in offsets]
+                    else:
+                        batch = [(k, i, o, l) for (k, o, l) in offsets]
+                    del offsets
+                    con.executemany(
+                        "INSERT INTO offset_data (key,file_number,offset,length) VALUES (?,?,?,?);",
+                        batch,
+                    )
+                    con.commit()
+                    count += len(batch)
+                    continue
+                random_access_proxy = proxy_factory(fmt, filename)
+                if key_function:
+                    offset_iter = (
+                        (key_function(k), i, o, l) for (k, o, l) in random_access_proxy
+                    )
+                else:
+                    offset_iter = ((k, i, o, l) for (k, o, l) in random_access_proxy)
+                while True:
+                    batch = list(itertools.islice(offset_iter, 100))
+                    if not batch:
+                        break
+                    # print("Inserting batch of %i offsets, %s ... %s"
+                    #       % (len(batch), batch[0][0], batch[-1][0]))
+                    con.executemany(
+                        "INSERT INTO offset_data (key,file_number,offset,length) VALUES (?,?,?,?);",
+                        batch,
+                    )
+                    con.commit()
+                    count += len(batch)
+                if len(random_access_proxies) < max_open:
+                    random_access_proxies[i] = random_access_proxy
+                else:
+                    random_access_proxy._handle.close()
+        finally:
+            if executor is not None:
+                for scan in scans:
+                    if scan is not None:
+                        scan.cancel()
+                executor.shutdown()
         self._length = count
         # print("About to index %i entries" % count)
         try:
@@ -546,8 +1105,30 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         ):
             yield str(row[0])
 
-    def __getitem__(self, key):
-        """Return record for the specified key."""
+    def _locate(self, key):
+        """Return the file number, offset and length for a key (PRIVATE)."""
+        row = self._con.execute(
+            "SELECT file_number, offset, length FROM offset_data WHERE key=?;", (key,)
+        ).fetchone()
+        if not row:
+            raise KeyError(key)
+        return row
+
+    def _get_proxy(self, file_number):
+        """Return the random access proxy for a file number (PRIVATE)."""
+        proxies = self._proxies
+        if file_number not in proxies:
+            if len(proxies) >= self._max_open:
+                # Close an old handle...
+                proxies.popitem()[1]._handle.close()
+            # Open a new handle...
+            proxies[file_number] = self._proxy_factory(
+                self._format, self._filenames[file_number]
+            )
+        return proxies[file_number]
+
+    def _get_record(self, key):
+        """Parse the record for the specified key from its file (PRIVATE)."""
         # Pass the offset to the proxy
         row = self._con.execute(
             "SELECT file_number, offset FROM offset_data WHERE key=?;", (key,)
@@ -616,3 +1197,4 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         proxies = self._proxies
         while proxies:
             proxies.popitem()[1]._handle.close()
+        self._cache.clear()
@@ -33,8 +33,11 @@ import re
 import sys
 from collections import defaultdict
 
+from io import StringIO
+
 from Bio.File import as_handle
 from Bio.Seq import Seq
+from Bio.SeqRecord import _RestrictedDict
 from Bio.SeqRecord import SeqRecord
 from Bio import BiopythonParserWarning
 
@@ -501,19 +504,50 @@ class InsdcScanner:
         else:
             return None
 
-    def parse_records(self, handle, do_features=True):
+    def _read_record_text(self):
+        """Return the text of the next record, from the ID/LOCUS line to the // line (PRIVATE).
+
+        Returns None if there are no more records.
+        """
+        if not self.find_start():
+            return None
+        lines = [self.line]
+        while True:
+            line = self.handle.readline()
+            if not line:
+                # Leave any problem to be reported when parsing the sequence
+                break
+            lines.append(line)
+            if line.rstrip() == "//":
+                break
+        self.line = line.rstrip()
+        return "".join(lines)
+
+    def parse_records(self, handle, do_features=True, lazy=False):
         """Parse records, return a SeqRecord object iterator.
 
         Each record (from the ID/LOCUS line to the // line) becomes a SeqRecord
 
         The SeqRecord objects include SeqFeatures if do_features=True
 
+        With lazy=True only the ID/LOCUS line and the header are parsed up
+        front (giving the id, name, description and dbxrefs), and the raw
+        text of the record is kept. The features are only parsed when first
+        used, and likewise the annotations and sequence.
+
         This method is intended for use in Bio.SeqIO
         """
         # This is a generator function
         with as_handle(handle) as handle:
+            self.set_handle(handle)
             while True:
-                record = self.parse(handle, do_features)
+                if lazy:
+                    text = self._read_record_text()
+                    if text is None:
+                        break
+                    record = _LazySeqRecord._from_text(self.__class__, text)
+                else:
+                    record = self.parse(handle, do_features)
                 if record is None:
                     break
                 if record.id is None:
@@ -1899,3 +1933,105 @@ class GenBankScanner(InsdcScanner):
             return
         except StopIteration:
             raise ValueError("Problem in misc lines before sequence") from None
+
+
+class _LazySeqRecord(SeqRecord):
+    """SeqRecord from a GenBank or EMBL record, parsed on demand (PRIVATE).
+
+    Only the ID/LOCUS line and the header are parsed when this is created,
+    giving the id, name, description and dbxrefs. The raw text of the record
+    is kept, along with the position of the feature table within it. The
+    features are parsed the first time they are used, as are the annotations
+    and sequence (which come from both the header and the footer).
+
+    Objects created in the usual way (e.g. by slicing) act like a SeqRecord.
+    """
+
+    @classmethod
+    def _from_text(cls, scanner_class, text):
+        """Parse the header of the record given as a string (PRIVATE)."""
+        # Not calling SeqRecord.__init__, as the features, annotations and
+        # sequence are filled in by __getattr__ when first used.
+        self = cls.__new__(cls)
+        self._scanner_class = scanner_class
+        self._text = text
+        self._footer = None
+        scanner, consumer = self._start()
+        self._first_line = scanner.line
+        scanner._feed_header_lines(consumer, scanner.parse_header())
+        self._features = scanner.handle.tell(), scanner.line
+        consumer.record_end("//")
+        record = consumer.data
+        self.id = record.id
+        self.name = record.name
+        self.description = record.description
+        self.dbxrefs = record.dbxrefs
+        return self
+
+    def _start(self, offset=None, line=None):
+        """Return a scanner and consumer at the given position in the text (PRIVATE).
+
+        By default this is at the start of the record, having fed the
+        ID/LOCUS line to the consumer.
+        """
+        from Bio.GenBank import _FeatureConsumer
+        from Bio.GenBank.utils import FeatureValueCleaner
+
+        consumer = _FeatureConsumer(
+            use_fuzziness=1, feature_cleaner=FeatureValueCleaner()
+        )
+        scanner = self._scanner_class(debug=0)
+        handle = StringIO(self._text)
+        scanner.set_handle(handle)
+        if offset is None:
+            scanner.find_start()
+            scanner._feed_first_line(consumer, scanner.line)
+        else:
+            scanner._feed_first_line(consumer, self._first_line)
+            handle.seek(offset)
+            scanner.line = line
+        return scanner, consumer
+
+    def __getattr__(self, name):
+        """Parse the features or sequence when first used (PRIVATE)."""
+        if name == "features":
+            self._parse_features()
+        elif name in ("annotations", "_seq", "_per_letter_annotations"):
+            self._parse_footer()
+        else:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{name}'"
+            )
+        return self.__dict__[name]
+
+    def _parse_features(self):
+        """Parse the feature table (PRIVATE)."""
+        scanner, consumer = self._start(*self._features)
+        scanner._feed_feature_table(consumer, scanner.parse_features(skip=False))
+        self._footer = scanner.handle.tell(), scanner.line
+        self.features = consumer.data.features
+
+    def _parse_footer(self):
+        """Parse the annotations and the sequence (PRIVATE)."""
+        if self._footer is None:
+            scanner, consumer = self._start(*self._features)
+            scanner.parse_features(skip=True)
+            self._footer = scanner.handle.tell(), scanner.line
+        scanner, consumer = self._start()
+        scanner._feed_header_lines(consumer, scanner.parse_header())
+        consumer.start_feature_table()
+        offset, scanner.line = self._footer
+        scanner.handle.seek(offset)
+        misc_lines, sequence_string = scanner.parse_footer()
+        scanner._feed_misc_lines(consumer, misc_lines)
+        consumer.sequence(sequence_string)
+        consumer.record_end("//")
+        record = consumer.data
+        # Keep any of these already set by the user, parsing the footer only
+        # fills in the missing ones:
+        values = self.__dict__
+        values.setdefault("annotations", record.annotations)
+        values.setdefault("_seq", record.seq)
+        values.setdefault(
+            "_per_letter_annotations", _RestrictedDict(length=len(record.seq))
+        )
@@ -88,6 +88,8 @@ import warnings
 import re
 import itertools
 
+import numpy
+
 from Bio.Seq import Seq, MutableSeq
 from Bio.Restriction.Restriction_Dictionary import rest_dict as enzymedict
 from Bio.Restriction.Restriction_Dictionary import typedict
@@ -256,6 +258,119 @@ class FormattedSeq:
         return self.klass(self.data[i])
 
 
+# Below this length it is faster to search with the regular expression of
+# each enzyme than to build a _SiteIndex of the sequence:
+_SITE_INDEX_MIN_LENGTH = 1000
+
+_site_pattern = re.compile(r"\(\?=\(\?P<(\w+)>([^()]*)\)\)")
+_site_element = re.compile(r"\[[^\]]*\]|.")
+_site_elements_cache = {}
+
+
+def _site_elements(compsite):
+    """Split a compiled recognition site pattern into its parts (PRIVATE).
+
+    Returns a list of (group name, elements) tuples, one for each strand
+    searched, where the elements are the single letters, character classes
+    (like ``[AG]``) or dots of the site. Returns None if the pattern is not
+    of the form generated for the enzyme dictionary.
+    """
+    try:
+        return _site_elements_cache[compsite.pattern]
+    except KeyError:
+        pass
+    sites = _site_pattern.findall(compsite.pattern)
+    result = None
+    if sites and compsite.pattern == "|".join(
+        f"(?=(?P<{name}>{site}))" for name, site in sites
+    ):
+        result = [(name, _site_element.findall(site)) for name, site in sites]
+        for name, elements in result:
+            for element in elements:
+                if element != "." and not re.fullmatch(r"[A-Z]|\[[A-Z]+\]", element):
+                    result = None
+    _site_elements_cache[compsite.pattern] = result
+    return result
+
+
+class _SiteIndex:
+    """Find the restriction sites of many enzymes in a sequence (PRIVATE).
+
+    Rather than running the regular expression of each enzyme over the
+    whole sequence, the positions of every k-mer (k up to 4) of unambiguous
+    bases are sorted once. Each site is then seeded by its longest run of
+    unambiguous bases, and the candidate positions found in the sorted
+    index are checked against the rest of the site with NumPy, which gives
+    the same positions as the regular expression (as used by
+    ``FormattedSeq.finditer``).
+    """
+
+    def __init__(self, data):
+        """Initialize with the sequence string, including any leading space."""
+        self.data = numpy.frombuffer(data.encode("ascii"), numpy.uint8)
+        bases = numpy.full(256, 4, numpy.uint8)
+        for i, letter in enumerate("ACGT"):
+            bases[ord(letter)] = i
+        self.bases = bases[self.data]
+        self.indexes = {}
+
+    def _index(self, k):
+        """Return the sorted positions of each k-mer, and the bounds (PRIVATE)."""
+        try:
+            return self.indexes[k]
+        except KeyError:
+            pass
+        n = len(self.data) - k + 1
+        codes = numpy.zeros(max(n, 0), numpy.uint16)
+        ambiguous = numpy.zeros(max(n, 0), bool)
+        for i in range(k):
+            codes = codes * 4 + self.bases[i : i + n] % 4
+            ambiguous |= self.bases[i : i + n] == 4
+        codes[ambiguous] = 4**k
+        order = numpy.argsort(codes, kind="stable")
+        bounds = numpy.searchsorted(codes[order], numpy.arange(4**k + 2))
+        self.indexes[k] = order, bounds
+        return order, bounds
+
+    def find(self, elements, limit):
+        """Return the start positions of the site, as a NumPy array.
+
+        Argument elements are as returned by _site_elements, and limit is
+        the length of the sequence which the site must fit into.
+        """
+        length = len(elements)
+        # Find the longest run of single bases (up to 4) to use as the seed
+        seed_start, seed_length = 0, 0
+        start = None
+        for i, element in enumerate(elements + ["."]):
+            if element in ("A", "C", "G", "T"):
+                if start is None:
+                    start = i
+                if min(i - start + 1, 4) > seed_length:
+                    seed_start, seed_length = max(start, i - 3), min(i - start + 1, 4)
+            else:
+                start = None
+        if seed_length == 0:
+            return None
+        code = 0
+        for element in elements[seed_start : seed_start + seed_length]:
+            code = code * 4 + "ACGT".index(element)
+        order, bounds = self._index(seed_length)
+        positions = order[bounds[code] : bounds[code + 1]] - seed_start
+        positions = positions[(positions >= 0) & (positions + length <= limit)]
+        # Check the rest of the site, single bases first as most selective
+        checks = [
+            (len(element), i, element)
+            for i, element in enumerate(elements)
+            if element != "." and not seed_start <= i < seed_start + seed_length
+        ]
+        for size, i, element in sorted(checks):
+            allowed = numpy.zeros(256, bool)
+            allowed[numpy.frombuffer(element.strip("[]").encode(), numpy.uint8)] = True
+            positions = positions[allowed[self.data[positions + i]]]
+        return positions
+
+
 class RestrictionType(type):
     """RestrictionType. Type from which all enzyme classes are derived.
 
@@ -946,15 +1061,18 @@ class Palindromic(AbstractCut):
     """
 
     @classmethod
-    def _search(cls):
+    def _search(cls, sites=None):
         """Return a list of cutting sites of the enzyme in the sequence (PRIVATE).
 
         For internal use only.
 
-        Implement the search method for palindromic enzymes.
+        Implement the search method for palindromic enzymes. If given, sites
+        is a list of (position, forward strand) tuples for the recognition
+        sites already found by RestrictionBatch.search.
         """
-        siteloc = cls.dna.finditer(cls.compsite, cls.size)
-        cls.results = [r for s, g in siteloc for r in cls._modify(s)]
+        if sites is None:
+            sites = cls.dna.finditer(cls.compsite, cls.size)
+        cls.results = [r for s, forward in sites for r in cls._modify(s)]
         if cls.results:
             cls._drop()
         return cls.results
@@ -975,22 +1093,26 @@ class NonPalindromic(AbstractCut):
     """
 
     @classmethod
-    def _search(cls):
+    def _search(cls, sites=None):
         """Return a list of cutting sites of the enzyme in the sequence (PRIVATE).
 
         For internal use only.
 
-        Implement the search method for non palindromic enzymes.
+        Implement the search method for non palindromic enzymes. If given,
+        sites is a list of (position, forward strand) tuples for the
+        recognition sites already found by RestrictionBatch.search.
         """
-        iterator = cls.dna.finditer(cls.compsite, cls.size)
+        s = str(cls)
+        if sites is None:
+            iterator = cls.dna.finditer(cls.compsite, cls.size)
+            sites = [(start, group(s) is not None) for start, group in iterator]
         cls.results = []
         modif = cls._modify
         revmodif = cls._rev_modify
-        s = str(cls)
         cls.on_minus = []
 
-        for start, group in iterator:
-            if group(s):
+        for start, forward in sites:
+            if forward:
                 cls.results += list(modif(start))
             else:
                 cls.on_minus += list(revmodif(start))
@@ -2284,17 +2406,67 @@ class RestrictionBatch(set):
             else:
                 self.already_mapped = str(dna), linear
                 fseq = FormattedSeq(dna, linear)
-                self.mapping = {x: x.search(fseq) for x in self}
+                self.mapping = self._search_all(fseq)
                 return self.mapping
         elif isinstance(dna, FormattedSeq):
             if (str(dna), dna.linear) == self.already_mapped:
                 return self.mapping
             else:
                 self.already_mapped = str(dna), dna.linear
-                self.mapping = {x: x.search(dna) for x in self}
+                self.mapping = self._search_all(dna)
                 return self.mapping
         raise TypeError(f"Expected Seq or MutableSeq instance, got {type(dna)} instead")
 
+    def _search_all(self, fseq):
+        """Return a dict of cutting sites in the FormattedSeq for each enzyme (PRIVATE).
+
+        Short sequences are searched with the regular expression of each
+        enzyme in turn. Otherwise the recognition sites of all the enzymes
+        are found from a single _SiteIndex of the sequence, which is much
+        faster than scanning the whole sequence once per enzyme.
+        """
+        if len(fseq) < _SITE_INDEX_MIN_LENGTH:
+            return {x: x.search(fseq) for x in self}
+        data = fseq.data
+        if not fseq.is_linear():
+            data += data[1 : max(x.size for x in self)]
+        index = _SiteIndex(data)
+        found = {}
+        mapping = {}
+        for enzyme in self:
+            enzyme.dna = fseq
+            patterns = _site_elements(enzyme.compsite)
+            if patterns is None:
+                mapping[enzyme] = enzyme._search()
+                continue
+            limit = len(fseq.data)
+            if not fseq.is_linear():
+                limit += len(fseq.data[1 : enzyme.size])
+            positions = []
+            strands = []
+            for name, elements in patterns:
+                key = tuple(elements), limit
+                if key not in found:
+                    found[key] = index.find(elements, limit)
+                if found[key] is None:
+                    break
+                # Where both strands match, the regular expression reports
+                # the first alternative (normally the forward strand)
+                new = found[key]
+                for old in positions:
+                    new = new[~numpy.isin(new, old, assume_unique=True)]
+                positions.append(new)
+                strands.append(numpy.full(len(new), name == str(enzyme)))
+            else:
+                positions = numpy.concatenate(positions)
+                strands = numpy.concatenate(strands)
+                order = numpy.argsort(positions, kind="stable")
+                sites = zip(positions[order].tolist(), strands[order].tolist())
+                mapping[enzyme] = enzyme._search(list(sites))
+                continue
+            mapping[enzyme] = enzyme._search()
+        return mapping
+
 
 ###############################################################################
 #                                                                             #
@@ -196,6 +196,8 @@ of the format's documentation.
 
 """
 
+import functools
+
 from Bio.File import as_handle
 from Bio.SearchIO._model import QueryResult, Hit, HSP, HSPFragment
 from Bio.SearchIO._utils import get_processor
@@ -418,13 +420,20 @@ def to_dict(qresults, key_function=None):
     return qdict
 
 
-def index(filename, format=None, key_function=None, **kwargs):
+def index(
+    filename, format=None, key_function=None, compact=False, cache_size=1, **kwargs
+):
     """Indexes a search output file and returns a dictionary-like object.
 
      - filename     - string giving name of file to be indexed
      - format       - Lower case string denoting one of the supported formats.
      - key_function - Optional callback function which when given a
                       QueryResult should return a unique key for the dictionary.
+     - compact      - Optional boolean, hold the keys and offsets in compact
+                      arrays rather than a Python dictionary (default False).
+                      This uses less memory, but requires string keys.
+     - cache_size   - Optional number of most recently used QueryResult
+                      objects to keep in memory (default 1).
      - kwargs       - Format-specific keyword arguments.
 
     Index returns a pseudo-dictionary object with QueryResult objects as its
@@ -481,15 +490,30 @@ def index(filename, format=None, key_function=None, **kwargs):
         raise TypeError("Need a filename (not a handle)")
 
     from Bio.File import _IndexedSeqFileDict
+    from Bio.File import _check_cache_size
 
     proxy_class = get_processor(format, _INDEXER_MAP)
+    _check_cache_size(cache_size)
     repr = f"SearchIO.index({filename!r}, {format!r}, key_function={key_function!r})"
     return _IndexedSeqFileDict(
-        proxy_class(filename, **kwargs), key_function, repr, "QueryResult"
+        proxy_class(filename, **kwargs),
+        key_function,
+        repr,
+        "QueryResult",
+        compact=compact,
+        cache_size=cache_size,
     )
 
 
-def index_db(index_filename, filenames=None, format=None, key_function=None, **kwargs):
+def index_db(
+    index_filename,
+    filenames=None,
+    format=None,
+    key_function=None,
+    workers=None,
+    cache_size=0,
+    **kwargs,
+):
     """Indexes several search output files into an SQLite database.
 
      - index_filename - The SQLite filename.
@@ -501,6 +525,10 @@ def index_db(index_filename, filenames=None, format=None, key_function=None, **k
      - key_function - Optional callback function which when given a
                       QueryResult identifier string should return a unique
                       key for the dictionary.
+     - workers      - Optional number of processes used to scan the files in
+                      parallel when building a new index.
+     - cache_size   - Optional number of most recently used QueryResult
+                      objects to keep in memory (default 0).
      - kwargs       - Format-specific keyword arguments.
 
     The ``index_db`` function is similar to ``index`` in that it indexes the start
@@ -558,18 +586,30 @@ def index_db(index_filename, filenames=None, format=None, key_function=None, **k
 
     repr = f"SearchIO.index_db({index_filename!r}, filenames={filenames!r}, {format!r}, key_function={key_function!r})"
 
-    def proxy_factory(format, filename=None):
-        """Given a filename returns proxy object, else boolean if format OK."""
-        if filename:
-            return get_processor(format, _INDEXER_MAP)(filename, **kwargs)
-        else:
-            return format in _INDEXER_MAP
+    # A partial function of a module level function can be pickled,
+    # which is needed to scan the files in worker processes
+    proxy_factory = functools.partial(_index_db_proxy_factory, **kwargs)
 
     return _SQLiteManySeqFilesDict(
-        index_filename, filenames, proxy_factory, format, key_function, repr
+        index_filename,
+        filenames,
+        proxy_factory,
+        format,
+        key_function,
+        repr,
+        workers=workers,
+        cache_size=cache_size,
     )
 
 
+def _index_db_proxy_factory(format, filename=None, **kwargs):
+    """Given a filename returns proxy object, else boolean if format OK (PRIVATE)."""
+    if filename:
+        return get_processor(format, _INDEXER_MAP)(filename, **kwargs)
+    else:
+        return format in _INDEXER_MAP
+
+
 def write(qresults, handle, format=None, **kwargs):
     """Write QueryResult objects to a file in the given format.
 
@@ -22,6 +22,7 @@ See also the Seq_ wiki and the chapter in our tutorial:
 import array
 import numbers
 import warnings
+import weakref
 
 from abc import ABC
 from abc import abstractmethod
@@ -3397,6 +3398,72 @@ def _translate_str(
        ...
     Bio.Data.CodonTable.TranslationError: Extra in frame stop codon found.
     """
+    codon_table = _get_codon_table(table)
+    _check_dual_coding(codon_table, to_stop)
+    sequence, amino_acids = _translate_prepare(sequence, codon_table, cds)
+    _check_gap(gap)
+    n = len(sequence)
+
+    if n >= _TRANSLATE_VECTOR_MIN_LENGTH:
+        proteins = _translate_vector(
+            [sequence], codon_table, stop_symbol, to_stop, cds, pos_stop, gap
+        )
+        if proteins is not None:
+            return amino_acids + proteins[0]
+    return amino_acids + _translate_codons(
+        sequence, codon_table, stop_symbol, to_stop, cds, pos_stop, gap
+    )
+
+
+def _translate_codons(sequence, codon_table, stop_symbol, to_stop, cds, pos_stop, gap):
+    """Translate a string of whole codons with a per codon loop (PRIVATE).
+
+    The sequence should already be upper case, with any start codon (if
+    cds=True) removed by _translate_prepare.
+    """
+    n = len(sequence)
+    amino_acids = []
+    forward_table = codon_table.forward_table
+    if codon_table.nucleotide_alphabet is not None:
+        valid_letters = set(codon_table.nucleotide_alphabet.upper())
+    else:
+        # Assume the worst case, ambiguous DNA or RNA:
+        valid_letters = set(
+            IUPACData.ambiguous_dna_letters.upper()
+            + IUPACData.ambiguous_rna_letters.upper()
+        )
+    for i in range(0, n, 3):
+        codon = sequence[i : i + 3]
+        try:
+            amino_acids.append(forward_table[codon])
+        except (KeyError, CodonTable.TranslationError):
+            if codon in codon_table.stop_codons:
+                if cds:
+                    raise CodonTable.TranslationError(
+                        "Extra in frame stop codon found."
+                    ) from None
+                if to_stop:
+                    break
+                amino_acids.append(stop_symbol)
+            elif valid_letters.issuperset(set(codon)):
+                # Possible stop codon (e.g. NNN or TAN)
+                amino_acids.append(pos_stop)
+            elif gap is not None and codon == gap * 3:
+                # Gapped translation
+                amino_acids.append(gap)
+            else:
+                raise CodonTable.TranslationError(
+                    f"Codon '{codon}' is invalid"
+                ) from None
+    return "".join(amino_acids)
+
+
+def _get_codon_table(table):
+    """Return the CodonTable object for a translation table argument (PRIVATE).
+
+    The table can be a name (string), an NCBI identifier (integer), or a
+    CodonTable object.
+    """
     try:
         table_id = int(table)
     except ValueError:
@@ -3424,22 +3491,13 @@ def _translate_str(
         # Assume it's a table ID
         # The same table can be used for RNA or DNA
         codon_table = CodonTable.ambiguous_generic_by_id[table_id]
-    sequence = sequence.upper()
-    amino_acids = []
-    forward_table = codon_table.forward_table
-    stop_codons = codon_table.stop_codons
-    if codon_table.nucleotide_alphabet is not None:
-        valid_letters = set(codon_table.nucleotide_alphabet.upper())
-    else:
-        # Assume the worst case, ambiguous DNA or RNA:
-        valid_letters = set(
-            IUPACData.ambiguous_dna_letters.upper()
-            + IUPACData.ambiguous_rna_letters.upper()
-        )
-    n = len(sequence)
+    return codon_table
 
-    # Check for tables with 'ambiguous' (dual-coding) stop codons:
-    dual_coding = [c for c in stop_codons if c in forward_table]
+
+def _check_dual_coding(codon_table, to_stop):
+    """Warn or raise if the table has dual-coding stop codons (PRIVATE)."""
+    forward_table = codon_table.forward_table
+    dual_coding = [c for c in codon_table.stop_codons if c in forward_table]
     if dual_coding:
         c = dual_coding[0]
         if to_stop:
@@ -3455,6 +3513,24 @@ def _translate_str(
             BiopythonWarning,
         )
 
+
+def _check_gap(gap):
+    """Check the gap argument is None or a single character string (PRIVATE)."""
+    if gap is not None:
+        if not isinstance(gap, str):
+            raise TypeError("Gap character should be a single character string.")
+        elif len(gap) > 1:
+            raise ValueError("Gap character should be a single character string.")
+
+
+def _translate_prepare(sequence, codon_table, cds):
+    """Return the codons to translate, and the translated prefix (PRIVATE).
+
+    The sequence is upper cased and trimmed to whole codons. If cds is True
+    the start and stop codons are checked and removed, giving the prefix "M".
+    """
+    sequence = sequence.upper()
+    n = len(sequence)
     if cds:
         if str(sequence[:3]).upper() not in codon_table.start_codons:
             raise CodonTable.TranslationError(
@@ -3464,14 +3540,12 @@ def _translate_str(
             raise CodonTable.TranslationError(
                 f"Sequence length {n} is not a multiple of three"
             )
-        if str(sequence[-3:]).upper() not in stop_codons:
+        if str(sequence[-3:]).upper() not in codon_table.stop_codons:
             raise CodonTable.TranslationError(
                 f"Final codon '{sequence[-3:]}' is not a stop codon"
             )
         # Don't translate the stop symbol, and manually translate the M
-        sequence = sequence[3:-3]
-        n -= 6
-        amino_acids = ["M"]
+        return sequence[3:-3], "M"
     elif n % 3 != 0:
         warnings.warn(
             "Partial codon, len(sequence) not a multiple of three. "
@@ -3479,36 +3553,160 @@ def _translate_str(
             "translation. This may become an error in future.",
             BiopythonWarning,
         )
-    if gap is not None:
-        if not isinstance(gap, str):
-            raise TypeError("Gap character should be a single character string.")
-        elif len(gap) > 1:
-            raise ValueError("Gap character should be a single character string.")
+        return sequence[: n - n % 3], ""
+    return sequence, ""
 
-    for i in range(0, n - n % 3, 3):
-        codon = sequence[i : i + 3]
-        try:
-            amino_acids.append(forward_table[codon])
-        except (KeyError, CodonTable.TranslationError):
-            if codon in codon_table.stop_codons:
-                if cds:
-                    raise CodonTable.TranslationError(
-                        "Extra in frame stop codon found."
-                    ) from None
-                if to_stop:
-                    break
-                amino_acids.append(stop_symbol)
-            elif valid_letters.issuperset(set(codon)):
-                # Possible stop codon (e.g. NNN or TAN)
-                amino_acids.append(pos_stop)
-            elif gap is not None and codon == gap * 3:
-                # Gapped translation
-                amino_acids.append(gap)
-            else:
-                raise CodonTable.TranslationError(
-                    f"Codon '{codon}' is invalid"
-                ) from None
-    return "".join(amino_acids)
+
+# Below this length the per codon loop in _translate_str is faster than
+# setting up the NumPy arrays used by _translate_vector:
+_TRANSLATE_VECTOR_MIN_LENGTH = 150
+
+# Codes used in the codon lookup tables for anything other than an amino acid
+# (all below the ASCII letters, so cannot clash with an amino acid):
+_CODON_INVALID = 0
+_CODON_STOP = 1
+_CODON_POSSIBLE_STOP = 2
+
+_codon_lookups = weakref.WeakKeyDictionary()
+
+
+def _codon_lookup(codon_table):
+    """Return arrays for translating codons by table lookup (PRIVATE).
+
+    Returns a tuple of two NumPy arrays and an integer size. The first array
+    maps each byte (ASCII character) to a nucleotide number, from 0 to
+    size - 2 for the upper case (ambiguous) DNA and RNA letters, or size - 1
+    for anything else. The second array maps the codon number
+    (first * size + second) * size + third to the amino acid letter (as an
+    ASCII code), or one of the _CODON_* codes.
+
+    These follow the per codon logic in _translate_str, and are cached for
+    each codon table.
+    """
+    try:
+        return _codon_lookups[codon_table]
+    except KeyError:
+        pass
+    import numpy
+
+    forward_table = codon_table.forward_table
+    stop_codons = codon_table.stop_codons
+    if codon_table.nucleotide_alphabet is not None:
+        valid_letters = set(codon_table.nucleotide_alphabet.upper())
+    else:
+        valid_letters = set(
+            IUPACData.ambiguous_dna_letters.upper()
+            + IUPACData.ambiguous_rna_letters.upper()
+        )
+    # Include any other letters accepted by an ambiguous forward table (e.g. X)
+    letters = sorted(
+        valid_letters.union(
+            IUPACData.ambiguous_dna_letters.upper(),
+            IUPACData.ambiguous_rna_letters.upper(),
+            *getattr(forward_table, "ambiguous_nucleotide", {}),
+        )
+    )
+    size = len(letters) + 1
+    nucleotides = numpy.full(256, len(letters), numpy.intp)
+    for i, letter in enumerate(letters):
+        nucleotides[ord(letter)] = i
+    codons = numpy.full(size**3, _CODON_INVALID, numpy.uint8)
+    for i, first in enumerate(letters):
+        for j, second in enumerate(letters):
+            for k, third in enumerate(letters):
+                codon = first + second + third
+                try:
+                    amino_acid = forward_table[codon]
+                except (KeyError, CodonTable.TranslationError):
+                    if codon in stop_codons:
+                        code = _CODON_STOP
+                    elif valid_letters.issuperset(codon):
+                        code = _CODON_POSSIBLE_STOP
+                    else:
+                        continue
+                else:
+                    code = ord(amino_acid)
+                    if len(amino_acid) != 1 or code <= _CODON_POSSIBLE_STOP:
+                        raise ValueError(f"Unexpected amino acid {amino_acid!r}")
+                codons[(i * size + j) * size + k] = code
+    _codon_lookups[codon_table] = nucleotides, codons, size
+    return nucleotides, codons, size
+
+
+def _translate_vector(sequences, codon_table, stop_symbol, to_stop, cds, pos_stop, gap):
+    """Translate a list of strings of whole codons using table lookups (PRIVATE).
+
+    The sequences should already be upper case, and are looked up together
+    in a single pass. Returns a list of protein strings, giving the same
+    results as the per codon loop in _translate_str, or None (for the caller
+    to fall back on the loop) if the symbols or sequences are not single byte
+    ASCII characters.
+    """
+    import numpy
+
+    sequence = "".join(sequences)
+    if not (
+        sequence.isascii()
+        and len(stop_symbol) == 1
+        and stop_symbol.isascii()
+        and len(pos_stop) == 1
+        and pos_stop.isascii()
+        and (gap is None or gap.isascii())
+    ):
+        return None
+    try:
+        nucleotides, codons, size = _codon_lookup(codon_table)
+    except ValueError:
+        return None
+    data = numpy.frombuffer(sequence.encode("ascii"), numpy.uint8).reshape(-1, 3)
+    index = nucleotides[data]
+    codes = codons[(index[:, 0] * size + index[:, 1]) * size + index[:, 2]]
+    proteins = []
+    start = 0
+    for sequence in sequences:
+        end = start + len(sequence) // 3
+        protein = codes[start:end]
+        if len(protein) and protein.min() <= _CODON_POSSIBLE_STOP:
+            protein = _translate_special(
+                protein.copy(),
+                data[start:end],
+                to_stop,
+                cds,
+                stop_symbol,
+                pos_stop,
+                gap,
+            )
+        proteins.append(protein.tobytes().decode("ascii"))
+        start = end
+    return proteins
+
+
+def _translate_special(protein, codons, to_stop, cds, stop_symbol, pos_stop, gap):
+    """Replace the _CODON_* codes in a looked up protein (PRIVATE).
+
+    Arguments protein and codons are NumPy arrays of the looked up codes and
+    of the codons (as rows of three ASCII codes). Raises TranslationError
+    at the first invalid codon, as the loop in _translate_str would.
+    """
+    invalid = protein == _CODON_INVALID
+    if gap is not None and invalid.any():
+        gaps = invalid & (codons == ord(gap)).all(axis=1)
+        protein[gaps] = ord(gap)
+        invalid[gaps] = False
+    stops = protein == _CODON_STOP
+    first_invalid = invalid.argmax() if invalid.any() else len(protein)
+    first_stop = stops.argmax() if stops.any() else len(protein)
+    if first_stop < first_invalid and (cds or to_stop):
+        if cds:
+            raise CodonTable.TranslationError("Extra in frame stop codon found.")
+        protein = protein[:first_stop]
+    elif first_invalid < len(protein):
+        codon = codons[first_invalid].tobytes().decode("ascii")
+        raise CodonTable.TranslationError(f"Codon '{codon}' is invalid")
+    else:
+        protein[stops] = ord(stop_symbol)
+    protein[protein == _CODON_POSSIBLE_STOP] = ord(pos_stop)
+    return protein
 
 
 def translate(
@@ -3615,6 +3813,89 @@ def translate(
         return _translate_str(sequence, table, stop_symbol, to_stop, cds, gap=gap)
 
 
+def translate_many(
+    sequences, table="Standard", stop_symbol="*", to_stop=False, cds=False, gap=None
+):
+    """Translate many nucleotide sequences into amino acids.
+
+    This gives the same results as calling the ``translate`` function on
+    each sequence in turn with the same arguments (raising an exception if
+    any of the sequences cannot be translated), but the codon table is only
+    set up once and the codons of all the sequences are looked up together,
+    which is much faster for large numbers of sequences (e.g. all the genes
+    of a genome). Returns a list with a string for each string in the input,
+    and a Seq object for each Seq or MutableSeq object.
+
+    Arguments table, stop_symbol, to_stop, cds and gap are as for the
+    ``translate`` function.
+
+    >>> translate_many(["ATGGCCATTGTAATGGGCCGCTGA", "GTGGCCTAG"])
+    ['MAIVMGR*', 'VA*']
+    >>> translate_many(["ATGGCCATTGTAATGGGCCGCTGA", "GTGGCCTAG"], table=11, cds=True)
+    ['MAIVMGR', 'MA']
+    >>> translate_many([Seq("AUGGCCAUUGUAAUGGGCCGCUGA")], to_stop=True)
+    [Seq('MAIVMGR')]
+    """
+    sequences = list(sequences)
+    codon_table = _get_codon_table(table)
+    _check_dual_coding(codon_table, to_stop)
+    _check_gap(gap)
+    codons = []
+    prefixes = []
+    for sequence in sequences:
+        sequence, prefix = _translate_prepare(str(sequence), codon_table, cds)
+        codons.append(sequence)
+        prefixes.append(prefix)
+    proteins = _translate_vector(
+        codons, codon_table, stop_symbol, to_stop, cds, "X", gap
+    )
+    if proteins is None:
+        # Not plain ASCII, use the per codon loop
+        proteins = [
+            _translate_codons(codon, codon_table, stop_symbol, to_stop, cds, "X", gap)
+            for codon in codons
+        ]
+    proteins = [prefix + protein for prefix, protein in zip(prefixes, proteins)]
+    return [
+        Seq(protein) if isinstance(sequence, (Seq, MutableSeq)) else protein
+        for sequence, protein in zip(sequences, proteins)
+    ]
+
+
+def translate_six_frames(sequence, table="Standard", stop_symbol="*", gap=None):
+    """Translate a nucleotide sequence in all six reading frames.
+
+    Returns a list of the translations of frames +1, +2 and +3 (starting
+    from the first, second and third letter of the sequence), and of frames
+    -1, -2 and -3 (likewise on the reverse complement). Each frame is
+    trimmed to a whole number of codons, and the six frames are translated
+    together as with ``translate_many``. Any U in the sequence is treated as
+    a T. Returns strings if given a string, or Seq objects if given a Seq or
+    MutableSeq.
+
+    Arguments table, stop_symbol and gap are as for the ``translate``
+    function.
+
+    >>> for protein in translate_six_frames("AUGGCCAUUGUAAUGGGCCGCUGA"):
+    ...     print(protein)
+    ...
+    MAIVMGR*
+    WPL*WAA
+    GHCNGPL
+    SAAHYNGH
+    QRPITMA
+    SGPLQWP
+    """
+    frames = []
+    for strand in (str(sequence), reverse_complement(str(sequence), inplace=False)):
+        for i in range(3):
+            frames.append(strand[i : i + 3 * ((len(strand) - i) // 3)])
+    proteins = translate_many(frames, table, stop_symbol, gap=gap)
+    if isinstance(sequence, (Seq, MutableSeq)):
+        return [Seq(protein) for protein in proteins]
+    return proteins
+
+
 def reverse_complement(sequence, inplace=None):
     """Return the reverse complement as a DNA sequence.
 
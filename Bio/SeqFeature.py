@@ -21,6 +21,8 @@ Base class to hold a Feature
 
 Classes:
  - SeqFeature
+ - FeatureTable - Compact table of features, stored in NumPy arrays.
+ - FeatureIndex - Index of features by location, for overlap queries.
 
 Hold information about a Reference
 ----------------------------------
@@ -51,9 +53,13 @@ Classes:
  - UnknownPosition - Represents missing information like '?' in UniProt.
 
 """
+import array
+import copy
 import functools
 import warnings
 
+import numpy
+
 from Bio import BiopythonDeprecationWarning
 from Bio.Seq import MutableSeq
 from Bio.Seq import reverse_complement
@@ -610,6 +616,535 @@ class SeqFeature:
         return value in self.location
 
 
+class _UninternedValue:
+    """Wrapper for a qualifier value that cannot be hashed (PRIVATE).
+
+    This compares and hashes by identity, so each value is stored separately.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        """Wrap the qualifier value."""
+        self.value = value
+
+
+class FeatureTable:
+    """Compact, column based, read only table of sequence features.
+
+    A list of SeqFeature objects (such as the features of a SeqRecord for a
+    whole chromosome) uses a lot of memory, as each feature holds a location
+    object, position objects, and a dictionary of qualifiers. A FeatureTable
+    stores the same information in NumPy arrays (the start, end and strand
+    of each feature and of each part of its location, and a code for the
+    feature type), while the qualifiers are interned so that identical
+    entries (e.g. the same /gene qualifier on a gene and its CDS) are only
+    stored once:
+
+    >>> from Bio import SeqIO
+    >>> from Bio.SeqFeature import FeatureTable
+    >>> record = SeqIO.read("GenBank/NC_005816.gb", "gb")
+    >>> table = FeatureTable(record.features)
+    >>> len(table)
+    41
+    >>> table.types
+    ['source', 'repeat_region', 'gene', 'CDS', 'misc_feature', 'variation']
+    >>> table.start[:4]
+    array([ 0,  0, 86, 86])
+
+    Indexing the table with an integer creates the corresponding SeqFeature
+    object on demand:
+
+    >>> feature = table[3]
+    >>> print(feature.type, feature.location, feature.qualifiers["locus_tag"])
+    CDS [86:1109](+) ['YP_pPCP01']
+    >>> feature == record.features[3]
+    True
+
+    These are new objects, so modifying them does not change the table.
+    Indexing the table with a slice, an array of indices or a boolean mask
+    instead gives a new FeatureTable, so you can use NumPy to filter the
+    features, for example to find the long features on the reverse strand:
+
+    >>> long_reverse = table[(table.end - table.start > 1000) & (table.strand == -1)]
+    >>> for feature in long_reverse:
+    ...     print(feature.type, feature.location)
+    ...
+    gene [4814:5888](-)
+    CDS [4814:5888](-)
+
+    The most common queries, by feature type and by region, are provided
+    by the select method (see below).
+
+    The strand array uses 1, -1 and 0 as in the location objects, with the
+    value FeatureTable.NO_STRAND (2) for features with strand None. Fuzzy
+    positions are stored as their integer values, with the original location
+    object also kept so that the SeqFeature objects are recreated unchanged.
+    """
+
+    NO_STRAND = 2
+
+    def __init__(self, features=()):
+        """Create the table from an iterable of SeqFeature objects."""
+        types = {}
+        ids = {}
+        operators = {None: 0}
+        pairs = {}
+        qualifiers = {}
+        locations = {}
+        type_codes = array.array("l")
+        id_codes = array.array("l")
+        operator_codes = array.array("b")
+        qualifier_codes = array.array("l")
+        offsets = array.array("q", [0])
+        part_start = array.array("q")
+        part_end = array.array("q")
+        part_strand = array.array("b")
+        strand = array.array("b")
+        for index, feature in enumerate(features):
+            type_codes.append(types.setdefault(feature.type, len(types)))
+            id_codes.append(ids.setdefault(feature.id, len(ids)))
+            key = []
+            for pair in feature.qualifiers.items():
+                pair = self._intern_qualifier(pair)
+                key.append(pairs.setdefault(pair, pair))
+            key = tuple(key)
+            qualifier_codes.append(qualifiers.setdefault(key, len(qualifiers)))
+            location = feature.location
+            if location is None:
+                locations[index] = None
+                operator_codes.append(0)
+                strand.append(self.NO_STRAND)
+                offsets.append(offsets[-1])
+                continue
+            parts = location.parts
+            exact = True
+            try:
+                for part in parts:
+                    start = part.start
+                    end = part.end
+                    exact &= type(start) is ExactPosition
+                    exact &= type(end) is ExactPosition
+                    exact &= part.ref is None and part.ref_db is None
+                    part_start.append(int(start))
+                    part_end.append(int(end))
+                    part_strand.append(
+                        self.NO_STRAND if part.strand is None else part.strand
+                    )
+            except TypeError:
+                # e.g. an UnknownPosition, store the feature without any parts
+                # so that it is never found by a region query.
+                del part_start[offsets[-1] :]
+                del part_end[offsets[-1] :]
+                del part_strand[offsets[-1] :]
+                exact = False
+            offsets.append(len(part_start))
+            if not exact:
+                locations[index] = location
+            if isinstance(location, CompoundLocation):
+                operator = location.operator
+                operator_codes.append(operators.setdefault(operator, len(operators)))
+            else:
+                operator_codes.append(0)
+            strand.append(
+                self.NO_STRAND if location.strand is None else location.strand
+            )
+        self.types = list(types)
+        self._ids = list(ids)
+        self._operators = list(operators)
+        self._qualifiers = list(qualifiers)
+        self._locations = locations
+        self.type_code = numpy.array(type_codes, numpy.int32)
+        self._id_code = numpy.array(id_codes, numpy.int32)
+        self._operator_code = numpy.array(operator_codes, numpy.int8)
+        self._qualifier_code = numpy.array(qualifier_codes, numpy.int32)
+        self.strand = numpy.array(strand, numpy.int8)
+        self.offsets = numpy.array(offsets, numpy.int64)
+        self.part_start = numpy.array(part_start, numpy.int64)
+        self.part_end = numpy.array(part_end, numpy.int64)
+        self.part_strand = numpy.array(part_strand, numpy.int8)
+        self._set_bounds()
+
+    @staticmethod
+    def _intern_qualifier(pair):
+        """Return a hashable (key, is_list, value) tuple for a qualifier (PRIVATE).
+
+        List values (as used by the parsers) are stored as tuples, and turned
+        back into lists when creating the SeqFeature objects. Values which
+        cannot be hashed (e.g. dictionaries or nested lists) are copied into
+        an _UninternedValue wrapper, so they are stored but not interned.
+        """
+        key, value = pair
+        is_list = isinstance(value, list)
+        if is_list:
+            value = tuple(value)
+        try:
+            hash(value)
+        except TypeError:
+            return (key, False, _UninternedValue(copy.deepcopy(pair[1])))
+        return (key, is_list, value)
+
+    def _set_bounds(self):
+        """Calculate the start and end of each feature from its parts (PRIVATE)."""
+        offsets = self.offsets
+        n = len(offsets) - 1
+        self.start = numpy.zeros(n, numpy.int64)
+        self.end = numpy.zeros(n, numpy.int64)
+        present = offsets[1:] > offsets[:-1]
+        if len(self.part_start):
+            starts = offsets[:-1][present]
+            self.start[present] = numpy.minimum.reduceat(self.part_start, starts)
+            self.end[present] = numpy.maximum.reduceat(self.part_end, starts)
+
+    def __len__(self):
+        """Return the number of features in the table."""
+        return len(self.type_code)
+
+    def __iter__(self):
+        """Iterate over the features, creating SeqFeature objects on demand."""
+        for index in range(len(self)):
+            yield self._feature(index)
+
+    def __repr__(self):
+        """Represent the table as a string for debugging."""
+        return f"<{self.__class__.__name__} with {len(self)} features>"
+
+    def __getitem__(self, index):
+        """Return a SeqFeature (for an integer), or a new FeatureTable.
+
+        Slices, integer arrays and boolean masks select the features to
+        include in the new table, as when indexing a NumPy array.
+        """
+        if isinstance(index, (int, numpy.integer)):
+            n = len(self)
+            if index < 0:
+                index += n
+            if not 0 <= index < n:
+                raise IndexError("feature table index out of range")
+            return self._feature(index)
+        rows = numpy.arange(len(self))[index]
+        return self._subset(rows)
+
+    @property
+    def type(self):
+        """Type of each feature, as an array of strings."""
+        return numpy.array(self.types, dtype=object)[self.type_code]
+
+    def _feature(self, index):
+        """Create the SeqFeature object for the given row (PRIVATE)."""
+        try:
+            location = self._locations[index]
+        except KeyError:
+            start, end = self.offsets[index : index + 2]
+            parts = [
+                FeatureLocation(
+                    int(self.part_start[i]),
+                    int(self.part_end[i]),
+                    self._strand_value(self.part_strand[i]),
+                )
+                for i in range(start, end)
+            ]
+            if len(parts) == 1:
+                location = parts[0]
+            else:
+                operator = self._operators[self._operator_code[index]]
+                location = CompoundLocation(parts, operator)
+        qualifiers = {}
+        for key, is_list, value in self._qualifiers[self._qualifier_code[index]]:
+            if is_list:
+                value = list(value)
+            elif isinstance(value, _UninternedValue):
+                value = copy.deepcopy(value.value)
+            qualifiers[key] = value
+        return SeqFeature(
+            location,
+            type=self.types[self.type_code[index]],
+            id=self._ids[self._id_code[index]],
+            qualifiers=qualifiers,
+        )
+
+    def _strand_value(self, strand):
+        """Convert a strand code from the arrays to 1, -1, 0 or None (PRIVATE)."""
+        if strand == self.NO_STRAND:
+            return None
+        return int(strand)
+
+    def _subset(self, rows):
+        """Return a new table with the features in the given rows (PRIVATE)."""
+        offsets = self.offsets
+        counts = offsets[rows + 1] - offsets[rows]
+        new_offsets = numpy.zeros(len(rows) + 1, numpy.int64)
+        numpy.cumsum(counts, out=new_offsets[1:])
+        parts = numpy.arange(new_offsets[-1]) + numpy.repeat(
+            offsets[rows] - new_offsets[:-1], counts
+        )
+        table = self.__class__.__new__(self.__class__)
+        table.types = self.types
+        table._ids = self._ids
+        table._operators = self._operators
+        table._qualifiers = self._qualifiers
+        if self._locations:
+            locations = self._locations
+            table._locations = {
+                index: locations[row]
+                for index, row in enumerate(rows.tolist())
+                if row in locations
+            }
+        else:
+            table._locations = {}
+        table.type_code = self.type_code[rows]
+        table._id_code = self._id_code[rows]
+        table._operator_code = self._operator_code[rows]
+        table._qualifier_code = self._qualifier_code[rows]
+        table.strand = self.strand[rows]
+        table.start = self.start[rows]
+        table.end = self.end[rows]
+        table.offsets = new_offsets
+        table.part_start = self.part_start[parts]
+        table.part_end = self.part_end[parts]
+        table.part_strand = self.part_strand[parts]
+        return table
+
+    def mask(self, type=None, start=None, end=None, strand=None):
+        """Return a boolean array marking the features matching all criteria.
+
+        Arguments:
+         - type - a feature type (e.g. "CDS"), or a list of feature types.
+         - start, end - select features with a part of their location
+           overlapping the region start:end (using Python counting). For
+           a feature defined as a join of several parts, the gaps between
+           the parts (e.g. introns) are not included.
+         - strand - select features on this strand (1, -1 or 0, or
+           FeatureTable.NO_STRAND for features with strand None).
+
+        See the select method for examples.
+        """
+        mask = numpy.ones(len(self), bool)
+        if type is not None:
+            if isinstance(type, str):
+                type = [type]
+            codes = [self.types.index(t) for t in type if t in self.types]
+            mask &= numpy.isin(self.type_code, codes)
+        if strand is not None:
+            mask &= self.strand == strand
+        if start is not None or end is not None:
+            overlap = numpy.ones(len(self.part_start), bool)
+            if start is not None:
+                overlap &= self.part_end > start
+            if end is not None:
+                overlap &= self.part_start < end
+            rows = numpy.repeat(numpy.arange(len(self)), numpy.diff(self.offsets))
+            mask &= numpy.bincount(rows[overlap], minlength=len(self)) > 0
+        return mask
+
+    def select(self, type=None, start=None, end=None, strand=None):
+        """Return a new FeatureTable with the features matching all criteria.
+
+        This takes the same arguments as the mask method. For example,
+
+        >>> from Bio import SeqIO
+        >>> from Bio.SeqFeature import FeatureTable
+        >>> record = SeqIO.read("GenBank/NC_000932.gb", "gb")
+        >>> table = FeatureTable(record.features)
+        >>> for feature in table.select(["gene", "tRNA"], 1750, 1760):
+        ...     print(feature.type, feature.location)
+        ...
+        gene [1716:4347](-)
+        tRNA join{[4310:4347](-), [1716:1751](-)}
+
+        Here the tRNA is included as its second part ends at 1751, while
+        the region 1751:1760 would only overlap the gene:
+
+        >>> for feature in table.select(["gene", "tRNA"], 1751, 1760):
+        ...     print(feature.type, feature.location)
+        ...
+        gene [1716:4347](-)
+
+        Selecting by type and strand:
+
+        >>> len(table.select("CDS")), len(table.select("CDS", strand=-1))
+        (85, 54)
+        """
+        mask = self.mask(type, start, end, strand)
+        return self._subset(numpy.flatnonzero(mask))
+
+
+class FeatureIndex:
+    """Index of features by location, to find those overlapping a region.
+
+    This is a nested containment list (Alekseyenko and Lee, 2007) over the
+    parts of the feature locations, so for a feature defined as a join of
+    several parts (e.g. exons) the gaps between the parts (e.g. introns)
+    are not included. A query takes a binary search plus time proportional
+    to the number of overlapping parts, rather than looking at every feature.
+
+    >>> from Bio import SeqIO
+    >>> from Bio.SeqFeature import FeatureIndex
+    >>> record = SeqIO.read("GenBank/NC_000932.gb", "gb")
+    >>> index = FeatureIndex(record.features)
+    >>> for feature in index.at(1750):
+    ...     print(feature.type, feature.location)
+    ...
+    source [0:154478](+)
+    gene [1716:4347](-)
+    tRNA join{[4310:4347](-), [1716:1751](-)}
+    >>> for feature in index.overlapping(1751, 4310):
+    ...     print(feature.type, feature.location)
+    ...
+    source [0:154478](+)
+    gene [1716:4347](-)
+    gene [2055:3570](-)
+    CDS [2055:3570](-)
+
+    The features are returned in their original order, and are the same
+    objects as in the list used to build the index. You can also give a
+    FeatureTable, for example to index the features of every record in
+    a large GenBank file opened with Bio.SeqIO.index without keeping all
+    the SeqFeature objects in memory:
+
+    >>> from Bio.SeqFeature import FeatureTable
+    >>> records = SeqIO.index("GenBank/cor6_6.gb", "gb")
+    >>> indexes = {
+    ...     key: FeatureIndex(FeatureTable(records[key].features)) for key in records
+    ... }
+    >>> for feature in indexes["X62281.1"].at(200):
+    ...     print(feature.type, feature.location)
+    ...
+    source [0:880](+)
+    prim_transcript [43:>579](+)
+    gene [43:579](+)
+    intron [160:319](+)
+    >>> records.close()
+
+    Note the mRNA, join{[43:160](+), [319:390](+), [503:>579](+)}, is not
+    included as position 200 falls in its first intron.
+
+    The index is not updated if the features are modified.
+    """
+
+    def __init__(self, features):
+        """Build the index from a list of SeqFeature objects, or a FeatureTable."""
+        if isinstance(features, FeatureTable):
+            offsets = features.offsets
+            rows = numpy.repeat(numpy.arange(len(features)), numpy.diff(offsets))
+            starts = features.part_start
+            ends = features.part_end
+            strands = features.part_strand
+        else:
+            rows, starts, ends, strands = self._parts(features)
+        self.features = features
+        # Sort by start, with longer intervals first when the start is the same
+        # so that an interval always comes after any interval containing it.
+        order = numpy.lexsort((-ends, starts))
+        starts = starts[order]
+        ends = ends[order]
+        parents = numpy.empty(len(order), numpy.int64)
+        stack = []
+        for i, end in enumerate(ends.tolist()):
+            while stack and stack[-1][1] < end:
+                stack.pop()
+            parents[i] = stack[-1][0] if stack else -1
+            stack.append((i, end))
+        # Store each list (the top level, and the intervals contained directly
+        # in each interval) contiguously, with the top level list first; in
+        # each list both the starts and ends are then increasing.
+        layout = numpy.argsort(parents, kind="stable")
+        parents = parents[layout]
+        self._start = starts[layout]
+        self._end = ends[layout]
+        self._row = rows[order][layout]
+        self._strand = strands[order][layout]
+        self._sublist_start = numpy.searchsorted(parents, layout, "left")
+        self._sublist_end = numpy.searchsorted(parents, layout, "right")
+        self._top = numpy.searchsorted(parents, -1, "right")
+
+    @staticmethod
+    def _parts(features):
+        """Return arrays of the row, start, end and strand of each part (PRIVATE).
+
+        Only the locations are used. As in a FeatureTable, features with a
+        position that cannot be converted to an integer (e.g. an
+        UnknownPosition) are not included, so they are never found.
+        """
+        rows = array.array("q")
+        starts = array.array("q")
+        ends = array.array("q")
+        strands = array.array("b")
+        for row, feature in enumerate(features):
+            location = feature.location
+            if location is None:
+                continue
+            try:
+                parts = [(int(part.start), int(part.end)) for part in location.parts]
+            except TypeError:
+                continue
+            for (start, end), part in zip(parts, location.parts):
+                rows.append(row)
+                starts.append(start)
+                ends.append(end)
+                if part.strand is None:
+                    strands.append(FeatureTable.NO_STRAND)
+                else:
+                    strands.append(part.strand)
+        return (
+            numpy.array(rows, numpy.int64),
+            numpy.array(starts, numpy.int64),
+            numpy.array(ends, numpy.int64),
+            numpy.array(strands, numpy.int8),
+        )
+
+    def __len__(self):
+        """Return the number of features in the index."""
+        return len(self.features)
+
+    def _find(self, start, end, strand):
+        """Return the sorted row numbers of the overlapping features (PRIVATE)."""
+        starts = self._start
+        ends = self._end
+        sublist_start = self._sublist_start
+        sublist_end = self._sublist_end
+        hits = []
+        lists = [(0, self._top)]
+        while lists:
+            lo, hi = lists.pop()
+            # First interval ending after the start, and first one starting
+            # at or after the end of the region, using that both the starts
+            # and the ends are sorted within a list.
+            first = lo + numpy.searchsorted(ends[lo:hi], start, "right")
+            last = lo + numpy.searchsorted(starts[lo:hi], end, "left")
+            if first >= last:
+                continue
+            hits.append((first, last))
+            nested = sublist_start[first:last] < sublist_end[first:last]
+            lists.extend(
+                zip(
+                    sublist_start[first:last][nested].tolist(),
+                    sublist_end[first:last][nested].tolist(),
+                )
+            )
+        if not hits:
+            return numpy.zeros(0, numpy.int64)
+        hits = numpy.concatenate([numpy.arange(first, last) for first, last in hits])
+        if strand is not None:
+            hits = hits[self._strand[hits] == strand]
+        return numpy.unique(self._row[hits])
+
+    def overlapping(self, start, end, strand=None):
+        """Return a list of the features overlapping the region start:end.
+
+        The region uses Python counting, like a slice. Give the optional
+        strand argument (1, -1 or 0, or FeatureTable.NO_STRAND for strand
+        None) to find only the features with a part on that strand in the
+        region.
+        """
+        features = self.features
+        return [features[row] for row in self._find(start, end, strand).tolist()]
+
+    def at(self, position, strand=None):
+        """Return a list of the features including the given position."""
+        return self.overlapping(position, position + 1, strand)
+
+
 # --- References
 
 
@@ -12,7 +12,12 @@
 
 You are expected to use this module via the Bio.SeqIO functions.
 """
+import os
+from collections.abc import Mapping
+
+from Bio import bgzf
 from Bio.Seq import Seq
+from Bio.Seq import SequenceDataAbstractBaseClass
 from Bio.SeqRecord import SeqRecord
 
 from .Interfaces import _clean
@@ -243,6 +248,258 @@ class FastaTwoLineIterator(SequenceIterator):
             )
 
 
+def build_fai_index(handle):
+    """Build a samtools faidx style index of a FASTA file.
+
+    Arguments:
+     - handle - input stream opened in binary mode, which may be a
+       BgzfReader for a BGZF compressed file
+
+    Returns a list of tuples, one per record, giving the name (the first
+    word of the title line), the sequence length, the offset of the start
+    of the sequence, the number of bases on each line, and the number of
+    bytes on each line (including the new line characters). These are the
+    columns of a ``.fai`` file. For a BGZF compressed file the offsets are
+    into the uncompressed data, as in samtools.
+
+    >>> with open("Fasta/f002", "rb") as handle:
+    ...     for entry in build_fai_index(handle):
+    ...         print(entry)
+    ...
+    ('gi|1348912|gb|G26680|G26680', 633, 102, 70, 71)
+    ('gi|1348917|gb|G26685|G26685', 413, 796, 70, 71)
+    ('gi|1592936|gb|G29385|G29385', 471, 1265, 70, 71)
+
+    As in samtools, all the sequence lines of a record must have the same
+    length except for the last, otherwise a ValueError is raised.
+    """
+    index = []
+    name = None
+    length = start = line_bases = line_width = 0
+    last_line = False
+    offset = 0
+    for line in handle:
+        if line.startswith(b">"):
+            if name is not None:
+                index.append((name, length, start, line_bases, line_width))
+            try:
+                name = line[1:].split(None, 1)[0].decode()
+            except IndexError:
+                raise ValueError(
+                    "Missing name in FASTA title line at offset %i" % offset
+                ) from None
+            start = offset + len(line)
+            length = 0
+            line_bases = line_width = 0
+            last_line = False
+        elif name is None:
+            if line.strip():
+                raise ValueError("FASTA file does not start with '>'")
+        else:
+            bases = len(line.rstrip(b"\r\n"))
+            if bases:
+                if last_line:
+                    raise ValueError(
+                        "Different line length in FASTA record %r at offset %i"
+                        % (name, offset)
+                    )
+                if not line_bases:
+                    line_bases = bases
+                    line_width = len(line)
+                elif bases != line_bases or len(line) != line_width:
+                    if bases > line_bases:
+                        raise ValueError(
+                            "Different line length in FASTA record %r at offset %i"
+                            % (name, offset)
+                        )
+                    last_line = True
+                length += bases
+            else:
+                # Blank lines are only allowed at the end of a record
+                last_line = True
+        offset += len(line)
+    if name is not None:
+        index.append((name, length, start, line_bases, line_width))
+    return index
+
+
+def write_fai_index(filename, index):
+    """Save a FASTA index from build_fai_index as a samtools ``.fai`` file."""
+    with open(filename, "w") as handle:
+        for entry in index:
+            handle.write("%s\t%i\t%i\t%i\t%i\n" % entry)
+
+
+def read_fai_index(filename):
+    """Load a FASTA index from a samtools ``.fai`` file.
+
+    Returns a list of tuples as from build_fai_index.
+    """
+    index = []
+    with open(filename) as handle:
+        for line in handle:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) != 5:
+                raise ValueError(
+                    "Expected five columns in FASTA index file, not %r" % line
+                )
+            name = fields[0]
+            length, start, line_bases, line_width = (int(value) for value in fields[1:])
+            index.append((name, length, start, line_bases, line_width))
+    return index
+
+
+class _FaidxSequenceData(SequenceDataAbstractBaseClass):
+    """Stores information needed to retrieve sequence data from an indexed FASTA file (PRIVATE).
+
+    Objects of this class store the file position at which the sequence
+    starts, its length, and the line layout from the ``.fai`` index. Only
+    the bytes needed for the requested region are read from the file.
+    """
+
+    __slots__ = ("stream", "seek", "offset", "length", "line_bases", "line_width")
+
+    def __init__(self, stream, seek, offset, length, line_bases, line_width):
+        """Initialize the file stream and file position of the sequence data."""
+        self.stream = stream
+        self.seek = seek
+        self.offset = offset
+        self.length = length
+        self.line_bases = line_bases
+        self.line_width = line_width
+        super().__init__()
+
+    def __getitem__(self, key):
+        """Return the sequence contents (as a bytes object) for the requested region."""
+        length = self.length
+        if isinstance(key, slice):
+            start, end, step = key.indices(length)
+            positions = range(start, end, step)
+            if not positions:
+                return b""
+            if step == 1:
+                return self._read(start, end)
+            low = min(positions[0], positions[-1])
+            high = max(positions[0], positions[-1]) + 1
+            return self._read(low, high)[positions[0] - low :: step]
+        else:
+            if key < 0:
+                key += length
+            if not 0 <= key < length:
+                raise IndexError("index out of range")
+            return self._read(key, key + 1)[0]
+
+    def _read(self, start, end):
+        """Read the sequence from start to end, dropping the line breaks (PRIVATE)."""
+        line_bases = self.line_bases
+        line_width = self.line_width
+        first = self.offset + start // line_bases * line_width + start % line_bases
+        end -= 1
+        last = self.offset + end // line_bases * line_width + end % line_bases + 1
+        try:
+            self.seek(first)
+        except ValueError as exception:
+            if str(exception) == "seek of closed file":
+                raise ValueError("cannot retrieve sequence: file is closed") from None
+            raise
+        data = self.stream.read(last - first)
+        if line_width != line_bases:
+            data = data.translate(None, b"\r\n")
+        if len(data) != end + 1 - start:
+            raise ValueError("FASTA index does not match the file contents")
+        return data
+
+    def __len__(self):
+        """Get the sequence length."""
+        return self.length
+
+
+class FaidxDict(Mapping):
+    """Read only dictionary of the records in a samtools faidx indexed FASTA file.
+
+    The keys are the record names (the first word of each title line), and
+    the values are SeqRecord objects whose sequence is only read from the
+    file when needed. Taking a slice of the sequence reads just that region
+    from the disk, so this is suitable for pulling out short regions from
+    whole chromosomes.
+
+    The FASTA file may be BGZF compressed (e.g. using ``bgzip``), in which
+    case the BGZF block index is taken from a samtools ``.gzi`` file if
+    present, or built by scanning the block headers.
+    """
+
+    def __init__(self, filename, fai_filename=None, gzi_filename=None):
+        """Open the FASTA file and load or build its index.
+
+        Arguments:
+         - filename - path to the FASTA file, which may be BGZF compressed
+         - fai_filename - path to the ``.fai`` index, default is the FASTA
+           filename plus ``.fai``. If this does not exist, the index is
+           built and saved there (as ``samtools faidx`` does).
+         - gzi_filename - path to the ``.gzi`` BGZF block index, default
+           is the FASTA filename plus ``.gzi``. If this does not exist the
+           block index is built but not saved.
+
+        """
+        if fai_filename is None:
+            fai_filename = filename + ".fai"
+        if gzi_filename is None:
+            gzi_filename = filename + ".gzi"
+        with open(filename, "rb") as handle:
+            compressed = handle.read(4) == bgzf._bgzf_magic
+        if compressed:
+            stream = bgzf.BgzfReader(filename, "rb")
+            if os.path.isfile(gzi_filename):
+                stream.load_gzi_index(gzi_filename)
+            else:
+                stream.load_gzi_index()
+            seek = stream.seek_uncompressed
+        else:
+            stream = open(filename, "rb")
+            seek = stream.seek
+        try:
+            if os.path.isfile(fai_filename):
+                index = read_fai_index(fai_filename)
+            else:
+                seek(0)
+                index = build_fai_index(stream)
+                write_fai_index(fai_filename, index)
+        except Exception:
+            stream.close()
+            raise
+        self._stream = stream
+        self._seek = seek
+        self._index = {entry[0]: entry[1:] for entry in index}
+
+    def __getitem__(self, name):
+        """Return the record with the given name as a SeqRecord object."""
+        length, start, line_bases, line_width = self._index[name]
+        data = _FaidxSequenceData(
+            self._stream, self._seek, start, length, line_bases, line_width
+        )
+        return SeqRecord(Seq(data), id=name, name=name)
+
+    def __iter__(self):
+        """Iterate over the record names in the file."""
+        return iter(self._index)
+
+    def __len__(self):
+        """Return the number of records."""
+        return len(self._index)
+
+    def close(self):
+        """Close the FASTA file."""
+        self._stream.close()
+
+    def __enter__(self):
+        """Open a file operable with WITH statement."""
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """Close a file with WITH statement."""
+        self.close()
+
+
 class FastaWriter(SequenceWriter):
     """Class to write Fasta format files (OBSOLETE).
 
@@ -58,7 +58,7 @@ from .Interfaces import SequenceWriter
 class GenBankIterator(SequenceIterator):
     """Parser for GenBank files."""
 
-    def __init__(self, source):
+    def __init__(self, source, lazy=False):
         """Break up a Genbank file into SeqRecord objects.
 
         Argument source is a file-like object opened in text mode or a path to a file.
@@ -94,19 +94,35 @@ class GenBankIterator(SequenceIterator):
         L31939.1
         AF297471.1
 
+        With lazy=True only the header of each record is parsed up front,
+        which is much faster if you only need the record identifiers or
+        descriptions. The features, annotations and sequence are parsed when
+        they are first used:
+
+        >>> for record in GenBankIterator("GenBank/cor6_6.gb", lazy=True):
+        ...     print("%s %i features" % (record.id, len(record.features)))
+        ...
+        X55053.1 3 features
+        X62281.1 15 features
+        M81224.1 6 features
+        AJ237582.1 7 features
+        L31939.1 3 features
+        AF297471.1 4 features
+
         """
+        self.lazy = lazy
         super().__init__(source, mode="t", fmt="GenBank")
 
     def parse(self, handle):
         """Start parsing the file, and return a SeqRecord generator."""
-        records = GenBankScanner(debug=0).parse_records(handle)
+        records = GenBankScanner(debug=0).parse_records(handle, lazy=self.lazy)
         return records
 
 
 class EmblIterator(SequenceIterator):
     """Parser for EMBL files."""
 
-    def __init__(self, source):
+    def __init__(self, source, lazy=False):
         """Break up an EMBL file into SeqRecord objects.
 
         Argument source is a file-like object opened in text mode or a path to a file.
@@ -148,19 +164,22 @@ class EmblIterator(SequenceIterator):
         A00078.1
         CQ797900.1
 
+        Use lazy=True to only parse the features, annotations and sequence
+        of each record when they are first used.
         """
+        self.lazy = lazy
         super().__init__(source, mode="t", fmt="EMBL")
 
     def parse(self, handle):
         """Start parsing the file, and return a SeqRecord generator."""
-        records = EmblScanner(debug=0).parse_records(handle)
+        records = EmblScanner(debug=0).parse_records(handle, lazy=self.lazy)
         return records
 
 
 class ImgtIterator(SequenceIterator):
     """Parser for IMGT files."""
 
-    def __init__(self, source):
+    def __init__(self, source, lazy=False):
         """Break up an IMGT file into SeqRecord objects.
 
         Argument source is a file-like object opened in text mode or a path to a file.
@@ -169,12 +188,16 @@ class ImgtIterator(SequenceIterator):
 
         Note that for genomes or chromosomes, there is typically only
         one record.
+
+        Use lazy=True to only parse the features, annotations and sequence
+        of each record when they are first used.
         """
+        self.lazy = lazy
         super().__init__(source, mode="t", fmt="IMGT")
 
     def parse(self, handle):
         """Start parsing the file, and return a SeqRecord generator."""
-        records = _ImgtScanner(debug=0).parse_records(handle)
+        records = _ImgtScanner(debug=0).parse_records(handle, lazy=self.lazy)
         return records
 
 
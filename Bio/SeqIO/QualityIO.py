@@ -357,10 +357,13 @@ the Illumina 1.3 to 1.7 format - high quality PHRED scores and Solexa scores
 are approximately equal.
 
 """
+import itertools
 import warnings
 
 from math import log
 
+import numpy
+
 from Bio import BiopythonParserWarning
 from Bio import BiopythonWarning
 from Bio import StreamModeError
@@ -921,71 +924,173 @@ def FastqGeneralIterator(source):
         if handle.read(0) != "":
             raise StreamModeError("Fastq files must be opened in text mode") from None
     try:
-        try:
-            line = next(handle)
-        except StopIteration:
-            return  # Premature end of file, or just empty?
+        yield from _fastq_records(handle)
+    finally:
+        if handle is not source:
+            handle.close()
 
-        while True:
-            if line[0] != "@":
-                raise ValueError(
-                    "Records in Fastq files should start with '@' character"
-                )
-            title_line = line[1:].rstrip()
-            seq_string = ""
-            # There will now be one or more sequence lines; keep going until we
-            # find the "+" marking the quality line:
-            for line in handle:
-                if line[0] == "+":
-                    break
-                seq_string += line.rstrip()
+
+def _fastq_records(lines):
+    """Iterate over FASTQ records as string tuples from an iterator of lines (PRIVATE).
+
+    This does the work of the FastqGeneralIterator function.
+    """
+    try:
+        line = next(lines)
+    except StopIteration:
+        return  # Premature end of file, or just empty?
+
+    while True:
+        if line[0] != "@":
+            raise ValueError("Records in Fastq files should start with '@' character")
+        title_line = line[1:].rstrip()
+        seq_string = ""
+        # There will now be one or more sequence lines; keep going until we
+        # find the "+" marking the quality line:
+        for line in lines:
+            if line[0] == "+":
+                break
+            seq_string += line.rstrip()
+        else:
+            if seq_string:
+                raise ValueError("End of file without quality information.")
             else:
-                if seq_string:
-                    raise ValueError("End of file without quality information.")
-                else:
-                    raise ValueError("Unexpected end of file")
-            # The title here is optional, but if present must match!
-            second_title = line[1:].rstrip()
-            if second_title and second_title != title_line:
-                raise ValueError("Sequence and quality captions differ.")
-            # This is going to slow things down a little, but assuming
-            # this isn't allowed we should try and catch it here:
-            if " " in seq_string or "\t" in seq_string:
-                raise ValueError("Whitespace is not allowed in the sequence.")
-            seq_len = len(seq_string)
-
-            # There will now be at least one line of quality data, followed by
-            # another sequence, or EOF
+                raise ValueError("Unexpected end of file")
+        # The title here is optional, but if present must match!
+        second_title = line[1:].rstrip()
+        if second_title and second_title != title_line:
+            raise ValueError("Sequence and quality captions differ.")
+        # This is going to slow things down a little, but assuming
+        # this isn't allowed we should try and catch it here:
+        if " " in seq_string or "\t" in seq_string:
+            raise ValueError("Whitespace is not allowed in the sequence.")
+        seq_len = len(seq_string)
+
+        # There will now be at least one line of quality data, followed by
+        # another sequence, or EOF
+        line = None
+        quality_string = ""
+        for line in lines:
+            if line[0] == "@":
+                # This COULD be the start of a new sequence. However, it MAY just
+                # be a line of quality data which starts with a "@" character.  We
+                # should be able to check this by looking at the sequence length
+                # and the amount of quality data found so far.
+                if len(quality_string) >= seq_len:
+                    # We expect it to be equal if this is the start of a new record.
+                    # If the quality data is longer, we'll raise an error below.
+                    break
+                # Continue - its just some (more) quality data.
+            quality_string += line.rstrip()
+        else:
+            if line is None:
+                raise ValueError("Unexpected end of file")
             line = None
-            quality_string = ""
-            for line in handle:
-                if line[0] == "@":
-                    # This COULD be the start of a new sequence. However, it MAY just
-                    # be a line of quality data which starts with a "@" character.  We
-                    # should be able to check this by looking at the sequence length
-                    # and the amount of quality data found so far.
-                    if len(quality_string) >= seq_len:
-                        # We expect it to be equal if this is the start of a new record.
-                        # If the quality data is longer, we'll raise an error below.
-                        break
-                    # Continue - its just some (more) quality data.
-                quality_string += line.rstrip()
-            else:
-                if line is None:
-                    raise ValueError("Unexpected end of file")
-                line = None
 
-            if seq_len != len(quality_string):
-                raise ValueError(
-                    "Lengths of sequence and quality values differs for %s (%i and %i)."
-                    % (title_line, seq_len, len(quality_string))
-                )
+        if seq_len != len(quality_string):
+            raise ValueError(
+                "Lengths of sequence and quality values differs for %s (%i and %i)."
+                % (title_line, seq_len, len(quality_string))
+            )
 
-            # Return the record and then continue...
-            yield (title_line, seq_string, quality_string)
+        # Return the record and then continue...
+        yield (title_line, seq_string, quality_string)
 
-            if line is None:
-                break
+        if line is None:
+            break
+
+
+def _fastq_quality_array(qualities, offset):
+    """Convert a list of quality strings into a 2D array of scores (PRIVATE)."""
+    lengths = numpy.fromiter(map(len, qualities), numpy.intp, len(qualities))
+    try:
+        scores = numpy.frombuffer("".join(qualities).encode("ascii"), numpy.uint8)
+    except UnicodeEncodeError:
+        raise ValueError("Invalid character in quality string") from None
+    if len(scores) and scores.min() < offset:
+        raise ValueError("Invalid character in quality string")
+    width = lengths.max() if len(lengths) else 0
+    array = numpy.zeros((len(lengths), width), numpy.uint8)
+    array[numpy.arange(width) < lengths[:, None]] = scores - offset
+    return array
+
+
+def FastqBatchIterator(source, batch_size=10000, offset=SANGER_SCORE_OFFSET):
+    """Iterate over FASTQ records in batches, with the qualities as an array.
+
+    Arguments:
+     - source - input stream opened in text mode, or a path to a file
+     - batch_size - maximum number of records in each batch (default 10000)
+     - offset - ASCII offset of the quality scores, 33 for Sanger style FASTQ
+       (default) or 64 for Illumina 1.3 to 1.7 style FASTQ.
+
+    Each batch is a tuple of a list of the title strings, a list of the
+    sequence strings, and a 2D NumPy array of unsigned 8 bit integers holding
+    the quality scores, with one row per record. Where the records have
+    different lengths, the rows are padded with zeros after the end of each
+    read. No SeqRecord objects or per-read lists of scores are created, which
+    makes this much faster than Bio.SeqIO.parse when processing large numbers
+    of reads, and allows filtering or trimming of a whole batch at once using
+    NumPy.
+
+    >>> for titles, sequences, qualities in FastqBatchIterator("Quality/example.fastq"):
+    ...     print(titles)
+    ...     print(qualities.shape)
+    ...     print(qualities.mean(axis=1).round(1))
+    ['EAS54_6_R1_2_1_413_324', 'EAS54_6_R1_2_1_540_792', 'EAS54_6_R1_2_1_443_348']
+    (3, 25)
+    [ 25.3  24.5  23.4]
+
+    Records with the typical layout of four lines (title, sequence, plus line
+    and quality) are handled in bulk. Otherwise, such as if the sequence or
+    quality is split over several lines, this falls back on parsing the rest
+    of the file with the FastqGeneralIterator function.
+
+    The quality characters are not checked beyond being at least the offset.
+    Note that old Solexa style FASTQ files can have negative scores, which
+    this function does not support.
+    """
+    if batch_size < 1:
+        raise ValueError(f"Batch size should be at least one, not {batch_size}")
+    try:
+        handle = open(source)
+    except TypeError:
+        handle = source
+        if handle.read(0) != "":
+            raise StreamModeError("Fastq files must be opened in text mode") from None
+    try:
+        while True:
+            lines = list(itertools.islice(handle, 4 * batch_size))
+            if not lines:
+                return
+            if len(lines) % 4 == 0:
+                titles = [line[1:].rstrip() for line in lines[::4]]
+                sequences = [line.rstrip() for line in lines[1::4]]
+                second_titles = [line[1:].rstrip() for line in lines[2::4]]
+                qualities = [line.rstrip() for line in lines[3::4]]
+                sequence_string = "".join(sequences)
+                if (
+                    all(line[0] == "@" for line in lines[::4])
+                    and all(line[0] == "+" for line in lines[2::4])
+                    and list(map(len, sequences)) == list(map(len, qualities))
+                    and " " not in sequence_string
+                    and "\t" not in sequence_string
+                    and all(
+                        title == second_title or not second_title
+                        for title, second_title in zip(titles, second_titles)
+                    )
+                ):
+                    yield titles, sequences, _fastq_quality_array(qualities, offset)
+                    continue
+            # Not the simple four line layout (or an invalid file), so use the
+            # general parser for the rest of the file:
+            records = _fastq_records(itertools.chain(lines, handle))
+            while True:
+                batch = list(itertools.islice(records, batch_size))
+                if not batch:
+                    return
+                titles, sequences, qualities = (list(values) for values in zip(*batch))
+                yield titles, sequences, _fastq_quality_array(qualities, offset)
     finally:
         if handle is not source:
             handle.close()
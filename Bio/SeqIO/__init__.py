@@ -736,7 +736,16 @@ def to_dict(sequences, key_function=None):
     return d
 
 
-def index(filename, format, alphabet=None, key_function=None):
+def index(
+    filename,
+    format,
+    alphabet=None,
+    key_function=None,
+    index_filename=None,
+    compact=False,
+    cache_size=1,
+    lazy=False,
+):
     """Indexes a sequence file and returns a dictionary like object.
 
     Arguments:
@@ -746,6 +755,15 @@ def index(filename, format, alphabet=None, key_function=None):
      - key_function - Optional callback function which when given a
        SeqRecord identifier string should return a unique key for the
        dictionary.
+     - index_filename - Optional filename where the keys and offsets are
+       saved, and reused next time if still up to date.
+     - compact - Optional boolean, hold the keys and offsets in compact
+       arrays rather than a Python dictionary (default False).
+     - cache_size - Optional number of most recently used records to keep
+       in memory (default 1, just the previous record).
+     - lazy - Optional boolean, for GenBank, EMBL and IMGT files only parse
+       the header of each record when it is loaded, leaving the features,
+       annotations and sequence to be parsed when first used (default False).
 
     This indexing function will return a dictionary like object, giving the
     SeqRecord objects as values.
@@ -840,6 +858,88 @@ def index(filename, format, alphabet=None, key_function=None):
     to be completely parsed while building the index. Right now this is
     usually avoided.
 
+    Scanning a very large file can take a while, so you can ask for the keys
+    and offsets to be saved to an index file. The next time you index the same
+    file (e.g. in another process), the saved index is memory mapped rather
+    than scanning the file again. The index records the size and modification
+    time of the indexed file, and is rebuilt automatically if these change:
+
+    >>> import os
+    >>> from Bio import SeqIO
+    >>> records = SeqIO.index("Quality/example.fastq", "fastq",
+    ...                       index_filename="example.fastq.idx")
+    >>> records.close()
+    >>> records = SeqIO.index("Quality/example.fastq", "fastq",
+    ...                       index_filename="example.fastq.idx")
+    >>> len(records)
+    3
+    >>> print(records["EAS54_6_R1_2_1_540_792"].seq)
+    TTGGCAGGCCAAGGCCGATGGATCA
+    >>> records.close()
+    >>> os.remove("example.fastq.idx")  # tidy up
+
+    This requires the keys to be strings. As the key_function itself cannot
+    be saved, you must use the same key_function each time.
+
+    The keys and offsets are normally held in memory in a Python dictionary,
+    which for hundreds of millions of records (e.g. a large FASTQ file) can
+    need tens of gigabytes of RAM. Using compact=True stores them in flat
+    arrays instead (one buffer of all the keys, plus arrays of the offsets
+    and a hash table), which takes several times less memory at the cost of
+    slightly slower lookups. Again, this requires the keys to be strings:
+
+    >>> from Bio import SeqIO
+    >>> records = SeqIO.index("Quality/example.fastq", "fastq", compact=True)
+    >>> len(records)
+    3
+    >>> print(records["EAS54_6_R1_2_1_540_792"].seq)
+    TTGGCAGGCCAAGGCCGATGGATCA
+    >>> records.close()
+
+    Each time you access a record, it is parsed from the file. To avoid doing
+    this again when revisiting the same records (e.g. mate pairs or the same
+    contigs), the most recently used records are kept in a cache. By default
+    this holds just the previous record, but you can make it larger. Note the
+    cached records are returned as the same objects, so any changes you make
+    to them will be seen next time:
+
+    >>> from Bio import SeqIO
+    >>> records = SeqIO.index("Quality/example.fastq", "fastq", cache_size=2)
+    >>> for key in ["EAS54_6_R1_2_1_413_324", "EAS54_6_R1_2_1_540_792",
+    ...             "EAS54_6_R1_2_1_413_324", "EAS54_6_R1_2_1_443_348"]:
+    ...     record = records[key]
+    >>> records.cache_info()
+    CacheInfo(hits=1, misses=3, maxsize=2, currsize=2)
+    >>> records.close()
+
+    If you want many records (e.g. to extract a subset of reads from a large
+    FASTQ file), use the get_many method rather than looking them up one by
+    one. This reads the records in the order they are in the file, so that
+    nearby records are read together rather than each needing a seek. It
+    gives (key, record) tuples, by default in the order of the keys given:
+
+    >>> from Bio import SeqIO
+    >>> records = SeqIO.index("Quality/example.fastq", "fastq")
+    >>> for key, record in records.get_many(["EAS54_6_R1_2_1_443_348",
+    ...                                      "EAS54_6_R1_2_1_413_324"]):
+    ...     print(f"{key} {record.seq}")
+    EAS54_6_R1_2_1_443_348 GTTGCTTCTGGCGTGGGTGGGGGGG
+    EAS54_6_R1_2_1_413_324 CCCTTCTTGTCTTCAGCGTTTCTCC
+    >>> records.close()
+
+    There is also a get_raw_many method which gives the raw records as bytes.
+
+    For large annotated GenBank or EMBL records, use lazy=True if you only
+    need some of the information in each record. For example, this parses
+    just the header to get the description, but not the features or the
+    sequence:
+
+    >>> from Bio import SeqIO
+    >>> records = SeqIO.index("GenBank/cor6_6.gb", "genbank", lazy=True)
+    >>> print(records["AJ237582.1"].description)
+    Armoracia rusticana csp14 gene (partial), exons 2-3
+    >>> records.close()
+
     See Also: Bio.SeqIO.index_db() and Bio.SeqIO.to_dict()
 
     """
@@ -858,11 +958,19 @@ def index(filename, format, alphabet=None, key_function=None):
     # Map the file format to a sequence iterator:
     from ._index import _FormatToRandomAccess  # Lazy import
     from Bio.File import _IndexedSeqFileDict
+    from Bio.File import _check_cache_size
 
     try:
         proxy_class = _FormatToRandomAccess[format]
     except KeyError:
         raise ValueError(f"Unsupported format {format!r}") from None
+    _check_cache_size(cache_size)
+    if lazy:
+        if format not in ("genbank", "gb", "embl", "imgt"):
+            raise ValueError(f"Lazy parsing is not supported for format {format!r}")
+        proxy = proxy_class(filename, format, lazy=True)
+    else:
+        proxy = proxy_class(filename, format)
     repr = "SeqIO.index(%r, %r, alphabet=%r, key_function=%r)" % (
         filename,
         format,
@@ -870,12 +978,24 @@ def index(filename, format, alphabet=None, key_function=None):
         key_function,
     )
     return _IndexedSeqFileDict(
-        proxy_class(filename, format), key_function, repr, "SeqRecord"
+        proxy,
+        key_function,
+        repr,
+        "SeqRecord",
+        index_filename=index_filename,
+        compact=compact,
+        cache_size=cache_size,
     )
 
 
 def index_db(
-    index_filename, filenames=None, format=None, alphabet=None, key_function=None
+    index_filename,
+    filenames=None,
+    format=None,
+    alphabet=None,
+    key_function=None,
+    workers=None,
+    cache_size=0,
 ):
     """Index several sequence files and return a dictionary like object.
 
@@ -893,6 +1013,11 @@ def index_db(
      - key_function - Optional callback function which when given a
        SeqRecord identifier string should return a unique
        key for the dictionary.
+     - workers - Optional number of processes used to scan the files
+       in parallel when building a new index (default None, meaning
+       the files are scanned one after another).
+     - cache_size - Optional number of most recently used records to keep
+       in memory (default 0, no caching).
 
     This indexing function will return a dictionary like object, giving the
     SeqRecord objects as values:
@@ -919,6 +1044,11 @@ def index_db(
     BGZF compressed files are supported, and detected automatically. Ordinary
     GZIP compressed files are not supported.
 
+    When building an index over many files, you can scan them in parallel
+    using several processes with the workers argument, e.g. ``workers=4``.
+    Each file is scanned by a single process, so this helps with many files
+    (such as hundreds of FASTQ shards) rather than with one large file.
+
     See Also: Bio.SeqIO.index() and Bio.SeqIO.to_dict(), and the Python module
     glob which is useful for building lists of files.
 
@@ -939,8 +1069,6 @@ def index_db(
     if alphabet is not None:
         raise ValueError("The alphabet argument is no longer supported")
 
-    # Map the file format to a sequence iterator:
-    from ._index import _FormatToRandomAccess  # Lazy import
     from Bio.File import _SQLiteManySeqFilesDict
 
     repr = "SeqIO.index_db(%r, filenames=%r, format=%r, key_function=%r)" % (
@@ -950,18 +1078,33 @@ def index_db(
         key_function,
     )
 
-    def proxy_factory(format, filename=None):
-        """Given a filename returns proxy object, else boolean if format OK."""
-        if filename:
-            return _FormatToRandomAccess[format](filename, format)
-        else:
-            return format in _FormatToRandomAccess
-
     return _SQLiteManySeqFilesDict(
-        index_filename, filenames, proxy_factory, format, key_function, repr
+        index_filename,
+        filenames,
+        _index_db_proxy_factory,
+        format,
+        key_function,
+        repr,
+        workers=workers,
+        cache_size=cache_size,
     )
 
 
+def _index_db_proxy_factory(format, filename=None):
+    """Given a filename returns proxy object, else boolean if format OK (PRIVATE).
+
+    This is a module level function so that it can be pickled, allowing
+    Bio.SeqIO.index_db to scan files in worker processes.
+    """
+    # Map the file format to a sequence iterator:
+    from ._index import _FormatToRandomAccess  # Lazy import
+
+    if filename:
+        return _FormatToRandomAccess[format](filename, format)
+    else:
+        return format in _FormatToRandomAccess
+
+
 # TODO? - Handling aliases explicitly would let us shorten this list:
 _converter = {
     ("genbank", "fasta"): InsdcIO._genbank_convert_fasta,
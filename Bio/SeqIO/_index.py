@@ -25,6 +25,7 @@ sequencing. If memory is an issue, the index_db(...) interface stores the
 keys and offsets in an SQLite database - which can be re-used to avoid
 re-indexing the file for use another time.
 """
+import functools
 import re
 
 from io import BytesIO
@@ -248,6 +249,12 @@ class SequentialSeqFileRandomAccess(SeqFileRandomAccess):
 class GenBankRandomAccess(SequentialSeqFileRandomAccess):
     """Indexed dictionary like access to a GenBank file."""
 
+    def __init__(self, filename, format, lazy=False):
+        """Initialize the class, optionally with lazy record parsing."""
+        SequentialSeqFileRandomAccess.__init__(self, filename, format)
+        if lazy:
+            self._iterator = functools.partial(self._iterator, lazy=True)
+
     def __iter__(self):
         """Iterate over the sequence records in the file."""
         handle = self._handle
@@ -310,6 +317,12 @@ class GenBankRandomAccess(SequentialSeqFileRandomAccess):
 class EmblRandomAccess(SequentialSeqFileRandomAccess):
     """Indexed dictionary like access to an EMBL file."""
 
+    def __init__(self, filename, format, lazy=False):
+        """Initialize the class, optionally with lazy record parsing."""
+        SequentialSeqFileRandomAccess.__init__(self, filename, format)
+        if lazy:
+            self._iterator = functools.partial(self._iterator, lazy=True)
+
     def __iter__(self):
         """Iterate over the sequence records in the file."""
         handle = self._handle
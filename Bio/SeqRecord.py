@@ -603,6 +603,73 @@ class SeqRecord:
         """
         return char in self.seq
 
+    def _get_feature_index(self):
+        """Return a FeatureIndex of the features, reusing it if possible (PRIVATE).
+
+        The index is rebuilt if the features list has been replaced, or
+        if features have been added or removed.
+        """
+        from Bio.SeqFeature import FeatureIndex
+
+        features = self.features
+        try:
+            cached, length, index = self._feature_index
+        except AttributeError:
+            pass
+        else:
+            if cached is features and length == len(features):
+                return index
+        index = FeatureIndex(features)
+        self._feature_index = (features, len(features), index)
+        return index
+
+    def features_overlapping(self, start, end, strand=None):
+        """Return a list of the features overlapping the region start:end.
+
+        The region uses Python counting, like a slice. For a feature defined
+        as a join of several parts (e.g. exons), the gaps between the parts
+        (e.g. introns) are not included:
+
+        >>> from Bio import SeqIO
+        >>> record = SeqIO.read("GenBank/NC_000932.gb", "gb")
+        >>> for feature in record.features_overlapping(1751, 4310):
+        ...     print(feature.type, feature.location)
+        ...
+        source [0:154478](+)
+        gene [1716:4347](-)
+        gene [2055:3570](-)
+        CDS [2055:3570](-)
+
+        Give the optional strand argument (1, -1 or 0) to find only the
+        features with a part on that strand in the region:
+
+        >>> len(record.features_overlapping(1751, 4310, strand=+1))
+        1
+
+        The first call builds an index of the features (see the FeatureIndex
+        class in Bio.SeqFeature), which is reused by later calls as long as
+        no features are added or removed. If you change the locations of the
+        existing features, assign a new list to record.features (e.g. with
+        ``record.features = record.features[:]``) to update the index.
+        """
+        return self._get_feature_index().overlapping(start, end, strand)
+
+    def features_at(self, position, strand=None):
+        """Return a list of the features including the given position.
+
+        >>> from Bio import SeqIO
+        >>> record = SeqIO.read("GenBank/NC_000932.gb", "gb")
+        >>> for feature in record.features_at(1750):
+        ...     print(feature.type, feature.location)
+        ...
+        source [0:154478](+)
+        gene [1716:4347](-)
+        tRNA join{[4310:4347](-), [1716:1751](-)}
+
+        See the features_overlapping method for details.
+        """
+        return self._get_feature_index().at(position, strand)
+
     def __str__(self):
         """Return a human readable summary of the record and its annotation (string).
 
@@ -50,6 +50,10 @@ Other public methods of this module:
    formaldehyde. The method returns a corrected Tm. Chemical
    correction is not an integral part of the Tm methods and must
    be called additionally.
+ - Tm_Wallace_many, Tm_GC_many, Tm_NN_many and salt_correction_many: To
+   calculate the Tm (or salt correction) of many sequences at once, returning
+   NumPy arrays. These give the same results as calling the respective method
+   for each sequence, but are much faster for long lists of primers or probes.
 
 For example:
 
@@ -165,6 +169,8 @@ by '1':
 import math
 import warnings
 
+import numpy
+
 from Bio import SeqUtils, Seq
 from Bio import BiopythonWarning
 
@@ -536,8 +542,21 @@ def salt_correction(Na=0, K=0, Tris=0, Mg=0, dNTPs=0, method=1, seq=None):
         raise ValueError(
             "sequence is missing (is needed to calculate GC content or sequence length)."
         )
+    length = percent_gc = None
     if seq:
         seq = str(seq)
+        length = len(seq)
+        if method in (6, 7):
+            percent_gc = SeqUtils.GC(seq)
+    return _salt_correction(Na, K, Tris, Mg, dNTPs, method, length, percent_gc)
+
+
+def _salt_correction(Na, K, Tris, Mg, dNTPs, method, length, percent_gc):
+    """Calculate the salt correction for a sequence length and GC content (PRIVATE).
+
+    The length and percent_gc arguments (only used by methods 5 to 7) may be
+    NumPy arrays, giving an array of corrections.
+    """
     corr = 0
     if not method:
         return corr
@@ -563,10 +582,10 @@ def salt_correction(Na=0, K=0, Tris=0, Mg=0, dNTPs=0, method=1, seq=None):
     if method == 4:
         corr = 11.7 * math.log10(mon)
     if method == 5:
-        corr = 0.368 * (len(seq) - 1) * math.log(mon)
+        corr = 0.368 * (length - 1) * math.log(mon)
     if method == 6:
         corr = (
-            (4.29 * SeqUtils.GC(seq) / 100 - 3.95) * 1e-5 * math.log(mon)
+            (4.29 * percent_gc / 100 - 3.95) * 1e-5 * math.log(mon)
         ) + 9.40e-6 * math.log(mon) ** 2
     # Turn black code style off
     # fmt: off
@@ -583,7 +602,7 @@ def salt_correction(Na=0, K=0, Tris=0, Mg=0, dNTPs=0, method=1, seq=None):
         if Mon > 0:
             R = math.sqrt(mg) / mon
             if R < 0.22:
-                corr = (4.29 * SeqUtils.GC(seq) / 100 - 3.95) * \
+                corr = (4.29 * percent_gc / 100 - 3.95) * \
                     1e-5 * math.log(mon) + 9.40e-6 * math.log(mon) ** 2
                 return corr
             elif R < 6.0:
@@ -592,8 +611,8 @@ def salt_correction(Na=0, K=0, Tris=0, Mg=0, dNTPs=0, method=1, seq=None):
                             - 8.03e-3 * math.log(mon) ** 2)
                 g = 8.31 * (0.486 - 0.258 * math.log(mon)
                             + 5.25e-3 * math.log(mon) ** 3)
-        corr = (a + b * math.log(mg) + (SeqUtils.GC(seq) / 100)
-                * (c + d * math.log(mg)) + (1 / (2.0 * (len(seq) - 1)))
+        corr = (a + b * math.log(mg) + (percent_gc / 100)
+                * (c + d * math.log(mg)) + (1 / (2.0 * (length - 1)))
                 * (e + f * math.log(mg) + g * math.log(mg) ** 2)) * 1e-5
     # Turn black code style on
     # fmt: on
@@ -627,6 +646,9 @@ def chem_correction(
        while in fmdmethod=2 it is given in molar.
      - GC: GC content in percent.
 
+    The melting temperatures (and GC contents) can also be given as NumPy
+    arrays, for example from Tm_NN_many, to correct them all at once.
+
     Examples:
         >>> from Bio.SeqUtils import MeltingTemp as mt
         >>> mt.chem_correction(70)
@@ -640,19 +662,20 @@ def chem_correction(
         66.68
 
     """
+    # Not using augmented assignment, which would modify an array in place
     if DMSO:
-        melting_temp -= DMSOfactor * DMSO
+        melting_temp = melting_temp - DMSOfactor * DMSO
     if fmd:
         # McConaughy et al. (1969), Biochemistry 8: 3289-3295
         if fmdmethod == 1:
             # Note: Here fmd is given in percent
-            melting_temp -= fmdfactor * fmd
+            melting_temp = melting_temp - fmdfactor * fmd
         # Blake & Delcourt (1996), Nucl Acids Res 11: 2095-2103
         if fmdmethod == 2:
-            if GC is None or GC < 0:
+            if GC is None or numpy.any(numpy.less(GC, 0)):
                 raise ValueError("'GC' is missing or negative")
             # Note: Here fmd is given in molar
-            melting_temp += (0.453 * (GC / 100.0) - 2.88) * fmd
+            melting_temp = melting_temp + (0.453 * (GC / 100.0) - 2.88) * fmd
         if fmdmethod not in (1, 2):
             raise ValueError("'fmdmethod' must be 1 or 2")
     return melting_temp
@@ -1083,6 +1106,412 @@ def Tm_NN(
     return melting_temp
 
 
+def _encode_many(seqs, method, check):
+    """Encode many sequences for the vectorized Tm calculations (PRIVATE).
+
+    The sequences are checked as by _check (if check is True), and the letters
+    are replaced by their index in the alphabet of the letters found. Returns
+    the sequences as strings, the alphabet, an array with the code of each
+    letter (of all sequences, one after the other), an array with the length
+    of each sequence, and a list of the indices of sequences which are not
+    ASCII (these should be done one at a time by the scalar function).
+    """
+    seqs = [str(seq) for seq in seqs]
+    data = []
+    fallback = []
+    for index, seq in enumerate(seqs):
+        try:
+            data.append(seq.encode("ASCII"))
+        except UnicodeEncodeError:
+            data.append(b"")
+            fallback.append(index)
+    lengths = numpy.array([len(item) for item in data], numpy.int64)
+    letters = numpy.frombuffer(b"".join(data), numpy.uint8)
+    if check:
+        # As in _check, use upper case, back transcribe, and remove other letters
+        table = numpy.frombuffer(bytes(range(256)).upper(), numpy.uint8).copy()
+        table[ord("U")] = table[ord("u")] = ord("T")
+        letters = table[letters]
+        if method != "Tm_Wallace":
+            if method == "Tm_GC":
+                baseset = b"ABCDGHIKMNRSTVWXY"
+            else:
+                baseset = b"ACGTI"
+            keep = numpy.isin(letters, numpy.frombuffer(baseset, numpy.uint8))
+            rows = numpy.repeat(numpy.arange(len(seqs)), lengths)
+            letters = letters[keep]
+            lengths = numpy.bincount(rows[keep], minlength=len(seqs))
+    alphabet, codes = numpy.unique(letters, return_inverse=True)
+    return seqs, alphabet.tobytes().decode(), codes, lengths, fallback
+
+
+def _count_many(alphabet, codes, lengths):
+    """Count each letter of the alphabet in each sequence (PRIVATE).
+
+    Returns a function taking a string of letters, and returning an array
+    with the total count of those letters in each sequence.
+    """
+    rows = numpy.repeat(numpy.arange(len(lengths)), lengths)
+    size = len(alphabet)
+    counts = numpy.bincount(rows * size + codes, minlength=len(lengths) * size)
+    counts = counts.reshape(len(lengths), size)
+
+    def count(letters):
+        columns = [alphabet.index(letter) for letter in letters if letter in alphabet]
+        return counts[:, columns].sum(axis=1)
+
+    return count
+
+
+def Tm_Wallace_many(seqs, check=True, strict=True):
+    """Calculate the Tm of many sequences using the 'Wallace rule'.
+
+    This gives the same results as calling Tm_Wallace for each sequence (with
+    the same arguments), returned as a NumPy array:
+
+    >>> from Bio.SeqUtils import MeltingTemp as mt
+    >>> mt.Tm_Wallace_many(['ACGTTGCAATGCCGTA', 'ACGT TGCA', 'GGCCS'])
+    array([ 48.,  24.,  20.])
+
+    If strict is True (the default), ValueError is raised if any of the
+    sequences includes ambiguous bases.
+    """
+    seqs, alphabet, codes, lengths, fallback = _encode_many(seqs, "Tm_Wallace", check)
+    count = _count_many(alphabet, codes, lengths)
+    melting_temp = 2 * count("ATW") + 4 * count("CGS")
+    tmp = 3 * count("KMNRY") + 10 / 3.0 * count("BV") + 8 / 3.0 * count("DH")
+    if strict and tmp.any():
+        raise ValueError(
+            "ambiguous bases B, D, H, K, M, N, R, V, Y not allowed when strict=True"
+        )
+    melting_temp = melting_temp + tmp
+    for index in fallback:
+        melting_temp[index] = Tm_Wallace(seqs[index], check, strict)
+    return melting_temp
+
+
+def Tm_GC_many(
+    seqs,
+    check=True,
+    strict=True,
+    valueset=7,
+    userset=None,
+    Na=50,
+    K=0,
+    Tris=0,
+    Mg=0,
+    dNTPs=0,
+    saltcorr=0,
+    mismatch=True,
+):
+    """Calculate the Tm of many sequences using empirical formulas based on GC content.
+
+    This takes the same arguments as Tm_GC, and gives the same results as
+    calling Tm_GC for each sequence, returned as a NumPy array:
+
+    >>> from Bio.SeqUtils import MeltingTemp as mt
+    >>> tms = mt.Tm_GC_many(['CTGCTGATXGCACGAGGTTATGG', 'CGTTCCAAAGATGTGGGCATGAGCTTAC'])
+    >>> print(", ".join("%0.2f" % tm for tm in tms))
+    50.86, 58.97
+
+    If strict is True (the default), ValueError is raised if any of the
+    sequences includes ambiguous bases.
+    """
+    if saltcorr == 5:
+        raise ValueError("salt-correction method 5 not applicable to Tm_GC")
+    seqs, alphabet, codes, lengths, fallback = _encode_many(seqs, "Tm_GC", check)
+    # Empty sequences raise ZeroDivisionError in Tm_GC
+    fallback.extend(numpy.flatnonzero(lengths == 0).tolist())
+    length = numpy.where(lengths == 0, 1, lengths)
+    count = _count_many(alphabet, codes, lengths)
+    gc_content = count("GCgcSs") * 100.0 / length
+    tmp = (
+        count("KMNRY") * 50.0 / length
+        + count("BV") * 66.67 / length
+        + count("DH") * 33.33 / length
+    )
+    tmp[fallback] = 0
+    if strict and tmp.any():
+        raise ValueError(
+            "ambiguous bases B, D, H, K, M, N, R, V, Y not allowed when 'strict=True'"
+        )
+    percent_gc = gc_content + tmp
+    # Same parameters as in Tm_GC
+    saltcorr_used = saltcorr
+    if userset:
+        A, B, C, D = userset
+    else:
+        A, B, C, D, saltcorr_used = {
+            1: (69.3, 0.41, 650, 1, 0),
+            2: (81.5, 0.41, 675, 1, 0),
+            3: (81.5, 0.41, 675, 1, 1),
+            4: (81.5, 0.41, 500, 1, 2),
+            5: (78.0, 0.7, 500, 1, 2),
+            6: (67.0, 0.8, 500, 1, 2),
+            7: (81.5, 0.41, 600, 1, 1),
+            8: (77.1, 0.41, 528, 1, 4),
+        }.get(valueset, (None, None, None, None, saltcorr))
+    if valueset > 8:
+        raise ValueError("allowed values for parameter 'valueset' are 0-8.")
+    melting_temp = A + B * percent_gc - C / (length * 1.0)
+    if saltcorr_used:
+        melting_temp = melting_temp + _salt_correction(
+            Na, K, Tris, Mg, dNTPs, saltcorr_used, length, gc_content
+        )
+    if mismatch:
+        melting_temp = melting_temp - D * (count("X") * 100.0 / length)
+    for index in fallback:
+        melting_temp[index] = Tm_GC(
+            seqs[index],
+            check,
+            strict,
+            valueset,
+            userset,
+            Na,
+            K,
+            Tris,
+            Mg,
+            dNTPs,
+            saltcorr,
+            mismatch,
+        )
+    return melting_temp
+
+
+def Tm_NN_many(
+    seqs,
+    check=True,
+    strict=True,
+    nn_table=None,
+    tmm_table=None,
+    imm_table=None,
+    dnac1=25,
+    dnac2=25,
+    selfcomp=False,
+    Na=50,
+    K=0,
+    Tris=0,
+    Mg=0,
+    dNTPs=0,
+    saltcorr=5,
+):
+    """Calculate the Tm of many sequences using nearest neighbor thermodynamics.
+
+    This takes the same arguments as Tm_NN, except that each sequence is
+    taken to bind its perfect complement (so there are no c_seq, shift and
+    de_table arguments), and gives the same results as calling Tm_NN for
+    each sequence, returned as a NumPy array:
+
+    >>> from Bio.SeqUtils import MeltingTemp as mt
+    >>> tms = mt.Tm_NN_many(['CGTTCCAAAGATGTGGGCATGAGCTTAC', 'ACGTTGCAATGCCGTA'])
+    >>> print(", ".join("%0.2f" % tm for tm in tms))
+    60.32, 48.45
+
+    Rather than adding up the thermodynamic values of the neighbors of each
+    sequence in turn, the values are looked up in arrays (made from the tables)
+    for all the sequences at once, one position at a time. The sequences may
+    have different lengths, but as they are held in a single array (padded to
+    the length of the longest), this is intended for many short sequences,
+    such as candidate primers or probes.
+
+    If strict is True (the default), ValueError is raised if there are no
+    thermodynamic data for the neighbors in any of the sequences.
+    """
+    if not nn_table:
+        nn_table = DNA_NN3
+    if not tmm_table:
+        tmm_table = DNA_TMM1
+    if not imm_table:
+        imm_table = DNA_IMM1
+    seqs, alphabet, codes, lengths, fallback = _encode_many(seqs, "Tm_NN", check)
+    n = len(seqs)
+    for index, seq in enumerate(seqs):
+        if "U" in seq or "u" in seq:
+            # The complement of the sequence would be RNA (or, if there is
+            # also T, fail), which is only the same as the DNA complement once
+            # the sequence is checked.
+            if not check or "T" in seq or "t" in seq:
+                fallback.append(index)
+    # Short sequences are done one at a time, so that terminal mismatches
+    # can always be removed without overlapping
+    fallback.extend(numpy.flatnonzero(lengths < 3).tolist())
+    valid = numpy.ones(n, bool)
+    valid[fallback] = False
+    size = len(alphabet)
+    complement = [
+        str(Seq.Seq(letter).complement()) if letter not in "Uu" else "?"
+        for letter in alphabet
+    ]
+
+    def lookup(key):
+        # Thermodynamic values of a neighbor, in the same order as Tm_NN
+        for table in (imm_table, nn_table):
+            if key in table:
+                return table[key]
+            if key[::-1] in table:
+                return table[key[::-1]]
+        return None
+
+    # Arrays indexed by the codes of two letters, with the extra code size
+    # used for padding
+    neighbor = numpy.zeros((2, size + 1, size + 1))
+    missing = numpy.zeros((size + 1, size + 1), bool)
+    left_tmm = numpy.zeros((2, size + 1, size + 1))
+    left = numpy.zeros((size + 1, size + 1), bool)
+    right_tmm = numpy.zeros((2, size + 1, size + 1))
+    right = numpy.zeros((size + 1, size + 1), bool)
+    for x, a in enumerate(alphabet):
+        for y, b in enumerate(alphabet):
+            values = lookup(a + b + "/" + complement[x] + complement[y])
+            if values is None:
+                missing[x, y] = True
+            else:
+                neighbor[:, x, y] = values
+            key = complement[y] + complement[x] + "/" + b + a
+            if key in tmm_table:
+                left[x, y] = True
+                left_tmm[:, x, y] = tmm_table[key]
+            key = a + b + "/" + complement[x] + complement[y]
+            if key in tmm_table:
+                right[x, y] = True
+                right_tmm[:, x, y] = tmm_table[key]
+
+    width = max(lengths.max(initial=0), 1)
+    matrix = numpy.full((n, width), size, numpy.intp)
+    rows = numpy.repeat(numpy.arange(n), lengths)
+    offsets = numpy.cumsum(lengths) - lengths
+    matrix[rows, numpy.arange(len(codes)) - offsets[rows]] = codes
+    matrix[~valid] = size
+    rows = numpy.arange(n)
+    last = numpy.maximum(lengths - 1, 0)
+    first_letter = matrix[:, 0]
+    last_letter = matrix[rows, last]
+
+    def letters(text):
+        return [alphabet.index(letter) for letter in text if letter in alphabet]
+
+    # Terminal mismatches
+    start = left[first_letter, matrix[:, min(1, width - 1)]]
+    end = right[matrix[rows, numpy.maximum(lengths - 2, 0)], last_letter]
+    delta = [numpy.zeros(n), numpy.zeros(n)]
+    for i in (0, 1):
+        delta[i] = delta[i] + numpy.where(
+            start, left_tmm[i, first_letter, matrix[:, min(1, width - 1)]], 0.0
+        )
+        delta[i] = delta[i] + numpy.where(
+            end,
+            right_tmm[i, matrix[rows, numpy.maximum(lengths - 2, 0)], last_letter],
+            0.0,
+        )
+    # Initiation
+    no_gc = ~numpy.isin(matrix, letters("GCgcSs")).any(axis=1)
+    start_t = numpy.isin(first_letter, letters("T"))
+    end_a = numpy.isin(last_letter, letters("A"))
+    ends_at = numpy.isin(first_letter, letters("AT")).astype(int) + numpy.isin(
+        last_letter, letters("AT")
+    )
+    ends_gc = numpy.isin(first_letter, letters("GC")).astype(int) + numpy.isin(
+        last_letter, letters("GC")
+    )
+    for i in (0, 1):
+        delta[i] = delta[i] + nn_table["init"][i]
+        delta[i] = delta[i] + numpy.where(
+            no_gc, nn_table["init_allA/T"][i], nn_table["init_oneG/C"][i]
+        )
+        delta[i] = delta[i] + numpy.where(start_t, nn_table["init_5T/A"][i], 0.0)
+        delta[i] = delta[i] + numpy.where(end_a, nn_table["init_5T/A"][i], 0.0)
+        delta[i] = delta[i] + nn_table["init_A/T"][i] * ends_at
+        delta[i] = delta[i] + nn_table["init_G/C"][i] * ends_gc
+    # The 'zipping', after removing any terminal mismatches
+    end = lengths - end
+    first_missing = numpy.full(n, -1)
+    for position in range(width - 1):
+        x = matrix[:, position]
+        y = matrix[:, position + 1]
+        include = (position >= start) & (position + 1 < end)
+        for i in (0, 1):
+            delta[i] = delta[i] + numpy.where(include, neighbor[i, x, y], 0.0)
+        unknown = include & missing[x, y] & (first_missing < 0)
+        first_missing[unknown] = position
+    if (first_missing >= 0).any():
+        for index in numpy.flatnonzero(first_missing >= 0):
+            position = first_missing[index]
+            x, y = matrix[index, position : position + 2]
+            _key_error(
+                alphabet[x] + alphabet[y] + "/" + complement[x] + complement[y], strict
+            )
+    delta_h, delta_s = delta
+    k = (dnac1 - (dnac2 / 2.0)) * 1e-9
+    if selfcomp:
+        k = dnac1 * 1e-9
+        delta_h = delta_h + nn_table["sym"][0]
+        delta_s = delta_s + nn_table["sym"][1]
+    R = 1.987  # universal gas constant in Cal/degrees C*Mol
+    # The values for the sequences done one at a time are meaningless, and
+    # may give division by zero
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        if saltcorr:
+            percent_gc = None
+            if saltcorr in (6, 7):
+                count = _count_many(alphabet, codes, lengths)
+                percent_gc = count("GCgcSs") * 100.0 / numpy.maximum(lengths, 1)
+            corr = _salt_correction(
+                Na, K, Tris, Mg, dNTPs, saltcorr, lengths, percent_gc
+            )
+        if saltcorr == 5:
+            delta_s = delta_s + corr
+        melting_temp = (1000 * delta_h) / (delta_s + (R * (math.log(k)))) - 273.15
+        if saltcorr in (1, 2, 3, 4):
+            melting_temp = melting_temp + corr
+        if saltcorr in (6, 7):
+            # Tm = 1/(1/Tm + corr)
+            melting_temp = 1 / (1 / (melting_temp + 273.15) + corr) - 273.15
+    for index in fallback:
+        melting_temp[index] = Tm_NN(
+            seqs[index],
+            check=check,
+            strict=strict,
+            nn_table=nn_table,
+            tmm_table=tmm_table,
+            imm_table=imm_table,
+            dnac1=dnac1,
+            dnac2=dnac2,
+            selfcomp=selfcomp,
+            Na=Na,
+            K=K,
+            Tris=Tris,
+            Mg=Mg,
+            dNTPs=dNTPs,
+            saltcorr=saltcorr,
+        )
+    return melting_temp
+
+
+def salt_correction_many(seqs, Na=0, K=0, Tris=0, Mg=0, dNTPs=0, method=1):
+    """Calculate the salt correction terms for many sequences.
+
+    This takes the same arguments as salt_correction, and gives the same
+    results as calling salt_correction for each sequence, returned as a
+    NumPy array:
+
+    >>> from Bio.SeqUtils import MeltingTemp as mt
+    >>> corr = mt.salt_correction_many(["ACGTTGCAAG", "GGCC"], Na=50, method=5)
+    >>> print(", ".join("%0.2f" % value for value in corr))
+    -9.92, -3.31
+    """
+    seqs = [str(seq) for seq in seqs]
+    if method in (5, 6, 7) and not all(seqs):
+        raise ValueError(
+            "sequence is missing (is needed to calculate GC content or sequence length)."
+        )
+    lengths = numpy.array([len(seq) for seq in seqs], numpy.int64)
+    percent_gc = None
+    if method in (6, 7):
+        percent_gc = numpy.array([SeqUtils.GC(seq) for seq in seqs])
+    corr = _salt_correction(Na, K, Tris, Mg, dNTPs, method, lengths, percent_gc)
+    return corr + numpy.zeros(len(seqs))
+
+
 if __name__ == "__main__":
     from Bio._utils import run_doctest
 
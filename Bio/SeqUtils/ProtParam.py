@@ -43,10 +43,17 @@ Other public methods are:
  - flexibility
  - charge_at_pH
 
+To calculate the standard descriptors of many proteins at once, for example
+all the proteins of a proteome, use the protein_descriptors function instead,
+which returns them as a NumPy array.
+
 """
 
 
 import sys
+
+import numpy
+
 from Bio.SeqUtils import ProtParamData  # Local
 from Bio.SeqUtils import IsoelectricPoint  # Local
 from Bio.Seq import Seq
@@ -348,6 +355,186 @@ class ProteinAnalysis:
         return (mec_reduced, mec_cystines)
 
 
+# Columns of the array returned by protein_descriptors
+descriptor_names = (
+    "molecular_weight",
+    "isoelectric_point",
+    "gravy",
+    "instability_index",
+    "aromaticity",
+    "helix_fraction",
+    "turn_fraction",
+    "sheet_fraction",
+)
+
+# Number of residues processed at a time by protein_descriptors
+_CHUNK = 1 << 22
+
+
+def _isoelectric_points(counts, nterm_codes, cterm_codes):
+    """Calculate the isoelectric points from the amino acid counts (PRIVATE).
+
+    This runs the same bisection as IsoelectricPoint.pi for all the proteins
+    at once; nterm_codes and cterm_codes are the indices of the terminal
+    residues in IUPACData.protein_letters.
+    """
+    letters = IUPACData.protein_letters
+    pK = IsoelectricPoint.positive_pKs["Nterm"]
+    nterm = numpy.array([IsoelectricPoint.pKnterminal.get(aa, pK) for aa in letters])
+    pK = IsoelectricPoint.negative_pKs["Cterm"]
+    cterm = numpy.array([IsoelectricPoint.pKcterminal.get(aa, pK) for aa in letters])
+    pKs = {"Nterm": nterm[nterm_codes], "Cterm": cterm[cterm_codes]}
+    content = {aa: counts[:, letters.index(aa)].astype(float) for aa in "KRHDECY"}
+    content["Nterm"] = content["Cterm"] = 1.0
+
+    def charge_at_pH(pH):
+        positive_charge = 0.0
+        for aa, pK in IsoelectricPoint.positive_pKs.items():
+            pK = pKs.get(aa, pK)
+            partial_charge = 1.0 / (10 ** (pH - pK) + 1.0)
+            positive_charge = positive_charge + content[aa] * partial_charge
+        negative_charge = 0.0
+        for aa, pK in IsoelectricPoint.negative_pKs.items():
+            pK = pKs.get(aa, pK)
+            partial_charge = 1.0 / (10 ** (pK - pH) + 1.0)
+            negative_charge = negative_charge + content[aa] * partial_charge
+        return positive_charge - negative_charge
+
+    n = len(counts)
+    pH = numpy.full(n, 7.775)
+    min_ = numpy.full(n, 4.05)
+    max_ = numpy.full(n, 12.0)
+    active = max_ - min_ > 0.0001
+    while active.any():
+        positive = charge_at_pH(pH) > 0.0
+        min_ = numpy.where(active & positive, pH, min_)
+        max_ = numpy.where(active & ~positive, pH, max_)
+        pH = numpy.where(active, (min_ + max_) / 2, pH)
+        active = max_ - min_ > 0.0001
+    return pH
+
+
+def _descriptors(sequences, weights, water, hydropathy, instability):
+    """Calculate the descriptors of a list of protein sequences (PRIVATE).
+
+    The sequences should not be empty (as checked by protein_descriptors).
+    """
+    letters = IUPACData.protein_letters
+    # As in ProteinAnalysis, only use upper case if the sequence is lower case
+    sequences = [seq.upper() if seq.islower() else seq for seq in sequences]
+    n = len(sequences)
+    lengths = numpy.array([len(seq) for seq in sequences], numpy.int64)
+    data = numpy.frombuffer("".join(sequences).encode("ASCII", "replace"), numpy.uint8)
+    table = numpy.full(256, len(letters), numpy.intp)
+    table[numpy.frombuffer(letters.encode(), numpy.uint8)] = numpy.arange(len(letters))
+    codes = table[data]
+    invalid = numpy.flatnonzero(codes == len(letters))
+    if len(invalid):
+        letter = chr(data[invalid[0]])
+        raise ValueError(f"{letter!r} is not a standard amino acid")
+    rows = numpy.repeat(numpy.arange(n), lengths)
+    counts = numpy.bincount(rows * len(letters) + codes, minlength=n * len(letters))
+    counts = counts.reshape(n, len(letters))
+    percentages = counts / lengths[:, None].astype(float)
+    ends = numpy.cumsum(lengths)
+
+    def fraction(residues):
+        total = 0.0
+        for residue in residues:
+            total = total + percentages[:, letters.index(residue)]
+        return total
+
+    descriptors = numpy.empty((n, len(descriptor_names)))
+    descriptors[:, 0] = numpy.bincount(rows, weights[codes], n) - (lengths - 1) * water
+    descriptors[:, 1] = _isoelectric_points(
+        counts, codes[ends - lengths], codes[ends - 1]
+    )
+    descriptors[:, 2] = numpy.bincount(rows, hydropathy[codes], n) / lengths
+    # Dipeptides within each protein
+    pairs = rows[:-1] == rows[1:]
+    score = numpy.bincount(
+        rows[:-1][pairs], instability[codes[:-1], codes[1:]][pairs], n
+    )
+    descriptors[:, 3] = (10.0 / lengths) * score
+    descriptors[:, 4] = fraction("YWF")
+    descriptors[:, 5] = fraction("VIYFWL")
+    descriptors[:, 6] = fraction("NPGS")
+    descriptors[:, 7] = fraction("EMAL")
+    return descriptors
+
+
+def protein_descriptors(sequences, monoisotopic=False, scale="KyteDoolitle"):
+    """Calculate the standard descriptors of many proteins as a NumPy array.
+
+    Arguments:
+     - sequences - a protein sequence (as a string, Seq or SeqRecord), or an
+       iterable of these, for example from Bio.SeqIO.parse(handle, "fasta").
+     - monoisotopic - use the monoisotopic instead of the average masses of
+       the amino acids (default False).
+     - scale - the hydrophobicity scale for the GRAVY (default KyteDoolitle).
+
+    Returns an array with a row for each protein, and the columns named in
+    descriptor_names; these are the molecular weight, isoelectric point,
+    GRAVY, instability index, aromaticity, and the helix, turn and sheet
+    fractions, with the same values as the ProteinAnalysis methods:
+
+    >>> from Bio.SeqUtils.ProtParam import protein_descriptors, descriptor_names
+    >>> descriptors = protein_descriptors(["MAEGEITTFTALTEKFNLPPGNYKKPKLLY",
+    ...                                    "PETER", "INGAR"])
+    >>> descriptors.shape
+    (3, 8)
+    >>> for name, value in zip(descriptor_names, descriptors[1]):
+    ...     print("%s: %0.2f" % (name, value))
+    molecular_weight: 630.65
+    isoelectric_point: 4.53
+    gravy: -2.76
+    instability_index: 81.28
+    aromaticity: 0.00
+    helix_fraction: 0.00
+    turn_fraction: 0.20
+    sheet_fraction: 0.40
+
+    Rather than analysing each protein in turn, the amino acids of many
+    proteins are counted at once, and the isoelectric points are found
+    by bisection of all the proteins together, which is much faster for a
+    large number of proteins. The sequences may only contain the twenty
+    standard amino acids; ValueError is raised for any other letters.
+    """
+    from Bio.SeqRecord import SeqRecord
+
+    if isinstance(sequences, (str, Seq, SeqRecord)):
+        sequences = [sequences]
+    if scale not in ProtParamData.gravy_scales:
+        raise ValueError(f"scale: {scale} not known")
+    letters = IUPACData.protein_letters
+    if monoisotopic:
+        weights = IUPACData.monoisotopic_protein_weights
+        water = 18.010565
+    else:
+        weights = IUPACData.protein_weights
+        water = 18.0153
+    weights = numpy.array([weights[letter] for letter in letters])
+    hydropathy = ProtParamData.gravy_scales[scale]
+    hydropathy = numpy.array([hydropathy[letter] for letter in letters])
+    instability = numpy.array(
+        [[ProtParamData.DIWV[a][b] for b in letters] for a in letters]
+    )
+    blocks = []
+    batch = []
+    size = 0
+    for index, sequence in enumerate(sequences):
+        batch.append(str(getattr(sequence, "seq", sequence)))
+        if not batch[-1]:
+            raise ValueError("protein sequence %i is empty" % index)
+        size += len(batch[-1])
+        if size >= _CHUNK:
+            blocks.append(_descriptors(batch, weights, water, hydropathy, instability))
+            batch = []
+            size = 0
+    blocks.append(_descriptors(batch, weights, water, hydropathy, instability))
+    return numpy.concatenate(blocks)
+
+
 if __name__ == "__main__":
     from Bio._utils import run_doctest
 
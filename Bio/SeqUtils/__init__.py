@@ -94,19 +94,17 @@ def GC_skew(seq, window=100):
     Returns 0 for windows without any G/C by handling zero division errors.
 
     Does NOT look at any ambiguous nucleotides.
+
+    See also Bio.SeqUtils.windows.GC_skew, which returns a NumPy array and
+    allows overlapping windows, but only includes complete windows.
     """
-    # 8/19/03: Iddo: added lowercase
-    values = []
-    for i in range(0, len(seq), window):
-        s = seq[i : i + window]
-        g = s.count("G") + s.count("g")
-        c = s.count("C") + s.count("c")
-        try:
-            skew = (g - c) / float(g + c)
-        except ZeroDivisionError:
-            skew = 0.0
-        values.append(skew)
-    return values
+    import numpy
+
+    from Bio.SeqUtils import windows
+
+    starts = numpy.arange(0, len(seq), window)
+    ends = numpy.minimum(starts + window, len(seq))
+    return windows._skew(seq, starts, ends, ["G", "C"]).tolist()
 
 
 def xGC_skew(seq, window=1000, zoom=100, r=300, px=100, py=100):
@@ -419,7 +417,8 @@ def six_frame_translations(seq, genetic_code=1):
     <BLANKLINE>
 
     """  # noqa for pep8 W291 trailing whitespace
-    from Bio.Seq import reverse_complement, reverse_complement_rna, translate
+    from Bio.Seq import reverse_complement, reverse_complement_rna
+    from Bio.Seq import translate_six_frames
 
     if "u" in seq.lower():
         anti = reverse_complement_rna(seq)
@@ -428,10 +427,10 @@ def six_frame_translations(seq, genetic_code=1):
     comp = anti[::-1]
     length = len(seq)
     frames = {}
+    proteins = translate_six_frames(seq, genetic_code)
     for i in range(0, 3):
-        fragment_length = 3 * ((length - i) // 3)
-        frames[i + 1] = translate(seq[i : i + fragment_length], genetic_code)
-        frames[-(i + 1)] = translate(anti[i : i + fragment_length], genetic_code)[::-1]
+        frames[i + 1] = proteins[i]
+        frames[-(i + 1)] = proteins[i + 3][::-1]
 
     # create header
     if length > 20:
@@ -0,0 +1,424 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Count k-mers in DNA sequences, using two bits per nucleotide.
+
+Each k-mer (for k up to 31) is stored as an unsigned 64 bit integer, using
+the same two bit encoding as the UCSC twoBit file format (see the module
+Bio.SeqIO.TwoBitIO), with T = 0, C = 1, A = 2, and G = 3, and the first
+nucleotide in the most significant bits:
+
+>>> from Bio.SeqUtils import kmers
+>>> kmers.encode_kmer("TCAG")
+27
+>>> kmers.decode_kmer(27, 4)
+'TCAG'
+
+The count function counts the k-mers in a sequence, or in all sequences
+from an iterable such as Bio.SeqIO.parse(...):
+
+>>> from Bio import SeqIO
+>>> records = SeqIO.parse("GenBank/NC_005816.gb", "genbank")
+>>> counts = kmers.count(records, 8)
+>>> counts
+<KmerCounts of 7758 canonical 8-mers>
+>>> counts.total
+9602
+>>> counts.most_common(3)
+[('TGTTTTTT', 7), ('TTTTTTTC', 6), ('TTTTTTAT', 6)]
+>>> counts["GAAAAAAA"]  # same as its reverse complement TTTTTTTC
+6
+
+By default canonical k-mers are counted, meaning that a k-mer and its
+reverse complement are counted together, under whichever is the lower of
+the two codes. Any k-mers including letters other than A, C, G, T and U
+(in upper or lower case) are skipped.
+
+The k-mers and their counts are held as two NumPy arrays (sorted by k-mer
+code), making this compact even for millions of distinct k-mers.
+"""
+
+import numpy
+
+# Number of k-mers counted at a time, limiting the memory used
+_CHUNK = 1 << 22
+
+# Code used by kmer_codes for k-mers including other letters
+INVALID = numpy.iinfo(numpy.uint64).max
+
+_CODES = numpy.full(256, 4, numpy.uint8)
+for _code, _letters in enumerate(["TtUu", "Cc", "Aa", "Gg"]):
+    for _letter in _letters:
+        _CODES[ord(_letter)] = _code
+del _code, _letters, _letter
+
+_LETTERS = "TCAG"
+
+
+def _as_bytes(sequence):
+    """Return the sequence (a Seq, MutableSeq, string or bytes) as bytes (PRIVATE)."""
+    if isinstance(sequence, str):
+        # Any non-ASCII characters become "?", which is skipped
+        return sequence.encode("ASCII", "replace")
+    return bytes(sequence)
+
+
+def _check_k(k):
+    """Check that k-mers of length k fit in an unsigned 64 bit integer (PRIVATE)."""
+    if not 1 <= k <= 31:
+        raise ValueError(f"k must be between 1 and 31, not {k}")
+
+
+def encode_kmer(kmer):
+    """Return the integer code of a k-mer given as a string.
+
+    >>> from Bio.SeqUtils import kmers
+    >>> kmers.encode_kmer("GATTACA")
+    14374
+    """
+    _check_k(len(kmer))
+    code = 0
+    for letter in kmer.upper().replace("U", "T"):
+        try:
+            code = (code << 2) | _LETTERS.index(letter)
+        except ValueError:
+            raise ValueError(f"Unexpected letter {letter!r} in k-mer") from None
+    return code
+
+
+def decode_kmer(code, k):
+    """Return the k-mer with the given integer code as a string.
+
+    >>> from Bio.SeqUtils import kmers
+    >>> kmers.decode_kmer(14374, 7)
+    'GATTACA'
+    """
+    _check_k(k)
+    code = int(code)
+    letters = []
+    for i in range(k):
+        letters.append(_LETTERS[code & 3])
+        code >>= 2
+    return "".join(reversed(letters))
+
+
+def reverse_complement_kmer(code, k):
+    """Return the code of the reverse complement of the k-mer with this code.
+
+    >>> from Bio.SeqUtils import kmers
+    >>> code = kmers.encode_kmer("GATTACA")
+    >>> kmers.decode_kmer(kmers.reverse_complement_kmer(code, 7), 7)
+    'TGTAATC'
+    """
+    _check_k(k)
+    code = int(code)
+    answer = 0
+    for i in range(k):
+        # T = 0 <-> A = 2, C = 1 <-> G = 3
+        answer = (answer << 2) | ((code & 3) ^ 2)
+        code >>= 2
+    return answer
+
+
+def kmer_codes(sequence, k, canonical=False):
+    """Return the code of the k-mer starting at each position as a NumPy array.
+
+    Arguments:
+     - sequence - a Seq, MutableSeq, string or bytes object.
+     - k - k-mer length, between 1 and 31.
+     - canonical - if True, use the lower of the codes of each k-mer and of
+       its reverse complement.
+
+    The array has length len(sequence) - k + 1 and data type uint64, with the
+    value INVALID (the largest unsigned 64 bit integer) for k-mers including
+    letters other than A, C, G, T and U:
+
+    >>> from Bio.SeqUtils import kmers
+    >>> codes = kmers.kmer_codes("ACGTNAC", 2)
+    >>> [kmers.decode_kmer(code, 2) for code in codes[:3]]
+    ['AC', 'CG', 'GT']
+    >>> codes[3] == codes[4] == kmers.INVALID
+    True
+    >>> codes = kmers.kmer_codes("ACGTNAC", 2, canonical=True)
+    >>> [kmers.decode_kmer(code, 2) for code in codes[:3]]
+    ['AC', 'CG', 'AC']
+
+    As INVALID is larger than the code of any k-mer, such positions are never
+    picked when looking for the minimum code in a window (as is done when
+    selecting minimizers).
+    """
+    _check_k(k)
+    return _kmer_codes(_as_bytes(sequence), k, canonical)
+
+
+def _kmer_codes(data, k, canonical):
+    """Calculate the k-mer codes for a bytes object (PRIVATE).
+
+    The codes of the k-mers are built up by repeatedly doubling the length
+    of the k-mers, combining those needed for the binary representation of
+    k, taking O(n log(k)) time rather than O(n k).
+    """
+    bases = _CODES[numpy.frombuffer(data, numpy.uint8)]
+    n = len(bases) - k + 1
+    if n <= 0:
+        return numpy.zeros(0, numpy.uint64)
+    invalid = numpy.zeros(len(bases) + 1, numpy.int64)
+    numpy.cumsum(bases == 4, out=invalid[1:])
+    invalid = invalid[k:] > invalid[:-k]
+    bases &= 3
+    # For p-mers, and for the first r letters of the k-mers:
+    forward = bases.astype(numpy.uint64)
+    reverse = forward ^ numpy.uint64(2)
+    p = 1
+    codes = rc_codes = None
+    r = 0
+    remaining = k
+    while True:
+        if remaining & 1:
+            if codes is None:
+                codes = forward[:n].copy()
+                rc_codes = reverse[:n].copy()
+            else:
+                codes <<= numpy.uint64(2 * p)
+                codes |= forward[r : r + n]
+                rc_codes |= reverse[r : r + n] << numpy.uint64(2 * r)
+            r += p
+        remaining >>= 1
+        if not remaining:
+            break
+        m = len(forward) - p
+        forward = (forward[:m] << numpy.uint64(2 * p)) | forward[p:]
+        reverse = (reverse[p:] << numpy.uint64(2 * p)) | reverse[:m]
+        p *= 2
+    if canonical:
+        numpy.minimum(codes, rc_codes, out=codes)
+    codes[invalid] = INVALID
+    return codes
+
+
+def _count_chunk(data, k, canonical):
+    """Count the k-mers in a bytes object, returning k-mers and counts (PRIVATE)."""
+    codes = _kmer_codes(data, k, canonical)
+    codes = codes[codes != INVALID]
+    kmers, counts = numpy.unique(codes, return_counts=True)
+    return kmers, counts.astype(numpy.int64)
+
+
+def _merge(results):
+    """Merge a list of (k-mers, counts) array pairs (PRIVATE)."""
+    if len(results) == 1:
+        return results[0]
+    kmers = numpy.concatenate([result[0] for result in results])
+    counts = numpy.concatenate([result[1] for result in results])
+    if len(kmers) == 0:
+        return kmers, counts
+    order = numpy.argsort(kmers)
+    kmers = kmers[order]
+    starts = numpy.flatnonzero(numpy.concatenate([[True], kmers[1:] != kmers[:-1]]))
+    return kmers[starts], numpy.add.reduceat(counts[order], starts)
+
+
+class KmerCounts:
+    """Counts of the k-mers in one or more sequences.
+
+    Attributes:
+     - k - the k-mer length.
+     - canonical - whether k-mers and their reverse complement are counted
+       together.
+     - kmers - sorted NumPy array with the code of each k-mer found.
+     - counts - NumPy array with the number of times each k-mer was found.
+
+    This behaves like a read only dictionary, with the k-mers as strings:
+
+    >>> from Bio.SeqUtils import kmers
+    >>> counts = kmers.count("AAACGTTT", 3)
+    >>> len(counts)
+    3
+    >>> counts["AAA"], counts["TTT"], counts["ACG"], counts["CAT"]
+    (2, 2, 2, 0)
+    >>> dict(counts)
+    {'TTT': 2, 'CGT': 2, 'AAC': 2}
+
+    The entries are in the order of the k-mer codes.
+    """
+
+    def __init__(self, k, canonical=True, kmers=None, counts=None):
+        """Initialize the class, by default without any k-mers."""
+        _check_k(k)
+        self.k = k
+        self.canonical = canonical
+        if kmers is None:
+            kmers = numpy.zeros(0, numpy.uint64)
+            counts = numpy.zeros(0, numpy.int64)
+        self.kmers = kmers
+        self.counts = counts
+
+    def __repr__(self):
+        """Represent the object as a string for debugging."""
+        return (
+            f"<{self.__class__.__name__} of {len(self)} "
+            f"{'canonical ' if self.canonical else ''}{self.k}-mers>"
+        )
+
+    def __len__(self):
+        """Return the number of distinct k-mers."""
+        return len(self.kmers)
+
+    @property
+    def total(self):
+        """Total number of k-mers counted."""
+        return int(self.counts.sum())
+
+    def _find(self, kmer):
+        """Return the index of a k-mer (string or code), or -1 (PRIVATE)."""
+        if isinstance(kmer, str):
+            if len(kmer) != self.k:
+                return -1
+            kmer = encode_kmer(kmer)
+        if self.canonical:
+            kmer = min(kmer, reverse_complement_kmer(kmer, self.k))
+        index = numpy.searchsorted(self.kmers, kmer)
+        if index < len(self.kmers) and self.kmers[index] == kmer:
+            return index
+        return -1
+
+    def __getitem__(self, kmer):
+        """Return the count of a k-mer (as a string or as a code), or zero."""
+        index = self._find(kmer)
+        if index < 0:
+            return 0
+        return int(self.counts[index])
+
+    def __contains__(self, kmer):
+        """Return True if the k-mer (as a string or as a code) was found."""
+        return self._find(kmer) >= 0
+
+    def __iter__(self):
+        """Iterate over the k-mers found, as strings."""
+        for code in self.kmers.tolist():
+            yield decode_kmer(code, self.k)
+
+    def keys(self):
+        """Iterate over the k-mers found, as strings."""
+        return iter(self)
+
+    def values(self):
+        """Iterate over the counts of the k-mers."""
+        return iter(self.counts.tolist())
+
+    def items(self):
+        """Iterate over the k-mers found (as strings) and their counts."""
+        return zip(self, self.values())
+
+    def most_common(self, n=None):
+        """Return a list of the n most common k-mers and their counts.
+
+        As for collections.Counter, the default is to return all k-mers.
+        K-mers with the same count are in the order of their codes.
+        """
+        order = numpy.argsort(-self.counts, kind="stable")[:n]
+        return [
+            (decode_kmer(code, self.k), count)
+            for code, count in zip(
+                self.kmers[order].tolist(), self.counts[order].tolist()
+            )
+        ]
+
+    def spectrum(self):
+        """Return the k-mer spectrum as a NumPy array.
+
+        Element i of the array is the number of distinct k-mers found i times:
+
+        >>> from Bio.SeqUtils import kmers
+        >>> counts = kmers.count("AAAAAACGT", 3, canonical=False)
+        >>> counts.spectrum()
+        array([0, 3, 0, 0, 1])
+        """
+        return numpy.bincount(self.counts)
+
+    def __add__(self, other):
+        """Combine the counts of two KmerCounts objects."""
+        if not isinstance(other, KmerCounts):
+            return NotImplemented
+        if (self.k, self.canonical) != (other.k, other.canonical):
+            raise ValueError("Can only add counts of the same kind of k-mers")
+        kmers, counts = _merge([(self.kmers, self.counts), (other.kmers, other.counts)])
+        return self.__class__(self.k, self.canonical, kmers, counts)
+
+
+def _chunks(sequences, k):
+    """Split the sequences into overlapping pieces of bytes to count (PRIVATE)."""
+    from Bio.Seq import MutableSeq
+    from Bio.Seq import Seq
+    from Bio.SeqRecord import SeqRecord
+
+    if isinstance(sequences, (str, bytes, Seq, MutableSeq, SeqRecord)):
+        sequences = [sequences]
+    for sequence in sequences:
+        data = _as_bytes(getattr(sequence, "seq", sequence))
+        for start in range(0, len(data) - k + 1, _CHUNK):
+            yield data[start : start + _CHUNK + k - 1]
+
+
+def count(sequences, k, canonical=True, processes=1):
+    """Count the k-mers in one or more sequences, returning a KmerCounts object.
+
+    Arguments:
+     - sequences - a Seq, MutableSeq, SeqRecord, string or bytes object, or an
+       iterable of these, for example from Bio.SeqIO.parse(handle, "fasta").
+     - k - k-mer length, between 1 and 31.
+     - canonical - count a k-mer and its reverse complement together
+       (default True).
+     - processes - number of worker processes counting the k-mers in
+       parallel (default 1 counts them in this process, None uses a process
+       for each CPU).
+
+    Long sequences are counted a piece at a time, and the counts of the
+    pieces merged as the total grows, so that the memory used depends on
+    the number of distinct k-mers rather than the total sequence length.
+    """
+    _check_k(k)
+    chunks = _chunks(sequences, k)
+    total = [(numpy.zeros(0, numpy.uint64), numpy.zeros(0, numpy.int64))]
+    pending = []
+    size = 0
+
+    def add(result):
+        # Merge once the pending counts are as large as the total so far,
+        # so each k-mer is merged O(log(number of pieces)) times.
+        nonlocal size
+        pending.append(result)
+        size += len(result[0])
+        if size >= len(total[0][0]):
+            total[0] = _merge(total + pending)
+            del pending[:]
+            size = 0
+
+    if processes == 1:
+        for chunk in chunks:
+            add(_count_chunk(chunk, k, canonical))
+    else:
+        import os
+        from collections import deque
+        from concurrent.futures import ProcessPoolExecutor
+
+        if processes is None:
+            processes = os.cpu_count() or 1
+        with ProcessPoolExecutor(processes) as executor:
+            # Limit how many pieces are held in memory waiting to be counted
+            futures = deque()
+            for chunk in chunks:
+                if len(futures) >= 2 * processes:
+                    add(futures.popleft().result())
+                futures.append(executor.submit(_count_chunk, chunk, k, canonical))
+            for future in futures:
+                add(future.result())
+    kmers, counts = _merge(total + pending)
+    return KmerCounts(k, canonical, kmers, counts)
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+
+    run_doctest()
@@ -0,0 +1,228 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Sequence statistics over sliding windows, returned as NumPy arrays.
+
+The functions in this module calculate a statistic (such as the G+C
+content) for each window of a given size along a sequence, moving the
+window along by a given step each time:
+
+>>> from Bio.Seq import Seq
+>>> from Bio.SeqUtils import windows
+>>> seq = Seq("GGGCCCAAAATTTTGGGGCCAT")
+>>> values = windows.GC(seq, window=6, step=4)
+>>> values.round(2).tolist()
+[100.0, 33.33, 0.0, 66.67, 66.67]
+
+The i-th value is for the window seq[i * step : i * step + window], and only
+complete windows are included (so there are (len(seq) - window) // step + 1
+values). Rather than counting the letters in each window separately, the
+counts are found from the cumulative counts along the sequence at the window
+boundaries, so the time taken is proportional to the length of the sequence
+plus the number of windows, regardless of the window size.
+
+The sequence can be a Seq or MutableSeq object, a string, or bytes, and
+mixed case is allowed.
+"""
+
+import numpy
+
+# Number of positions processed at a time, limiting the memory used
+_CHUNK = 1 << 20
+
+
+def _encode(seq, letters):
+    """Return an array with the code of each letter in the sequence (PRIVATE).
+
+    Here letters is a list of strings; each letter in the i-th string (in
+    upper or lower case) gets code i, and any other letter gets code
+    len(letters).
+    """
+    if isinstance(seq, str):
+        # Any non-ASCII characters become "?", which is never counted
+        data = seq.encode("ASCII", "replace")
+    else:
+        data = bytes(seq)
+    table = numpy.full(256, len(letters), numpy.uint8)
+    for code, group in enumerate(letters):
+        for letter in group.upper() + group.lower():
+            table[ord(letter)] = code
+    return table[numpy.frombuffer(data, numpy.uint8)]
+
+
+def _windows(length, window, step):
+    """Return the start and end of each complete window (PRIVATE)."""
+    if window < 1:
+        raise ValueError(f"window must be positive, not {window}")
+    if step < 1:
+        raise ValueError(f"step must be positive, not {step}")
+    starts = numpy.arange(0, max(length - window + 1, 0), step, numpy.int64)
+    return starts, starts + window
+
+
+def _window_counts(codes, size, starts, ends):
+    """Count the codes in each window, returning an array of shape (n, size) (PRIVATE).
+
+    Arguments:
+     - codes - array of integer codes; any codes >= size are ignored.
+     - size - number of codes to count.
+     - starts, ends - arrays with the start and end of each window.
+
+    The counts of each code before each window boundary are found by
+    splitting the sequence into segments at the boundaries and counting
+    the codes in each segment, followed by a cumulative sum over the
+    segments. The window counts are then differences between those.
+    """
+    boundaries, inverse = numpy.unique(
+        numpy.concatenate([starts, ends]), return_inverse=True
+    )
+    counts = numpy.zeros((len(boundaries), size + 1), numpy.int64)
+    if len(boundaries):
+        # Segment j (1 <= j < len(boundaries)) is boundaries[j - 1]:boundaries[j],
+        # positions before the first or after the last boundary are not needed.
+        first = boundaries[0]
+        last = boundaries[-1]
+        for offset in range(first, last, _CHUNK):
+            end = min(offset + _CHUNK, last)
+            # Segments low to high - 1 overlap this chunk
+            low, high = numpy.searchsorted(boundaries, [offset, end - 1], "right")
+            high += 1
+            edges = numpy.clip(boundaries[low - 1 : high], offset, end)
+            segments = numpy.repeat(numpy.arange(high - low), numpy.diff(edges))
+            chunk = numpy.minimum(codes[offset:end], size)
+            counts[low:high] += numpy.bincount(
+                segments * (size + 1) + chunk,
+                minlength=(high - low) * (size + 1),
+            ).reshape(high - low, size + 1)
+        numpy.cumsum(counts, axis=0, out=counts)
+    n = len(starts)
+    return counts[inverse[n:], :size] - counts[inverse[:n], :size]
+
+
+def GC(seq, window, step=1):
+    """Calculate the G+C content of each window as a percentage.
+
+    As in Bio.SeqUtils.GC, the ambiguous nucleotide S (G or C) is counted,
+    and the percentage is calculated against the full window length:
+
+    >>> from Bio.SeqUtils import windows
+    >>> windows.GC("ACGTNNSSAT", window=4, step=2)
+    array([ 50.,  25.,  50.,  50.])
+    """
+    starts, ends = _windows(len(seq), window, step)
+    counts = _window_counts(_encode(seq, ["GCS"]), 1, starts, ends)
+    return counts[:, 0] * 100.0 / window
+
+
+def _skew(seq, starts, ends, letters):
+    """Calculate the (X - Y) / (X + Y) skew for letters X and Y (PRIVATE)."""
+    counts = _window_counts(_encode(seq, letters), 2, starts, ends)
+    x = counts[:, 0]
+    y = counts[:, 1]
+    total = x + y
+    skew = numpy.zeros(len(starts))
+    numpy.divide(x - y, total, out=skew, where=total > 0)
+    return skew
+
+
+def GC_skew(seq, window, step=1):
+    """Calculate the GC skew (G-C)/(G+C) of each window.
+
+    Windows without any G or C get zero, and ambiguous nucleotides are
+    not counted:
+
+    >>> from Bio.SeqUtils import windows
+    >>> windows.GC_skew("GGGCAAATTT", window=5, step=5)
+    array([ 0.5,  0. ])
+    """
+    starts, ends = _windows(len(seq), window, step)
+    return _skew(seq, starts, ends, ["G", "C"])
+
+
+def AT_skew(seq, window, step=1):
+    """Calculate the AT skew (A-T)/(A+T) of each window.
+
+    Windows without any A or T get zero, and ambiguous nucleotides are
+    not counted:
+
+    >>> from Bio.SeqUtils import windows
+    >>> windows.AT_skew("AAATGGGGGG", window=5, step=5)
+    array([ 0.5,  0. ])
+    """
+    starts, ends = _windows(len(seq), window, step)
+    return _skew(seq, starts, ends, ["A", "T"])
+
+
+def lcc(seq, window, step=1):
+    """Calculate the Local Composition Complexity (LCC) of each window.
+
+    This gives the same values as Bio.SeqUtils.lcc.lcc_simp for each window
+    (and with step=1, the same values as Bio.SeqUtils.lcc.lcc_mult), for an
+    unambiguous DNA sequence:
+
+    >>> from Bio.SeqUtils import windows
+    >>> values = windows.lcc("ACGATAGCAAAAAAAA", window=8, step=4)
+    >>> values.round(4).tolist()
+    [0.9528, 0.7744, 0.0]
+    """
+    starts, ends = _windows(len(seq), window, step)
+    counts = _window_counts(_encode(seq, "ACGT"), 4, starts, ends)
+    # Letters not in the window contribute zero, as log(1) is zero
+    ratios = numpy.ones(counts.shape)
+    numpy.divide(window, counts, out=ratios, where=counts > 0)
+    return (counts * numpy.log(ratios)).sum(axis=1) / (window * numpy.log(4))
+
+
+def _kmer_codes(seq, k):
+    """Return the code of the k-mer starting at each position (PRIVATE).
+
+    The code is the k-mer's index in lexicographic order of the k-mers
+    using A, C, G and T; k-mers with any other letters get code 4**k.
+    """
+    bases = _encode(seq, "ACGT")
+    n = len(bases) - k + 1
+    if n <= 0:
+        return numpy.zeros(0, numpy.int64)
+    codes = numpy.zeros(n, numpy.int64)
+    invalid = numpy.zeros(n, bool)
+    for i in range(k):
+        codes <<= 2
+        codes |= bases[i : i + n] & 3
+        invalid |= bases[i : i + n] == 4
+    codes[invalid] = 4**k
+    return codes
+
+
+def kmer_counts(seq, k, window, step=1):
+    """Count the k-mers in each window, returning an array of shape (n, 4**k).
+
+    Column j counts the j-th k-mer in lexicographic order, where A, C, G,
+    and T (or U) are the only letters; k-mers including any other letters
+    are not counted. A k-mer is counted in a window if it lies entirely
+    within the window. For example, counting the dinucleotides:
+
+    >>> from Bio.SeqUtils import windows
+    >>> counts = windows.kmer_counts("ACGTACGNAC", k=2, window=5, step=5)
+    >>> counts.shape
+    (2, 16)
+    >>> counts[:, [1, 6, 11, 12]]  # AC, CG, GT, TA
+    array([[1, 1, 1, 1],
+           [1, 1, 0, 0]])
+    """
+    if k < 1:
+        raise ValueError(f"k must be positive, not {k}")
+    if isinstance(seq, str):
+        seq = seq.replace("U", "T").replace("u", "t")
+    else:
+        seq = bytes(seq).replace(b"U", b"T").replace(b"u", b"t")
+    starts, ends = _windows(len(seq), window, step)
+    # The k-mers starting in start:end - k + 1 are within start:end
+    ends = numpy.maximum(ends - k + 1, starts)
+    return _window_counts(_kmer_codes(seq, k), 4**k, starts, ends)
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+
+    run_doctest()
@@ -247,6 +247,9 @@ If your data is in UTF-8 or any other incompatible encoding, you must use
 binary mode, and decode the appropriate fragments yourself.
 """
 
+import bisect
+import collections
+import concurrent.futures
 import struct
 import sys
 import zlib
@@ -259,7 +262,7 @@ _bgzf_eof = b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00\x1b\x00
 _bytes_BC = b"BC"
 
 
-def open(filename, mode="rb"):
+def open(filename, mode="rb", threads=1):
     r"""Open a BGZF file for reading, writing or appending.
 
     If text mode is requested, in order to avoid multi-byte characters, this is
@@ -268,11 +271,14 @@ def open(filename, mode="rb"):
 
     If your data is in UTF-8 or any other incompatible encoding, you must use
     binary mode, and decode the appropriate fragments yourself.
+
+    Argument ``threads`` sets the number of threads used to decompress or
+    compress the BGZF blocks (default one, meaning no background threads).
     """
     if "r" in mode.lower():
-        return BgzfReader(filename, mode)
+        return BgzfReader(filename, mode, threads=threads)
     elif "w" in mode.lower() or "a" in mode.lower():
-        return BgzfWriter(filename, mode)
+        return BgzfWriter(filename, mode, threads=threads)
     else:
         raise ValueError(f"Bad mode {mode!r}")
 
@@ -429,12 +435,100 @@ def BgzfBlocks(handle):
         data_start += data_len
 
 
+def build_gzi_index(handle):
+    """Build a BGZF block index, as used in samtools ``.gzi`` files.
+
+    Expects a BGZF compressed file opened in binary read mode using
+    the builtin open function (as for the BgzfBlocks function).
+
+    Returns a list of (compressed offset, uncompressed offset) tuples,
+    giving the start of each non-empty BGZF block except the first
+    (which is always at offset zero in both):
+
+    >>> from builtins import open
+    >>> with open("SamBam/ex1.bam", "rb") as handle:
+    ...     index = build_gzi_index(handle)
+    ...
+    >>> for values in index:
+    ...     print("Raw start %i, data start %i" % values)
+    Raw start 18239, data start 65536
+    Raw start 36462, data start 131072
+    Raw start 54479, data start 196608
+    Raw start 71821, data start 262144
+    Raw start 89536, data start 327680
+    Raw start 107264, data start 393216
+
+    This only needs to read the block headers, as the uncompressed length
+    of each block is recorded at its end. See also the functions
+    write_gzi_index and read_gzi_index, and the BgzfReader's
+    seek_uncompressed method.
+    """
+    if isinstance(handle, BgzfReader):
+        raise TypeError("Function build_gzi_index expects a binary handle")
+    index = []
+    data_start = 0
+    while True:
+        start_offset = handle.tell()
+        try:
+            block_size, deflated, crc, data_len = _read_bgzf_block(handle)
+        except StopIteration:
+            break
+        if data_len and start_offset:
+            index.append((start_offset, data_start))
+        data_start += data_len
+    return index
+
+
+def write_gzi_index(filename, index):
+    """Save a BGZF block index as a samtools compatible ``.gzi`` file.
+
+    The index should be a list of (compressed offset, uncompressed offset)
+    tuples as from the build_gzi_index function. The file holds the number
+    of entries and then each pair of offsets, all as little endian unsigned
+    64-bit integers.
+    """
+    with _open(filename, "wb") as handle:
+        handle.write(struct.pack("<Q", len(index)))
+        for offsets in index:
+            handle.write(struct.pack("<QQ", *offsets))
+
+
+def read_gzi_index(filename):
+    """Load a BGZF block index from a samtools ``.gzi`` file.
+
+    Returns a list of (compressed offset, uncompressed offset) tuples,
+    as from the build_gzi_index function.
+    """
+    with _open(filename, "rb") as handle:
+        data = handle.read()
+    if len(data) < 8:
+        raise ValueError("Truncated BGZF index file %r" % filename)
+    count = struct.unpack_from("<Q", data)[0]
+    if len(data) != 8 + 16 * count:
+        raise ValueError(
+            "BGZF index file %r should have %i entries, but is %i bytes"
+            % (filename, count, len(data))
+        )
+    values = struct.unpack_from("<%iQ" % (2 * count), data, 8)
+    return list(zip(values[::2], values[1::2]))
+
+
 def _load_bgzf_block(handle, text_mode=False):
     """Load the next BGZF block of compressed data (PRIVATE).
 
     Returns a tuple (block size and data), or at end of file
     will raise StopIteration.
     """
+    block = _read_bgzf_block(handle)
+    return block[0], _inflate_bgzf_block(block, text_mode)
+
+
+def _read_bgzf_block(handle):
+    """Read the next BGZF block without decompressing it (PRIVATE).
+
+    Returns a tuple (block size, deflated data, CRC, uncompressed length),
+    or at end of file will raise StopIteration.
+    """
     magic = handle.read(4)
     if not magic:
         # End of file - should we signal this differently now?
@@ -469,10 +563,21 @@ def _load_bgzf_block(handle, text_mode=False):
         raise ValueError("Missing BC, this isn't a BGZF file!")
     # Now comes the compressed data, CRC, and length of uncompressed data.
     deflate_size = block_size - 1 - extra_len - 19
-    d = zlib.decompressobj(-15)  # Negative window size means no headers
-    data = d.decompress(handle.read(deflate_size)) + d.flush()
+    deflated = handle.read(deflate_size)
     expected_crc = handle.read(4)
     expected_size = struct.unpack("<I", handle.read(4))[0]
+    return block_size, deflated, expected_crc, expected_size
+
+
+def _inflate_bgzf_block(block, text_mode=False):
+    """Decompress and check a block from _read_bgzf_block (PRIVATE).
+
+    This only calls zlib, which releases the GIL, so can be run in a
+    worker thread.
+    """
+    block_size, deflated, expected_crc, expected_size = block
+    d = zlib.decompressobj(-15)  # Negative window size means no headers
+    data = d.decompress(deflated) + d.flush()
     if expected_size != len(data):
         raise RuntimeError("Decompressed to %i, not %i" % (len(data), expected_size))
     # Should cope with a mix of Python platforms...
@@ -486,9 +591,38 @@ def _load_bgzf_block(handle, text_mode=False):
     if text_mode:
         # Note ISO-8859-1 aka Latin-1 preserves first 256 chars
         # (i.e. ASCII), but critically is a single byte encoding
-        return block_size, data.decode("latin-1")
+        return data.decode("latin-1")
     else:
-        return block_size, data
+        return data
+
+
+def _deflate_bgzf_block(block, compresslevel):
+    """Compress data as a single BGZF block, returning the raw bytes (PRIVATE).
+
+    This only calls zlib, which releases the GIL, so can be run in a
+    worker thread.
+    """
+    if len(block) > 65536:
+        raise ValueError(f"{len(block)} Block length > 65536")
+    # Giving a negative window bits means no gzip/zlib headers,
+    # -15 used in samtools
+    c = zlib.compressobj(compresslevel, zlib.DEFLATED, -15, zlib.DEF_MEM_LEVEL, 0)
+    compressed = c.compress(block) + c.flush()
+    del c
+    if len(compressed) > 65536:
+        raise RuntimeError("TODO - Didn't compress enough, try less data in this block")
+    bsize = struct.pack("<H", len(compressed) + 25)  # includes -1
+    crc = struct.pack("<I", zlib.crc32(block) & 0xFFFFFFFF)
+    uncompressed_length = struct.pack("<I", len(block))
+    # Fixed 16 bytes,
+    # gzip magic bytes (4) mod time (4),
+    # gzip flag (1), os (1), extra length which is six (2),
+    # sub field which is BC (2), sub field length of two (2),
+    # Variable data,
+    # 2 bytes: block length as BC sub field (2)
+    # X bytes: the data
+    # 8 bytes: crc (4), uncompressed data length (4)
+    return _bgzf_header + bsize + compressed + crc + uncompressed_length
 
 
 class BgzfReader:
@@ -554,9 +688,19 @@ class BgzfReader:
     block can be up to 64kb, the default cache could take up to 6MB of
     RAM. The cache is not important for reading through the file in one
     pass, but is important for improving performance of random access.
+
+    Use the threads argument to decompress the following blocks in
+    background threads while you work on the current block, which helps
+    when reading through a large file:
+
+    >>> with BgzfReader("SamBam/ex1.bam", "rb", threads=4) as handle:
+    ...     data = handle.read(200000)
+    ...
+    >>> len(data)
+    200000
     """
 
-    def __init__(self, filename=None, mode="r", fileobj=None, max_cache=100):
+    def __init__(self, filename=None, mode="r", fileobj=None, max_cache=100, threads=1):
         r"""Initialize the class for reading a BGZF file.
 
         You would typically use the top level ``bgzf.open(...)`` function
@@ -582,11 +726,19 @@ class BgzfReader:
         cache in memory. Each can be up to 64kb thus the default of 100 blocks
         could take up to 6MB of RAM. This is important for efficient random
         access, a small value is fine for reading the file in one pass.
+
+        Argument ``threads`` controls how many threads are used to decompress
+        the BGZF blocks. With the default of one, each block is decompressed
+        when it is needed. With more, the upcoming blocks (up to twice the
+        number of threads) are read ahead and decompressed in the background,
+        which speeds up reading through the file in one pass.
         """
         # TODO - Assuming we can seek, check for 28 bytes EOF empty block
         # and if missing warn about possible truncation (as in samtools)?
         if max_cache < 1:
             raise ValueError("Use max_cache with a minimum of 1")
+        if threads < 1:
+            raise ValueError("Use threads with a minimum of 1")
         # Must open the BGZF file in binary mode, but we may want to
         # treat the contents as either text or binary (unicode or
         # bytes under Python 3)
@@ -613,6 +765,17 @@ class BgzfReader:
         self._buffers = {}
         self._block_start_offset = None
         self._block_raw_length = None
+        if threads > 1:
+            self._executor = concurrent.futures.ThreadPoolExecutor(threads)
+            self._read_ahead = 2 * threads
+        else:
+            self._executor = None
+        # Blocks being decompressed in the background, keyed by start offset
+        self._pending = {}
+        self._pending_offset = None
+        # Block starts from the BGZF block index, see seek_uncompressed
+        self._block_offsets = None
+        self._data_offsets = None
         self._load_block(handle.tell())
 
     def _load_block(self, start_offset=None):
@@ -635,6 +798,13 @@ class BgzfReader:
             # TODO - Implement LRU cache removal?
             self._buffers.popitem()
         # Now load the block
+        if self._executor is not None:
+            self._block_start_offset = start_offset
+            block_size, self._buffer = self._load_pending(start_offset)
+            self._within_block_offset = 0
+            self._block_raw_length = block_size
+            self._buffers[start_offset] = self._buffer, block_size
+            return
         handle = self._handle
         if start_offset is not None:
             handle.seek(start_offset)
@@ -653,6 +823,45 @@ class BgzfReader:
         # Finally save the block in our cache,
         self._buffers[self._block_start_offset] = self._buffer, block_size
 
+    def _load_pending(self, start_offset):
+        """Return the block size and data, decompressed in a thread (PRIVATE).
+
+        Reads the raw blocks ahead of the requested one, and queues them
+        up to be decompressed by the thread pool.
+        """
+        pending = self._pending
+        if start_offset not in pending:
+            # Not reading sequentially, discard anything read ahead
+            for block_size, future in pending.values():
+                future.cancel()
+            pending.clear()
+            self._pending_offset = start_offset
+        handle = self._handle
+        if len(pending) < self._read_ahead and self._pending_offset is not None:
+            handle.seek(self._pending_offset)
+        while len(pending) < self._read_ahead and self._pending_offset is not None:
+            offset = self._pending_offset
+            try:
+                block = _read_bgzf_block(handle)
+            except StopIteration:
+                # EOF
+                future = concurrent.futures.Future()
+                future.set_result("" if self._text else b"")
+                pending[offset] = 0, future
+                self._pending_offset = None
+            except Exception as err:
+                # Only raise this when the caller gets to this block
+                future = concurrent.futures.Future()
+                future.set_exception(err)
+                pending[offset] = 0, future
+                self._pending_offset = None
+            else:
+                future = self._executor.submit(_inflate_bgzf_block, block, self._text)
+                pending[offset] = block[0], future
+                self._pending_offset = offset + block[0]
+        block_size, future = pending.pop(start_offset)
+        return block_size, future.result()
+
     def tell(self):
         """Return a 64-bit unsigned BGZF virtual offset."""
         if 0 < self._within_block_offset and self._within_block_offset == len(
@@ -696,6 +905,51 @@ class BgzfReader:
         #       self._within_block_offset)
         return virtual_offset
 
+    def load_gzi_index(self, filename=None):
+        """Load the BGZF block index used by the seek_uncompressed method.
+
+        Reads a samtools compatible ``.gzi`` file if given a filename,
+        otherwise builds the index by scanning the block headers of this
+        file.
+        """
+        if filename is None:
+            self._handle.seek(0)
+            index = build_gzi_index(self._handle)
+        else:
+            index = read_gzi_index(filename)
+        index.sort()
+        self._block_offsets = [0] + [offsets[0] for offsets in index]
+        self._data_offsets = [0] + [offsets[1] for offsets in index]
+
+    def seek_uncompressed(self, offset):
+        """Seek to an offset in the uncompressed data.
+
+        Uses the BGZF block index to find the block containing this offset,
+        so is fast even for large files. Unless already loaded using the
+        load_gzi_index method, the index is built by scanning the file the
+        first time this is used.
+
+        Returns the matching 64-bit unsigned BGZF virtual offset:
+
+        >>> with BgzfReader("SamBam/ex1.bam", "rb") as handle:
+        ...     handle.seek_uncompressed(65540)
+        ...     handle.tell()
+        ...
+        1195311108
+        1195311108
+
+        This is four bytes into the second block, as in the example above.
+        """
+        if offset < 0:
+            raise ValueError("Offset must be non-negative, not %i" % offset)
+        if self._data_offsets is None:
+            self.load_gzi_index()
+        i = bisect.bisect_right(self._data_offsets, offset) - 1
+        within_block = offset - self._data_offsets[i]
+        if within_block >= 65536:
+            raise ValueError("Offset %i is beyond the end of the data" % offset)
+        return self.seek(make_virtual_offset(self._block_offsets[i], within_block))
+
     def read(self, size=-1):
         """Read method for the BGZF module."""
         if size < 0:
@@ -765,10 +1019,18 @@ class BgzfReader:
 
     def close(self):
         """Close BGZF file."""
+        if self._executor is not None:
+            for block_size, future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+            self._executor.shutdown()
+            self._executor = None
         self._handle.close()
         self._buffer = None
         self._block_start_offset = None
         self._buffers = None
+        self._block_offsets = None
+        self._data_offsets = None
 
     def seekable(self):
         """Return True indicating the BGZF supports random access."""
@@ -792,10 +1054,20 @@ class BgzfReader:
 
 
 class BgzfWriter:
-    """Define a BGZFWriter object."""
+    """Define a BGZFWriter object.
 
-    def __init__(self, filename=None, mode="w", fileobj=None, compresslevel=6):
+    Use the threads argument to compress the BGZF blocks in parallel using
+    a pool of threads. The blocks are still written to the file in order,
+    but note that calling the tell method must wait for all the queued
+    blocks to be written.
+    """
+
+    def __init__(
+        self, filename=None, mode="w", fileobj=None, compresslevel=6, threads=1
+    ):
         """Initilize the class."""
+        if threads < 1:
+            raise ValueError("Use threads with a minimum of 1")
         if filename and fileobj:
             raise ValueError("Supply either filename or fileobj, not both")
         if fileobj:
@@ -813,43 +1085,35 @@ class BgzfWriter:
         self._handle = handle
         self._buffer = b""
         self.compresslevel = compresslevel
+        if threads > 1:
+            self._executor = concurrent.futures.ThreadPoolExecutor(threads)
+            self._max_pending = 2 * threads
+        else:
+            self._executor = None
+        # Blocks being compressed in the background, in file order
+        self._pending = collections.deque()
 
     def _write_block(self, block):
         """Write provided data to file as a single BGZF compressed block (PRIVATE)."""
         # print("Saving %i bytes" % len(block))
-        start_offset = self._handle.tell()
+        if self._executor is None:
+            self._handle.write(_deflate_bgzf_block(block, self.compresslevel))
+            return
         if len(block) > 65536:
             raise ValueError(f"{len(block)} Block length > 65536")
-        # Giving a negative window bits means no gzip/zlib headers,
-        # -15 used in samtools
-        c = zlib.compressobj(
-            self.compresslevel, zlib.DEFLATED, -15, zlib.DEF_MEM_LEVEL, 0
+        self._pending.append(
+            self._executor.submit(_deflate_bgzf_block, block, self.compresslevel)
         )
-        compressed = c.compress(block) + c.flush()
-        del c
-        if len(compressed) > 65536:
-            raise RuntimeError(
-                "TODO - Didn't compress enough, try less data in this block"
-            )
-        crc = zlib.crc32(block)
-        # Should cope with a mix of Python platforms...
-        if crc < 0:
-            crc = struct.pack("<i", crc)
-        else:
-            crc = struct.pack("<I", crc)
-        bsize = struct.pack("<H", len(compressed) + 25)  # includes -1
-        crc = struct.pack("<I", zlib.crc32(block) & 0xFFFFFFFF)
-        uncompressed_length = struct.pack("<I", len(block))
-        # Fixed 16 bytes,
-        # gzip magic bytes (4) mod time (4),
-        # gzip flag (1), os (1), extra length which is six (2),
-        # sub field which is BC (2), sub field length of two (2),
-        # Variable data,
-        # 2 bytes: block length as BC sub field (2)
-        # X bytes: the data
-        # 8 bytes: crc (4), uncompressed data length (4)
-        data = _bgzf_header + bsize + compressed + crc + uncompressed_length
-        self._handle.write(data)
+        self._write_pending(self._max_pending)
+
+    def _write_pending(self, limit=0):
+        """Write out compressed blocks until at most limit are queued (PRIVATE).
+
+        The blocks are written in the order they were queued.
+        """
+        pending = self._pending
+        while len(pending) > limit:
+            self._handle.write(pending.popleft().result())
 
     def write(self, data):
         """Write method for the class."""
@@ -869,9 +1133,13 @@ class BgzfWriter:
         else:
             # print("Got %r, writing out some data..." % data)
             self._buffer += data
-            while len(self._buffer) >= 65536:
-                self._write_block(self._buffer[:65536])
-                self._buffer = self._buffer[65536:]
+            # Avoid repeatedly copying the rest of a large buffer
+            start = 0
+            end = len(self._buffer) - 65536
+            while start <= end:
+                self._write_block(self._buffer[start : start + 65536])
+                start += 65536
+            self._buffer = self._buffer[start:]
 
     def flush(self):
         """Flush data explicitally."""
@@ -880,6 +1148,7 @@ class BgzfWriter:
             self._buffer = self._buffer[65535:]
         self._write_block(self._buffer)
         self._buffer = b""
+        self._write_pending()
         self._handle.flush()
 
     def close(self):
@@ -892,12 +1161,17 @@ class BgzfWriter:
         """
         if self._buffer:
             self.flush()
+        if self._executor is not None:
+            self._write_pending()
+            self._executor.shutdown()
+            self._executor = None
         self._handle.write(_bgzf_eof)
         self._handle.flush()
         self._handle.close()
 
     def tell(self):
         """Return a BGZF 64-bit virtual offset."""
+        self._write_pending()
         return make_virtual_offset(self._handle.tell(), len(self._buffer))
 
     def seekable(self):
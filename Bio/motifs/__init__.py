@@ -618,6 +618,104 @@ def write(motifs, fmt):
         raise ValueError("Unknown format type %s" % fmt)
 
 
+def search(motifs, sequences, threshold=0.0, both=True, processes=1, chunksize=10**6):
+    """Search many sequences for the hits of many DNA motifs.
+
+    Arguments:
+     - motifs - a list of Motif objects (searched using their pssm), or of
+       PositionSpecificScoringMatrix objects, e.g. a JASPAR collection.
+     - sequences - an iterable of SeqRecord, Seq or string objects, for
+       example from Bio.SeqIO.parse(handle, "fasta").
+     - threshold - minimum score of a hit, either a single number or a list
+       with the threshold for each motif.
+     - both - search the reverse strand as well as the forward strand?
+     - processes - number of worker processes to search the sequences in
+       parallel (default 1 searches in this process, None uses a process
+       for each CPU).
+     - chunksize - long sequences are scored this many positions at a time.
+
+    The log-odds matrices of the motifs are computed once, and then each
+    sequence is scored against all of them. This is much faster than calling
+    the search method of each PSSM in turn, and the results are returned as
+    a NumPy structured array with one element for each hit, with fields
+    motif (index into the motifs list), sequence (index of the sequence),
+    position (zero based start of the hit on the forward strand), strand
+    (1 or -1) and score. Hits are sorted by sequence, motif and position.
+
+    >>> from Bio import motifs
+    >>> with open("motifs/SRF.pfm") as handle:
+    ...     srf = motifs.read(handle, "pfm")
+    >>> with open("motifs/Arnt.sites") as handle:
+    ...     arnt = motifs.read(handle, "sites")
+    >>> sequences = ["GTTAGCCCATATATGGTACAC", "CACGTGTTT"]
+    >>> hits = motifs.search([srf, arnt], sequences, threshold=5.0)
+    >>> for hit in hits:
+    ...     print(hit["motif"], hit["sequence"], hit["position"], hit["strand"])
+    0 0 4 1
+    0 0 6 -1
+    1 1 0 1
+    1 1 0 -1
+
+    """
+    import os
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    import numpy as np
+
+    from Bio.motifs import matrix
+
+    matrices = []
+    for motif in motifs:
+        if isinstance(motif, Motif):
+            motif = motif.pssm
+        if sorted(motif.alphabet) != ["A", "C", "G", "T"]:
+            raise ValueError(
+                "PSSM has wrong alphabet: %s - Use only with DNA motifs"
+                % motif.alphabet
+            )
+        logodds = motif._logodds()
+        if both:
+            matrices.append((logodds, motif.reverse_complement()._logodds()))
+        else:
+            matrices.append((logodds, None))
+    try:
+        thresholds = [float(threshold)] * len(matrices)
+    except TypeError:
+        thresholds = [float(value) for value in threshold]
+        if len(thresholds) != len(matrices):
+            raise ValueError("Expected a threshold for each motif") from None
+    sequences = (
+        matrix._as_bytes(getattr(sequence, "seq", sequence)) for sequence in sequences
+    )
+    if processes == 1:
+        hits = [
+            matrix._search_sequence(sequence, matrices, thresholds, chunksize)
+            for sequence in sequences
+        ]
+    else:
+        if processes is None:
+            processes = os.cpu_count() or 1
+        hits = []
+        with ProcessPoolExecutor(
+            processes,
+            initializer=matrix._search_initializer,
+            initargs=(matrices, thresholds, chunksize),
+        ) as executor:
+            # Limit how many sequences are held in memory waiting to be searched
+            pending = deque()
+            for sequence in sequences:
+                if len(pending) >= 2 * processes:
+                    hits.append(pending.popleft().result())
+                pending.append(executor.submit(matrix._search_worker, sequence))
+            hits.extend(future.result() for future in pending)
+    for index, result in enumerate(hits):
+        result["sequence"] = index
+    if hits:
+        return np.concatenate(hits)
+    return np.zeros(0, matrix._search_dtype)
+
+
 if __name__ == "__main__":
     from Bio._utils import run_doctest
 
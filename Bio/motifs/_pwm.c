@@ -9,6 +9,7 @@
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
 #include <math.h>
+#include <string.h>
 
 
 static void
@@ -16,45 +17,36 @@ calculate(const char sequence[], int s, Py_ssize_t m, double* matrix,
           Py_ssize_t n, float* scores)
 {
     Py_ssize_t i, j;
-    char c;
+    int k;
     double score;
-    int ok;
+    signed char columns[256];
     float* p = scores;
 #ifndef NAN
     float NAN = 0.0;
     NAN /= NAN;
 #endif
 
+    /* Handling mixed case input here rather than converting it to uppercase
+       in Python code first, since doing so could use too much memory if
+       sequence is too long (e.g. chromosome or plasmid). Looking up the
+       matrix column of each letter avoids a hard to predict branch for each
+       letter of the sequence. */
+    memset(columns, -1, sizeof(columns));
+    columns['A'] = columns['a'] = 0;
+    columns['C'] = columns['c'] = 1;
+    columns['G'] = columns['g'] = 2;
+    columns['T'] = columns['t'] = 3;
+
     for (i = 0; i < n; i++)
     {
         score = 0.0;
-        ok = 1;
         for (j = 0; j < m; j++)
         {
-            c = sequence[i+j];
-            switch (c)
-            {
-              /* Handling mixed case input here rather than converting it to
-                 uppercase in Python code first, since doing so could use too
-                 much memory if sequence is too long (e.g. chromosome or
-                 plasmid). */
-                case 'A':
-                case 'a':
-                    score += matrix[j*4+0]; break;
-                case 'C':
-                case 'c':
-                    score += matrix[j*4+1]; break;
-                case 'G':
-                case 'g':
-                    score += matrix[j*4+2]; break;
-                case 'T':
-                case 't':
-                    score += matrix[j*4+3]; break;
-                default:
-                    ok = 0;
-            }
+            k = columns[(unsigned char)sequence[i+j]];
+            if (k < 0) break;
+            score += matrix[j*4+k];
         }
-        if (ok) *p = (float)score;
+        if (j == m) *p = (float)score;
         else *p = NAN;
         p++;
     }
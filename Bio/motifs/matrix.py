@@ -11,6 +11,7 @@ Implementation of frequency (count) matrices, position-weight matrices,
 and position-specific scoring matrices.
 """
 
+import copy
 import math
 import numbers
 
@@ -344,62 +345,52 @@ class PositionSpecificScoringMatrix(GenericPositionMatrix):
                 "PSSM has wrong alphabet: %s - Use only with DNA motifs" % self.alphabet
             )
 
-        # NOTE: The C code handles mixed case input as this could be large
-        # (e.g. contig or chromosome), so requiring it be all upper or lower
-        # case would impose an overhead to allocate the extra memory.
-        try:
-            sequence = bytes(sequence)
-        except TypeError:  # str
-            try:
-                sequence = bytes(sequence, "ASCII")
-            except TypeError:
-                raise ValueError(
-                    "sequence should be a Seq, MutableSeq, string, or bytes-like object"
-                ) from None
-            except UnicodeEncodeError:
-                raise ValueError(
-                    "sequence should contain ASCII characters only"
-                ) from None
-        except Exception:
-            raise ValueError(
-                "sequence should be a Seq, MutableSeq, string, or bytes-like object"
-            ) from None
-
-        n = len(sequence)
-        m = self.length
-        # Create the numpy arrays here; the C module then does not rely on numpy
-        # Use a float32 for the scores array to save space
-        scores = np.empty(n - m + 1, np.float32)
-        logodds = np.array(
-            [[self[letter][i] for letter in "ACGT"] for i in range(m)], float
-        )
-        _pwm.calculate(sequence, logodds, scores)
-
+        sequence = _as_bytes(sequence)
+        scores = _calculate(sequence, self._logodds())
         if len(scores) == 1:
             return scores[0]
         else:
             return scores
 
+    def _logodds(self):
+        """Return the log-odds scores as a NumPy array for the C code (PRIVATE).
+
+        The array has a row for each position, and a column for each of the
+        letters A, C, G and T (in that order).
+        """
+        return np.array(
+            [[self[letter][i] for letter in "ACGT"] for i in range(self.length)],
+            float,
+        )
+
     def search(self, sequence, threshold=0.0, both=True, chunksize=10**6):
         """Find hits with PWM score above given threshold.
 
         A generator function, returning found hits in the given sequence
         with the pwm score higher than the threshold.
         """
+        if sorted(self.alphabet) != ["A", "C", "G", "T"]:
+            raise ValueError(
+                "PSSM has wrong alphabet: %s - Use only with DNA motifs" % self.alphabet
+            )
         sequence = sequence.upper()
         seq_len = len(sequence)
         motif_l = self.length
         chunk_starts = np.arange(0, seq_len, chunksize)
+        # Only calculate the log-odds arrays once, not for every chunk
+        logodds = self._logodds()
         if both:
-            rc = self.reverse_complement()
+            rc_logodds = self.reverse_complement()._logodds()
         for chunk_start in chunk_starts:
-            subseq = sequence[chunk_start : chunk_start + chunksize + motif_l - 1]
-            pos_scores = self.calculate(subseq)
+            subseq = _as_bytes(
+                sequence[chunk_start : chunk_start + chunksize + motif_l - 1]
+            )
+            pos_scores = _calculate(subseq, logodds)
             pos_ind = pos_scores >= threshold
             pos_positions = np.where(pos_ind)[0] + chunk_start
             pos_scores = pos_scores[pos_ind]
             if both:
-                neg_scores = rc.calculate(subseq)
+                neg_scores = _calculate(subseq, rc_logodds)
                 neg_ind = neg_scores >= threshold
                 neg_positions = np.where(neg_ind)[0] + chunk_start
                 neg_scores = neg_scores[neg_ind]
@@ -538,7 +529,18 @@ class PositionSpecificScoringMatrix(GenericPositionMatrix):
         return numerator / denominator
 
     def distribution(self, background=None, precision=10**3):
-        """Calculate the distribution of the scores at the given precision."""
+        """Calculate the distribution of the scores at the given precision.
+
+        The distributions of the most recently used matrices are cached (keyed
+        by the log-odds scores, background and precision), so that asking for
+        the same distribution again, e.g. to set thresholds for a database of
+        motifs more than once, only looks up the thresholds already found.
+        The cache is kept in memory for the current Python session only.
+
+        Each call returns a new ScoreDistribution object, so calling its
+        modify method does not change the cached distribution. The density
+        arrays of the cached distribution are shared, and are read only.
+        """
         from .thresholds import ScoreDistribution
 
         if background is None:
@@ -548,4 +550,123 @@ class PositionSpecificScoringMatrix(GenericPositionMatrix):
         total = sum(background.values())
         for letter in self.alphabet:
             background[letter] /= total
-        return ScoreDistribution(precision=precision, pssm=self, background=background)
+        key = (
+            precision,
+            tuple(
+                (letter, background[letter], tuple(self[letter]))
+                for letter in self.alphabet
+            ),
+        )
+        try:
+            distribution = _distributions.pop(key)
+        except KeyError:
+            distribution = ScoreDistribution(
+                precision=precision, pssm=self, background=background
+            )
+            distribution.mo_density.flags.writeable = False
+            distribution.bg_density.flags.writeable = False
+            if len(_distributions) >= _DISTRIBUTION_CACHE_SIZE:
+                del _distributions[next(iter(_distributions))]
+        _distributions[key] = distribution
+        # The modify method replaces the densities and the thresholds found,
+        # so a shallow copy is enough to keep the cached distribution intact.
+        return copy.copy(distribution)
+
+
+# Cache of the score distributions calculated by the PSSM distribution
+# method, with the most recently used last:
+_DISTRIBUTION_CACHE_SIZE = 256
+_distributions = {}
+
+
+def _as_bytes(sequence):
+    """Return the sequence as bytes for the C code (PRIVATE)."""
+    # NOTE: The C code handles mixed case input as this could be large
+    # (e.g. contig or chromosome), so requiring it be all upper or lower
+    # case would impose an overhead to allocate the extra memory.
+    try:
+        return bytes(sequence)
+    except TypeError:  # str
+        try:
+            return bytes(sequence, "ASCII")
+        except TypeError:
+            raise ValueError(
+                "sequence should be a Seq, MutableSeq, string, or bytes-like object"
+            ) from None
+        except UnicodeEncodeError:
+            raise ValueError("sequence should contain ASCII characters only") from None
+    except Exception:
+        raise ValueError(
+            "sequence should be a Seq, MutableSeq, string, or bytes-like object"
+        ) from None
+
+
+def _calculate(sequence, logodds):
+    """Return the scores of the log-odds array at each position (PRIVATE).
+
+    Arguments sequence (bytes) and logodds (as returned by the _logodds
+    method) are passed to the C code. Returns a float32 NumPy array, which
+    is empty if the sequence is shorter than the motif.
+    """
+    n = len(sequence) - len(logodds) + 1
+    # Create the numpy arrays here; the C module then does not rely on numpy
+    # Use a float32 for the scores array to save space
+    scores = np.empty(max(n, 0), np.float32)
+    if n > 0:
+        _pwm.calculate(sequence, logodds, scores)
+    return scores
+
+
+# Data type of the hits returned by Bio.motifs.search
+_search_dtype = np.dtype(
+    [
+        ("motif", np.intp),
+        ("sequence", np.intp),
+        ("position", np.intp),
+        ("strand", np.int8),
+        ("score", np.float32),
+    ]
+)
+
+
+def _search_sequence(sequence, matrices, thresholds, chunksize):
+    """Return the hits of all the matrices in one sequence (PRIVATE).
+
+    Arguments matrices is a list of (forward, reverse) log-odds arrays, with
+    reverse None to search only the forward strand, and thresholds a list of
+    the minimum score for each. Returns a structured NumPy array of the hits
+    (with the sequence field left as zero), sorted by motif then position.
+    """
+    hits = []
+    for chunk_start in range(0, len(sequence), chunksize):
+        for motif, (logodds, threshold) in enumerate(zip(matrices, thresholds)):
+            chunk = sequence[
+                chunk_start : chunk_start + chunksize + len(logodds[0]) - 1
+            ]
+            for strand, array in zip((1, -1), logodds):
+                if array is None:
+                    continue
+                scores = _calculate(chunk, array)
+                positions = np.flatnonzero(scores >= threshold)
+                found = np.zeros(len(positions), _search_dtype)
+                found["motif"] = motif
+                found["position"] = positions + chunk_start
+                found["strand"] = strand
+                found["score"] = scores[positions]
+                hits.append(found)
+    hits = np.concatenate(hits) if hits else np.zeros(0, _search_dtype)
+    return hits[np.lexsort((-hits["strand"], hits["position"], hits["motif"]))]
+
+
+_search_arguments = None
+
+
+def _search_initializer(*args):
+    """Store the matrices and options in a worker process (PRIVATE)."""
+    global _search_arguments
+    _search_arguments = args
+
+
+def _search_worker(sequence):
+    """Search one sequence in a worker process (PRIVATE)."""
+    return _search_sequence(sequence, *_search_arguments)
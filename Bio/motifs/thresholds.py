@@ -5,6 +5,8 @@
 # as part of this package.
 """Approximate calculation of appropriate thresholds for motif finding."""
 
+import numpy as np
+
 
 class ScoreDistribution:
     """Class representing approximate score distribution for a given motif.
@@ -27,27 +29,22 @@ class ScoreDistribution:
             self.n_points = precision * pssm.length
             self.ic = pssm.mean(background)
         self.step = self.interval / (self.n_points - 1)
-        self.mo_density = [0.0] * self.n_points
+        self.mo_density = np.zeros(self.n_points)
         self.mo_density[-self._index_diff(self.min_score)] = 1.0
-        self.bg_density = [0.0] * self.n_points
+        self.bg_density = np.zeros(self.n_points)
         self.bg_density[-self._index_diff(self.min_score)] = 1.0
+        self._thresholds = {}
         if pssm is None:
             for lo, mo in zip(motif.log_odds(), motif.pwm()):
                 self.modify(lo, mo, motif.background)
         else:
             for position in range(pssm.length):
-                mo_new = [0.0] * self.n_points
-                bg_new = [0.0] * self.n_points
                 lo = pssm[:, position]
-                for letter, score in lo.items():
-                    bg = background[letter]
-                    mo = pow(2, pssm[letter, position]) * bg
-                    d = self._index_diff(score)
-                    for i in range(self.n_points):
-                        mo_new[self._add(i, d)] += self.mo_density[i] * mo
-                        bg_new[self._add(i, d)] += self.bg_density[i] * bg
-                self.mo_density = mo_new
-                self.bg_density = bg_new
+                mo = {
+                    letter: pow(2, pssm[letter, position]) * background[letter]
+                    for letter in lo
+                }
+                self.modify(lo, mo, background)
 
     def _index_diff(self, x, y=0.0):
         return int((x - y + 0.5 * self.step) // self.step)
@@ -55,49 +52,91 @@ class ScoreDistribution:
     def _add(self, i, j):
         return max(0, min(self.n_points - 1, i + j))
 
+    def _shift(self, density, d):
+        """Return the density moved d points up, piling up at the ends (PRIVATE).
+
+        This is the same as adding density[i] to point _add(i, d) for all i.
+        """
+        n = self.n_points
+        shifted = np.zeros(n)
+        if d >= n:
+            shifted[-1] = density.sum()
+        elif d <= -n:
+            shifted[0] = density.sum()
+        elif d >= 0:
+            shifted[d:] = density[: n - d]
+            shifted[-1] += density[n - d :].sum()
+        else:
+            shifted[: n + d] = density[-d:]
+            shifted[0] += density[:-d].sum()
+        return shifted
+
     def modify(self, scores, mo_probs, bg_probs):
         """Modify motifs and background density."""
-        mo_new = [0.0] * self.n_points
-        bg_new = [0.0] * self.n_points
+        mo_new = np.zeros(self.n_points)
+        bg_new = np.zeros(self.n_points)
         for k, v in scores.items():
             d = self._index_diff(v)
-            for i in range(self.n_points):
-                mo_new[self._add(i, d)] += self.mo_density[i] * mo_probs[k]
-                bg_new[self._add(i, d)] += self.bg_density[i] * bg_probs[k]
+            mo_new += self._shift(self.mo_density, d) * mo_probs[k]
+            bg_new += self._shift(self.bg_density, d) * bg_probs[k]
         self.mo_density = mo_new
         self.bg_density = bg_new
+        self._thresholds = {}
 
     def threshold_fpr(self, fpr):
         """Approximate the log-odds threshold which makes the type I error (false positive rate)."""
-        i = self.n_points
-        prob = 0.0
-        while prob < fpr:
-            i -= 1
-            prob += self.bg_density[i]
-        return self.min_score + i * self.step
+        key = ("fpr", fpr)
+        try:
+            return self._thresholds[key]
+        except KeyError:
+            pass
+        # Cumulative probability of the top scoring points, as summed up one
+        # point at a time going down from the maximum score:
+        prob = np.cumsum(self.bg_density[::-1])
+        if fpr > 0.0:
+            i = self.n_points - 1 - int(np.searchsorted(prob, fpr))
+        else:
+            i = self.n_points
+        threshold = self.min_score + max(i, 0) * self.step
+        self._thresholds[key] = threshold
+        return threshold
 
     def threshold_fnr(self, fnr):
         """Approximate the log-odds threshold which makes the type II error (false negative rate)."""
-        i = -1
-        prob = 0.0
-        while prob < fnr:
-            i += 1
-            prob += self.mo_density[i]
-        return self.min_score + i * self.step
+        key = ("fnr", fnr)
+        try:
+            return self._thresholds[key]
+        except KeyError:
+            pass
+        prob = np.cumsum(self.mo_density)
+        if fnr > 0.0:
+            i = int(np.searchsorted(prob, fnr))
+        else:
+            i = -1
+        threshold = self.min_score + min(i, self.n_points - 1) * self.step
+        self._thresholds[key] = threshold
+        return threshold
 
     def threshold_balanced(self, rate_proportion=1.0, return_rate=False):
         """Approximate log-odds threshold making FNR equal to FPR times rate_proportion."""
-        i = self.n_points
-        fpr = 0.0
-        fnr = 1.0
-        while fpr * rate_proportion < fnr:
-            i -= 1
-            fpr += self.bg_density[i]
-            fnr -= self.mo_density[i]
+        key = ("balanced", rate_proportion)
+        try:
+            threshold, fpr = self._thresholds[key]
+        except KeyError:
+            # The false positive and negative rates at each threshold, going
+            # down from the maximum score:
+            fprs = np.cumsum(self.bg_density[::-1])
+            fnrs = np.subtract.accumulate(np.append(1.0, self.mo_density[::-1]))[1:]
+            k = int(np.argmax(fprs * rate_proportion >= fnrs))
+            if fprs[k] * rate_proportion < fnrs[k]:
+                k = self.n_points - 1
+            threshold = self.min_score + (self.n_points - 1 - k) * self.step
+            fpr = float(fprs[k])
+            self._thresholds[key] = threshold, fpr
         if return_rate:
-            return self.min_score + i * self.step, fpr
+            return threshold, fpr
         else:
-            return self.min_score + i * self.step
+            return threshold
 
     def threshold_patser(self):
         """Threshold selection mimicking the behaviour of patser (Hertz, Stormo 1999) software.
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+
+"""Compare full, banded, and X-drop pairwise alignment scores.
+
+Aligns a random DNA sequence to a copy with about 5% substitutions and 1%
+short insertions and deletions, calculating the score with the full dynamic
+programming matrix, restricted to a band of diagonals (band_width), and with
+X-drop termination (xdrop), for global and local affine gap alignments of
+10 kb and 100 kb sequences (or the given lengths). The full matrix is only
+used for sequences of up to 20 kb, as it takes time proportional to the
+product of the sequence lengths; where it is used, the banded and X-drop
+scores are checked against it.
+
+Usage: python pairwise_banded.py [sequence length ...]
+"""
+
+import random
+import sys
+import time
+
+from Bio.Align import PairwiseAligner
+
+
+def mutate(seq, substitutions=0.05, indels=0.01):
+    """Return a copy of the sequence with random substitutions and indels."""
+    letters = []
+    for letter in seq:
+        r = random.random()
+        if r < indels / 2:
+            continue  # deletion
+        if r < indels:
+            letters.append(random.choice("ACGT"))  # insertion
+        if random.random() < substitutions:
+            letter = random.choice("ACGT")
+        letters.append(letter)
+    return "".join(letters)
+
+
+def timed(function, *args):
+    """Return the result and the time taken by calling the function."""
+    start = time.time()
+    result = function(*args)
+    return result, time.time() - start
+
+
+def report(mode, method, score, seconds):
+    """Print the score and time taken."""
+    print("%-6s %-16s %10.1f %8.3f s" % (mode, method, score, seconds))
+
+
+def main(lengths):
+    """Run the benchmark for sequences of the given lengths."""
+    aligner = PairwiseAligner()
+    aligner.match_score = 2
+    aligner.mismatch_score = -3
+    aligner.open_gap_score = -5
+    aligner.extend_gap_score = -2
+    for length in lengths:
+        target = "".join(random.choice("ACGT") for i in range(length))
+        query = mutate(target)
+        print(f"Target {len(target)} bp, query {len(query)} bp")
+        for mode in ("global", "local"):
+            aligner.mode = mode
+            if length <= 20000:
+                full, full_time = timed(aligner.score, target, query)
+                report(mode, "full matrix", full, full_time)
+            else:
+                full = None
+            # Wide enough to cover the drift of the diagonal due to the indels
+            aligner.band_width = max(100, abs(len(query) - len(target)) + 50)
+            aligner.band_offset = 0
+            score, seconds = timed(aligner.score, target, query)
+            report(mode, f"band_width {aligner.band_width}", score, seconds)
+            if full is not None:
+                assert score == full
+            aligner.band_width = None
+            aligner.xdrop = 50
+            score, seconds = timed(aligner.score, target, query)
+            report(mode, "xdrop 50", score, seconds)
+            if full is not None:
+                assert score == full
+            aligner.xdrop = None
+
+
+if __name__ == "__main__":
+    main([int(argument) for argument in sys.argv[1:]] or [10000, 100000])
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+
+"""Compare local alignment scores calculated with and without a query profile.
+
+Scores a random protein query against a number of random protein targets
+(including mutated copies of the query) using BLOSUM62 with affine gaps, and
+a random DNA query against DNA targets, first by calling the score method of
+the aligner for each target, and then by calling the score method of the
+query profile returned by the prepare method of the aligner, which uses the
+striped Smith-Waterman algorithm. The scores are checked to be the same.
+
+Usage: python pairwise_profile.py [query length] [number of targets]
+"""
+
+import random
+import sys
+import time
+
+from Bio.Align import PairwiseAligner
+from Bio.Align import substitution_matrices
+
+
+def mutate(seq, alphabet, substitutions=0.2):
+    """Return a copy of the sequence with random substitutions."""
+    return "".join(
+        random.choice(alphabet) if random.random() < substitutions else letter
+        for letter in seq
+    )
+
+
+def run(aligner, alphabet, length, number):
+    """Score the targets against the query with and without a query profile."""
+    query = "".join(random.choice(alphabet) for i in range(length))
+    targets = []
+    for i in range(number):
+        if i % 10 == 0:
+            targets.append(mutate(query, alphabet))
+        else:
+            targets.append("".join(random.choice(alphabet) for i in range(length)))
+    start = time.time()
+    scores = [aligner.score(target, query) for target in targets]
+    seconds = time.time() - start
+    print("aligner.score  %8.3f s" % seconds)
+    start = time.time()
+    profile = aligner.prepare(query)
+    profile_scores = [profile.score(target) for target in targets]
+    profile_seconds = time.time() - start
+    print(
+        "profile.score  %8.3f s (%.1f times faster)"
+        % (profile_seconds, seconds / profile_seconds)
+    )
+    assert scores == profile_scores
+
+
+def main(length, number):
+    """Run the benchmark for a protein and a DNA query."""
+    aligner = PairwiseAligner(mode="local")
+    aligner.substitution_matrix = substitution_matrices.load("BLOSUM62")
+    aligner.open_gap_score = -11
+    aligner.extend_gap_score = -1
+    print(f"Protein query of {length} amino acids, {number} targets")
+    run(aligner, "ARNDCQEGHILKMFPSTWYV", length, number)
+    aligner = PairwiseAligner(mode="local")
+    aligner.match_score = 2
+    aligner.mismatch_score = -3
+    aligner.open_gap_score = -5
+    aligner.extend_gap_score = -2
+    print(f"DNA query of {length} nucleotides, {number} targets")
+    run(aligner, "ACGT", length, number)
+
+
+if __name__ == "__main__":
+    arguments = [int(argument) for argument in sys.argv[1:]]
+    main(*(arguments + [500, 500][len(arguments) :]))
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+
+"""Compare restriction site searching of AllEnzymes one enzyme at a time.
+
+Searches a random sequence (or the first record of a FASTA file) for the
+sites of every enzyme in Bio.Restriction.AllEnzymes, first calling the
+search method of each enzyme in turn (one regular expression scan of the
+whole sequence per enzyme), then using RestrictionBatch.search (which finds
+the sites of all the enzymes from a single index of the sequence), and
+checks both give the same results.
+
+Usage: python restriction_search.py [sequence length or FASTA filename]
+"""
+
+import os
+import random
+import sys
+import time
+
+from Bio import SeqIO
+from Bio.Restriction import AllEnzymes, RestrictionBatch
+from Bio.Seq import Seq
+
+
+def main(argument):
+    """Run the benchmark on a random sequence or a FASTA file."""
+    if os.path.isfile(argument):
+        record = next(SeqIO.parse(argument, "fasta"))
+        seq = record.seq.upper()
+        print(f"Searching {record.id}, {len(seq)} bp")
+    else:
+        seq = Seq("".join(random.choice("ACGT") for i in range(int(argument))))
+        print(f"Searching random sequence, {len(seq)} bp")
+    for linear in (True, False):
+        start = time.time()
+        expected = {enzyme: enzyme.search(seq, linear) for enzyme in AllEnzymes}
+        each = time.time() - start
+        start = time.time()
+        results = RestrictionBatch(AllEnzymes).search(seq, linear)
+        batch = time.time() - start
+        assert results == expected
+        print(
+            "%-8s %i enzymes, %i sites: %7.2f s each enzyme, %7.2f s batch"
+            % (
+                "linear" if linear else "circular",
+                len(AllEnzymes),
+                sum(len(sites) for sites in results.values()),
+                each,
+                batch,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "1000000")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+
+"""Compare memory use and lookup speed of Bio.SeqIO.index key storage.
+
+Writes a FASTQ file of synthetic reads to a temporary directory, then in a
+fresh process for each backend indexes it with the default dict storage,
+with compact=True, and with an index_filename (memory mapped), reporting
+the growth in resident memory (RSS) and the mean time per key lookup.
+
+Usage: python seqio_index_memory.py [number of reads]
+"""
+
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+from Bio import SeqIO
+
+
+def rss():
+    """Return the current resident set size in MB."""
+    try:
+        with open("/proc/self/statm") as handle:
+            pages = int(handle.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024**2
+    except OSError:
+        # Peak rather than current, but fine in a fresh process
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(filename, options, queue):
+    """Index the file and report (MB used, build seconds, lookup microseconds)."""
+    before = rss()
+    start = time.time()
+    records = SeqIO.index(filename, "fastq", **options)
+    build = time.time() - start
+    after = rss()
+    keys = random.sample(list(records), min(100000, len(records)))
+    offsets = records._offsets
+    start = time.time()
+    for key in keys:
+        offsets[key]
+    lookup = (time.time() - start) / len(keys) * 1e6
+    records.close()
+    queue.put((after - before, build, lookup))
+
+
+def main(count):
+    """Run the benchmark on the given number of reads."""
+    temp_dir = tempfile.mkdtemp()
+    filename = os.path.join(temp_dir, "reads.fastq")
+    index_filename = os.path.join(temp_dir, "reads.fastq.idx")
+    with open(filename, "w") as handle:
+        for i in range(count):
+            handle.write(
+                "@HWI-ST1234:8:1101:%i:%i/1\nACGTACGTAC\n+\nIIIIIIIIII\n"
+                % (i // 1000, i % 1000)
+            )
+    print(f"Indexing {count} reads")
+    context = multiprocessing.get_context("spawn")
+    backends = [
+        ("dict", {}),
+        ("compact", {"compact": True}),
+        ("index_filename (build)", {"index_filename": index_filename}),
+        ("index_filename (reuse)", {"index_filename": index_filename}),
+    ]
+    try:
+        for name, options in backends:
+            queue = context.Queue()
+            process = context.Process(target=measure, args=(filename, options, queue))
+            process.start()
+            memory, build, lookup = queue.get()
+            process.join()
+            print(
+                "%-24s %8.1f MB %8.2f s to index %6.2f us per lookup"
+                % (name, memory, build, lookup)
+            )
+    finally:
+        for name in os.listdir(temp_dir):
+            os.remove(os.path.join(temp_dir, name))
+        os.rmdir(temp_dir)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
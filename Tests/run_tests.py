@@ -73,6 +73,7 @@ if numpy is None:
         [
             "Bio.Affy.CelFile",
             "Bio.Align",
+            "Bio.Align.bam",
             "Bio.Align.substitution_matrices",
             "Bio.Cluster",
             "Bio.kNN",
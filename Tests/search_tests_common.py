@@ -116,6 +116,9 @@ class CheckIndex(SearchTestBaseClass):
             "Should be %i records in %s, index says %i"
             % (len(parsed), filename, len(indexed)),
         )
+        # compare values by index, with the compact key/offset storage
+        compact_indexed = SearchIO.index(filename, format, compact=True, **kwargs)
+        self.assertEqual(list(indexed), list(compact_indexed))
         # compare values by index_db, only if sqlite3 is present
         if sqlite3 is not None:
             db_indexed = SearchIO.index_db(":memory:", [filename], format, **kwargs)
@@ -132,6 +135,7 @@ class CheckIndex(SearchTestBaseClass):
             self.assertNotEqual(id(qres), id(idx_qres))
             # but they should have the same attribute values
             self.compare_search_obj(qres, idx_qres)
+            self.compare_search_obj(qres, compact_indexed[qres.id])
             # sqlite3 comparison, only if it's present
             if sqlite3 is not None:
                 dbidx_qres = db_indexed[qres.id]
@@ -139,6 +143,7 @@ class CheckIndex(SearchTestBaseClass):
                 self.compare_search_obj(qres, dbidx_qres)
 
         indexed.close()
+        compact_indexed.close()
         if sqlite3 is not None:
             db_indexed.close()
             db_indexed._con.close()
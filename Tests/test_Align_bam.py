@@ -0,0 +1,300 @@
+# Copyright 2022 by Michiel de Hoon.  All rights reserved.
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for Align.bam module."""
+import os
+import tempfile
+import unittest
+import warnings
+
+
+from Bio.Align import Alignment
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+from Bio import BiopythonExperimentalWarning
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", BiopythonExperimentalWarning)
+    from Bio.Align import bam, sam
+
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+
+    raise MissingPythonDependencyError(
+        "Install numpy if you want to use Bio.Align.bam."
+    ) from None
+
+
+class TestAlign_ex1(unittest.TestCase):
+
+    # The BAM files ex1.bam, ex1_header.bam, and ex1_refresh.bam were generated
+    # from ex1.sam and ex1_header.sam by samtools.
+
+    def check_last_alignment(self, alignment):
+        self.assertEqual(alignment.sequences[0].id, "chr2")
+        self.assertEqual(len(alignment.sequences[0].seq), 1584)
+        self.assertEqual(alignment.sequences[1].id, "EAS114_26:7:37:79:581")
+        self.assertEqual(
+            alignment.sequences[1].seq, "TTTTCTGGCATGAAAAAAAAAAAAAAAAAAAAAAA"
+        )
+        self.assertEqual(alignment.flag, 83)
+        self.assertEqual(alignment.mapq, 68)
+        self.assertTrue(
+            numpy.array_equal(
+                alignment.coordinates, numpy.array([[1532, 1567], [35, 0]])
+            )
+        )
+        self.assertEqual(alignment.rnext, "chr2")
+        self.assertEqual(alignment.pnext, 1348)
+        self.assertEqual(alignment.tlen, -219)
+        self.assertEqual(
+            alignment.sequences[1].letter_annotations["phred_quality"],
+            "3,,,===6===<===<;=====-============",
+        )
+        self.assertEqual(len(alignment.annotations), 6)
+        self.assertEqual(alignment.annotations["MF"], 18)
+        self.assertEqual(alignment.annotations["Aq"], 27)
+        self.assertEqual(alignment.annotations["NM"], 2)
+        self.assertEqual(alignment.annotations["UQ"], 23)
+        self.assertEqual(alignment.annotations["H0"], 0)
+        self.assertEqual(alignment.annotations["H1"], 1)
+
+    def check_same_alignments(self, alignments1, alignments2):
+        n = 0
+        for alignment1, alignment2 in zip(alignments1, alignments2):
+            n += 1
+            self.assertEqual(alignment1.query.id, alignment2.query.id)
+            self.assertEqual(alignment1.query.seq, alignment2.query.seq)
+            self.assertEqual(
+                alignment1.query.letter_annotations,
+                alignment2.query.letter_annotations,
+            )
+            self.assertEqual(alignment1.flag, alignment2.flag)
+            for key in ("mapq", "rnext", "pnext", "tlen", "score", "annotations"):
+                self.assertEqual(
+                    getattr(alignment1, key, None), getattr(alignment2, key, None)
+                )
+            if alignment1.flag & 0x4:  # unmapped
+                self.assertIsNone(alignment1.target)
+                self.assertIsNone(alignment2.target)
+                self.assertIsNone(alignment1.coordinates)
+                self.assertIsNone(alignment2.coordinates)
+            else:
+                self.assertEqual(alignment1.target.id, alignment2.target.id)
+                self.assertTrue(
+                    numpy.array_equal(alignment1.coordinates, alignment2.coordinates)
+                )
+        return n
+
+    def test_ex1(self):
+        alignments = bam.AlignmentIterator("SamBam/ex1.bam")
+        self.assertEqual(alignments.metadata, {})
+        self.assertEqual(len(alignments.targets), 2)
+        self.assertEqual(len(alignments.targets["chr1"].seq), 1575)
+        self.assertEqual(len(alignments.targets["chr2"].seq), 1584)
+        n = 0
+        for alignment in alignments:
+            n += 1
+        self.assertEqual(n, 3270)
+        self.check_last_alignment(alignment)
+
+    def test_ex1_header(self):
+        alignments = bam.AlignmentIterator("SamBam/ex1_header.bam")
+        self.assertEqual(alignments.metadata["HD"], {"VN": "1.3", "SO": "coordinate"})
+        self.assertEqual(len(alignments.targets), 2)
+        sam_alignments = sam.AlignmentIterator("SamBam/ex1_header.sam")
+        n = self.check_same_alignments(alignments, sam_alignments)
+        self.assertEqual(n, 3270)
+        # ex1_refresh.bam has the same alignments, without the header text
+        alignments = bam.AlignmentIterator("SamBam/ex1_refresh.bam")
+        self.assertEqual(alignments.metadata, {})
+        self.assertEqual(len(alignments.targets), 2)
+        sam_alignments = sam.AlignmentIterator("SamBam/ex1_header.sam")
+        n = self.check_same_alignments(alignments, sam_alignments)
+        self.assertEqual(n, 3270)
+
+    def test_unmapped(self):
+        alignments = bam.AlignmentIterator("SamBam/ex1.bam")
+        alignment = next(alignments)
+        self.assertEqual(alignment.flag, 69)
+        self.assertEqual(alignment.query.id, "EAS56_57:6:190:289:82")
+        self.assertIsNone(alignment.target)
+        self.assertIsNone(alignment.coordinates)
+        self.assertEqual(alignment.query.seq, "CTCAAGGTTGTTGCAAGGGGGTCTATGTGAACAAA")
+        self.assertEqual(alignment.rnext, "chr1")
+        self.assertEqual(alignment.pnext, 99)
+
+    def test_lazy(self):
+        alignments = bam.AlignmentIterator("SamBam/ex1.bam", lazy=True)
+        for alignment in alignments:
+            pass
+        self.assertEqual(alignment.flag, 83)
+        self.assertEqual(alignment.mapq, 68)
+        self.assertEqual(alignment.rnext, "chr2")
+        self.assertEqual(alignment.pnext, 1348)
+        self.assertEqual(alignment.tlen, -219)
+        self.assertNotIn("coordinates", alignment.__dict__)
+        self.assertNotIn("sequences", alignment.__dict__)
+        self.check_last_alignment(alignment)
+        self.assertIn("coordinates", alignment.__dict__)
+        self.assertIsInstance(alignment, Alignment)
+        self.assertFalse(hasattr(alignment, "score"))
+        self.assertFalse(hasattr(alignment, "operations"))
+        lazy_alignments = bam.AlignmentIterator("SamBam/ex1.bam", lazy=True)
+        alignments = bam.AlignmentIterator("SamBam/ex1.bam")
+        n = self.check_same_alignments(lazy_alignments, alignments)
+        self.assertEqual(n, 3270)
+
+    def test_lazy_set_attributes(self):
+        alignments = bam.AlignmentIterator("SamBam/ex1.bam", lazy=True)
+        alignment = next(alignments)
+        alignment.annotations = {"mine": 1}
+        coordinates = numpy.array([[0, 5], [0, 5]])
+        alignment.coordinates = coordinates
+        self.assertEqual(alignment.query.id, "EAS56_57:6:190:289:82")
+        self.assertEqual(alignment.annotations, {"mine": 1})
+        self.assertIs(alignment.coordinates, coordinates)
+        alignment = next(alignments)
+        alignment.score = 10
+        self.assertEqual(alignment.annotations["MF"], 64)
+        self.assertEqual(alignment.score, 10)
+
+    def test_writing(self):
+        # The SAM writer, and therefore the BAM writer, cannot write unmapped
+        # alignments, so write the header and the mapped alignments only.
+        alignments = bam.AlignmentIterator("SamBam/ex1_header.bam")
+        mapped_alignments = [
+            alignment for alignment in alignments if not alignment.flag & 0x4
+        ]
+        handle, path = tempfile.mkstemp(suffix=".bam")
+        os.close(handle)
+        try:
+            writer = bam.AlignmentWriter(path)
+            writer.write_header(alignments)
+            n = writer.write_alignments(mapped_alignments)
+            writer.write_footer()
+            writer.stream.close()
+            self.assertEqual(n, 3235)
+            alignments = bam.AlignmentIterator(path)
+            self.assertEqual(
+                alignments.metadata["HD"], {"VN": "1.3", "SO": "coordinate"}
+            )
+            self.assertEqual(len(alignments.targets), 2)
+            self.assertEqual(len(alignments.targets["chr1"].seq), 1575)
+            n = self.check_same_alignments(alignments, mapped_alignments)
+            self.assertEqual(n, 3235)
+        finally:
+            os.remove(path)
+
+    def test_array_tags(self):
+        # The element type of a B (numeric array) tag is kept
+        alignments = bam.AlignmentIterator("SamBam/ex1_header.bam")
+        alignment = next(
+            alignment for alignment in alignments if not alignment.flag & 0x4
+        )
+        arrays = {
+            "Zc": numpy.array([-3, 0, 5], numpy.int8),
+            "ZC": numpy.array([0, 7, 255], numpy.uint8),
+            "Zs": numpy.array([-300, 2], numpy.int16),
+            "ZS": numpy.array([65535], numpy.uint16),
+            "Zi": numpy.array([-70000, 1], numpy.int32),
+            "ZI": numpy.array([4000000000], numpy.uint32),
+            "Zf": numpy.array([0.5, -1.25], numpy.float32),
+        }
+        alignment.annotations.update(arrays)
+        handle, path = tempfile.mkstemp(suffix=".bam")
+        os.close(handle)
+        try:
+            writer = bam.AlignmentWriter(path)
+            writer.write_file([alignment])
+            alignment = next(bam.AlignmentIterator(path))
+            for key, array in arrays.items():
+                value = alignment.annotations[key]
+                self.assertEqual(value.dtype, array.dtype, msg=key)
+                self.assertTrue(numpy.array_equal(value, array), msg=key)
+            # Formatting the record again keeps the uint8 element type
+            alignment.annotations["ZX"] = alignment.annotations["ZC"]
+            record = writer.format_alignment(alignment)
+            self.assertIn(b"ZXBC\x03\x00\x00\x00\x00\x07\xff", record)
+        finally:
+            os.remove(path)
+
+    def test_format_alignment(self):
+        # The binary record of a mapped alignment is written as by samtools
+        alignments = bam.AlignmentIterator("SamBam/ex1.bam")
+        next(alignments)  # unmapped
+        alignment = next(alignments)
+        self.assertEqual(alignment.flag, 137)
+        writer = bam.AlignmentWriter(None)
+        writer._references = {"chr1": 0, "chr2": 1}
+        data = writer.format_alignment(alignment)
+        self.assertEqual(len(data), 139)
+        self.assertEqual(
+            data[:36],
+            b"\x87\x00\x00\x00\x00\x00\x00\x00c\x00\x00\x00\x16II\x12\x01\x00\x89\x00#\x00\x00\x00\x00\x00\x00\x00c\x00\x00\x00\x00\x00\x00\x00",
+        )  # noqa: E501
+        self.assertEqual(data[-24:], b"MFC@AqC\x00NMC\x00UQC\x00H0C\x01H1C\x00")
+
+
+class TestAlign_tags(unittest.TestCase):
+    def test_tags(self):
+        target = SeqRecord(Seq("AAAACCCCGGGGTTTT"), id="chr1")
+        query = SeqRecord(Seq("CCCCGGGG"), id="read1")
+        query.letter_annotations["phred_quality"] = "IIIIHHHH"
+        coordinates = numpy.array([[4, 12], [0, 8]])
+        alignment = Alignment([target, query], coordinates)
+        alignment.score = 8
+        alignment.annotations = {
+            "XA": "x",
+            "XI": -70000,
+            "XF": 1.5,
+            "XZ": "some text",
+            "XH": b"\x1a\xe3\x01",
+            "XB": numpy.array([1, -2, 300]),
+        }
+        handle, path = tempfile.mkstemp(suffix=".bam")
+        os.close(handle)
+        try:
+            writer = bam.AlignmentWriter(path, md=True)
+            n = writer.write_file([alignment])
+            self.assertEqual(n, 1)
+            alignments = bam.AlignmentIterator(path)
+            self.assertEqual(len(alignments.targets["chr1"].seq), 16)
+            alignment = next(alignments)
+            self.assertRaises(StopIteration, next, alignments)
+        finally:
+            os.remove(path)
+        self.assertEqual(alignment.target.id, "chr1")
+        self.assertEqual(alignment.target.seq[4:12], "CCCCGGGG")
+        self.assertEqual(alignment.query.id, "read1")
+        self.assertEqual(alignment.query.seq, "CCCCGGGG")
+        self.assertEqual(
+            alignment.query.letter_annotations["phred_quality"], "IIIIHHHH"
+        )
+        self.assertTrue(numpy.array_equal(alignment.coordinates, coordinates))
+        self.assertEqual(alignment.score, 8)
+        annotations = alignment.annotations
+        self.assertEqual(len(annotations), 6)
+        self.assertEqual(annotations["XA"], "x")
+        self.assertEqual(annotations["XI"], -70000)
+        self.assertEqual(annotations["XF"], 1.5)
+        self.assertEqual(annotations["XZ"], "some text")
+        self.assertEqual(annotations["XH"], b"\x1a\xe3\x01")
+        self.assertTrue(numpy.array_equal(annotations["XB"], [1, -2, 300]))
+        # The same tags in SAM format
+        line = sam.AlignmentWriter(None).format_alignment(alignment)
+        self.assertTrue(
+            line.endswith(
+                "AS:i:8\tXA:A:x\tXI:i:-70000\tXF:f:1.5\tXZ:Z:some text\t"
+                "XH:H:1AE301\tXB:B:i,1,-2,300\n"
+            )
+        )
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -232,6 +232,51 @@ class ProtParamTest(unittest.TestCase):
             self.analysis.molar_extinction_coefficient()[1], 17545, places=5
         )
 
+    def test_protein_descriptors(self):
+        """Calculate descriptors of many proteins at once."""
+        sequences = [
+            self.seq_text,
+            "PETER",
+            "ingar",
+            "K",
+            "DDEEDDEECCYY",
+            Seq("MKWVTFISLLLLFSSAYS"),
+        ]
+        for monoisotopic in (False, True):
+            descriptors = ProtParam.protein_descriptors(
+                sequences, monoisotopic, scale="Eisenberg"
+            )
+            self.assertEqual(
+                descriptors.shape, (len(sequences), len(ProtParam.descriptor_names))
+            )
+            for sequence, row in zip(sequences, descriptors):
+                analysis = ProtParam.ProteinAnalysis(str(sequence), monoisotopic)
+                expected = [
+                    analysis.molecular_weight(),
+                    analysis.isoelectric_point(),
+                    analysis.gravy("Eisenberg"),
+                    analysis.instability_index(),
+                    analysis.aromaticity(),
+                    *analysis.secondary_structure_fraction(),
+                ]
+                self.assertEqual(list(row), expected)
+        descriptors = ProtParam.protein_descriptors(self.seq_text)
+        self.assertEqual(descriptors.shape, (1, 8))
+        self.assertEqual(ProtParam.protein_descriptors([]).shape, (0, 8))
+        self.assertRaises(ValueError, ProtParam.protein_descriptors, ["PETER", "PXTER"])
+        self.assertRaises(ValueError, ProtParam.protein_descriptors, ["PETER", ""])
+        # The index of the empty sequence is in the input, not in the batch
+        chunk = ProtParam._CHUNK
+        ProtParam._CHUNK = 10
+        try:
+            with self.assertRaisesRegex(ValueError, "protein sequence 5 is empty"):
+                ProtParam.protein_descriptors(["PETER"] * 5 + [""])
+        finally:
+            ProtParam._CHUNK = chunk
+        self.assertRaises(
+            ValueError, ProtParam.protein_descriptors, ["PETER"], scale="Wrong"
+        )
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
@@ -498,6 +498,25 @@ class RestrictionBatches(unittest.TestCase):
         search = seq / NonComm
         self.assertEqual(search[McrI], [28])
 
+    def test_search_long_sequence(self):
+        """Test batch search of a long sequence matches each enzyme's search."""
+        # Long enough for the batch to use a single site index for all enzymes
+        seq = "".join(
+            "ACGT"[(i * i + 7 * i // 3) % 4] + "ACGTN"[(i * 37) % 11 % 5]
+            for i in range(3000)
+        )
+        seq = Seq(seq + "GAATTC" + "GGTCTC" + "GAGACC" + seq[:20])
+        self.assertGreater(len(seq), Restriction._SITE_INDEX_MIN_LENGTH)
+        for linear in (True, False):
+            batch = RestrictionBatch(AllEnzymes)
+            search = batch.search(seq, linear=linear)
+            self.assertEqual(len(search), len(AllEnzymes))
+            self.assertIn(6002, search[EcoRI])
+            for enzyme in AllEnzymes:
+                self.assertEqual(
+                    search[enzyme], enzyme.search(seq, linear=linear), enzyme
+                )
+
     def test_analysis_restrictions(self):
         """Test Fancier restriction analysis."""
         new_seq = Seq("TTCAAAAAAAAAAAAAAAAAAAAAAAAAAAAGAA")
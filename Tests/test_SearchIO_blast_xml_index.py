@@ -7,6 +7,8 @@
 
 import unittest
 
+from Bio import SearchIO
+
 from search_tests_common import CheckRaw, CheckIndex
 
 
@@ -760,6 +762,17 @@ class BlastXmlIndexCases(CheckIndex):
         filename = "Blast/xml_2226_tblastn_004.xml"
         self.check_index(filename, self.fmt)
 
+    def test_blastxml_index_db_workers(self):
+        """Test blast-xml index_db of several files with worker processes."""
+        filenames = ["Blast/mirna.xml", "Blast/wnts.xml"]
+        serial = SearchIO.index_db(":memory:", filenames, self.fmt)
+        parallel = SearchIO.index_db(":memory:", filenames, self.fmt, workers=2)
+        self.assertEqual(list(serial), list(parallel))
+        for key in serial:
+            self.compare_search_obj(serial[key], parallel[key])
+        serial.close()
+        parallel.close()
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
@@ -19,7 +19,9 @@ from Bio.SeqFeature import BeforePosition
 from Bio.SeqFeature import BetweenPosition
 from Bio.SeqFeature import CompoundLocation
 from Bio.SeqFeature import ExactPosition
+from Bio.SeqFeature import FeatureIndex
 from Bio.SeqFeature import FeatureLocation
+from Bio.SeqFeature import FeatureTable
 from Bio.SeqFeature import OneOfPosition
 from Bio.SeqFeature import SeqFeature
 from Bio.SeqFeature import UnknownPosition
@@ -263,6 +265,183 @@ class TestPositions(unittest.TestCase):
         self.assertEqual(oneof_pos.position_choices, oneof_pos2.position_choices)
 
 
+class TestFeatureTable(unittest.TestCase):
+    """Tests for the FeatureTable class."""
+
+    def test_round_trip(self):
+        """Test the features of a GenBank file are recreated unchanged."""
+        for filename in ("NC_000932.gb", "NC_005816.gb", "arab1.gb"):
+            record = SeqIO.read(path.join("GenBank", filename), "genbank")
+            table = FeatureTable(record.features)
+            self.assertEqual(len(table), len(record.features))
+            self.assertEqual(list(table), record.features)
+            self.assertEqual(table[-1], record.features[-1])
+            self.assertEqual(list(table[10:20]), record.features[10:20])
+            self.assertEqual(
+                list(table.type), [feature.type for feature in record.features]
+            )
+
+    def test_locations(self):
+        """Test fuzzy, compound and missing locations."""
+        features = [
+            SeqFeature(FeatureLocation(BeforePosition(5), 20, strand=1)),
+            SeqFeature(
+                CompoundLocation(
+                    [FeatureLocation(30, 40, strand=-1), FeatureLocation(0, 10)],
+                    "order",
+                ),
+                type="misc_feature",
+                qualifiers={"note": ["mixed strands"]},
+            ),
+            SeqFeature(FeatureLocation(UnknownPosition(), 50, strand=-1)),
+            SeqFeature(None, type="unplaced"),
+            SeqFeature(FeatureLocation(45, 60, ref="ABC123.1")),
+        ]
+        table = FeatureTable(features)
+        self.assertEqual(list(table), features)
+        self.assertEqual(list(table.start), [5, 0, 0, 0, 45])
+        self.assertEqual(list(table.end), [20, 40, 0, 0, 60])
+        self.assertEqual(list(table.strand), [1, FeatureTable.NO_STRAND, -1, 2, 2])
+        self.assertEqual(list(table.offsets), [0, 1, 3, 3, 3, 4])
+        self.assertEqual(table[1].location.operator, "order")
+        self.assertIsNone(table[1].strand)
+        self.assertEqual(list(table.mask(start=12, end=35)), [1, 1, 0, 0, 0])
+        self.assertEqual(list(table.mask(start=12, end=29)), [1, 0, 0, 0, 0])
+        self.assertEqual(list(table.mask(start=50)), [0, 0, 0, 0, 1])
+        self.assertEqual(list(table.mask(strand=-1)), [0, 0, 1, 0, 0])
+        self.assertEqual(list(table.mask(type=["unplaced", "gene"])), [0, 0, 0, 1, 0])
+        self.assertEqual(table.select(end=5)[0], features[1])
+        self.assertEqual(len(FeatureTable()), 0)
+        self.assertEqual(len(table.select("gene")), 0)
+        self.assertRaises(IndexError, table.__getitem__, 5)
+
+    def test_qualifiers(self):
+        """Test qualifier values of various types, including unhashable ones."""
+        qualifiers = {
+            "gene": ["abc"],
+            "pair": ("x", "y"),
+            "score": 5,
+            "db_xref": [["a", "b"]],
+            "tags": {"k": "v"},
+        }
+        features = [
+            SeqFeature(FeatureLocation(0, 10), qualifiers=qualifiers),
+            SeqFeature(FeatureLocation(5, 20), qualifiers={"gene": ("abc",)}),
+        ]
+        table = FeatureTable(features)
+        self.assertEqual(list(table), features)
+        self.assertIsInstance(table[0].qualifiers["pair"], tuple)
+        self.assertIsInstance(table[1].qualifiers["gene"], tuple)
+        self.assertIsInstance(table[0].qualifiers["gene"], list)
+        # The table is not changed by modifying the features
+        table[0].qualifiers["tags"]["k"] = "w"
+        qualifiers["db_xref"][0].append("c")
+        self.assertEqual(table[0].qualifiers["tags"], {"k": "v"})
+        self.assertEqual(table[0].qualifiers["db_xref"], [["a", "b"]])
+        self.assertEqual(table[0:1][0].qualifiers["tags"], {"k": "v"})
+
+    def test_select(self):
+        """Test selecting features by type and region."""
+        record = SeqIO.read(path.join("GenBank", "NC_000932.gb"), "genbank")
+        table = FeatureTable(record.features)
+        for start, end in ((0, 100), (1750, 1760), (50000, 60000), (154000, 154478)):
+            expected = [
+                feature
+                for feature in record.features
+                if feature.type in ("CDS", "tRNA")
+                and any(
+                    part.start < end and start < part.end
+                    for part in feature.location.parts
+                )
+            ]
+            selected = table.select(["CDS", "tRNA"], start, end)
+            self.assertEqual(list(selected), expected)
+            # Selecting again from a subset table
+            self.assertEqual(
+                list(selected.select("tRNA")),
+                [feature for feature in expected if feature.type == "tRNA"],
+            )
+        mask = (table.end - table.start > 5000) & (table.type == "CDS")
+        self.assertEqual(
+            list(table[mask]),
+            [
+                feature
+                for feature in record.features
+                if feature.type == "CDS"
+                and feature.location.end - feature.location.start > 5000
+            ],
+        )
+
+
+class TestFeatureIndex(unittest.TestCase):
+    """Tests for the FeatureIndex class."""
+
+    def check_queries(self, features, index, positions):
+        for start in positions:
+            for end in positions:
+                for strand in (None, 1, -1):
+                    expected = [
+                        feature
+                        for feature in features
+                        if any(
+                            part.start < end
+                            and start < part.end
+                            and (strand is None or part.strand == strand)
+                            for part in feature.location.parts
+                        )
+                    ]
+                    self.assertEqual(
+                        [id(f) for f in index.overlapping(start, end, strand)],
+                        [id(f) for f in expected],
+                    )
+                    self.assertEqual(index.overlapping(start, end, strand), expected)
+
+    def test_nested(self):
+        """Test queries with nested, identical and compound locations."""
+        features = [
+            SeqFeature(FeatureLocation(0, 100, strand=1)),
+            SeqFeature(FeatureLocation(10, 20, strand=-1)),
+            SeqFeature(FeatureLocation(10, 20, strand=1)),
+            SeqFeature(FeatureLocation(10, 15, strand=1)),
+            SeqFeature(
+                CompoundLocation(
+                    [FeatureLocation(5, 12, strand=1), FeatureLocation(50, 60)]
+                )
+            ),
+            SeqFeature(FeatureLocation(12, 30, strand=-1)),
+            SeqFeature(FeatureLocation(40, 40, strand=-1)),
+            SeqFeature(FeatureLocation(90, 120, strand=-1)),
+        ]
+        index = FeatureIndex(features)
+        self.assertEqual(len(index), 8)
+        self.check_queries(features, index, range(-1, 125, 3))
+        self.assertEqual(index.at(12), [features[i] for i in (0, 1, 2, 3, 5)])
+        self.assertEqual(index.at(40), [features[0]])
+        self.assertEqual(FeatureIndex([]).at(5), [])
+
+    def test_qualifiers(self):
+        """Test features with unhashable qualifier values and missing locations."""
+        features = [
+            SeqFeature(FeatureLocation(0, 10), qualifiers={"db_xref": [["a", "b"]]}),
+            SeqFeature(None, type="unplaced", qualifiers={"note": {"k": "v"}}),
+            SeqFeature(FeatureLocation(UnknownPosition(), 8)),
+            SeqFeature(FeatureLocation(5, 15, strand=-1)),
+        ]
+        index = FeatureIndex(features)
+        self.assertEqual(len(index), 4)
+        self.assertEqual(index.at(7), [features[0], features[3]])
+        self.assertEqual(index.at(7, strand=-1), [features[3]])
+
+    def test_genbank(self):
+        """Test queries on the features of a GenBank file."""
+        record = SeqIO.read(path.join("GenBank", "NC_005816.gb"), "genbank")
+        index = FeatureIndex(record.features)
+        self.check_queries(record.features, index, range(0, 10000, 650))
+        table = FeatureTable(record.features)
+        index = FeatureIndex(table)
+        self.assertEqual(index.at(5000), [f for f in record.features if 5000 in f])
+
+
 class TestExtract(unittest.TestCase):
     def test_reference_in_location_record(self):
         """Test location with reference to another record."""
@@ -4,11 +4,18 @@
 # license.  Please see the LICENSE file that should have been included
 # as part of this package.
 """Tests for Bio.SeqIO.FastaIO module."""
+import os
+import shutil
+import tempfile
 import unittest
 
+from io import BytesIO
 from io import StringIO
 
+from Bio import bgzf
 from Bio import SeqIO
+from Bio.SeqIO.FastaIO import build_fai_index
+from Bio.SeqIO.FastaIO import FaidxDict
 from Bio.SeqIO.FastaIO import FastaIterator
 from Bio.SeqIO.FastaIO import FastaTwoLineParser
 from Bio.SeqIO.FastaIO import SimpleFastaParser
@@ -230,6 +237,107 @@ class TestSimpleFastaParsers(unittest.TestCase):
                 list(FastaTwoLineParser(handle))
 
 
+class TestFaidx(unittest.TestCase):
+    """Test samtools faidx style indexed FASTA access."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, name, data, compressed=False):
+        filename = os.path.join(self.temp_dir, name)
+        if compressed:
+            with bgzf.BgzfWriter(filename, "wb") as handle:
+                # Use small blocks so regions span several blocks
+                for i in range(0, len(data), 1000):
+                    handle.write(data[i : i + 1000])
+                    handle.flush()
+        else:
+            with open(filename, "wb") as handle:
+                handle.write(data)
+        return filename
+
+    def check(self, filename, records):
+        with FaidxDict(filename) as faidx:
+            self.assertEqual(list(faidx), [record.id for record in records])
+            for record in records:
+                new = faidx[record.id]
+                self.assertEqual(new.id, record.id)
+                self.assertEqual(len(new), len(record))
+                self.assertEqual(new.seq, record.seq)
+                seq = str(record.seq)
+                for start, end, step in [
+                    (0, 1, None),
+                    (5, 150, None),
+                    (69, 71, None),
+                    (-100, None, None),
+                    (3, 300, 7),
+                    (None, None, -1),
+                    (200, 10, -3),
+                ]:
+                    region = slice(start, end, step)
+                    self.assertEqual(new.seq[region], seq[region])
+                self.assertEqual(new.seq[-1], seq[-1])
+                self.assertEqual(new.seq[71], seq[71])
+                with self.assertRaises(IndexError):
+                    new.seq[len(seq)]
+        # Second time should use the saved .fai file
+        self.assertTrue(os.path.isfile(filename + ".fai"))
+        with FaidxDict(filename) as faidx:
+            self.assertEqual(len(faidx), len(records))
+            self.assertEqual(faidx[records[-1].id].seq, records[-1].seq)
+            seq = faidx[records[0].id].seq
+        with self.assertRaises(ValueError):
+            seq[:10]
+
+    def test_plain(self):
+        """Check indexed access to a plain FASTA file."""
+        with open("Fasta/f002", "rb") as handle:
+            data = handle.read()
+        filename = self.write("f002.fasta", data)
+        self.check(filename, list(SeqIO.parse("Fasta/f002", "fasta")))
+
+    def test_windows(self):
+        """Check indexed access to a FASTA file with Windows line endings."""
+        with open("Fasta/f002", "rb") as handle:
+            data = handle.read().replace(b"\n", b"\r\n")
+        filename = self.write("f002.fasta", data)
+        self.check(filename, list(SeqIO.parse("Fasta/f002", "fasta")))
+
+    def test_bgzf(self):
+        """Check indexed access to a BGZF compressed FASTA file."""
+        with open("Fasta/f002", "rb") as handle:
+            data = handle.read()
+        filename = self.write("f002.fasta.bgz", data, compressed=True)
+        self.check(filename, list(SeqIO.parse("Fasta/f002", "fasta")))
+        with open(filename, "rb") as handle:
+            bgzf.write_gzi_index(filename + ".gzi", bgzf.build_gzi_index(handle))
+        self.check(filename, list(SeqIO.parse("Fasta/f002", "fasta")))
+
+    def test_bad_lines(self):
+        """Check get ValueError with irregular line lengths."""
+        for data in [
+            b">a\nACGT\nAC\nACGT\n",
+            b">a\nACGT\nACGTA\n",
+            b">a\nACGT\n\nACGT\n",
+            b"ACGT\n>a\nACGT\n",
+            b">\nACGT\n",
+        ]:
+            handle = BytesIO(data)
+            with self.assertRaises(ValueError):
+                build_fai_index(handle)
+
+    def test_layout(self):
+        """Check the index of records with and without sequence."""
+        handle = BytesIO(b">a one\nACGT\nAC\n\n>b\n>c\nACG")
+        self.assertEqual(
+            build_fai_index(handle),
+            [("a", 6, 7, 4, 5), ("b", 0, 19, 0, 0), ("c", 3, 22, 3, 3)],
+        )
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
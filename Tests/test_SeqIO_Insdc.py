@@ -11,6 +11,8 @@ from Bio import SeqIO
 from Bio.Seq import Seq
 from Bio.SeqFeature import FeatureLocation
 from Bio.SeqFeature import SeqFeature
+from Bio.SeqIO.InsdcIO import EmblIterator
+from Bio.SeqIO.InsdcIO import GenBankIterator
 from Bio.SeqRecord import SeqRecord
 from seq_tests_common import SeqRecordTestBaseClass
 from test_SeqIO import SeqIOConverterTestBaseClass
@@ -101,6 +103,77 @@ class TestEmblRewrite(SeqRecordTestBaseClass):
         self.check_rewrite("EMBL/AE017046.embl")
 
 
+class TestLazy(SeqRecordTestBaseClass):
+    """Check lazy parsing gives the same records as full parsing."""
+
+    def check_lazy(self, filename, fmt, iterator):
+        old = list(SeqIO.parse(filename, fmt))
+        # Start with the features
+        new = list(iterator(filename, lazy=True))
+        for record in new:
+            self.assertNotIn("features", record.__dict__)
+            self.assertNotIn("annotations", record.__dict__)
+            record.features
+            self.assertNotIn("_seq", record.__dict__)
+        self.compare_records(old, new)
+        # Start with the sequence and annotations
+        new = list(iterator(filename, lazy=True))
+        for record in new:
+            record.annotations
+            self.assertNotIn("features", record.__dict__)
+        self.compare_records(old, new)
+        for old_r, new_r in zip(old, new):
+            self.assertEqual(old_r.annotations, new_r.annotations)
+            self.compare_record(old_r[5:20], new_r[5:20])
+        # Via SeqIO.index
+        records = SeqIO.index(filename, fmt, lazy=True)
+        for old_r in old:
+            self.compare_record(old_r, records[old_r.id])
+        records.close()
+
+    def test_genbank(self):
+        """Check lazy parsing of GenBank files."""
+        for filename in [
+            "GenBank/cor6_6.gb",
+            "GenBank/NC_005816.gb",
+            "GenBank/NC_000932.gb",
+            "GenBank/arab1.gb",
+            "GenBank/no_end_marker.gb",
+        ]:
+            self.check_lazy(filename, "genbank", GenBankIterator)
+
+    def test_embl(self):
+        """Check lazy parsing of EMBL files."""
+        for filename in [
+            "EMBL/TRBG361.embl",
+            "EMBL/AE017046.embl",
+            "EMBL/epo_prt_selection.embl",
+            "EMBL/location_wrap.embl",
+        ]:
+            self.check_lazy(filename, "embl", EmblIterator)
+
+    def test_set_before_parsing(self):
+        """Check values set before lazy parsing are not overwritten."""
+        old = SeqIO.read("GenBank/NC_005816.gb", "genbank")
+        record = next(GenBankIterator("GenBank/NC_005816.gb", lazy=True))
+        record.annotations = {"mine": 1}
+        record.features = []
+        self.assertEqual(record.seq, old.seq)
+        self.assertEqual(record.annotations, {"mine": 1})
+        self.assertEqual(record.features, [])
+        record = next(GenBankIterator("GenBank/NC_005816.gb", lazy=True))
+        record.seq = Seq("ACGT")
+        self.assertEqual(record.seq, "ACGT")
+        self.assertEqual(record.annotations, old.annotations)
+        record.letter_annotations["quality"] = [1, 2, 3, 4]
+        self.assertEqual(record[1:3].letter_annotations["quality"], [2, 3])
+
+    def test_index_unsupported(self):
+        """Check lazy SeqIO.index rejects other formats."""
+        with self.assertRaises(ValueError):
+            SeqIO.index("Fasta/f002", "fasta", lazy=True)
+
+
 class ConvertTestsInsdc(SeqIOConverterTestBaseClass):
     def test_conversion(self):
         """Test format conversion by SeqIO.write/SeqIO.parse and SeqIO.convert."""
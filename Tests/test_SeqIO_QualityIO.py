@@ -10,6 +10,8 @@ import warnings
 from io import BytesIO
 from io import StringIO
 
+import numpy
+
 from Bio import BiopythonParserWarning
 from Bio import BiopythonWarning
 from Bio import SeqIO
@@ -157,6 +159,83 @@ class TestFastqErrors(unittest.TestCase):
             self.check_general_passes(path, full_count)
 
 
+class TestFastqBatch(unittest.TestCase):
+    """Test the FastqBatchIterator function."""
+
+    def check_batches(self, filename, fmt="fastq", offset=33):
+        records = list(SeqIO.parse(filename, fmt))
+        for batch_size in (1, 2, 10000):
+            count = 0
+            for titles, seqs, quals in QualityIO.FastqBatchIterator(
+                filename, batch_size, offset
+            ):
+                self.assertLessEqual(len(titles), batch_size)
+                self.assertEqual(len(titles), len(seqs))
+                self.assertEqual(quals.dtype, numpy.uint8)
+                self.assertEqual(quals.shape[0], len(titles))
+                self.assertEqual(quals.shape[1], max(len(seq) for seq in seqs))
+                for title, seq, row in zip(titles, seqs, quals):
+                    record = records[count]
+                    self.assertEqual(title, record.description)
+                    self.assertEqual(seq, record.seq)
+                    self.assertEqual(
+                        list(row[: len(seq)]),
+                        record.letter_annotations["phred_quality"],
+                    )
+                    self.assertFalse(row[len(seq) :].any())
+                    count += 1
+            self.assertEqual(count, len(records))
+
+    def test_sanger(self):
+        """Check batches match SeqIO.parse for Sanger FASTQ files."""
+        for filename in [
+            "Quality/example.fastq",
+            "Quality/example_dos.fastq",
+            "Quality/tricky.fastq",
+            "Quality/sanger_93.fastq",
+            "Quality/sanger_faked.fastq",
+            "Quality/longreads_original_sanger.fastq",
+            "Quality/misc_dna_original_sanger.fastq",
+            "Quality/wrapping_original_sanger.fastq",
+            "Quality/zero_length.fastq",
+        ]:
+            self.check_batches(filename)
+
+    def test_illumina(self):
+        """Check batches match SeqIO.parse for Illumina 1.3+ FASTQ files."""
+        self.check_batches("Quality/illumina_faked.fastq", "fastq-illumina", 64)
+
+    def test_handle(self):
+        """Check batches from a handle."""
+        with open("Quality/example.fastq") as handle:
+            batches = list(QualityIO.FastqBatchIterator(handle, batch_size=2))
+        self.assertEqual([len(titles) for titles, seqs, quals in batches], [2, 1])
+        with open("Quality/example.fastq", "rb") as handle:
+            with self.assertRaises(ValueError):
+                next(QualityIO.FastqBatchIterator(handle))
+
+    def test_errors(self):
+        """Check invalid files are rejected."""
+        for filename in [
+            "Quality/error_diff_ids.fastq",
+            "Quality/error_no_qual.fastq",
+            "Quality/error_long_qual.fastq",
+            "Quality/error_short_qual.fastq",
+            "Quality/error_double_seq.fastq",
+            "Quality/error_double_qual.fastq",
+            "Quality/error_tabs.fastq",
+            "Quality/error_spaces.fastq",
+            "Quality/error_trunc_in_title.fastq",
+            "Quality/error_trunc_in_qual.fastq",
+            "Quality/error_trunc_at_qual.fastq",
+            "Quality/error_qual_space.fastq",
+            "Quality/error_qual_null.fastq",
+        ]:
+            with self.assertRaises(ValueError, msg=filename):
+                for batch in QualityIO.FastqBatchIterator(filename):
+                    pass
+
+
 class TestReferenceSffConversions(unittest.TestCase):
     def check(self, sff_name, sff_format, out_name, fmt):
         wanted = list(SeqIO.parse(out_name, fmt))
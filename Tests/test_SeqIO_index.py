@@ -10,6 +10,7 @@ except ImportError:
     # Try to run what tests we can in case sqlite3 was not installed
     sqlite3 = None
 
+import gc
 import os
 import unittest
 import tempfile
@@ -449,8 +450,25 @@ class IndexDictTests(SeqRecordTestBaseClass, SeqIOTestBaseClass):
 
             rec_dict = SeqIO.index(filename, fmt)
             self.check_dict_methods(rec_dict, id_list, id_list, msg=msg)
+            key_order = list(rec_dict)
             rec_dict.close()
 
+            # Hold the offsets in compact arrays rather than a dict
+            rec_dict = SeqIO.index(filename, fmt, compact=True)
+            self.assertEqual(key_order, list(rec_dict), msg=msg)
+            self.check_dict_methods(rec_dict, id_list, id_list, msg=msg)
+            rec_dict.close()
+
+            # Save the offsets to an index file, and then reuse it
+            if os.path.isfile(self.index_tmp):
+                os.remove(self.index_tmp)
+            for i in range(2):
+                rec_dict = SeqIO.index(filename, fmt, index_filename=self.index_tmp)
+                self.assertEqual(key_order, list(rec_dict), msg=msg)
+                self.check_dict_methods(rec_dict, id_list, id_list, msg=msg)
+                rec_dict.close()
+            os.remove(self.index_tmp)
+
             if not sqlite3:
                 return
 
@@ -664,6 +682,35 @@ class IndexDictTests(SeqRecordTestBaseClass, SeqIOTestBaseClass):
             else:
                 rec2 = SeqIO.read(handle, fmt)
             self.compare_record(rec1, rec2)
+
+        # Fetch them all at once, in the reverse order
+        keys = id_list[::-1]
+        many = list(rec_dict.get_raw_many(keys))
+        self.assertEqual(keys, [key for key, raw in many], msg=msg)
+        for key, raw in many:
+            self.assertEqual(raw, rec_dict.get_raw(key), msg=msg)
+        many = list(rec_dict.get_many(keys))
+        self.assertEqual(keys, [key for key, rec in many], msg=msg)
+        for key, rec in many:
+            self.compare_record(rec, rec_dict[key])
+        many = list(rec_dict.get_many(keys, sort=True))
+        self.assertEqual(
+            sorted(keys, key=rec_dict._offsets.get),
+            [key for key, rec in many],
+            msg=msg,
+        )
+        if sqlite3:
+            many = list(rec_dict_db.get_raw_many(keys))
+            self.assertEqual(keys, [key for key, raw in many], msg=msg)
+            for key, raw in many:
+                self.assertEqual(raw, rec_dict.get_raw(key), msg=msg)
+            many = list(rec_dict_db.get_many(keys, sort=True))
+            self.assertCountEqual(keys, [key for key, rec in many], msg=msg)
+            for key, rec in many:
+                self.compare_record(rec, rec_dict[key])
+            rec_dict_db.close()
+        with self.assertRaises(KeyError, msg=msg):
+            list(rec_dict.get_many(keys + [chr(0)]))
         rec_dict.close()
         del rec_dict
 
@@ -700,6 +747,23 @@ class IndexDictTests(SeqRecordTestBaseClass, SeqIOTestBaseClass):
         """Index file with duplicate identifiers with Bio.SeqIO.index()."""
         self.assertRaises(ValueError, SeqIO.index, "Fasta/dups.fasta", "fasta")
 
+    def test_duplicates_index_compact(self):
+        """Index file with duplicate identifiers with compact Bio.SeqIO.index()."""
+        self.assertRaises(
+            ValueError, SeqIO.index, "Fasta/dups.fasta", "fasta", compact=True
+        )
+
+    def test_non_string_keys_compact(self):
+        """Reject keys which are not strings in compact Bio.SeqIO.index()."""
+        self.assertRaises(
+            TypeError,
+            SeqIO.index,
+            "Quality/example.fastq",
+            "fastq",
+            key_function=len,
+            compact=True,
+        )
+
     def test_duplicates_to_dict(self):
         """Index file with duplicate identifiers with Bio.SeqIO.to_dict()."""
         with open("Fasta/dups.fasta") as handle:
@@ -734,6 +798,204 @@ class IndexDictTests(SeqRecordTestBaseClass, SeqIOTestBaseClass):
                 self.get_raw_check(filename2, fmt, comp)
 
 
+class IndexFileTests(unittest.TestCase):
+    """Check Bio.SeqIO.index() with an index_filename."""
+
+    def setUp(self):
+        os.chdir(CUR_DIR)
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.temp_dir, "example.fastq")
+        self.index_filename = os.path.join(self.temp_dir, "example.fastq.idx")
+        with open("Quality/example.fastq", "rb") as handle:
+            self.data = handle.read()
+        with open(self.filename, "wb") as handle:
+            handle.write(self.data)
+
+    def tearDown(self):
+        for name in os.listdir(self.temp_dir):
+            os.remove(os.path.join(self.temp_dir, name))
+        os.rmdir(self.temp_dir)
+
+    def test_reuse(self):
+        """Check an up to date index file is reused."""
+        records = SeqIO.index(
+            self.filename, "fastq", index_filename=self.index_filename
+        )
+        records.close()
+        self.assertTrue(os.path.isfile(self.index_filename))
+        mtime = os.stat(self.index_filename).st_mtime_ns
+        records = SeqIO.index(
+            self.filename, "fastq", index_filename=self.index_filename
+        )
+        self.assertEqual(os.stat(self.index_filename).st_mtime_ns, mtime)
+        self.assertEqual(len(records), 3)
+        self.assertIn("EAS54_6_R1_2_1_443_348", records)
+        self.assertNotIn("EAS54_6_R1_2_1_443_34", records)
+        self.assertNotIn(("EAS54_6_R1_2_1_443_348",), records)
+        self.assertEqual(
+            str(records["EAS54_6_R1_2_1_443_348"].seq), "GTTGCTTCTGGCGTGGGTGGGGGGG"
+        )
+        records.close()
+
+    def test_stale(self):
+        """Check an out of date index file is rebuilt."""
+        records = SeqIO.index(
+            self.filename, "fastq", index_filename=self.index_filename
+        )
+        records.close()
+        with open(self.filename, "wb") as handle:
+            # Drop the first record (four lines)
+            handle.write(b"\n".join(self.data.split(b"\n")[4:]))
+        records = SeqIO.index(
+            self.filename, "fastq", index_filename=self.index_filename
+        )
+        self.assertEqual(
+            list(records), ["EAS54_6_R1_2_1_540_792", "EAS54_6_R1_2_1_443_348"]
+        )
+        self.assertEqual(
+            str(records["EAS54_6_R1_2_1_540_792"].seq), "TTGGCAGGCCAAGGCCGATGGATCA"
+        )
+        records.close()
+
+    def test_not_an_index(self):
+        """Check an existing file which is not an index is not overwritten."""
+        with open(self.index_filename, "wb") as handle:
+            handle.write(b"Not an index")
+        self.assertRaises(
+            ValueError,
+            SeqIO.index,
+            self.filename,
+            "fastq",
+            index_filename=self.index_filename,
+        )
+        with open(self.index_filename, "rb") as handle:
+            self.assertEqual(handle.read(), b"Not an index")
+
+    def test_duplicates(self):
+        """Check duplicate keys are rejected."""
+        self.assertRaises(
+            ValueError,
+            SeqIO.index,
+            "Fasta/dups.fasta",
+            "fasta",
+            index_filename=self.index_filename,
+        )
+        self.assertFalse(os.path.isfile(self.index_filename))
+
+    def test_non_string_keys(self):
+        """Check keys which are not strings are rejected."""
+        self.assertRaises(
+            TypeError,
+            SeqIO.index,
+            self.filename,
+            "fastq",
+            key_function=len,
+            index_filename=self.index_filename,
+        )
+
+
+class IndexCacheTests(unittest.TestCase):
+    """Check the record cache of Bio.SeqIO.index() and index_db()."""
+
+    f = "GenBank/NC_000932.faa"
+    ids = [r.id for r in SeqIO.parse(f, "fasta")]
+
+    def check_cache(self, records):
+        a, b, c = self.ids[:3]
+        rec_a = records[a]
+        rec_b = records[b]
+        self.assertIs(records[a], rec_a)
+        self.assertEqual(tuple(records.cache_info()), (1, 2, 2, 2))
+        # Least recently used is now b, so it is dropped
+        rec_c = records[c]
+        self.assertIs(records[a], rec_a)
+        self.assertIs(records[c], rec_c)
+        self.assertIsNot(records[b], rec_b)
+        self.assertEqual(records[b].id, b)
+        info = records.cache_info()
+        self.assertEqual((info.hits, info.misses), (4, 4))
+        self.assertEqual((info.maxsize, info.currsize), (2, 2))
+        records.cache_clear()
+        self.assertEqual(tuple(records.cache_info()), (0, 0, 2, 0))
+        records.close()
+
+    def test_default(self):
+        """Check index caches just the previous record by default."""
+        records = SeqIO.index(self.f, "fasta")
+        self.assertIs(records[self.ids[0]], records[self.ids[0]])
+        self.assertEqual(records.cache_info().currsize, 1)
+        records.close()
+
+    def test_no_cache(self):
+        """Check index with no cache."""
+        records = SeqIO.index(self.f, "fasta", cache_size=0)
+        self.assertIsNot(records[self.ids[0]], records[self.ids[0]])
+        self.assertEqual(tuple(records.cache_info()), (0, 2, 0, 0))
+        records.close()
+
+    def test_negative(self):
+        """Check index rejects a negative cache size."""
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ResourceWarning)
+            self.assertRaises(ValueError, SeqIO.index, self.f, "fasta", cache_size=-1)
+            # The file should not have been opened, so not left open
+            gc.collect()
+        self.assertEqual(
+            [w for w in caught if issubclass(w.category, ResourceWarning)], []
+        )
+
+    def test_index(self):
+        """Check index with a larger cache."""
+        self.check_cache(SeqIO.index(self.f, "fasta", cache_size=2))
+
+    if sqlite3:
+
+        def test_index_db(self):
+            """Check index_db with a cache."""
+            records = SeqIO.index_db(":memory:", self.f, "fasta")
+            self.assertIsNot(records[self.ids[0]], records[self.ids[0]])
+            records.close()
+            self.check_cache(SeqIO.index_db(":memory:", self.f, "fasta", cache_size=2))
+
+
+class IndexGetManyTests(unittest.TestCase):
+    """Check using several get_many iterators at once."""
+
+    f = "GenBank/NC_000932.faa"
+    ids = [r.id for r in SeqIO.parse(f, "fasta")]
+
+    def test_interleaved(self):
+        """Check interleaved and abandoned get_many iterators."""
+        records = SeqIO.index(self.f, "fasta")
+        handle = records._proxy._handle
+        # With sort=True, the records are read while iterating
+        first = records.get_many(self.ids, sort=True)
+        second = records.get_raw_many(self.ids, sort=True)
+        self.assertEqual(next(first)[0], self.ids[0])
+        self.assertEqual(next(second)[0], self.ids[0])
+        for key, (key1, record) in zip(self.ids[1:], first):
+            self.assertEqual(key1, key)
+            self.assertEqual(record.id, key)
+            # Looking up a record in between should also work
+            self.assertEqual(records[key].id, key)
+        for key, (key2, raw) in zip(self.ids[1:], second):
+            self.assertEqual(key2, key)
+            self.assertEqual(raw, records.get_raw(key))
+        self.assertIs(records._proxy._handle, handle)
+        self.assertFalse(handle.closed)
+        # Nested, with the inner iterators abandoned half way
+        for key, record in records.get_many(self.ids[:3], sort=True):
+            inner = records.get_many(self.ids, sort=True)
+            self.assertEqual(next(inner)[1].id, self.ids[0])
+            self.assertEqual(record.id, key)
+            self.assertIs(records._proxy._handle, handle)
+        del inner
+        self.assertIs(records._proxy._handle, handle)
+        self.assertFalse(handle.closed)
+        self.assertEqual(records[self.ids[-1]].id, self.ids[-1])
+        records.close()
+
+
 class IndexOrderingSingleFile(unittest.TestCase):
     f = "GenBank/NC_000932.faa"
     ids = [r.id for r in SeqIO.parse(f, "fasta")]
@@ -768,6 +1030,47 @@ if sqlite3:
             d = SeqIO.index_db(":memory:", files, "fasta")
             self.assertEqual(ids, list(d))
 
+        def test_order_index_db_workers(self):
+            """Check index_db with workers preserves order in multiple files."""
+            files = [
+                "GenBank/NC_000932.faa",
+                "GenBank/NC_005816.faa",
+                "SwissProt/multi_ex.fasta",
+            ]
+            ids = []
+            for f in files:
+                ids.extend(r.id for r in SeqIO.parse(f, "fasta"))
+            d = SeqIO.index_db(":memory:", files, "fasta", workers=2)
+            self.assertEqual(ids, list(d))
+            self.assertEqual(len(ids), len(d))
+            for key in ids[::10]:
+                self.assertEqual(key, d[key].id)
+            d.close()
+
+        def test_key_function_index_db_workers(self):
+            """Check index_db with workers applies an unpicklable key function."""
+            files = ["GenBank/NC_000932.faa", "GenBank/NC_005816.faa"]
+            d = SeqIO.index_db(
+                ":memory:",
+                files,
+                "fasta",
+                key_function=lambda k: k.split("|")[1],
+                workers=2,
+            )
+            self.assertEqual(len(d), 95)
+            self.assertEqual(
+                d["7525076"].description,
+                "gi|7525076|ref|NP_051101.1| Ycf2 [Arabidopsis thaliana]",
+            )
+            d.close()
+
+        def test_duplicates_index_db_workers(self):
+            """Check index_db with workers rejects duplicate keys across files."""
+            files = ["GenBank/NC_005816.faa", "GenBank/NC_005816.faa"]
+            self.assertRaises(
+                ValueError, SeqIO.index_db, ":memory:", files, "fasta", workers=2
+            )
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
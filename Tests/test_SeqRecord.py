@@ -167,6 +167,27 @@ class SeqRecordMethods(unittest.TestCase):
     def test_contains(self):
         self.assertIn(Seq("ABC"), self.record)
 
+    def test_features_overlapping(self):
+        f0, f1, f2, f3 = self.record.features
+        self.assertEqual(self.record.features_overlapping(10, 12), [f0])
+        self.assertEqual(self.record.features_overlapping(9, 13), [f0, f1, f2])
+        self.assertEqual(self.record.features_overlapping(30, 40), [])
+        self.assertEqual(self.record.features_at(20), [f0, f2, f3])
+        self.assertEqual(self.record.features_at(20, strand=-1), [])
+        # Adding a feature updates the index
+        f4 = SeqFeature(FeatureLocation(19, 21, strand=-1))
+        self.record.features.append(f4)
+        self.assertEqual(self.record.features_at(20, strand=-1), [f4])
+        self.record.features = [f4]
+        self.assertEqual(self.record.features_at(20), [f4])
+        # Only the locations are indexed, so any qualifier values are allowed
+        f5 = SeqFeature(
+            FeatureLocation(5, 25), qualifiers={"db_xref": [["a", "b"]], "x": {}}
+        )
+        self.record.features.append(f5)
+        self.assertEqual(self.record.features_at(20), [f4, f5])
+        self.assertEqual(self.record.features_overlapping(0, 6), [f5])
+
     def test_str(self):
         expected = """
 ID: TestID
@@ -7,14 +7,19 @@
 import os
 import unittest
 
+import numpy
+
 from Bio import SeqIO
 from Bio.Seq import MutableSeq
 from Bio.Seq import Seq
 from Bio.SeqRecord import SeqRecord
 from Bio.SeqUtils import GC
 from Bio.SeqUtils import GC_skew
+from Bio.SeqUtils import MeltingTemp
 from Bio.SeqUtils import seq1
+from Bio.SeqUtils import kmers
 from Bio.SeqUtils import seq3
+from Bio.SeqUtils import windows
 from Bio.SeqUtils.CheckSum import crc32
 from Bio.SeqUtils.CheckSum import crc64
 from Bio.SeqUtils.CheckSum import gcg
@@ -212,6 +217,9 @@ class SeqUtilsTests(unittest.TestCase):
     def test_GC_skew(self):
         seq = "A" * 50
         self.assertEqual(GC_skew(seq)[0], 0)
+        seq = "GGGGCcgnnA" * 10 + "CCGGGATATA"
+        self.assertEqual(GC_skew(seq, 20), [3 / 7] * 5 + [1 / 5])
+        self.assertEqual(GC_skew(Seq(seq), 30), [3 / 7] * 3 + [1 / 3])
 
     def test_seq1_seq3(self):
         s3 = "MetAlaTyrtrpcysthrLYSLEUILEGlYPrOGlNaSnaLapRoTyRLySSeRHisTrpLysThr"
@@ -307,6 +315,255 @@ class SeqUtilsTests(unittest.TestCase):
         self.assertAlmostEqual(llc_lst[0], 0.9528, places=4)
 
 
+class WindowsTests(unittest.TestCase):
+    """Tests for the Bio.SeqUtils.windows module."""
+
+    def setUp(self):
+        record = SeqIO.read("GenBank/NC_005816.gb", "genbank")
+        self.seq = record.seq
+
+    def test_GC(self):
+        seq = self.seq
+        values = windows.GC(seq, 500, 70)
+        self.assertEqual(len(values), (len(seq) - 500) // 70 + 1)
+        for i, value in enumerate(values):
+            self.assertAlmostEqual(value, GC(seq[i * 70 : i * 70 + 500]))
+        self.assertEqual(list(windows.GC("GCgcsNAT", 2, 3)), [100.0, 100.0, 0.0])
+        self.assertEqual(len(windows.GC("ACGT", 5)), 0)
+        self.assertRaises(ValueError, windows.GC, seq, 0)
+        self.assertRaises(ValueError, windows.GC, seq, 10, step=0)
+
+    def test_skew(self):
+        seq = str(self.seq).lower()
+        gc_skew = windows.GC_skew(seq, 100, 100)
+        at_skew = windows.AT_skew(seq, 100, 100)
+        self.assertEqual(list(gc_skew), GC_skew(seq, 100)[:-1])
+        for i, value in enumerate(at_skew):
+            window = seq[i * 100 : i * 100 + 100]
+            a = window.count("a")
+            t = window.count("t")
+            self.assertAlmostEqual(value, (a - t) / (a + t))
+        self.assertEqual(list(windows.GC_skew("GGCNNAT", 3, 2)), [1 / 3, -1, 0])
+
+    def test_lcc(self):
+        seq = self.seq[:2000]
+        values = windows.lcc(seq, 50)
+        self.assertEqual(len(values), 1951)
+        for value1, value2 in zip(values, lcc_mult(seq, 50)):
+            self.assertAlmostEqual(value1, value2)
+        values = windows.lcc(seq, 300, 150)
+        self.assertEqual(len(values), 12)
+        for i, value in enumerate(values):
+            self.assertAlmostEqual(value, lcc_simp(seq[i * 150 : i * 150 + 300]))
+        self.assertEqual(list(windows.lcc("AAAA", 2)), [0, 0, 0])
+
+    def test_kmer_counts(self):
+        seq = self.seq
+        counts = windows.kmer_counts(seq, 3, 1000, 600)
+        self.assertEqual(counts.shape, (15, 64))
+        codons = [a + b + c for a in "ACGT" for b in "ACGT" for c in "ACGT"]
+        for i in (0, 7, 14):
+            window = seq[i * 600 : i * 600 + 1000]
+            self.assertEqual(
+                list(counts[i]), [window.count_overlap(codon) for codon in codons]
+            )
+        counts = windows.kmer_counts(Seq("ACGUNACG"), 2, 4, 1)
+        self.assertEqual(counts[:, 6].tolist(), [1, 1, 0, 0, 1])  # CG
+        self.assertEqual(counts.sum(axis=1).tolist(), [3, 2, 1, 1, 2])
+        self.assertRaises(ValueError, windows.kmer_counts, seq, 0, 10)
+
+
+class KmersTests(unittest.TestCase):
+    """Tests for the Bio.SeqUtils.kmers module."""
+
+    def count(self, sequences, k, canonical):
+        # Simple but slow reference implementation
+        counts = {}
+        for sequence in sequences:
+            sequence = str(sequence).upper()
+            for i in range(len(sequence) - k + 1):
+                kmer = sequence[i : i + k]
+                if set(kmer) <= set("ACGT"):
+                    if canonical:
+                        rc = str(Seq(kmer).reverse_complement())
+                        kmer = min(kmer, rc, key=kmers.encode_kmer)
+                    counts[kmer] = counts.get(kmer, 0) + 1
+        return counts
+
+    def test_codes(self):
+        self.assertEqual(kmers.encode_kmer("T" * 31), 0)
+        self.assertEqual(kmers.encode_kmer("G" * 31), 4**31 - 1)
+        self.assertEqual(kmers.encode_kmer("acgu"), kmers.encode_kmer("ACGT"))
+        self.assertEqual(
+            kmers.decode_kmer(kmers.encode_kmer("ACGTTGCA"), 8), "ACGTTGCA"
+        )
+        code = kmers.encode_kmer("AACGTGTT")
+        rc = kmers.reverse_complement_kmer(code, 8)
+        self.assertEqual(kmers.decode_kmer(rc, 8), "AACACGTT")
+        self.assertRaises(ValueError, kmers.encode_kmer, "ACN")
+        self.assertRaises(ValueError, kmers.encode_kmer, "A" * 32)
+        seq = "ACGTACGGTCANNACGTTTAGCAGCATCGAGCGGACAGTTACGGACTAGCAGCATC"
+        for k in (1, 2, 3, 7, 16, 31):
+            for canonical in (False, True):
+                codes = kmers.kmer_codes(Seq(seq), k, canonical)
+                self.assertEqual(len(codes), len(seq) - k + 1)
+                for i, code in enumerate(codes):
+                    kmer = seq[i : i + k]
+                    if "N" in kmer:
+                        self.assertEqual(code, kmers.INVALID)
+                        continue
+                    expected = kmers.encode_kmer(kmer)
+                    if canonical:
+                        rc = kmers.reverse_complement_kmer(expected, k)
+                        expected = min(expected, rc)
+                    self.assertEqual(code, expected)
+        self.assertEqual(len(kmers.kmer_codes("ACGT", 5)), 0)
+
+    def test_count(self):
+        records = list(SeqIO.parse("Fasta/f002", "fasta"))
+        for k in (1, 5, 11, 31):
+            for canonical in (False, True):
+                counts = kmers.count(records, k, canonical)
+                expected = self.count((r.seq for r in records), k, canonical)
+                self.assertEqual(dict(counts), expected)
+                self.assertEqual(counts.total, sum(expected.values()))
+                self.assertTrue(all(counts.kmers[:-1] < counts.kmers[1:]))
+        counts = kmers.count(records, 5)
+        for kmer, count in counts.most_common(10):
+            self.assertIs(type(count), int)
+            self.assertEqual(counts[kmer], count)
+            self.assertIn(kmer, counts)
+            rc = str(Seq(kmer).reverse_complement())
+            self.assertEqual(counts[rc], count)
+            self.assertEqual(counts[kmers.encode_kmer(rc)], count)
+        self.assertEqual(counts["ACG"], 0)
+        self.assertEqual(counts.spectrum().sum(), len(counts))
+        self.assertEqual(
+            (counts.spectrum() * numpy.arange(len(counts.spectrum()))).sum(),
+            counts.total,
+        )
+
+    def test_count_pieces(self):
+        record = SeqIO.read("GenBank/NC_005816.gb", "genbank")
+        expected = kmers.count(record.seq, 15)
+        original = kmers._CHUNK
+        try:
+            kmers._CHUNK = 1000
+            counts = kmers.count(record, 15)
+            self.assertEqual(list(counts.kmers), list(expected.kmers))
+            self.assertEqual(list(counts.counts), list(expected.counts))
+            counts = kmers.count(record, 15, processes=2)
+        finally:
+            kmers._CHUNK = original
+        self.assertEqual(list(counts.kmers), list(expected.kmers))
+        self.assertEqual(list(counts.counts), list(expected.counts))
+        half = len(record) // 2
+        total = kmers.count(record.seq[:half], 15) + kmers.count(
+            record.seq[half - 14 :], 15
+        )
+        self.assertEqual(list(total.items()), list(expected.items()))
+        self.assertRaises(ValueError, total.__add__, kmers.count(record, 15, False))
+        self.assertEqual(len(kmers.count([], 15)), 0)
+
+
+class MeltingTempTests(unittest.TestCase):
+    """Tests for the functions calculating the Tm of many sequences."""
+
+    seqs = [
+        "CGTTCCAAAGATGTGGGCATGAGCTTAC",
+        "acgttgcaatgccgta",
+        "ACGU UGCA AUGC",
+        "TTAATTAA",
+        "GCTCAGGAGCGAGGCT",
+        "CGCGXCGCGATAT",
+        "AC",
+        "T",
+        "",
+    ]
+
+    def test_Tm_Wallace_many(self):
+        tms = MeltingTemp.Tm_Wallace_many(self.seqs)
+        self.assertEqual(list(tms), [MeltingTemp.Tm_Wallace(s) for s in self.seqs])
+        tms = MeltingTemp.Tm_Wallace_many(["ACGTN"], strict=False)
+        self.assertEqual(list(tms), [MeltingTemp.Tm_Wallace("ACGTN", strict=False)])
+        self.assertRaises(ValueError, MeltingTemp.Tm_Wallace_many, ["ACGT", "ACGN"])
+
+    def test_Tm_GC_many(self):
+        seqs = self.seqs[:-1]
+        for valueset in range(1, 9):
+            for saltcorr in (0, 1, 2, 3, 4, 6, 7):
+                tms = MeltingTemp.Tm_GC_many(
+                    seqs, valueset=valueset, saltcorr=saltcorr, Mg=1.5
+                )
+                expected = [
+                    MeltingTemp.Tm_GC(s, valueset=valueset, saltcorr=saltcorr, Mg=1.5)
+                    for s in seqs
+                ]
+                self.assertEqual(list(tms), expected)
+        tms = MeltingTemp.Tm_GC_many(
+            ["ACGTNRB"], strict=False, userset=(70, 0.5, 600, 1)
+        )
+        expected = MeltingTemp.Tm_GC("ACGTNRB", strict=False, userset=(70, 0.5, 600, 1))
+        self.assertEqual(list(tms), [expected])
+        self.assertRaises(ValueError, MeltingTemp.Tm_GC_many, self.seqs, saltcorr=5)
+
+    def test_Tm_NN_many(self):
+        seqs = self.seqs[:-2]
+        tables = [
+            MeltingTemp.DNA_NN1,
+            MeltingTemp.DNA_NN3,
+            MeltingTemp.DNA_NN4,
+            MeltingTemp.RNA_NN2,
+            MeltingTemp.R_DNA_NN1,
+        ]
+        for nn_table in tables:
+            for saltcorr in range(8):
+                tms = MeltingTemp.Tm_NN_many(
+                    seqs, nn_table=nn_table, saltcorr=saltcorr, Mg=1.5
+                )
+                expected = [
+                    MeltingTemp.Tm_NN(s, nn_table=nn_table, saltcorr=saltcorr, Mg=1.5)
+                    for s in seqs
+                ]
+                self.assertEqual(list(tms), expected)
+        # Terminal mismatches (as the tables do not include G/T pairs)
+        tmm_table = MeltingTemp.make_table(
+            MeltingTemp.DNA_TMM1, {"CG/GC": (-1, -3), "AC/TG": (-2, -6)}
+        )
+        tms = MeltingTemp.Tm_NN_many(seqs, tmm_table=tmm_table, selfcomp=True)
+        expected = [
+            MeltingTemp.Tm_NN(s, tmm_table=tmm_table, selfcomp=True) for s in seqs
+        ]
+        self.assertEqual(list(tms), expected)
+        self.assertRaises(
+            ValueError, MeltingTemp.Tm_NN_many, ["ACGT", "ACNT"], check=False
+        )
+        self.assertRaises(
+            ValueError, MeltingTemp.Tm_NN_many, ["ACGU", "ACGT"], check=False
+        )
+        self.assertRaises(ValueError, MeltingTemp.Tm_NN_many, ["ACGT", "ACTU"])
+
+    def test_salt_correction_many(self):
+        seqs = self.seqs[:-2]
+        for method in range(1, 8):
+            corr = MeltingTemp.salt_correction_many(seqs, Na=50, Mg=1.5, method=method)
+            expected = [
+                MeltingTemp.salt_correction(Na=50, Mg=1.5, method=method, seq=s)
+                for s in seqs
+            ]
+            self.assertEqual(list(corr), expected)
+        tms = MeltingTemp.Tm_NN_many(seqs)
+        gc = numpy.array([GC(s) for s in seqs])
+        expected = [
+            MeltingTemp.chem_correction(tm, fmd=1.25, fmdmethod=2, GC=g)
+            for tm, g in zip(tms, gc)
+        ]
+        self.assertEqual(
+            list(MeltingTemp.chem_correction(tms, fmd=1.25, fmdmethod=2, GC=gc)),
+            expected,
+        )
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
@@ -458,6 +458,121 @@ class BgzfTests(unittest.TestCase):
             self.assertEqual(data[:4], b"\x01\x02\x03\x04")
             self.assertEqual(data[-5:], b"\x01\x02\x03\x04\n")
 
+    def test_threads_write(self):
+        """Check writing with threads gives the same blocks."""
+        with gzip.open("Quality/example.fastq.gz", "rb") as h:
+            data = h.read() * 50
+        with bgzf.BgzfWriter(self.temp_file, "wb") as h:
+            h.write(data)
+            offsets = [h.tell()]
+            h.write(data)
+        with open(self.temp_file, "rb") as h:
+            expected = h.read()
+        with bgzf.BgzfWriter(self.temp_file, "wb", threads=3) as h:
+            h.write(data)
+            self.assertEqual(h.tell(), offsets[0])
+            h.write(data)
+        with open(self.temp_file, "rb") as h:
+            self.assertEqual(h.read(), expected)
+
+    def test_threads_read(self):
+        """Check reading with threads."""
+        with gzip.open("SamBam/ex1.bam", "rb") as h:
+            old = h.read()
+        with open("SamBam/ex1.bam", "rb") as h:
+            blocks = list(bgzf.BgzfBlocks(h))
+        with bgzf.open("SamBam/ex1.bam", "rb", threads=3) as h:
+            self.assertEqual(b"".join(h), old)
+            # Jump around, including back to the start
+            for start, raw_len, data_start, data_len in blocks[::-2] + blocks[:2]:
+                h.seek(bgzf.make_virtual_offset(start, 0))
+                self.assertEqual(h.read(1000), old[data_start : data_start + 1000])
+        with bgzf.BgzfReader("SamBam/ex1.bam", "rb", max_cache=1, threads=2) as h:
+            temp = []
+            while True:
+                data = h.read(1000)
+                if not data:
+                    break
+                temp.append(data)
+            self.assertEqual(b"".join(temp), old)
+
+    def test_threads_ValueError(self):
+        """Check get expected ValueError with bad number of threads."""
+        with self.assertRaises(ValueError):
+            bgzf.BgzfReader("SamBam/ex1.bam", "rb", threads=0)
+        with self.assertRaises(ValueError):
+            bgzf.BgzfWriter(self.temp_file, "wb", threads=0)
+
+    def check_gzi_index(self, filename):
+        with gzip.open(filename, "rb") as h:
+            old = h.read()
+        with open(filename, "rb") as h:
+            blocks = list(bgzf.BgzfBlocks(h))
+        with open(filename, "rb") as h:
+            index = bgzf.build_gzi_index(h)
+        self.assertEqual(
+            index,
+            [
+                (start, data_start)
+                for start, raw_len, data_start, data_len in blocks
+                if start and data_len
+            ],
+        )
+        bgzf.write_gzi_index(self.temp_file, index)
+        self.assertEqual(os.path.getsize(self.temp_file), 8 + 16 * len(index))
+        self.assertEqual(bgzf.read_gzi_index(self.temp_file), index)
+        offsets = list(range(0, len(old), 997)) + [len(old) - 1]
+        shuffle(offsets)
+        for gzi in (None, self.temp_file):
+            with bgzf.BgzfReader(filename, "rb", max_cache=1) as h:
+                if gzi:
+                    h.load_gzi_index(gzi)
+                for offset in offsets:
+                    voffset = h.seek_uncompressed(offset)
+                    self.assertEqual(voffset, h.tell())
+                    self.assertEqual(h.read(100), old[offset : offset + 100])
+                h.seek_uncompressed(len(old))
+                self.assertEqual(h.read(1), b"")
+                with self.assertRaises(ValueError):
+                    h.seek_uncompressed(len(old) + 100000)
+                with self.assertRaises(ValueError):
+                    h.seek_uncompressed(-1)
+
+    def test_gzi_index_bam_ex1(self):
+        """Check BGZF block index for SamBam/ex1.bam."""
+        self.check_gzi_index("SamBam/ex1.bam")
+
+    def test_gzi_index_bam_ex1_header(self):
+        """Check BGZF block index for SamBam/ex1_header.bam."""
+        self.check_gzi_index("SamBam/ex1_header.bam")
+
+    def test_gzi_index_example_fastq(self):
+        """Check BGZF block index for Quality/example.fastq.bgz."""
+        self.check_gzi_index("Quality/example.fastq.bgz")
+
+    def test_gzi_index_many_blocks(self):
+        """Check BGZF block index with empty blocks."""
+        with bgzf.open(self.temp_file, "wb") as h:
+            for i in range(100):
+                h.write(b"%i\n" % i)
+                h.flush()
+                h.flush()  # empty block
+        with bgzf.open(self.temp_file, "rb") as h:
+            # Lines 0 to 9 take two bytes each, then three bytes each
+            h.seek_uncompressed(23)
+            self.assertEqual(h.readline(), b"11\n")
+            h.seek_uncompressed(21)
+            self.assertEqual(h.readline(), b"0\n")
+            h.seek_uncompressed(3)
+            self.assertEqual(h.read(5), b"\n2\n3\n")
+
+    def test_gzi_index_ValueError(self):
+        """Check get expected ValueError from a bad BGZF block index."""
+        with open(self.temp_file, "wb") as h:
+            h.write(b"\x02\x00\x00\x00\x00\x00\x00\x00")
+        with self.assertRaises(ValueError):
+            bgzf.read_gzi_index(self.temp_file)
+
     def test_BgzfBlocks_TypeError(self):
         """Check get expected TypeError from BgzfBlocks."""
         for mode in ("r", "rb"):
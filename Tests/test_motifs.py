@@ -2382,6 +2382,92 @@ class MotifTestPWM(unittest.TestCase):
         self.assertAlmostEqual(pseudocounts["G"], 1.695582495781317, places=5)
         self.assertAlmostEqual(pseudocounts["T"], 1.695582495781317, places=5)
 
+    def test_distribution(self):
+        """Test the score distribution and thresholds of a PSSM."""
+        background = {"A": 0.3, "C": 0.2, "G": 0.2, "T": 0.3}
+        pwm = motifs.create(["ACGT", "ACGA", "TCGT"]).counts.normalize(0.5)
+        pssm = pwm.log_odds(background)
+        distribution = pssm.distribution(background=background, precision=100)
+        self.assertAlmostEqual(distribution.bg_density.sum(), 1.0)
+        self.assertAlmostEqual(distribution.mo_density.sum(), 1.0)
+        # Compare with the exact distribution over all words of length 4
+        words = [""]
+        for i in range(4):
+            words = [word + letter for word in words for letter in "ACGT"]
+        scores = []
+        for word in words:
+            probability = 1.0
+            for letter in word:
+                probability *= background[letter]
+            scores.append((pssm.calculate(word), probability))
+        for fpr in (0.001, 0.01, 0.1, 0.5):
+            threshold = distribution.threshold_fpr(fpr)
+            # Allow for the rounding of the scores to the precision
+            total = sum(p for score, p in scores if score >= threshold - 0.05)
+            self.assertGreaterEqual(total, fpr)
+            total = sum(p for score, p in scores if score > threshold + 0.05)
+            self.assertLessEqual(total, fpr)
+        self.assertLess(distribution.threshold_fnr(0.1), pssm.max)
+        threshold, fpr = distribution.threshold_balanced(1000, return_rate=True)
+        self.assertEqual(distribution.threshold_balanced(1000), threshold)
+        self.assertAlmostEqual(distribution.threshold_patser(), -0.208, places=3)
+        # The distribution is cached, unless the background or scores change
+        cached = pssm.distribution(background=background, precision=100)
+        self.assertIs(cached.mo_density, distribution.mo_density)
+        self.assertIs(cached.bg_density, distribution.bg_density)
+        self.assertEqual(cached.threshold_balanced(1000), threshold)
+        self.assertIsNot(
+            pssm.distribution(precision=100).bg_density, distribution.bg_density
+        )
+        # Modifying the distribution returned does not change the cache
+        self.assertRaises(ValueError, cached.bg_density.fill, 0.0)
+        cached.modify({"A": 1.0, "C": 1.0, "G": 1.0, "T": 1.0}, background, background)
+        self.assertFalse(numpy.array_equal(cached.bg_density, distribution.bg_density))
+        cached = pssm.distribution(background=background, precision=100)
+        self.assertIs(cached.bg_density, distribution.bg_density)
+        self.assertEqual(cached.threshold_balanced(1000), threshold)
+        pssm["A"][0] += 1.0
+        self.assertIsNot(
+            pssm.distribution(background=background, precision=100).bg_density,
+            distribution.bg_density,
+        )
+
+    def test_search_many(self):
+        """Test searching many sequences for many motifs at once."""
+        with open("motifs/Arnt.sites") as handle:
+            arnt = motifs.read(handle, "sites")
+        pssms = [self.m.pssm, arnt.pssm]
+        sequences = [
+            Seq("ACGTGTGCGTAGTGCGTGCCCATATATGGCACGTG"),
+            "GCC",
+            "ccatatatgggcCACGTGn" * 3,
+        ]
+        for options in ({}, {"both": False}, {"chunksize": 10}, {"processes": 2}):
+            hits = motifs.search(pssms, sequences, threshold=3.0, **options)
+            self.assertEqual(
+                hits.dtype.names, ("motif", "sequence", "position", "strand", "score")
+            )
+            expected = []
+            for i, sequence in enumerate(sequences):
+                for j, pssm in enumerate(pssms):
+                    both = options.get("both", True)
+                    for position, score in pssm.search(sequence, 3.0, both):
+                        strand = 1
+                        if position < 0:
+                            position += len(sequence)
+                            strand = -1
+                        expected.append((j, i, position, strand, score))
+            # Sorted by sequence, motif, position, then forward strand first
+            expected.sort(key=lambda hit: (hit[1], hit[0], hit[2], -hit[3]))
+            self.assertEqual(len(hits), len(expected))
+            for hit, values in zip(hits, expected):
+                self.assertEqual(tuple(hit)[:4], values[:4])
+                self.assertAlmostEqual(hit["score"], values[4], places=5)
+        hits = motifs.search(pssms, sequences, threshold=[100.0, 3.0])
+        self.assertEqual(set(hits["motif"]), {1})
+        with self.assertRaises(ValueError):
+            motifs.search(pssms, sequences, threshold=[1.0])
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
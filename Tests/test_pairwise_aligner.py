@@ -75,6 +75,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: 0.000000
   query_right_extend_gap_score: 0.000000
   mode: global
+  memory_mode: auto
 """,
         )
 
@@ -118,6 +119,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -1.000000
   query_right_extend_gap_score: -2.000000
   mode: global
+  memory_mode: auto
 """,
         )
         self.assertAlmostEqual(aligner.query_end_open_gap_score, open_score)
@@ -174,6 +176,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -5.000000
   query_right_extend_gap_score: -5.000000
   mode: global
+  memory_mode: auto
 """,
         )
         with self.assertRaises(ValueError):
@@ -227,6 +230,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: 0.000000
   query_right_extend_gap_score: 0.000000
   mode: global
+  memory_mode: auto
 """,
         )
         self.assertEqual(aligner.algorithm, "Needleman-Wunsch")
@@ -335,6 +339,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -5.000000
   query_right_extend_gap_score: -1.000000
   mode: global
+  memory_mode: auto
 """,
         )
         score = aligner.score(seq1, seq2)
@@ -369,6 +374,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -0.100000
   query_right_extend_gap_score: -0.100000
   mode: local
+  memory_mode: auto
 """,
         )
         score = aligner.score("AwBw", "zABz")
@@ -418,6 +424,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -0.100000
   query_right_extend_gap_score: 0.000000
   mode: local
+  memory_mode: auto
 """,
         )
         score = aligner.score("AwBw", "zABz")
@@ -687,6 +694,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -0.100000
   query_right_extend_gap_score: 0.000000
   mode: global
+  memory_mode: auto
 """,
         )
         seq1 = "AA"
@@ -784,6 +792,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -0.100000
   query_right_extend_gap_score: 0.000000
   mode: global
+  memory_mode: auto
 """,
         )
         seq1 = "GAA"
@@ -883,6 +892,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -0.100000
   query_right_extend_gap_score: 0.000000
   mode: global
+  memory_mode: auto
 """,
         )
         seq1 = "GAACT"
@@ -955,6 +965,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -0.100000
   query_right_extend_gap_score: 0.000000
   mode: global
+  memory_mode: auto
 """,
         )
         seq1 = "GCT"
@@ -1060,6 +1071,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -0.200000
   query_right_extend_gap_score: -0.500000
   mode: global
+  memory_mode: auto
 """,
         )
         seq1 = "GACT"
@@ -1131,6 +1143,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -0.200000
   query_right_extend_gap_score: -1.500000
   mode: global
+  memory_mode: auto
 """,
         )
         seq1 = "GACT"
@@ -1236,6 +1249,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -1.700000
   query_right_extend_gap_score: -1.500000
   mode: global
+  memory_mode: auto
 """,
         )
         seq1 = "GACT"
@@ -1311,6 +1325,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: 0.000000
   query_right_extend_gap_score: 0.000000
   mode: global
+  memory_mode: auto
 """,
         )
         self.assertEqual(aligner.algorithm, "Gotoh global alignment algorithm")
@@ -1451,6 +1466,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -0.800000
   query_right_extend_gap_score: 0.000000
   mode: local
+  memory_mode: auto
 """,
         )
         score = aligner.score(seq1, seq2)
@@ -1554,6 +1570,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -0.200000
   query_right_extend_gap_score: 0.000000
   mode: local
+  memory_mode: auto
 """,
         )
         seq1 = "GAT"
@@ -1635,6 +1652,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -0.100000
   query_right_extend_gap_score: -0.100000
   mode: local
+  memory_mode: auto
 """,
         )
         score = aligner.score(seq1, seq2)
@@ -1762,7 +1780,7 @@ class TestPairwiseMatchDictionary(unittest.TestCase):
         aligner.extend_gap_score = 0.0
         self.assertEqual(aligner.algorithm, "Gotoh local alignment algorithm")
         lines = str(aligner).splitlines()
-        self.assertEqual(len(lines), 15)
+        self.assertEqual(len(lines), 16)
         self.assertEqual(lines[0], "Pairwise sequence aligner with parameters")
         line = lines[1]
         prefix = "  substitution_matrix: <Array object at "
@@ -1783,6 +1801,7 @@ class TestPairwiseMatchDictionary(unittest.TestCase):
         self.assertEqual(lines[12], "  query_right_open_gap_score: -0.500000")
         self.assertEqual(lines[13], "  query_right_extend_gap_score: 0.000000")
         self.assertEqual(lines[14], "  mode: local")
+        self.assertEqual(lines[15], "  memory_mode: auto")
         score = aligner.score(seq1, seq2)
         self.assertAlmostEqual(score, 3.0)
         score = aligner.score(seq1, reverse_complement(seq2), strand="-")
@@ -1866,7 +1885,7 @@ AT-T
         aligner.open_gap_score = -1.0
         aligner.extend_gap_score = 0.0
         lines = str(aligner).splitlines()
-        self.assertEqual(len(lines), 15)
+        self.assertEqual(len(lines), 16)
         self.assertEqual(lines[0], "Pairwise sequence aligner with parameters")
         line = lines[1]
         prefix = "  substitution_matrix: <Array object at "
@@ -1887,6 +1906,7 @@ AT-T
         self.assertEqual(lines[12], "  query_right_open_gap_score: -1.000000")
         self.assertEqual(lines[13], "  query_right_extend_gap_score: 0.000000")
         self.assertEqual(lines[14], "  mode: local")
+        self.assertEqual(lines[15], "  memory_mode: auto")
         score = aligner.score(seq1, seq2)
         self.assertAlmostEqual(score, 3.0)
         score = aligner.score(seq1, reverse_complement(seq2), strand="-")
@@ -1938,7 +1958,7 @@ ATT
         aligner.open_gap_score = -1.0
         aligner.extend_gap_score = 0.0
         lines = str(aligner).splitlines()
-        self.assertEqual(len(lines), 15)
+        self.assertEqual(len(lines), 16)
         self.assertEqual(lines[0], "Pairwise sequence aligner with parameters")
         line = lines[1]
         prefix = "  substitution_matrix: <Array object at "
@@ -1959,6 +1979,7 @@ ATT
         self.assertEqual(lines[12], "  query_right_open_gap_score: -1.000000")
         self.assertEqual(lines[13], "  query_right_extend_gap_score: 0.000000")
         self.assertEqual(lines[14], "  mode: local")
+        self.assertEqual(lines[15], "  memory_mode: auto")
         score = aligner.score(seq1, seq2)
         self.assertAlmostEqual(score, 3.0)
         score = aligner.score(seq1, reverse_complement(seq2), strand="-")
@@ -2013,7 +2034,7 @@ ATAT
         aligner.extend_gap_score = 0.0
         self.assertEqual(aligner.algorithm, "Gotoh local alignment algorithm")
         lines = str(aligner).splitlines()
-        self.assertEqual(len(lines), 15)
+        self.assertEqual(len(lines), 16)
         self.assertEqual(lines[0], "Pairwise sequence aligner with parameters")
         line = lines[1]
         prefix = "  substitution_matrix: <Array object at "
@@ -2034,6 +2055,7 @@ ATAT
         self.assertEqual(lines[12], "  query_right_open_gap_score: -0.500000")
         self.assertEqual(lines[13], "  query_right_extend_gap_score: 0.000000")
         self.assertEqual(lines[14], "  mode: local")
+        self.assertEqual(lines[15], "  memory_mode: auto")
         score = aligner.score(seq1, seq2)
         self.assertAlmostEqual(score, 3.0)
         score = aligner.score(seq1, reverse_complement(seq2), strand="-")
@@ -2119,7 +2141,7 @@ AT-T
         aligner.open_gap_score = -1.0
         aligner.extend_gap_score = 0.0
         lines = str(aligner).splitlines()
-        self.assertEqual(len(lines), 15)
+        self.assertEqual(len(lines), 16)
         self.assertEqual(lines[0], "Pairwise sequence aligner with parameters")
         line = lines[1]
         prefix = "  substitution_matrix: <Array object at "
@@ -2140,6 +2162,7 @@ AT-T
         self.assertEqual(lines[12], "  query_right_open_gap_score: -1.000000")
         self.assertEqual(lines[13], "  query_right_extend_gap_score: 0.000000")
         self.assertEqual(lines[14], "  mode: local")
+        self.assertEqual(lines[15], "  memory_mode: auto")
         score = aligner.score(seq1, seq2)
         self.assertAlmostEqual(score, 3.0)
         score = aligner.score(seq1, reverse_complement(seq2), strand="-")
@@ -2193,7 +2216,7 @@ ATT
         aligner.open_gap_score = -1.0
         aligner.extend_gap_score = 0.0
         lines = str(aligner).splitlines()
-        self.assertEqual(len(lines), 15)
+        self.assertEqual(len(lines), 16)
         self.assertEqual(lines[0], "Pairwise sequence aligner with parameters")
         line = lines[1]
         prefix = "  substitution_matrix: <Array object at "
@@ -2214,6 +2237,7 @@ ATT
         self.assertEqual(lines[12], "  query_right_open_gap_score: -1.000000")
         self.assertEqual(lines[13], "  query_right_extend_gap_score: 0.000000")
         self.assertEqual(lines[14], "  mode: local")
+        self.assertEqual(lines[15], "  memory_mode: auto")
         score = aligner.score(seq1, seq2)
         self.assertAlmostEqual(score, 3.0)
         score = aligner.score(seq1, reverse_complement(seq2), strand="-")
@@ -2279,6 +2303,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -0.300000
   query_right_extend_gap_score: -0.100000
   mode: local
+  memory_mode: auto
 """,
         )
         score = aligner.score("abcde", "c")
@@ -2326,6 +2351,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -0.300000
   query_right_extend_gap_score: -0.100000
   mode: local
+  memory_mode: auto
 """,
         )
         score = aligner.score("abcce", "c")
@@ -2387,6 +2413,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -0.300000
   query_right_extend_gap_score: -0.100000
   mode: global
+  memory_mode: auto
 """,
         )
         seq1 = "abcde"
@@ -2436,6 +2463,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -0.300000
   query_right_extend_gap_score: -0.100000
   mode: global
+  memory_mode: auto
 """,
         )
         score = aligner.score("abcde", "c")
@@ -2480,6 +2508,7 @@ class TestPerSiteGapPenalties(unittest.TestCase):
   target_gap_function: {nogaps}
   query_gap_function: {specificgaps}
   mode: global
+  memory_mode: auto
 """,
         )
         self.assertEqual(
@@ -2564,6 +2593,7 @@ AAAABBBAAAACCCCCCCCCCCCCCAAAABBBAAAA
   target_gap_function: {nogaps}
   query_gap_function: {specificgaps}
   mode: global
+  memory_mode: auto
 """,
         )
         self.assertEqual(
@@ -2676,6 +2706,7 @@ AAAABBBAAAACCCCCCCCCCCCCCAAAABBBAAAA
   query_right_open_gap_score: 0.000000
   query_right_extend_gap_score: 0.000000
   mode: global
+  memory_mode: auto
 """,
         )
         score = aligner.score(seq1, seq2)
@@ -2728,6 +2759,7 @@ TTG--GAA
   target_gap_function: {gap_score}
   query_gap_function: {gap_score}
   mode: global
+  memory_mode: auto
 """,
         )
         score = aligner.score(seq1, seq2)
@@ -2905,6 +2937,7 @@ TTG--GAA
   target_gap_function: {nogaps}
   query_gap_function: {specificgaps}
   mode: local
+  memory_mode: auto
 """,
         )
         score = aligner.score(seq1, seq2)
@@ -3008,6 +3041,7 @@ AAAABBBAAAACCCCCCCCCCCCCCAAAABBBAAAA
   target_gap_function: {nogaps}
   query_gap_function: {specificgaps}
   mode: local
+  memory_mode: auto
 """,
         )
         self.assertEqual(
@@ -3112,6 +3146,7 @@ AAAABBBAAAACCCCCCCCCCCCCCAAAABBBAAAA
   query_right_open_gap_score: 0.000000
   query_right_extend_gap_score: 0.000000
   mode: local
+  memory_mode: auto
 """,
         )
         score = aligner.score(seq1, seq2)
@@ -3188,6 +3223,7 @@ TTGGAA
   target_gap_function: {gap_score}
   query_gap_function: {gap_score}
   mode: local
+  memory_mode: auto
 """,
         )
         score = aligner.score(seq1, seq2)
@@ -3591,6 +3627,7 @@ Pairwise sequence aligner with parameters
   query_right_open_gap_score: -0.300000
   query_right_extend_gap_score: -0.100000
   mode: local
+  memory_mode: auto
 """,
         )
 
@@ -4467,6 +4504,381 @@ query	16	target	1	255	6D17M5I	*	0	0	ACGATCGAGCNGCTACGCCCNC	*	AS:i:13
         )
 
 
+class TestScoreMany(unittest.TestCase):
+    """Check score_many and score_matrix against the score method."""
+
+    def setUp(self):
+        path = os.path.join("Fasta", "f002")
+        self.records = list(SeqIO.parse(path, "fasta"))
+        self.seqs = [record.seq[:200] for record in self.records]
+
+    def check(self, aligner, strand="+"):
+        seqs = self.seqs
+        for threads in (1, 3):
+            scores = aligner.score_many(seqs, seqs[::-1], strand, threads)
+            expected = [aligner.score(a, b, strand) for a, b in zip(seqs, seqs[::-1])]
+            self.assertEqual(list(scores), expected)
+            scores = aligner.score_matrix(seqs, strand=strand, threads=threads)
+            self.assertEqual(scores.shape, (len(seqs), len(seqs)))
+            for i, a in enumerate(seqs):
+                for j, b in enumerate(seqs):
+                    self.assertEqual(scores[i, j], aligner.score(a, b, strand))
+
+    def test_algorithms(self):
+        aligner = Align.PairwiseAligner(match_score=2, mismatch_score=-1)
+        for mode in ("global", "local"):
+            aligner.mode = mode
+            aligner.gap_score = -1
+            self.check(aligner)
+            aligner.open_gap_score = -3
+            aligner.extend_gap_score = -1
+            self.check(aligner, "-")
+
+    def test_substitution_matrix(self):
+        from Bio.Align import substitution_matrices
+
+        aligner = Align.PairwiseAligner(mode="local", open_gap_score=-5)
+        aligner.substitution_matrix = substitution_matrices.load("NUC.4.4")
+        self.check(aligner)
+        scores = aligner.score_matrix(self.seqs[:2], self.seqs[1:])
+        self.assertEqual(scores.shape, (2, 2))
+        self.assertEqual(scores[0, 0], aligner.score(self.seqs[0], self.seqs[1]))
+
+    def test_errors(self):
+        aligner = Align.PairwiseAligner()
+        self.assertRaises(ValueError, aligner.score_many, ["ACGT"], [])
+        self.assertRaises(
+            ValueError, aligner.score_many, ["ACGT", "AC"], ["", "A"], threads=2
+        )
+        self.assertEqual(aligner.score_matrix([]).shape, (0, 0))
+
+
+class TestBandedScore(unittest.TestCase):
+    """Check the score calculated with band_width and xdrop."""
+
+    def setUp(self):
+        path = os.path.join("Fasta", "f002")
+        self.seqs = [record.seq for record in SeqIO.parse(path, "fasta")]
+
+    def check_wide(self, aligner, strand="+"):
+        # A band or X-drop covering everything gives the full score
+        pairs = [(a, b) for a in self.seqs for b in self.seqs]
+        expected = [aligner.score(a, b, strand) for a, b in pairs]
+        aligner.band_width = 1000
+        aligner.band_offset = -3
+        self.assertEqual([aligner.score(a, b, strand) for a, b in pairs], expected)
+        aligner.band_width = None
+        aligner.xdrop = 1e6
+        self.assertEqual([aligner.score(a, b, strand) for a, b in pairs], expected)
+        aligner.xdrop = None
+
+    def test_wide(self):
+        from Bio.Align import substitution_matrices
+
+        aligner = Align.PairwiseAligner(match_score=2, mismatch_score=-1)
+        for mode in ("global", "local"):
+            aligner.mode = mode
+            aligner.gap_score = -1
+            self.check_wide(aligner)
+            aligner.open_gap_score = -3
+            aligner.extend_gap_score = -1
+            aligner.query_end_gap_score = 0
+            self.check_wide(aligner, "-")
+            aligner.substitution_matrix = substitution_matrices.load("NUC.4.4")
+            self.check_wide(aligner)
+            aligner.substitution_matrix = None
+
+    def test_str(self):
+        aligner = Align.PairwiseAligner()
+        self.assertNotIn("band_width", str(aligner))
+        self.assertNotIn("xdrop", str(aligner))
+        aligner.band_width = 5
+        aligner.band_offset = -2
+        aligner.xdrop = 10
+        lines = str(aligner).splitlines()
+        self.assertIn("  band_width: 5", lines)
+        self.assertIn("  band_offset: -2", lines)
+        self.assertIn("  xdrop: 10.000000", lines)
+
+    def test_band(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-1, gap_score=-2)
+        # GAACTGCTTA
+        # ||-||||-||
+        # GA-CTGC-TTA with the last letters of each aligned off the diagonal
+        self.assertEqual(aligner.score("GAACTGCTTA", "GACTGCCTTA"), 5.0)
+        aligner.band_width = 1
+        self.assertEqual(aligner.score("GAACTGCTTA", "GACTGCCTTA"), 5.0)
+        aligner.band_width = 0
+        self.assertEqual(aligner.score("GAACTGCTTA", "GACTGCCTTA"), 2.0)
+        # The band must include both ends of a global alignment
+        self.assertRaises(ValueError, aligner.score, "GAACTGCTTA", "GACTG")
+        aligner.band_offset = -5
+        self.assertRaises(ValueError, aligner.score, "GAACTGCTTA", "GACTG")
+        aligner.band_width = 5
+        self.assertEqual(aligner.score("GAACTGCTTA", "GACTG"), -5.0)
+        # A local alignment can be anywhere in the band
+        aligner.mode = "local"
+        aligner.band_width = 0
+        aligner.band_offset = 5
+        self.assertEqual(aligner.score("ACGT", "TTTTTACGT"), 4.0)
+        aligner.band_offset = 4
+        self.assertEqual(aligner.score("ACGT", "TTTTTACGT"), 0.0)
+
+    def test_xdrop(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-1, gap_score=-2)
+        target = "ACGTACGTACTTTTACGTACGTAC"
+        query = "ACGTACGTACGGGGACGTACGTAC"
+        self.assertEqual(aligner.score(target, query), 16.0)
+        aligner.xdrop = 4
+        self.assertEqual(aligner.score(target, query), 16.0)
+        aligner.xdrop = 3
+        self.assertEqual(aligner.score(target, query), float("-inf"))
+        aligner.mode = "local"
+        self.assertEqual(aligner.score(target, query), 10.0)
+        aligner.xdrop = None
+        self.assertEqual(aligner.score(target, query), 16.0)
+
+    def test_attributes(self):
+        import pickle
+
+        aligner = Align.PairwiseAligner()
+        self.assertIsNone(aligner.band_width)
+        self.assertEqual(aligner.band_offset, 0)
+        self.assertIsNone(aligner.xdrop)
+        with self.assertRaises(ValueError):
+            aligner.band_width = -1
+        with self.assertRaises(ValueError):
+            aligner.xdrop = -1
+        aligner = Align.PairwiseAligner(band_width=10, band_offset=-2, xdrop=20)
+        pickled_aligner = pickle.loads(pickle.dumps(aligner))
+        self.assertEqual(pickled_aligner.band_width, 10)
+        self.assertEqual(pickled_aligner.band_offset, -2)
+        self.assertEqual(pickled_aligner.xdrop, 20)
+        # Only the score is available
+        self.assertRaises(ValueError, aligner.align, "ACGT", "ACGT")
+        aligner.band_width = None
+        aligner.xdrop = None
+        aligner.target_gap_score = lambda i, n: -n
+        self.assertEqual(aligner.score("ACGT", "AGT"), 3.0)
+        aligner.band_width = 10
+        self.assertRaises(ValueError, aligner.score, "ACGT", "AGT")
+
+
+class TestLinearMemory(unittest.TestCase):
+    """Check alignments calculated in linear memory."""
+
+    def setUp(self):
+        path = os.path.join("Fasta", "f002")
+        self.seqs = [record.seq[:120] for record in SeqIO.parse(path, "fasta")]
+
+    def path_score(self, aligner, target, query, coordinates):
+        """Calculate the score of an alignment from its coordinates."""
+        if aligner.substitution_matrix is None:
+            match = aligner.match_score
+            mismatch = aligner.mismatch_score
+            substitution = lambda a, b: match if a == b else mismatch  # noqa: E731
+        else:
+            substitution = lambda a, b: aligner.substitution_matrix[a][b]  # noqa: E731
+        score = 0
+        (i0, j0), *path = coordinates.transpose()
+        for i1, j1 in path:
+            if i1 > i0 and j1 > j0:
+                for a, b in zip(target[i0:i1], query[j0:j1]):
+                    score += substitution(a, b)
+            else:
+                if aligner.mode == "local":
+                    end = "internal"
+                elif i1 > i0:
+                    end = {0: "left", len(query): "right"}.get(j0, "internal")
+                else:
+                    end = {0: "left", len(target): "right"}.get(i0, "internal")
+                name = "query" if i1 > i0 else "target"
+                score += getattr(aligner, f"{name}_{end}_open_gap_score")
+                extend = getattr(aligner, f"{name}_{end}_extend_gap_score")
+                score += extend * (i1 - i0 + j1 - j0 - 1)
+            i0, j0 = i1, j1
+        return score
+
+    def check(self, aligner):
+        aligner.memory_mode = "linear"
+        for target in self.seqs:
+            for query in self.seqs:
+                score = aligner.score(target, query)
+                alignments = aligner.align(target, query)
+                self.assertEqual(alignments.score, score)
+                self.assertEqual(len(alignments), 1)
+                coordinates = alignments[0].coordinates
+                self.assertEqual(
+                    self.path_score(aligner, target, query, coordinates), score
+                )
+                # The reverse strand swaps the left and right end gap scores
+                rc = query.reverse_complement()
+                alignments = aligner.align(target, rc, "-")
+                self.assertEqual(alignments.score, aligner.score(target, rc, "-"))
+                self.assertEqual(len(alignments), 1)
+        aligner.memory_mode = "auto"
+
+    def test_algorithms(self):
+        aligner = Align.PairwiseAligner(match_score=2, mismatch_score=-1)
+        for mode in ("global", "local"):
+            aligner.mode = mode
+            aligner.gap_score = -2
+            self.check(aligner)
+            aligner.open_gap_score = -3
+            aligner.extend_gap_score = -1
+            self.check(aligner)
+        aligner.mode = "global"
+        aligner.target_end_gap_score = 0
+        aligner.query_left_open_gap_score = -6
+        self.check(aligner)
+
+    def test_substitution_matrix(self):
+        from Bio.Align import substitution_matrices
+
+        aligner = Align.PairwiseAligner(open_gap_score=-10, extend_gap_score=-1)
+        aligner.substitution_matrix = substitution_matrices.load("NUC.4.4")
+        self.check(aligner)
+        aligner.mode = "local"
+        self.check(aligner)
+
+    def test_alignment(self):
+        aligner = Align.PairwiseAligner(memory_mode="linear")
+        aligner.mismatch_score = -1
+        aligner.open_gap_score = -2
+        aligner.extend_gap_score = -0.5
+        alignments = aligner.align("AAGCTTACGTTGCAAT", "AGCTTACGGTTGCTT")
+        self.assertEqual(len(alignments), 1)
+        self.assertAlmostEqual(alignments.score, 6.0)
+        self.assertEqual(
+            str(alignments[0]),
+            """\
+AAGCTTAC-GTTGCAAT
+-|||||||-|||||-.|
+-AGCTTACGGTTGC-TT
+""",
+        )
+        aligner.mode = "local"
+        alignments = aligner.align("AAGCTTACGTTGCAAT", "AGCTTACGGTTGCTT")
+        self.assertEqual(len(alignments), 1)
+        self.assertAlmostEqual(alignments.score, 10.0)
+        self.assertEqual(
+            str(alignments[0]),
+            """\
+AAGCTTAC-GTTGCAAT
+ |||||||-|||||
+ AGCTTACGGTTGCTT
+""",
+        )
+        # No local alignment if nothing matches
+        alignments = aligner.align("AAAA", "CCC")
+        self.assertEqual(alignments.score, 0)
+        self.assertEqual(len(alignments), 0)
+
+    def test_attributes(self):
+        import pickle
+
+        aligner = Align.PairwiseAligner()
+        self.assertEqual(aligner.memory_mode, "auto")
+        with self.assertRaises(ValueError):
+            aligner.memory_mode = "none"
+        aligner.memory_mode = "linear"
+        self.assertEqual(str(aligner).splitlines()[-1], "  memory_mode: linear")
+        pickled_aligner = pickle.loads(pickle.dumps(aligner))
+        self.assertEqual(pickled_aligner.memory_mode, "linear")
+        # Gap score functions need the full matrix
+        aligner.target_gap_score = lambda i, n: -n
+        self.assertRaises(ValueError, aligner.align, "ACGT", "AGT")
+        aligner.memory_mode = "auto"
+        self.assertEqual(len(aligner.align("ACGT", "AGT")), 1)
+
+
+class TestQueryProfile(unittest.TestCase):
+    """Check local alignment scores calculated with a query profile."""
+
+    def setUp(self):
+        path = os.path.join("Fasta", "f002")
+        self.seqs = [record.seq[:300] for record in SeqIO.parse(path, "fasta")]
+
+    def check(self, aligner):
+        for query in self.seqs:
+            profile = aligner.prepare(query)
+            reverse_profile = aligner.prepare(query, "-")
+            for target in self.seqs:
+                self.assertEqual(profile.score(target), aligner.score(target, query))
+                self.assertEqual(
+                    reverse_profile.score(target), aligner.score(target, query, "-")
+                )
+
+    def test_compare(self):
+        aligner = Align.PairwiseAligner(mode="local", mismatch_score=-1)
+        aligner.gap_score = -2
+        self.check(aligner)
+        aligner.open_gap_score = -3
+        aligner.extend_gap_score = -1
+        self.check(aligner)
+        aligner.target_open_gap_score = -5
+        aligner.wildcard = "N"
+        self.check(aligner)
+        # Scores overflowing 8-bit and 16-bit integers
+        aligner.match_score = 100
+        self.check(aligner)
+        aligner.match_score = 10000
+        self.check(aligner)
+        # Scores that are not integers
+        aligner.match_score = 1.5
+        self.check(aligner)
+        # Extending a gap costs more than opening it
+        aligner.match_score = 2
+        aligner.query_extend_gap_score = -4
+        self.check(aligner)
+
+    def test_substitution_matrix(self):
+        from Bio.Align import substitution_matrices
+
+        aligner = Align.PairwiseAligner(mode="local")
+        aligner.substitution_matrix = substitution_matrices.load("NUC.4.4")
+        aligner.open_gap_score = -10
+        aligner.extend_gap_score = -1
+        self.check(aligner)
+        profile = aligner.prepare("GATTACA")
+        self.assertRaises(ValueError, profile.score, "GAUUACA")
+
+    def test_copy(self):
+        aligner = Align.PairwiseAligner(mode="local", mismatch_score=-1)
+        aligner.open_gap_score = -2
+        aligner.extend_gap_score = -1
+        profile = aligner.prepare("GAACTGCTTA")
+        self.assertEqual(profile.score("TTGACTGCTTACC"), 8.0)
+        self.assertEqual(profile.score(Seq("TTGACTGCTTACC")), 8.0)
+        aligner.match_score = 2
+        self.assertEqual(profile.score("TTGACTGCTTACC"), 8.0)
+
+    def test_alphabet(self):
+        import pickle
+
+        aligner = Align.PairwiseAligner(mode="local")
+        aligner.alphabet = "ABC"
+        self.assertRaises(ValueError, aligner.score, "ABCD", "ABC")
+        profile = aligner.prepare("ABC")
+        self.assertEqual(profile.score("CABCA"), aligner.score("CABCA", "ABC"))
+        self.assertRaises(ValueError, profile.score, "ABCD")
+        aligner = pickle.loads(pickle.dumps(aligner))
+        self.assertEqual(aligner.alphabet, "ABC")
+
+    def test_errors(self):
+        aligner = Align.PairwiseAligner(mode="global")
+        self.assertRaises(ValueError, aligner.prepare, "ACGT")
+        aligner.mode = "local"
+        aligner.band_width = 2
+        self.assertRaises(ValueError, aligner.prepare, "ACGT")
+        aligner.band_width = None
+        aligner.target_gap_score = lambda i, n: -n
+        self.assertRaises(ValueError, aligner.prepare, "ACGT")
+        aligner.gap_score = -1
+        profile = aligner.prepare("ACGT")
+        self.assertRaises(ValueError, profile.score, "")
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
@@ -1383,6 +1383,109 @@ class TestStopCodons(unittest.TestCase):
         self.assertEqual(Seq.translate("nnn"), "X")
 
 
+class TestTranslatingLong(unittest.TestCase):
+    """Check the table lookup translation of long sequences matches the loop."""
+
+    def setUp(self):
+        self.codons = [
+            "ATG", "TGG", "aaa", "TAA", "TGA", "TAR", "TAN", "NNN", "MGR", "AUG", "UAG"
+        ]  # fmt: skip
+        self.old_length = Seq._TRANSLATE_VECTOR_MIN_LENGTH
+
+    def tearDown(self):
+        Seq._TRANSLATE_VECTOR_MIN_LENGTH = self.old_length
+
+    def translate_both(self, sequence, **kwargs):
+        """Translate using the table lookup, then using the loop."""
+        results = []
+        for length in (0, len(sequence) + 1):
+            Seq._TRANSLATE_VECTOR_MIN_LENGTH = length
+            try:
+                results.append(Seq.translate(sequence, **kwargs))
+            except TranslationError as err:
+                results.append(str(err))
+        self.assertEqual(results[0], results[1])
+        return results[0]
+
+    def test_translation(self):
+        sequence = "".join(self.codons * 30)
+        for table in (1, 2, 11, 27):
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", BiopythonWarning)
+                self.translate_both(sequence, table=table)
+        protein = self.translate_both(sequence, stop_symbol="@", to_stop=True)
+        self.assertEqual(protein, "MWK")
+        protein = self.translate_both(sequence)
+        self.assertEqual(protein, "MWK***XXRM*" * 30)
+
+    def test_translation_cds(self):
+        sequence = "ATG" + "AAAGGGNNNCCC" * 50 + "TAG"
+        self.assertEqual(self.translate_both(sequence, cds=True), "M" + "KGXP" * 50)
+        sequence = "ATG" + "AAAGGGTAGCCC" * 50 + "TAG"
+        self.assertEqual(
+            self.translate_both(sequence, cds=True), "Extra in frame stop codon found."
+        )
+
+    def test_translation_invalid(self):
+        sequence = "ATG" * 100 + "---" + "TAA" + "A?G" + "ATG" * 100
+        self.assertEqual(self.translate_both(sequence), "Codon '---' is invalid")
+        self.assertEqual(
+            self.translate_both(sequence, to_stop=True), "Codon '---' is invalid"
+        )
+        self.assertEqual(
+            self.translate_both(sequence, gap="-"), "Codon 'A?G' is invalid"
+        )
+        self.assertEqual(
+            self.translate_both(sequence, gap="-", to_stop=True), "M" * 100 + "-"
+        )
+        self.assertEqual(self.translate_both("ATÉ" * 100), "Codon 'ATÉ' is invalid")
+
+    def test_translation_x(self):
+        self.assertEqual(Seq.translate("CCX" * 60), "P" * 60)
+        self.assertEqual(Seq.translate("CXG" * 60), "X" * 60)
+        sequence = "ATGCCXCXGGGX" * 20
+        self.assertEqual(self.translate_both(sequence), "MPXG" * 20)
+        self.assertEqual(self.translate_both(sequence.lower(), table=2), "MPXG" * 20)
+
+    def test_translate_many(self):
+        sequences = ["".join(self.codons), "", "ATGAAA", Seq.Seq("ATGTAGAAA")]
+        self.assertEqual(
+            Seq.translate_many(sequences),
+            ["MWK***XXRM*", "", "MK", Seq.Seq("M*K")],
+        )
+        self.assertEqual(
+            Seq.translate_many(sequences, to_stop=True), ["MWK", "", "MK", "M"]
+        )
+        self.assertEqual(
+            Seq.translate_many(["GTGAAATAA", "ATGTAG"], table=11, cds=True),
+            ["MK", "M"],
+        )
+        with self.assertRaises(TranslationError):
+            Seq.translate_many(["ATGAAATAA", "AAATAG"], cds=True)
+        with self.assertRaises(TranslationError):
+            Seq.translate_many(["ATGAAA", "A?G"])
+        # Falling back on the per codon loop, with a partial codon
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", BiopythonWarning)
+            proteins = Seq.translate_many(["ATGTAGAA", "ATG"], stop_symbol="\u2605")
+        self.assertEqual(proteins, ["M\u2605", "M"])
+        self.assertEqual(len(caught), 1)
+
+    def test_translate_six_frames(self):
+        sequence = "AUGGCCAUUGUAAUGGGCCGCUGA"
+        frames = Seq.translate_six_frames(sequence)
+        self.assertEqual(frames[0], Seq.translate(sequence))
+        self.assertEqual(frames[1], Seq.translate(sequence[1:22]))
+        self.assertEqual(frames[2], Seq.translate(sequence[2:23]))
+        reverse = Seq.reverse_complement(sequence, inplace=False)
+        self.assertEqual(frames[3], Seq.translate(reverse))
+        self.assertEqual(frames[4], Seq.translate(reverse[1:22]))
+        self.assertEqual(frames[5], Seq.translate(reverse[2:23]))
+        frames = Seq.translate_six_frames(Seq.Seq(sequence))
+        self.assertEqual(frames[0], Seq.Seq("MAIVMGR*"))
+        self.assertIsInstance(frames[5], Seq.Seq)
+
+
 class TestAttributes(unittest.TestCase):
     def test_seq(self):
         s = Seq.Seq("ACGT")